@@ -1,4 +1,9 @@
-from fastapi import APIRouter, HTTPException
+import json
+import re
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.core.sanitize import sanitize_text, QUESTION_MAX_LENGTH
 from app.schemas import ChatRequest, ChatResponse
@@ -6,21 +11,79 @@ from app.services import graph_service
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+# 대화 이력 세션: 헤더 우선 (Streamlit·교차 출처 그래프 UI), 없으면 쿠키 (같은 출처 브라우저)
+SESSION_HEADER = "X-Session-Id"
+SESSION_COOKIE = "graphiq_session"
+_SESSION_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,128}$")
+
 
 def _sanitize_question(question: str) -> str:
     """질문 정제 (XSS 방지 및 길이 제한). 공통 정책: app.core.sanitize."""
     return sanitize_text(question, max_length=QUESTION_MAX_LENGTH, allow_none=False) or ""
 
 
+def _session_id(request: Request) -> tuple[str, bool]:
+    """(세션 id, 새로 발급 여부). 헤더 → 쿠키 순, 없거나 형식이 틀리면 새 id."""
+    for candidate in (request.headers.get(SESSION_HEADER), request.cookies.get(SESSION_COOKIE)):
+        if candidate and _SESSION_ID_RE.match(candidate):
+            return candidate, False
+    return uuid.uuid4().hex, True
+
+
+def _attach_session(response: Response, session_id: str, new: bool) -> None:
+    # 헤더는 항상 회신 (헤더 방식 클라이언트가 발급된 id 를 알 수 있게), 쿠키는 새 세션일 때만
+    response.headers[SESSION_HEADER] = session_id
+    if new:
+        response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+
+
 @router.post("", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
+def chat(req: ChatRequest, request: Request, response: Response) -> ChatResponse:
+    if not req.question.strip():
+        raise HTTPException(400, "질문이 비어 있습니다.")
+    sanitized_question = _sanitize_question(req.question)
+    session_id, new = _session_id(request)
+    _attach_session(response, session_id, new)
+    return ChatResponse(**graph_service.ask_graph(sanitized_question, session_id))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(req: ChatRequest, request: Request) -> StreamingResponse:
+    """
+    POST /chat 의 SSE 버전 (text/event-stream). 5~15초 걸리는 한 턴을 단계별로 전송:
+
+    - hints: 벡터 인덱스 유사 회사명 {hints}
+    - cypher: 생성된 Cypher {cypher}
+    - rows: DB 조회 결과 {raw} (top_k 건)
+    - token: 답변 조각 {text} (LLM 생성 즉시, 이어 붙이면 최종 answer)
+    - done | error: 최종 결과 (ChatResponse 와 같은 모양, error 면 answer 에 ⚠️ 메시지)
+    """
     if not req.question.strip():
         raise HTTPException(400, "질문이 비어 있습니다.")
     sanitized_question = _sanitize_question(req.question)
-    return ChatResponse(**graph_service.ask_graph(sanitized_question))
+    session_id, new = _session_id(request)
+
+    async def events():
+        async for event, data in graph_service.ask_graph_stream(sanitized_question, session_id):
+            yield _sse(event, data)
+
+    response = StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    _attach_session(response, session_id, new)
+    return response
 
 
 @router.delete("")
-def clear_history():
-    graph_service.reset_chat()
+def clear_history(request: Request):
+    """요청 세션의 대화 이력만 초기화 (다른 사용자 이력은 그대로)."""
+    session_id, new = _session_id(request)
+    if not new:
+        graph_service.reset_chat(session_id)
     return {"message": "대화 이력이 초기화되었습니다."}
@@ -2,28 +2,71 @@
 그래프 시각화용 API 엔드포인트.
 노드/엣지 조회, 노드 상세 정보 제공, NetworkX 기반 레이아웃.
 """
+import asyncio
+import base64
+import json
 import logging
 import re
-import time
-from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Optional
+from typing import AsyncIterator, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from neo4j.exceptions import ServiceUnavailable, TransientError, ClientError
 
+from app.core import get_settings
+from app.core.cache import LRUTTLCache, get_cache
+from app.core.columnar import MEDIA_TYPE as COLUMNAR_MEDIA_TYPE, accepts_columnar, encode_graph
+from app.core.http_cache import PARTIAL_HEADER
 from app.core.sanitize import sanitize_text, SEARCH_MAX_LENGTH
-from app.schemas.layout import LayoutRequest, LayoutResponse
-from app.services import graph_service
+from app.schemas.layout import LayoutJobRequest, LayoutJobResponse, LayoutRequest, LayoutResponse
+from app.services import get_async_graph, get_ownership_engine, get_ownership_graph, get_stats_service
 from app.services import layout_service
+from app.services.data_version import get_data_version
+from app.services.global_layout import peek_global_layout
+from app.services.layout_jobs import LayoutJob, get_layout_jobs
+from app.services.layout_pool import LayoutPoolBusy
+from app.services.ownership_engine import RATIO_DECIMALS, round_ratio
+from app.services.ownership_analysis import (
+    peek_community_index,
+    peek_cycle_index,
+    top_ultimate_owners,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/graph", tags=["graph"])
 
-# 노드 상세 응답 캐시 (TTL). 동일 노드 재클릭 시 부하 감소
-_NODE_DETAIL_CACHE: dict[str, tuple[float, Any]] = {}
-NODE_DETAIL_CACHE_TTL_SEC = 60
-_node_detail_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="node_detail")
+
+
+def _node_detail_cache() -> LRUTTLCache:
+    """
+    노드 상세 응답 캐시 (LRU + TTL, 크기 상한, single-flight).
+    동일 노드 재클릭 / 핫 노드 동시 클릭 시 Cypher 1세트만 실행. CACHE_SHARED_PATH 설정 시 워커 간 공유.
+    """
+    s = get_settings()
+    return get_cache(
+        "node_detail",
+        ttl=s.NODE_DETAIL_CACHE_TTL_SEC,
+        max_entries=s.NODE_DETAIL_CACHE_MAX_ENTRIES,
+        max_bytes=s.NODE_DETAIL_CACHE_MAX_BYTES,
+        shared_path=s.CACHE_SHARED_PATH,
+        shared_max_entries=s.CACHE_SHARED_MAX_ENTRIES,
+        shared_max_bytes=s.CACHE_SHARED_MAX_BYTES,
+    )
+
+
+def _analysis_cache() -> LRUTTLCache:
+    """엔진 기반 분석 결과 캐시. 키에 스냅샷 version 을 포함해 데이터 버전별로 유지."""
+    s = get_settings()
+    return get_cache(
+        "analysis",
+        ttl=s.ANALYSIS_CACHE_TTL_SEC,
+        max_entries=s.ANALYSIS_CACHE_MAX_ENTRIES,
+        shared_path=s.CACHE_SHARED_PATH,
+        shared_max_entries=s.CACHE_SHARED_MAX_ENTRIES,
+        shared_max_bytes=s.CACHE_SHARED_MAX_BYTES,
+    )
 
 
 _ID_RE = re.compile(r"(\d+)$")
@@ -55,19 +98,151 @@ def _clamp_ratio(val) -> float:
         return 0.0
 
 
+def _encode_cursor(values: list) -> str:
+    """keyset 위치 → 불투명 커서 (base64url JSON)."""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, size: int, keys: bool = False) -> list:
+    """불투명 커서 → keyset 위치. 형식 오류는 400. keys=True 면 문자열 값(속성 키) 허용."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+    if (
+        not isinstance(values, list)
+        or len(values) != size
+        or not all(
+            (isinstance(v, (int, float)) and not isinstance(v, bool)) or (keys and isinstance(v, str))
+            for v in values
+        )
+    ):
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+    return values
+
+
+def _mark_partial(response: Response) -> None:
+    """준비 전이라 일부 필드가 빠진 응답 → 미들웨어가 ETag 생략 (불완전 본문이 304 로 고정되지 않게)."""
+    response.headers[PARTIAL_HEADER] = "1"
+
+
+def _graph_response(body: dict, accept: Optional[str]):
+    """
+    Accept 가 컬럼형이면 nodes/edges(+layout 좌표)를 열 단위 바이너리로, 나머지 키는 헤더 meta 로.
+    그 외에는 JSON 본문 그대로.
+    """
+    if not accepts_columnar(accept):
+        return body
+    meta = {k: v for k, v in body.items() if k not in ("nodes", "edges", "layout")}
+    positions = None
+    layout = body.get("layout")
+    if layout:
+        positions = layout.get("positions") or {}
+        meta["layout"] = {k: v for k, v in layout.items() if k != "positions"}
+    content = encode_graph(body.get("nodes", []), body.get("edges", []), meta=meta, positions=positions)
+    return Response(content=content, media_type=COLUMNAR_MEDIA_TYPE)
+
+
+async def _query_nodes_by_ids(ids: list[int], nt: Optional[str] = None) -> list[dict]:
+    """
+    node_ids 기반 노드 조회 (nodes / bootstrap 공통).
+    레이블과 무관하게 모든 노드를 한 번에 조회 후 nt(노드 타입) 필터 적용. 회사·주주가 아닌 노드는 제외.
+    """
+    rows = await _node_rows_by_id(ids, "노드")
+    nodes = []
+    for r in rows.values():
+        labels = r.get("labels") or []
+        if "Company" not in labels and "Stockholder" not in labels:
+            continue
+        node = _row_to_node(r)
+        if nt is None or node["type"] == nt:
+            nodes.append(node)
+    return nodes
+
+
+# 검색어 없는 노드 목록 페이지: 회사(kind=0, bizno 순) → 주주(kind=1, personId·id 순).
+# keyset 은 레이블별 인덱스 속성의 범위 탐색 + 인덱스 순서 (bizno: bizno_unique 제약 인덱스,
+# personId: stockholder_person_id) → 깊은 페이지도 인덱스에서 바로 시작. (id() 키는 인덱스가 없어 매 페이지 전체 스캔·정렬)
+# 키 속성이 없는 노드는 목록 순회에서 빠짐 (검색·node_ids 로 조회).
+# Company:Stockholder 이중 레이블 노드는 회사 쪽에서만 반환 (중복 없음 → keyset 유일).
+# 주주 타입 필터는 Cypher 안에서 적용해야 페이지 크기가 유지됨 (_row_to_node 와 같은 분류 규칙).
+# 행은 (id, labels, props) — 표시에 쓰는 속성만 맵 프로젝션으로 → _row_to_node 로 변환.
+# {after} 는 str.format 으로 채우므로 맵 프로젝션 중괄호는 {{ }} 로 이스케이프.
+_COMPANY_PAGE_QUERY = """
+    MATCH (c:Company)
+    WHERE {after}
+    RETURN c.bizno AS key, id(c) AS id, labels(c) AS labels, c {{.companyName, .bizno, .isActive}} AS props
+    ORDER BY key
+    LIMIT $limit
+"""
+_STOCKHOLDER_PAGE_QUERY = """
+    MATCH (s:Stockholder)
+    WHERE {after}
+      AND NOT s:Company
+    WITH s, s:MajorShareholder AS isMajor,
+         toUpper(coalesce(s.shareholderType, 'PERSON')) AS shareholderType
+    WHERE $stockholder_type IS NULL
+       OR ($stockholder_type = 'major' AND isMajor)
+       OR ($stockholder_type = 'institution' AND NOT isMajor AND shareholderType <> 'PERSON')
+       OR ($stockholder_type = 'person' AND NOT isMajor AND shareholderType = 'PERSON')
+    RETURN s.personId AS key, id(s) AS id, labels(s) AS labels,
+           s {{.stockName, .companyName, .shareholderType}} AS props
+    ORDER BY key, id
+    LIMIT $limit
+"""
+
+
+async def _nodes_page(graph, limit: int, nt: Optional[str], after: Optional[list]) -> list[dict]:
+    """
+    keyset 한 페이지 (kind 포함 row). 회사 목록이 페이지 중간에 끝나면 같은 요청에서 주주 처음부터 이어 채움.
+    personId 는 고유 제약이 없어 (personId, id) 로 순서 고정.
+    """
+    after_kind, after_key, after_id = after or (None, None, None)
+    rows: list[dict] = []
+    if nt in (None, "company") and after_kind in (None, 0):
+        q = _COMPANY_PAGE_QUERY.format(after="c.bizno IS NOT NULL" if after_kind is None else "c.bizno > $after_key")
+        found = await graph.query(q, params={"limit": limit, "after_key": after_key})
+        rows.extend({**r, "kind": 0} for r in found)
+        after_kind = None
+    if len(rows) < limit and nt in (None, "person", "major", "institution"):
+        after = (
+            "s.personId >= $after_key AND (s.personId > $after_key OR id(s) > $after_id)"
+            if after_kind == 1
+            else "s.personId IS NOT NULL"
+        )
+        found = await graph.query(
+            _STOCKHOLDER_PAGE_QUERY.format(after=after),
+            params={
+                "limit": limit - len(rows),
+                "after_key": after_key,
+                "after_id": after_id,
+                "stockholder_type": nt if nt in ("person", "major", "institution") else None,
+            },
+        )
+        rows.extend({**r, "kind": 1} for r in found)
+    return rows
+
+
 @router.get("/nodes")
-def get_nodes(
+async def get_nodes(
     limit: int = Query(50, ge=1, le=500, description="최대 노드 수"),
     node_type: Optional[str] = Query(None, description="필터: company, person, major, institution"),
     search: Optional[str] = Query(None, description="검색어 (회사명/주주명)"),
     node_ids: Optional[str] = Query(None, description="특정 노드 ID들 (쉼표 구분, 엣지 기반 로드용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (검색어 없는 목록의 다음 페이지)"),
+    accept: Optional[str] = Header(None),
 ):
     """
     그래프 노드 목록 조회 (시각화용).
     
     성능: limit 기본 50, 최대 500. 초기 로드는 작은 샘플 권장.
+    검색어가 없으면 회사(bizno 순) → 주주(personId 순)의 고정 순서로 반환하고 next_cursor 로 다음 페이지 조회
+    (keyset: 인덱스 범위 탐색이라 깊은 페이지도 같은 비용, 마지막 페이지면 next_cursor=null).
+    cursor 는 search·node_ids 와 함께 쓸 수 없음 (400).
+    Accept: application/vnd.graphiq.columnar 이면 컬럼형 바이너리 (app.core.columnar).
     """
-    graph = graph_service.get_graph()
+    graph = get_async_graph()
 
     nt = (node_type or "").lower().strip() or None
     sanitized_search = _sanitize_search(search)
@@ -77,172 +252,88 @@ def get_nodes(
     if node_ids:
         ids = [_neo4j_id(x.strip()) for x in node_ids.split(",") if x.strip()]
     
-    params = {"limit": limit, "search": sanitized_search} if sanitized_search else {"limit": limit}
+    if cursor and (ids or sanitized_search):
+        # 검색 결과는 점수순 상위 limit 만 (페이지 없음) → 커서를 조용히 무시하면 같은 결과가 반복됨
+        raise HTTPException(400, "cursor 는 search·node_ids 없이 목록을 조회할 때만 사용할 수 있습니다.")
+
     nodes: list[dict] = []
 
     try:
         # node_ids가 제공되면 레이블과 무관하게 모든 노드를 한 번에 조회
         if ids:
-            # 모든 노드를 ID로 조회 (Company와 Stockholder 모두 포함)
-            q = """
-                MATCH (n)
-                WHERE id(n) IN $ids
-                RETURN id(n) AS id,
-                       labels(n) AS labels,
-                       properties(n) AS props
-            """
-            rows = graph.query(q, params={"ids": ids})
-            
-            for r in rows:
-                labels = r.get("labels") or []
-                props = r.get("props") or {}
-                
-                # Company 노드 처리
-                if "Company" in labels:
-                    if nt in (None, "company"):
-                        nodes.append({
-                            "id": f"n{r['id']}",
-                            "type": "company",
-                            "label": (props.get("companyName") or "Unknown").strip(),
-                            "bizno": props.get("bizno"),
-                            "active": props.get("isActive", True),
-                            "sub": "회사",
-                        })
-                
-                # Stockholder 노드 처리
-                elif "Stockholder" in labels:
-                    shareholder_type = (props.get("shareholderType") or "PERSON").upper()
-                    is_major = "MajorShareholder" in labels
-                    node_t = "major" if is_major else ("institution" if shareholder_type != "PERSON" else "person")
-                    
-                    if nt in (None, "person", "major", "institution"):
-                        if nt and node_t != nt:
-                            continue
-                        
-                        nodes.append({
-                            "id": f"n{r['id']}",
-                            "type": node_t,
-                            "label": (props.get("stockName") or props.get("companyName") or "Unknown").strip(),
-                            "shareholderType": shareholder_type,
-                            "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
-                        })
+            nodes = await _query_nodes_by_ids(ids, nt)
+        elif not sanitized_search:
+            # 검색어 없음: (kind, 인덱스 키, id) 고정 순서 + keyset 커서 페이지
+            after = _decode_cursor(cursor, 3, keys=True) if cursor else None
+            if after is not None and (after[0] not in (0, 1) or not isinstance(after[2], int)):
+                raise HTTPException(400, "잘못된 cursor 입니다.")
+            rows = await _nodes_page(graph, limit, nt, after)
+            nodes = [_row_to_node(r) for r in rows]
+            last = rows[-1] if len(rows) == limit else None
+            next_cursor = _encode_cursor([last["kind"], last["key"], last["id"]]) if last else None
+            return _graph_response({"nodes": nodes, "total": len(nodes), "next_cursor": next_cursor}, accept)
         else:
-            # 기존 로직: node_ids가 없을 때는 레이블별로 조회
+            # 검색: 레이블별 텍스트 인덱스 조회
             # 1) Company nodes
             # 텍스트 인덱스(Neo4j 5.x+) 활용, 없으면 CONTAINS 폴백
             if nt in (None, "company"):
-                if sanitized_search:
-                    # 텍스트 인덱스 사용 시도 (Neo4j 5.x+)
-                    q = """
-                        CALL db.index.fulltext.queryNodes('company_name_text', $search)
-                        YIELD node, score
-                        WHERE score > 0.5
-                        RETURN id(node) AS id,
-                               node.companyName AS label,
-                               node.bizno AS bizno,
-                               coalesce(node.isActive, true) AS active
-                        LIMIT $limit
-                    """
-                    try:
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                    except ClientError:
-                        # 텍스트 인덱스가 없으면 CONTAINS로 폴백
-                        logger.debug("Text index not available, falling back to CONTAINS")
-                        q = """
-                            MATCH (c:Company)
-                            WHERE c.companyName CONTAINS $search
-                            RETURN id(c) AS id,
-                                   c.companyName AS label,
-                                   c.bizno AS bizno,
-                                   coalesce(c.isActive, true) AS active
-                            LIMIT $limit
-                        """
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                else:
+                # 텍스트 인덱스 사용 시도 (Neo4j 5.x+)
+                q = """
+                    CALL db.index.fulltext.queryNodes('company_name_text', $search)
+                    YIELD node, score
+                    WHERE score > 0.5
+                    RETURN id(node) AS id, labels(node) AS labels, node {.companyName, .bizno, .isActive} AS props
+                    LIMIT $limit
+                """
+                try:
+                    rows = await graph.query(q, params={"limit": limit, "search": sanitized_search})
+                except ClientError:
+                    # 텍스트 인덱스가 없으면 CONTAINS로 폴백
+                    logger.debug("Text index not available, falling back to CONTAINS")
                     q = """
                         MATCH (c:Company)
-                        RETURN id(c) AS id,
-                               c.companyName AS label,
-                               c.bizno AS bizno,
-                               coalesce(c.isActive, true) AS active
+                        WHERE c.companyName CONTAINS $search
+                        RETURN id(c) AS id, labels(c) AS labels, c {.companyName, .bizno, .isActive} AS props
                         LIMIT $limit
                     """
-                    rows = graph.query(q, params={"limit": limit})
-                nodes.extend(
-                    {
-                        "id": f"n{r['id']}",
-                        "type": "company",
-                        "label": (r.get("label") or r.get("companyName") or "Unknown").strip(),
-                        "bizno": r.get("bizno"),
-                        "active": r.get("active", True),
-                        "sub": "회사",
-                    }
-                    for r in rows
-                )
+                    rows = await graph.query(q, params={"limit": limit, "search": sanitized_search})
+                nodes.extend(_row_to_node(r) for r in rows)
 
             # 2) Stockholder nodes (Person/Company, plus MajorShareholder label if present)
             # 텍스트 인덱스 활용, 없으면 CONTAINS 폴백
             if nt in (None, "person", "major", "institution"):
-                if sanitized_search:
-                    # 텍스트 인덱스 사용 시도
-                    q = """
-                        CALL db.index.fulltext.queryNodes('stockholder_name_text', $search)
-                        YIELD node, score
-                        WHERE score > 0.5
-                        RETURN id(node) AS id,
-                               labels(node) AS labels,
-                               coalesce(node.stockName, node.companyName, 'Unknown') AS label,
-                               coalesce(node.shareholderType, 'PERSON') AS shareholderType
-                        LIMIT $limit
-                    """
-                    try:
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                    except ClientError:
-                        # 텍스트 인덱스가 없으면 CONTAINS로 폴백
-                        logger.debug("Text index not available, falling back to CONTAINS")
-                        q = """
-                            MATCH (s:Stockholder)
-                            WHERE coalesce(s.stockName, s.companyName, '') CONTAINS $search
-                            RETURN id(s) AS id,
-                                   labels(s) AS labels,
-                                   coalesce(s.stockName, s.companyName, 'Unknown') AS label,
-                                   coalesce(s.shareholderType, 'PERSON') AS shareholderType
-                            LIMIT $limit
-                        """
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                else:
+                # 텍스트 인덱스 사용 시도
+                q = """
+                    CALL db.index.fulltext.queryNodes('stockholder_name_text', $search)
+                    YIELD node, score
+                    WHERE score > 0.5
+                    RETURN id(node) AS id, labels(node) AS labels,
+                           node {.stockName, .companyName, .shareholderType} AS props
+                    LIMIT $limit
+                """
+                try:
+                    rows = await graph.query(q, params={"limit": limit, "search": sanitized_search})
+                except ClientError:
+                    # 텍스트 인덱스가 없으면 CONTAINS로 폴백
+                    logger.debug("Text index not available, falling back to CONTAINS")
                     q = """
                         MATCH (s:Stockholder)
-                        RETURN id(s) AS id,
-                               labels(s) AS labels,
-                               coalesce(s.stockName, s.companyName, 'Unknown') AS label,
-                               coalesce(s.shareholderType, 'PERSON') AS shareholderType
+                        WHERE coalesce(s.stockName, s.companyName, '') CONTAINS $search
+                        RETURN id(s) AS id, labels(s) AS labels,
+                               s {.stockName, .companyName, .shareholderType} AS props
                         LIMIT $limit
                     """
-                    rows = graph.query(q, params={"limit": limit})
+                    rows = await graph.query(q, params={"limit": limit, "search": sanitized_search})
                 for r in rows:
-                    labels = r.get("labels") or []
-                    shareholder_type = (r.get("shareholderType") or "PERSON").upper()
-                    is_major = "MajorShareholder" in labels
-
-                    node_t = "major" if is_major else ("institution" if shareholder_type != "PERSON" else "person")
-                    if nt and node_t != nt:
+                    node = _row_to_node(r)
+                    if nt and node["type"] != nt:
                         continue
-
-                    nodes.append(
-                        {
-                            "id": f"n{r['id']}",
-                            "type": node_t,
-                            "label": r.get("label") or "Unknown",
-                            "shareholderType": shareholder_type,
-                            "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
-                        }
-                    )
+                    nodes.append(node)
 
         # node_ids가 제공된 경우 limit 제한 없이 모든 요청된 노드 반환
         if ids:
-            return {"nodes": nodes, "total": len(nodes)}
-        return {"nodes": nodes[:limit], "total": len(nodes)}
+            return _graph_response({"nodes": nodes, "total": len(nodes)}, accept)
+        return _graph_response({"nodes": nodes[:limit], "total": len(nodes)}, accept)
 
     except HTTPException:
         raise
@@ -263,54 +354,24 @@ def get_nodes(
         raise HTTPException(500, f"노드 조회 실패: {str(e)}") from e
 
 
+async def _snapshot_node_counts() -> dict:
+    """
+    노드 타입별 개수 (통계 스냅샷). 요청마다 라벨 스캔하지 않음.
+    스냅샷이 아직 없을 때(기동 직후)만 스레드풀에서 1회 계산.
+    """
+    svc = get_stats_service()
+    snapshot = svc.peek() or await run_in_threadpool(svc.get_snapshot)
+    return {**snapshot["node_counts"], "snapshot": svc.meta(snapshot, with_age=False)}
+
+
 @router.get("/node-counts")
-def get_node_counts():
+async def get_node_counts():
     """
     노드 타입별 개수 조회 (필터 표시용).
-    성능 최적화: 단일 쿼리로 모든 개수 조회.
+    성능: 백그라운드 통계 스냅샷에서 반환 (snapshot.version / computed_at 포함, ETag 에 스냅샷 버전 반영).
     """
-    graph = graph_service.get_graph()
-    
     try:
-        # 단일 쿼리로 모든 노드 타입 개수 조회 (성능 최적화)
-        # 주의: shareholderType은 대소문자 구분하므로 toUpper() 사용하여 일관성 유지
-        # 기관 노드: shareholderType이 'CORPORATION' 또는 'INSTITUTION'이거나 Company:Stockholder 레이블을 가진 경우
-        query = """
-        MATCH (c:Company)
-        WHERE NOT 'Stockholder' IN labels(c)
-        WITH count(c) AS company_count
-        MATCH (s:Stockholder)
-        WHERE toUpper(coalesce(s.shareholderType, 'PERSON')) = 'PERSON' 
-          AND NOT 'MajorShareholder' IN labels(s)
-          AND NOT 'Company' IN labels(s)
-        WITH company_count, count(s) AS person_count
-        MATCH (m:MajorShareholder)
-        WITH company_count, person_count, count(m) AS major_count
-        MATCH (i:Stockholder)
-        WHERE (
-            toUpper(coalesce(i.shareholderType, 'PERSON')) IN ['CORPORATION', 'INSTITUTION']
-            OR 'Company' IN labels(i)
-          )
-          AND NOT 'MajorShareholder' IN labels(i)
-        RETURN company_count, person_count, major_count, count(i) AS institution_count
-        """
-        result = graph.query(query)
-        
-        if not result:
-            return {
-                "company": 0,
-                "person": 0,
-                "major": 0,
-                "institution": 0,
-            }
-        
-        row = result[0]
-        return {
-            "company": row.get("company_count", 0),
-            "person": row.get("person_count", 0),
-            "major": row.get("major_count", 0),
-            "institution": row.get("institution_count", 0),
-        }
+        return await _snapshot_node_counts()
     except ServiceUnavailable:
         logger.error("Neo4j 서비스 사용 불가", exc_info=True)
         raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
@@ -325,53 +386,179 @@ def get_node_counts():
         raise HTTPException(500, f"노드 개수 조회 실패: {str(e)}") from e
 
 
+def _edge_row_to_dict(row: dict) -> dict:
+    """집계 row (fromId, toId, ratio, relCount) → 시각화용 엣지 딕셔너리."""
+    r_val = _clamp_ratio(row.get("ratio"))
+    return {
+        "from": f"n{row['fromId']}",
+        "to": f"n{row['toId']}",
+        "type": "HOLDS_SHARES",
+        "ratio": round(r_val, 1),
+        "count": int(row.get("relCount") or 1),
+        "label": f"{r_val:.1f}%",
+    }
+
+
+# (from,to) 쌍 집계 엣지: (ratio DESC, fromId, toId) 결정적 순서 + keyset 조건 (after_* 가 null 이면 첫 페이지)
+# ratio 는 엔진과 같은 자리수로 반올림 (엔진/Neo4j 경로 간 순서·커서 일치)
+_EDGES_QUERY = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WHERE ($ids IS NULL OR id(s) IN $ids OR id(c) IN $ids)
+    WITH id(s) AS fromId,
+         id(c) AS toId,
+         round(coalesce(max(r.stockRatio), 0.0), $ratio_decimals) AS ratio,
+         count(r) AS relCount
+    WHERE ($min_ratio IS NULL OR ratio >= $min_ratio)
+      AND ($after_ratio IS NULL
+           OR ratio < $after_ratio
+           OR (ratio = $after_ratio AND (fromId > $after_from
+                                         OR (fromId = $after_from AND toId > $after_to))))
+    RETURN fromId, toId, ratio, relCount
+    ORDER BY ratio DESC, fromId, toId
+"""
+
+
+def _edge_cursor(row: dict) -> str:
+    return _encode_cursor([round_ratio(row.get("ratio")), int(row["fromId"]), int(row["toId"])])
+
+
+def _edge_params(
+    ids: Optional[list[int]],
+    min_ratio: Optional[float],
+    after: Optional[tuple[float, int, int]],
+) -> dict:
+    after_ratio, after_from, after_to = after if after is not None else (None, None, None)
+    return {
+        "ids": ids,
+        "min_ratio": min_ratio,
+        "ratio_decimals": RATIO_DECIMALS,
+        "after_ratio": after_ratio,
+        "after_from": after_from,
+        "after_to": after_to,
+    }
+
+
+async def _query_edge_rows(
+    graph,
+    limit: int,
+    ids: Optional[list[int]] = None,
+    min_ratio: Optional[float] = None,
+    after: Optional[tuple[float, int, int]] = None,
+) -> list[dict]:
+    """
+    (from,to) 단위 집계 엣지 원시 row 조회. ratio=max(stockRatio), count=관계 건수.
+    CSR 엔진이 준비되어 있으면 메모리에서 응답 (같은 row 형식·순서), 아니면 Neo4j.
+    """
+    engine = get_ownership_graph()
+    if engine is not None:
+        return engine.top_edges(limit, ids=ids, min_ratio=min_ratio, after=after)
+    params = {**_edge_params(ids, min_ratio, after), "limit": limit}
+    return await graph.query(_EDGES_QUERY + "LIMIT $limit", params=params)
+
+
+async def _query_edges(
+    graph,
+    limit: int,
+    ids: Optional[list[int]] = None,
+    min_ratio: Optional[float] = None,
+) -> list[dict]:
+    """집계 엣지 조회 (edges / bootstrap 공통)."""
+    rows = await _query_edge_rows(graph, limit, ids=ids, min_ratio=min_ratio)
+    return [_edge_row_to_dict(row) for row in rows]
+
+
+_STREAM_CHUNK = 5000  # 엔진 스트리밍 청크 (청크 사이 이벤트 루프 양보)
+
+
+async def _stream_edge_rows(
+    graph,
+    ids: Optional[list[int]],
+    min_ratio: Optional[float],
+    after: Optional[tuple[float, int, int]],
+) -> AsyncIterator[dict]:
+    """전체 집계 엣지를 순서대로 스트리밍. 엔진: 청크 단위 keyset 순회, Neo4j: 레코드 도착 즉시."""
+    engine = get_ownership_graph()
+    if engine is None:
+        async for row in graph.stream(_EDGES_QUERY, params=_edge_params(ids, min_ratio, after)):
+            yield row
+        return
+    while True:
+        rows = engine.top_edges(_STREAM_CHUNK, ids=ids, min_ratio=min_ratio, after=after)
+        for row in rows:
+            yield row
+        if len(rows) < _STREAM_CHUNK:
+            return
+        last = rows[-1]
+        after = (last["ratio"], last["fromId"], last["toId"])
+        await asyncio.sleep(0)
+
+
+async def _ndjson_edges(
+    graph,
+    ids: Optional[list[int]],
+    min_ratio: Optional[float],
+    after: Optional[tuple[float, int, int]],
+) -> AsyncIterator[bytes]:
+    """
+    NDJSON 본문: 엣지 1줄씩, 마지막 줄은 {"done": true, "count": N}.
+    스트리밍 도중 오류 시 상태 코드를 바꿀 수 없으므로 {"error", "next_cursor"} 줄로 종료 (재개 지점 제공).
+    """
+    count = 0
+    last: Optional[dict] = None
+    try:
+        async for row in _stream_edge_rows(graph, ids, min_ratio, after):
+            yield (json.dumps(_edge_row_to_dict(row), ensure_ascii=False) + "\n").encode("utf-8")
+            count += 1
+            last = row
+    except Exception as e:
+        logger.error(f"엣지 스트리밍 중단 (count={count}): {str(e)}", exc_info=True)
+        trailer = {"error": "엣지 스트리밍이 중단되었습니다.", "count": count,
+                   "next_cursor": _edge_cursor(last) if last is not None else None}
+        yield (json.dumps(trailer, ensure_ascii=False) + "\n").encode("utf-8")
+        return
+    yield (json.dumps({"done": True, "count": count}) + "\n").encode("utf-8")
+
+
 @router.get("/edges")
-def get_edges(
-    limit: int = Query(100, ge=1, le=1000, description="최대 엣지 수"),
+async def get_edges(
+    limit: int = Query(100, ge=1, le=1000, description="최대 엣지 수 (페이지 크기)"),
     node_ids: Optional[str] = Query(None, description="특정 노드 ID들 (쉼표 구분)"),
     min_ratio: Optional[float] = Query(None, description="최소 지분율(%) — 미만 관계 제외, 시각화 노이즈 감소"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지)"),
+    accept: Optional[str] = Header(None),
 ):
     """
     그래프 엣지(관계) 목록 조회.
     
     node_ids 제공 시 해당 노드와 연결된 엣지만 반환 (성능 최적화).
     min_ratio 제공 시 해당 지분율 미만 관계는 제외 (초기 로딩 시 5 등 권장).
+
+    순서: (ratio DESC, fromId, toId) 고정. 페이지네이션은 keyset 커서 — 응답의 next_cursor 를
+    cursor 로 넘기면 다음 페이지 (OFFSET 없음, 깊은 페이지도 동일 비용). 마지막 페이지면 next_cursor=null.
+
+    Accept: application/x-ndjson 이면 limit 없이 (cursor 위치부터) 전체를 줄 단위 스트리밍.
+    Accept: application/vnd.graphiq.columnar 이면 페이지를 컬럼형 바이너리로 (노드 테이블은 엣지 끝점 id 만).
     """
-    graph = graph_service.get_graph()
+    graph = get_async_graph()
 
     ids: Optional[list[int]] = None
     if node_ids:
         ids = [_neo4j_id(x.strip()) for x in node_ids.split(",") if x.strip()]
+    after: Optional[tuple[float, int, int]] = None
+    if cursor:
+        r, f, t = _decode_cursor(cursor, 3)
+        after = (round_ratio(r), int(f), int(t))
 
-    # (from,to) 단위 집계. ratio=max(stockRatio), count=관계 건수.
-    query = """
-        MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
-        WHERE ($ids IS NULL OR id(s) IN $ids OR id(c) IN $ids)
-        WITH id(s) AS fromId,
-             id(c) AS toId,
-             max(r.stockRatio) AS ratio,
-             count(r) AS relCount
-        WHERE ($min_ratio IS NULL OR ratio >= $min_ratio)
-        RETURN fromId, toId, ratio, relCount
-        ORDER BY ratio DESC
-        LIMIT $limit
-    """
-    params = {"limit": limit, "ids": ids, "min_ratio": min_ratio}
+    if accept and "application/x-ndjson" in accept:
+        return StreamingResponse(
+            _ndjson_edges(graph, ids, min_ratio, after), media_type="application/x-ndjson"
+        )
 
     try:
-        rows = graph.query(query, params=params)
-        edges = []
-        for row in rows:
-            r_val = _clamp_ratio(row.get("ratio"))
-            edges.append({
-                "from": f"n{row['fromId']}",
-                "to": f"n{row['toId']}",
-                "type": "HOLDS_SHARES",
-                "ratio": round(r_val, 1),
-                "count": int(row.get("relCount") or 1),
-                "label": f"{r_val:.1f}%",
-            })
-        return {"edges": edges, "total": len(edges)}
+        rows = await _query_edge_rows(graph, limit, ids=ids, min_ratio=min_ratio, after=after)
+        edges = [_edge_row_to_dict(row) for row in rows]
+        next_cursor = _edge_cursor(rows[-1]) if len(rows) == limit else None
+        return _graph_response({"edges": edges, "total": len(edges), "next_cursor": next_cursor}, accept)
 
     except ServiceUnavailable:
         logger.error("Neo4j 서비스 사용 불가", exc_info=True)
@@ -395,12 +582,18 @@ def post_layout(body: LayoutRequest):
     엔진:
     - networkx: Kamada-Kawai → Spring 2단계 (기본, 항상 사용 가능)
     - pygraphviz: Graphviz 기반 고품질 레이아웃 (overlap=scale로 라벨 겹침 방지, Graphviz 시스템 라이브러리 필요)
+    - fa2: ForceAtlas2 + Barnes-Hut (NumPy 벡터화, 수천 노드 이상 대형 그래프용)
+    - auto: 연결 요소별 선택 (별·체인·고리 공식 배치, 작은 요소 KK, 큰 요소 fa2), LAYOUT_AUTO_BUDGET_SEC 안에 완료
 
     요청: nodes, edges (프론트와 동일 스키마). 반환 좌표는 0~1 정규화.
+    계산은 레이아웃 프로세스 풀에서 (연결 요소 병렬). 풀 포화 시 503 + Retry-After.
+
+    증분: positions (기존 노드 0~1 좌표) + pin=True 면 해당 노드는 그대로 두고 새 노드만 배치
+    (비용 ∝ 새 노드 수, 화면의 기존 노드가 튀지 않음).
     프론트는 (x * (viewportWidth - 2*pad) + pad, y * (viewportHeight - 2*pad) + pad) 로 스케일.
     """
     try:
-        engine = body.engine if body.engine in ("networkx", "pygraphviz") else "networkx"
+        engine = body.engine if body.engine in layout_service.LAYOUT_ENGINES else "networkx"
         result = layout_service.compute_layout(
             body.nodes,
             body.edges,
@@ -409,35 +602,254 @@ def post_layout(body: LayoutRequest):
             padding=body.padding,
             use_components=body.use_components,
             engine=engine,
+            positions=body.positions,
+            pin=body.pin,
         )
         return LayoutResponse(positions=result["positions"], components=result["components"])
+    except LayoutPoolBusy as e:
+        logger.warning("레이아웃 풀 포화: 요청 거절 (503)")
+        raise HTTPException(
+            503,
+            "레이아웃 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
         logger.error(f"레이아웃 계산 실패: {str(e)}", exc_info=True)
         raise HTTPException(500, f"레이아웃 계산 실패: {str(e)}") from e
 
 
-@router.get("/nodes/{node_id}")
-def get_node_detail(node_id: str):
+@router.post("/layout/jobs", response_model=LayoutJobResponse)
+def create_layout_job(body: LayoutJobRequest):
     """
-    특정 노드의 상세 정보 + 연결된 노드 목록.
-    성능: 캐시(TTL 60초) + 관련/통계 쿼리 병렬 실행으로 체감 지연 감소.
+    점진 레이아웃 작업 생성 (대형 그래프: 스피너 대신 초기 배치부터 그리고 제자리 개선).
+
+    즉시 반환: job_id + 초기 배치 (연결 요소별 Pivot MDS, 반복 없음) — 프론트는 바로 렌더.
+    정제: 레이아웃 풀에서 fa2 반복, 중간 좌표는 GET /layout/jobs/{job_id}/events (SSE) 로 전송.
+    시간 예산(LAYOUT_JOB_BUDGET_SEC) 초과 시 그 시점 좌표로 완료 (truncated=true).
+    같은 그래프를 이미 정제한 적이 있으면 캐시된 최종 좌표로 status=done 즉시 반환.
+    풀 포화 시 503 + Retry-After.
     """
-    graph = graph_service.get_graph()
-    neo4j_id = _neo4j_id(node_id)
-    cache_key = node_id
-
-    # 캐시 적중 시 즉시 반환 (동일 노드 재클릭 체감 개선)
-    now = time.monotonic()
-    if cache_key in _NODE_DETAIL_CACHE:
-        expiry, payload = _NODE_DETAIL_CACHE[cache_key]
-        if now < expiry:
-            return payload
-        del _NODE_DETAIL_CACHE[cache_key]
-
-    node_query = """
-        MATCH (n)
-        WHERE id(n) = $id
-        RETURN labels(n) AS labels, properties(n) AS props
+    try:
+        job = get_layout_jobs().create(
+            body.nodes, body.edges, padding=body.padding, use_components=body.use_components
+        )
+        return LayoutJobResponse(**job.snapshot())
+    except LayoutPoolBusy as e:
+        logger.warning("레이아웃 풀 포화: 점진 작업 거절 (503)")
+        raise HTTPException(
+            503,
+            "레이아웃 요청이 많습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except Exception as e:
+        logger.error(f"레이아웃 작업 생성 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"레이아웃 작업 생성 실패: {str(e)}") from e
+
+
+@router.get("/layout/jobs/{job_id}", response_model=LayoutJobResponse)
+def get_layout_job(job_id: str):
+    """점진 레이아웃 작업 상태 + 최신 좌표 (SSE 를 못 쓰는 클라이언트의 폴링용)."""
+    job = get_layout_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(404, "레이아웃 작업을 찾을 수 없습니다 (만료되었거나 다른 서버 워커의 작업).")
+    return LayoutJobResponse(**job.snapshot())
+
+
+# SSE 유휴 시 주석 줄 전송 간격 (프록시 유휴 타임아웃 방지)
+_SSE_KEEPALIVE_SEC = 15.0
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
+
+
+async def _layout_job_events(job: LayoutJob) -> AsyncIterator[str]:
+    """snapshot 1회 → progress* → done | failed. 각 이벤트 data 에 seq (스냅샷 이하 seq 는 생략)."""
+    jobs = get_layout_jobs()
+    queue, snapshot = jobs.subscribe(job)
+    try:
+        yield _sse("snapshot", snapshot)
+        if snapshot["status"] != "running":
+            return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=_SSE_KEEPALIVE_SEC)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event["seq"] <= snapshot["seq"]:
+                continue
+            yield _sse(event["type"], event)
+            if event["type"] in ("done", "failed"):
+                return
+    finally:
+        jobs.unsubscribe(job, queue)
+
+
+@router.get("/layout/jobs/{job_id}/events")
+async def stream_layout_job(job_id: str):
+    """
+    점진 레이아웃 작업 이벤트 스트림 (text/event-stream).
+
+    - snapshot: 구독 시점 전체 상태 (초기 배치 또는 최신 좌표)
+    - progress: 그 사이 바뀐 노드 좌표만 {positions, part, iteration, seq}
+    - done: 최종 좌표 전체 {positions, truncated, elapsed_ms, iteration, seq} 후 스트림 종료
+    - failed: {error, seq} 후 스트림 종료 (프론트는 초기 배치 유지)
+    """
+    job = get_layout_jobs().get(job_id)
+    if job is None:
+        raise HTTPException(404, "레이아웃 작업을 찾을 수 없습니다 (만료되었거나 다른 서버 워커의 작업).")
+    return StreamingResponse(
+        _layout_job_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/engine")
+def get_engine_status():
+    """CSR 지분 그래프 엔진 상태 (준비 여부, 노드/쌍 수, 빌드 시각, 스냅샷 경로, 전역 레이아웃)."""
+    engine = get_ownership_graph()
+    global_layout = peek_global_layout(engine) if engine is not None else None
+    return {
+        "enabled": get_settings().OWNERSHIP_ENGINE_ENABLED,
+        **get_ownership_engine().status(),
+        "global_layout": global_layout.summary() if global_layout is not None else None,
+    }
+
+
+@router.post("/engine/reload")
+async def reload_engine():
+    """Neo4j 에서 엔진 재빌드 (데이터 재적재 직후). 완료 후 노드 상세 캐시 무효화 + 데이터 버전 갱신."""
+    try:
+        g = await run_in_threadpool(get_ownership_engine().rebuild)
+    except Exception as e:
+        logger.error(f"엔진 재빌드 실패: {str(e)}", exc_info=True)
+        raise HTTPException(503, "일시적으로 서비스를 사용할 수 없습니다. 잠시 후 다시 시도해 주세요.") from e
+    _node_detail_cache().invalidate()
+    version = get_data_version().bump("engine reload")
+    return {"meta": g.meta, "data_version": version}
+
+
+@router.get("/data-version")
+def get_data_version_token():
+    """현재 데이터 버전 토큰 (그래프 조회 ETag 의 기준값)."""
+    return {"data_version": get_data_version().current()}
+
+
+@router.post("/data-version/bump")
+def bump_data_version():
+    """
+    데이터 버전 수동 갱신 (엔진 없이 Neo4j 만 재적재한 경우 등).
+    이전 ETag 는 모두 불일치 → 다음 요청부터 새 응답. 노드 상세 캐시도 무효화.
+    """
+    _node_detail_cache().invalidate()
+    return {"data_version": get_data_version().bump("manual")}
+
+
+@router.get("/bootstrap")
+async def get_bootstrap(
+    response: Response,
+    edge_limit: int = Query(200, ge=1, le=1000, description="최대 엣지 수 (/edges limit 과 동일)"),
+    min_ratio: Optional[float] = Query(None, description="최소 지분율(%) — 미만 관계 제외"),
+    node_limit: int = Query(50, ge=1, le=500, description="엣지가 없을 때 노드 샘플 수"),
+    engine: str = Query("networkx", description="레이아웃 엔진: networkx, pygraphviz, fa2 또는 auto"),
+    layout: bool = Query(True, description="False면 레이아웃 계산 생략 (클라이언트 레이아웃 사용)"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    초기 뷰 단일 왕복 부트스트랩: node-counts + edges + nodes + layout.
+
+    기존 graph.js 초기 로드(/node-counts → /edges → /nodes → /nodes(누락분) → POST /layout)
+    5회 왕복을 서버에서 1회로 처리.
+    - node-counts 와 edges 는 서로 독립이므로 병렬 실행
+    - nodes 는 edges 가 참조하는 id 전체를 한 쿼리로 조회 (누락분 재조회 불필요)
+    - layout 은 POST /layout 과 동일 규칙 (0~1 정규화 좌표)
+    - Accept: application/vnd.graphiq.columnar 이면 컬럼형 바이너리 (counts·layout.components 는 헤더 meta, 좌표는 layout_x/y 열)
+    - counts 조회·레이아웃 계산이 실패해 null 인 응답은 ETag 없음 (다음 요청에서 다시 계산)
+    """
+    graph = get_async_graph()
+
+    try:
+        # node-counts 는 edges → nodes 체인과 독립: 백그라운드 태스크로 동시 실행 (보통 스냅샷 즉시 반환)
+        task_counts = asyncio.create_task(_snapshot_node_counts())
+        try:
+            edges = await _query_edges(graph, edge_limit, None, min_ratio)
+
+            required_ids = {int(x[1:]) for e in edges for x in (e["from"], e["to"])}
+            if required_ids:
+                nodes = await _query_nodes_by_ids(sorted(required_ids))
+            else:
+                # 엣지가 없으면 기본 샘플 노드만 로드 (graph.js nodesFallback 과 동일)
+                nodes = (await get_nodes(
+                    limit=node_limit, node_type=None, search=None, node_ids=None, cursor=None, accept=None
+                ))["nodes"]
+        except BaseException:
+            task_counts.cancel()
+            raise
+
+        # 양쪽 노드가 모두 로드된 엣지만 유지
+        loaded = {n["id"] for n in nodes}
+        edges = [e for e in edges if e["from"] in loaded and e["to"] in loaded]
+
+        try:
+            counts = await task_counts
+        except Exception as e:
+            # 개수 조회 실패해도 부트스트랩은 계속 (graph.js 는 로드된 노드 기준으로 표시)
+            logger.warning(f"부트스트랩 노드 개수 조회 실패: {e}")
+            counts = None
+
+    except HTTPException:
+        raise
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"부트스트랩 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"부트스트랩 조회 실패: {str(e)}") from e
+
+    layout_result = None
+    if layout and nodes and edges:
+        # 레이아웃 실패는 치명적이지 않음: graph.js 가 클라이언트 레이아웃으로 폴백
+        try:
+            # CPU 바운드 계산은 스레드풀에서 (이벤트 루프 블로킹 방지)
+            layout_result = await run_in_threadpool(
+                layout_service.compute_layout,
+                nodes,
+                edges,
+                padding=0.05,
+                use_components=True,
+                engine=engine if engine in layout_service.LAYOUT_ENGINES else "networkx",
+            )
+        except LayoutPoolBusy:
+            logger.info("부트스트랩 레이아웃 생략: 레이아웃 풀 포화 (클라이언트 레이아웃 사용)")
+        except Exception as e:
+            logger.warning(f"부트스트랩 레이아웃 계산 실패: {e}", exc_info=True)
+
+    result = _graph_response(
+        {
+            "counts": counts,
+            "nodes": nodes,
+            "edges": edges,
+            "layout": layout_result,
+        },
+        accept,
+    )
+    if counts is None or (layout and nodes and edges and layout_result is None):
+        _mark_partial(result if isinstance(result, Response) else response)
+    return result
+
+
+async def _load_node_detail(graph, neo4j_id: int) -> dict:
+    """
+    노드 상세 Cypher 세트 실행 (노드 + 관련 노드 + 통계). 캐시 미스 시에만 호출.
+    CSR 엔진에 있는 노드는 관련 노드 순위·통계를 엔진에서 계산 (Neo4j 왕복 1회).
     """
     related_query = """
         MATCH (n)-[r:HOLDS_SHARES]-(m)
@@ -459,77 +871,167 @@ def get_node_detail(node_id: str):
         RETURN count(c) AS holdings, avg(r.stockRatio) AS avgRatio
     """
 
-    try:
-        node_rows = graph.query(node_query, params={"id": neo4j_id})
-        if not node_rows:
-            raise HTTPException(404, "노드를 찾을 수 없습니다.")
+    # CSR 엔진: 관련 노드 순위·통계는 메모리에서 계산, Neo4j 는 속성 조회만 (노드 + 관련 노드 한 번에)
+    engine = get_ownership_graph()
+    idx = int(engine.index_of([neo4j_id])[0]) if engine is not None else -1
+    engine_related: Optional[list[tuple[int, float]]] = None
+    if idx >= 0:
+        best: dict[int, float] = {}
+        for direction in ("out", "in"):
+            for mid, ratio in engine.top_neighbors(idx, direction, 20):
+                best[mid] = max(ratio, best.get(mid, ratio))
+        engine_related = sorted(best.items(), key=lambda x: x[1], reverse=True)[:20]
+        props_by_id = await _node_rows_by_id([neo4j_id, *(mid for mid, _ in engine_related)], "노드 상세")
+    else:
+        props_by_id = await _node_rows_by_id([neo4j_id], "노드 상세")
+    node_row = props_by_id.get(neo4j_id)
+    if node_row is None:
+        raise HTTPException(404, "노드를 찾을 수 없습니다.")
 
-        node_row = node_rows[0]
-        labels = node_row.get("labels", [])
-        props = node_row.get("props", {})
-        shareholder_type = (props.get("shareholderType") or "PERSON").upper()
-        is_company = "Company" in labels
-        is_major = "MajorShareholder" in labels
-        if is_major:
-            node_type = "major"
-        elif is_company:
-            node_type = "company"
-        else:
-            node_type = "institution" if shareholder_type != "PERSON" else "person"
+    node = _row_to_node(node_row)
+    node_type = node["type"]
+    props = node_row.get("props") or {}
 
+    if engine_related is not None:
+        related_rows = [
+            {**props_by_id[mid], "ratio": ratio} for mid, ratio in engine_related if mid in props_by_id
+        ]
+        stat_rows = [engine.company_stats(idx) if node_type == "company" else engine.holder_stats(idx)]
+    else:
         # 관련 노드 + 통계 쿼리 병렬 실행 (체감 지연 감소)
         params_id = {"id": neo4j_id}
         stat_query = max_ratio_query if node_type == "company" else holdings_query
-        future_related = _node_detail_executor.submit(
-            lambda: graph.query(related_query, params=params_id)
-        )
-        future_stats = _node_detail_executor.submit(
-            lambda: graph.query(stat_query, params=params_id)
+        related_rows, stat_rows = await asyncio.gather(
+            graph.query(related_query, params=params_id),
+            graph.query(stat_query, params=params_id),
         )
-        related_rows = future_related.result()
-        stat_rows = future_stats.result()
-
-        related = [
-            {
-                "id": f"n{r['id']}",
-                "label": r.get("props", {}).get("companyName")
-                or r.get("props", {}).get("stockName", "Unknown"),
-                "type": "company"
-                if "Company" in (r.get("labels") or [])
-                else ("major" if "MajorShareholder" in (r.get("labels") or []) else "person"),
-                "ratio": round(_clamp_ratio(r.get("ratio")), 1),
-            }
-            for r in related_rows
+
+    related = []
+    for r in related_rows:
+        other = _row_to_node(r)
+        related.append({
+            "id": other["id"],
+            "label": other["label"],
+            "type": other["type"],
+            "ratio": round(_clamp_ratio(r.get("ratio")), 1),
+        })
+    stats = []
+    if node_type == "company" and stat_rows:
+        max_ratio = _clamp_ratio(stat_rows[0].get("maxRatio"))
+        holder_count = stat_rows[0].get("holderCount") or 0
+        stats = [
+            {"val": f"{float(max_ratio):.1f}%", "key": "최대주주 지분율"},
+            {"val": str(int(holder_count)), "key": "고유 노드 수"},
+        ]
+    elif node_type != "company" and stat_rows:
+        holdings = stat_rows[0].get("holdings") or 0
+        avg_ratio = _clamp_ratio(stat_rows[0].get("avgRatio"))
+        stats = [
+            {"val": str(int(holdings)), "key": "투자 종목수"},
+            {"val": f"{float(avg_ratio):.1f}%", "key": "평균 지분율"},
         ]
-        stats = []
-        if node_type == "company" and stat_rows:
-            max_ratio = _clamp_ratio(stat_rows[0].get("maxRatio"))
-            holder_count = stat_rows[0].get("holderCount") or 0
-            stats = [
-                {"val": f"{float(max_ratio):.1f}%", "key": "최대주주 지분율"},
-                {"val": str(int(holder_count)), "key": "고유 노드 수"},
-            ]
-        elif node_type != "company" and stat_rows:
-            holdings = stat_rows[0].get("holdings") or 0
-            avg_ratio = _clamp_ratio(stat_rows[0].get("avgRatio"))
-            stats = [
-                {"val": str(int(holdings)), "key": "투자 종목수"},
-                {"val": f"{float(avg_ratio):.1f}%", "key": "평균 지분율"},
-            ]
-
-        result = {
-            "id": f"n{neo4j_id}",
-            "type": node_type,
-            "label": props.get("companyName") or props.get("stockName", "Unknown"),
-            "sub": "회사"
-            if node_type == "company"
-            else ("최대주주" if node_type == "major" else ("기관" if node_type == "institution" else "개인주주")),
-            "stats": stats,
-            "props": {k: v for k, v in props.items() if k not in ["nameEmbedding"]},
-            "related": related,
-        }
-        _NODE_DETAIL_CACHE[cache_key] = (now + NODE_DETAIL_CACHE_TTL_SEC, result)
-        return result
+
+    result = {
+        "id": node["id"],
+        "type": node_type,
+        "label": node["label"],
+        "sub": node["sub"],
+        "stats": stats,
+        "props": {k: v for k, v in props.items() if k not in ["nameEmbedding"]},
+        "related": related,
+    }
+    return result
+
+
+def _node_cycle_flag(neo4j_id: int) -> tuple[Optional[dict], bool]:
+    """
+    (순환 출자 플래그, 준비 여부). 배치 계산된 인덱스 조회만 — 상세 캐시에 넣지 않고 응답마다 붙임
+    (인덱스 준비 전 None 이 캐시 TTL 동안 남지 않게). 엔진에 없는 노드는 None 이 최종값.
+    """
+    engine = get_ownership_graph()
+    if engine is None:
+        return None, False
+    idx = int(engine.index_of([neo4j_id])[0])
+    if idx < 0:
+        return None, True
+    cycle_index = peek_cycle_index(engine)
+    if cycle_index is None:
+        return None, False
+    return cycle_index.node_flag(idx), True
+
+
+@router.get("/viewport")
+async def get_viewport(
+    x0: float = Query(0.0, ge=0, le=1, description="상자 왼쪽 (전역 레이아웃 0~1 좌표)"),
+    y0: float = Query(0.0, ge=0, le=1, description="상자 위쪽"),
+    x1: float = Query(1.0, ge=0, le=1, description="상자 오른쪽"),
+    y1: float = Query(1.0, ge=0, le=1, description="상자 아래쪽"),
+    zoom: float = Query(1.0, gt=0, le=1_000_000, description="확대 배율 (1 = 전체 그래프가 한 화면)"),
+    limit: int = Query(2000, ge=1, le=5000, description="최대 노드 수 (초과 시 중요도 상위만)"),
+    accept: Optional[str] = Header(None),
+):
+    """
+    전역 레이아웃 타일 조회: 상자 안 노드 + 그 노드들 사이 엣지 + 전역 좌표.
+
+    전체 지분 그래프는 엔진 로드 직후 1회 배치(fa2)되어 격자 인덱스로 보관됨.
+    줌아웃일수록 격자 셀당 중요도(연결 쌍 수) 상위 노드만 → 응답 크기·비용이 데이터 크기와 무관.
+    반환 layout.positions 는 전역 0~1 좌표 (팬·줌 간 노드 위치 고정, 재배치 없음).
+    truncated=true 면 상자 안 일부 노드 생략 (더 확대하면 표시). total 은 셀 단위 추정 노드 수.
+    엔진/전역 레이아웃 준비 전에는 503 + Retry-After.
+    """
+    engine = get_ownership_graph()
+    global_layout = peek_global_layout(engine) if engine is not None else None
+    if global_layout is None:
+        raise HTTPException(
+            503,
+            "전역 레이아웃을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "30"},
+        )
+    idx, info = global_layout.query(x0, y0, x1, y1, zoom, limit)
+    ids = [int(i) for i in engine.node_ids[idx]]
+
+    by_id = await _node_rows_by_id(ids, "뷰포트 노드")
+    nodes = []
+    positions: dict[str, dict[str, float]] = {}
+    for nid, i in zip(ids, idx):
+        if nid not in by_id:
+            continue  # 엔진 스냅샷 이후 삭제된 노드
+        node = _row_to_node(by_id[nid])
+        node["importance"] = int(global_layout.importance[i])
+        nodes.append(node)
+        x, y = global_layout.xy[i]
+        positions[node["id"]] = {"x": round(float(x), 6), "y": round(float(y), 6)}
+    edges = [_edge_row_to_dict(row) for row in engine.induced_edges(ids)]
+
+    return _graph_response(
+        {
+            "nodes": nodes,
+            "edges": edges,
+            "layout": {"positions": positions, "level": info["level"], "version": global_layout.version},
+            "total": info["total"],
+            "truncated": info["truncated"],
+        },
+        accept,
+    )
+
+
+@router.get("/nodes/{node_id}")
+async def get_node_detail(node_id: str, response: Response):
+    """
+    특정 노드의 상세 정보 + 연결된 노드 목록.
+    성능: 캐시(LRU+TTL, 동시 미스 single-flight) + 관련/통계 쿼리 병렬 실행으로 체감 지연 감소.
+    cycle(순환 출자 플래그)은 인덱스 준비 전이면 null 이고 그 응답은 ETag 없음.
+    """
+    graph = get_async_graph()
+    neo4j_id = _neo4j_id(node_id)
+
+    # 키에 데이터·엔진 버전 포함 → 재적재/엔진 리로드 후 옛 상세가 (공유 티어 포함) 재사용되지 않음
+    engine = get_ownership_graph()
+    key = f"{get_data_version().current()}:{engine.version if engine is not None else 'neo4j'}:n{neo4j_id}"
+
+    try:
+        # 캐시 적중 시 즉시 반환, 동시 미스는 하나의 로드 결과 공유
+        detail = await _node_detail_cache().get_or_load(key, lambda: _load_node_detail(graph, neo4j_id))
 
     except HTTPException:
         raise
@@ -549,6 +1051,11 @@ def get_node_detail(node_id: str):
         logger.error(f"노드 상세 조회 실패 (node_id={node_id}): {str(e)}", exc_info=True)
         raise HTTPException(500, f"노드 상세 조회 실패: {str(e)}") from e
 
+    cycle, ready = _node_cycle_flag(neo4j_id)
+    if not ready:
+        _mark_partial(response)
+    return {**detail, "cycle": cycle}
+
 
 def _row_to_node(r: dict) -> dict:
     """Neo4j row (id, labels, props) → 시각화용 노드 딕셔너리 (공통)."""
@@ -561,7 +1068,7 @@ def _row_to_node(r: dict) -> dict:
             "type": "company",
             "label": (props.get("companyName") or "Unknown").strip(),
             "bizno": props.get("bizno"),
-            "active": props.get("isActive", True),
+            "active": True if props.get("isActive") is None else props["isActive"],
             "sub": "회사",
         }
     if "Stockholder" in labels:
@@ -578,69 +1085,247 @@ def _row_to_node(r: dict) -> dict:
     return {"id": nid, "type": "company", "label": "Unknown", "sub": ""}
 
 
+_NODE_ROWS_QUERY = """
+    UNWIND $ids AS nid
+    MATCH (n) WHERE id(n) = nid
+    RETURN id(n) AS id, labels(n) AS labels, properties(n) AS props
+"""
+
+
+async def _node_rows_by_id(ids: list[int], what: str) -> dict[int, dict]:
+    """
+    Neo4j id 목록 → {id: row(id, labels, props)} (엔진·인덱스가 고른 노드의 표시 속성 일괄 조회, _row_to_node 입력).
+    없는 id 는 빠짐 (엔진 스냅샷 이후 삭제된 노드). Neo4j 오류는 HTTPException 으로 변환.
+    """
+    try:
+        rows = await get_async_graph().query(_NODE_ROWS_QUERY, params={"ids": ids}) if ids else []
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"{what} 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"{what} 조회 실패: {str(e)}") from e
+    return {r["id"]: r for r in rows}
+
+
+# Ego 홉별 프론티어 확장: 방향별 1홉 쿼리 (패턴 길이 고정 → 경로 열거 없음)
+# degree 는 쌍 단위 (count(DISTINCT m), 엔진의 degree 와 같은 기준 — 같은 상대와의 다중 관계는 1).
+# degree_cap 초과 슈퍼노드는 ego 가 아니면 확장하지 않음.
+_EGO_HOP_QUERIES = {
+    "out": """
+        UNWIND $frontier AS fid
+        MATCH (f) WHERE id(f) = fid
+        CALL {
+            WITH f
+            MATCH (f)-[:HOLDS_SHARES]->(m)
+            RETURN count(DISTINCT m) AS degree
+        }
+        CALL {
+            WITH f, degree
+            MATCH (f)-[r:HOLDS_SHARES]->(m)
+            WHERE degree <= $degree_cap OR id(f) = $ego_id
+            WITH m, max(r.stockRatio) AS ratio
+            ORDER BY ratio DESC
+            LIMIT $top_k
+            RETURN collect({id: id(m), ratio: ratio}) AS nbrs
+        }
+        RETURN id(f) AS id, degree, nbrs
+    """,
+    "in": """
+        UNWIND $frontier AS fid
+        MATCH (f) WHERE id(f) = fid
+        CALL {
+            WITH f
+            MATCH (f)<-[:HOLDS_SHARES]-(m)
+            RETURN count(DISTINCT m) AS degree
+        }
+        CALL {
+            WITH f, degree
+            MATCH (f)<-[r:HOLDS_SHARES]-(m)
+            WHERE degree <= $degree_cap OR id(f) = $ego_id
+            WITH m, max(r.stockRatio) AS ratio
+            ORDER BY ratio DESC
+            LIMIT $top_k
+            RETURN collect({id: id(m), ratio: ratio}) AS nbrs
+        }
+        RETURN id(f) AS id, degree, nbrs
+    """,
+}
+
+
+async def _expand_ego_frontier(
+    graph,
+    ego_id: int,
+    max_hops: int,
+    max_nodes: int,
+    top_k: int,
+    degree_cap: int,
+) -> tuple[dict[int, int], set[int]]:
+    """
+    홉 단위 프론티어 확장 (방향 유지: ego→… 보유 방향, …→ego 피보유 방향).
+    각 홉에서 노드당 stockRatio 상위 top_k 이웃만, 전체는 max_nodes 까지 (높은 지분 우선).
+    반환: (노드 id → 홉 거리, 슈퍼노드라 확장 생략된 id 집합)
+    """
+    visited: dict[int, int] = {ego_id: 0}
+    supernodes: set[int] = set()
+    frontiers = {"out": [ego_id], "in": [ego_id]}
+
+    for hop in range(1, max_hops + 1):
+        directions = [d for d, f in frontiers.items() if f]
+        if not directions or len(visited) >= max_nodes:
+            break
+        params = {"top_k": top_k, "degree_cap": degree_cap, "ego_id": ego_id}
+        results = await asyncio.gather(*(
+            graph.query(_EGO_HOP_QUERIES[d], params={**params, "frontier": frontiers[d]})
+            for d in directions
+        ))
+
+        candidates: list[tuple[float, int, str]] = []
+        for direction, rows in zip(directions, results):
+            for row in rows:
+                if row["id"] != ego_id and (row.get("degree") or 0) > degree_cap:
+                    supernodes.add(row["id"])
+                for nb in row.get("nbrs") or []:
+                    candidates.append((_clamp_ratio(nb.get("ratio")), nb["id"], direction))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        frontiers = {"out": [], "in": []}
+        for _, nid, direction in candidates:
+            if len(visited) >= max_nodes:
+                break
+            if nid in visited:
+                continue
+            visited[nid] = hop
+            frontiers[direction].append(nid)
+
+    return visited, supernodes
+
+
+def _expand_ego_frontier_engine(
+    engine,
+    ego_id: int,
+    max_hops: int,
+    max_nodes: int,
+    top_k: int,
+    degree_cap: int,
+) -> tuple[dict[int, int], set[int]]:
+    """_expand_ego_frontier 의 CSR 엔진 버전 (같은 규칙, DB 왕복 없음). degree 는 쌍 단위."""
+    visited: dict[int, int] = {ego_id: 0}
+    supernodes: set[int] = set()
+    frontiers = {"out": [ego_id], "in": [ego_id]}
+
+    for hop in range(1, max_hops + 1):
+        if not any(frontiers.values()) or len(visited) >= max_nodes:
+            break
+        candidates: list[tuple[float, int, str]] = []
+        for direction, frontier in frontiers.items():
+            for fid, idx in zip(frontier, engine.index_of(frontier)):
+                if idx < 0:
+                    continue
+                if fid != ego_id and engine.degree(int(idx), direction) > degree_cap:
+                    supernodes.add(fid)
+                    continue
+                for mid, ratio in engine.top_neighbors(int(idx), direction, top_k):
+                    candidates.append((_clamp_ratio(ratio), mid, direction))
+        candidates.sort(key=lambda c: c[0], reverse=True)
+
+        frontiers = {"out": [], "in": []}
+        for _, nid, direction in candidates:
+            if len(visited) >= max_nodes:
+                break
+            if nid in visited:
+                continue
+            visited[nid] = hop
+            frontiers[direction].append(nid)
+
+    return visited, supernodes
+
+
 @router.get("/ego")
-def get_ego_graph(
+async def get_ego_graph(
     node_id: str = Query(..., description="중심 노드 ID (예: n123)"),
     max_hops: int = Query(2, ge=1, le=3, description="확장 홉 수"),
     max_nodes: int = Query(120, ge=10, le=300, description="최대 노드 수"),
+    top_k: int = Query(15, ge=1, le=100, description="홉별 노드당 최대 이웃 수 (stockRatio 상위)"),
+    degree_cap: int = Query(200, ge=10, le=10000, description="이 차수를 넘는 슈퍼노드는 (ego 제외) 확장하지 않음"),
 ):
     """
     Ego-Graph: 중심 노드 기준 N홉 이내 노드·엣지만 반환 (지배구조 맵용).
     Neo4j에서 (Stockholder)-[:HOLDS_SHARES]->(Company) 방향으로 확장.
+
+    성능: 가변 길이 패턴(*1..N) 대신 홉별 프론티어 확장.
+    국민연금 같은 허브를 만나도 경로 조합을 열거하지 않으므로 지연이 데이터 모양과 무관하게 제한됨.
+    - 각 홉: 노드당 stockRatio 상위 top_k 이웃, 전체 max_nodes 까지
+    - degree_cap 초과 슈퍼노드는 확장 생략 (supernode=true)
+    - 응답에 포함되지 않은 관계가 있는 노드는 truncated=true (degree: 전체 HOLDS_SHARES 관계 수)
     """
-    graph = graph_service.get_graph()
+    graph = get_async_graph()
     neo4j_id = _neo4j_id(node_id)
 
-    # 1) Ego + 양방향 1..max_hops 이내 노드 수집 (중복 제거)
-    # CTO: Neo4j는 관계 패턴 길이를 파라미터로 직접 지원하지 않음
-    # 해결: max_hops 값에 따라 쿼리를 동적으로 생성 (1~3 홉만 허용)
-    max_hops_clamped = max(1, min(3, max_hops))
-    
-    # 관계 패턴 길이는 리터럴만 허용, 동적 쿼리 생성
-    # 보안: max_hops_clamped는 이미 1~3 범위로 제한되어 있음
-    nodes_query = f"""
-        MATCH (ego)
-        WHERE id(ego) = $id
-        OPTIONAL MATCH (ego)-[r1:HOLDS_SHARES*1..{max_hops_clamped}]->(n1)
-        OPTIONAL MATCH (ego)<-[r2:HOLDS_SHARES*1..{max_hops_clamped}]-(n2)
-        WITH ego, n1, n2
-        UNWIND [n1, n2, ego] AS n
-        WITH n WHERE n IS NOT NULL
-        WITH DISTINCT n
-        LIMIT $max_nodes
-        RETURN id(n) AS id, labels(n) AS labels, properties(n) AS props
+    # 1) 홉별 프론티어 확장 → 2) 노드 속성 + 전체 차수 일괄 조회
+    nodes_query = """
+        UNWIND $ids AS nid
+        MATCH (n) WHERE id(n) = nid
+        RETURN id(n) AS id, labels(n) AS labels, properties(n) AS props,
+               COUNT { (n)-[:HOLDS_SHARES]-() } AS degree
     """
+    engine = get_ownership_graph()
     try:
-        rows = graph.query(
-            nodes_query, 
-            params={"id": neo4j_id, "max_nodes": max_nodes}
-        )
+        if engine is not None:
+            visited, supernodes = _expand_ego_frontier_engine(
+                engine, neo4j_id, max_hops, max_nodes, top_k, degree_cap
+            )
+        else:
+            visited, supernodes = await _expand_ego_frontier(
+                graph, neo4j_id, max_hops, max_nodes, top_k, degree_cap
+            )
+        rows = await graph.query(nodes_query, params={"ids": list(visited)})
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
     except Exception as e:
         logger.error(f"Ego 노드 조회 실패: {str(e)}", exc_info=True)
         raise HTTPException(500, f"Ego 그래프 조회 실패: {str(e)}") from e
 
-    seen = set()
     nodes = []
-    for r in rows:
-        nid = r.get("id")
-        if nid is None or nid in seen:
-            continue
-        seen.add(nid)
-        nodes.append(_row_to_node(r))
+    degrees: dict[str, int] = {}
+    for r in sorted(rows, key=lambda r: visited.get(r["id"], max_hops)):
+        node = _row_to_node(r)
+        node["hop"] = visited.get(r["id"], 0)
+        node["supernode"] = r["id"] in supernodes
+        degrees[node["id"]] = int(r.get("degree") or 0)
+        nodes.append(node)
 
     if not nodes:
         raise HTTPException(404, "해당 노드를 찾을 수 없거나 연결된 노드가 없습니다.")
 
     node_ids = [int(x["id"].lstrip("n")) for x in nodes]
 
-    # 2) 위 노드들 사이의 HOLDS_SHARES 엣지만 조회
+    # 2) 위 노드들 사이의 HOLDS_SHARES 엣지만 조회 (엔진: 쌍 단위 집계, degree 도 쌍 단위로 맞춤)
     edges_query = """
         MATCH (a)-[r:HOLDS_SHARES]->(b)
         WHERE id(a) IN $ids AND id(b) IN $ids
         RETURN id(a) AS fromId, id(b) AS toId, r.stockRatio AS ratio
     """
     try:
-        edge_rows = graph.query(edges_query, params={"ids": node_ids})
+        if engine is not None:
+            edge_rows = engine.induced_edges(node_ids)
+            for nid, idx in zip(node_ids, engine.index_of(node_ids)):
+                degrees[f"n{nid}"] = engine.degree(int(idx)) if idx >= 0 else 0
+        else:
+            edge_rows = await graph.query(edges_query, params={"ids": node_ids})
     except ServiceUnavailable:
         logger.error("Neo4j 서비스 사용 불가", exc_info=True)
         raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
@@ -657,16 +1342,327 @@ def get_ego_graph(
     edges = []
     for row in edge_rows:
         r_val = _clamp_ratio(row.get("ratio"))
-        edges.append({
+        edge = {
             "from": f"n{row['fromId']}",
             "to": f"n{row['toId']}",
             "type": "HOLDS_SHARES",
             "ratio": round(r_val, 1),
             "label": f"{r_val:.1f}%",
-        })
+        }
+        if "relCount" in row:
+            edge["count"] = int(row["relCount"])
+        edges.append(edge)
+
+    # 응답 엣지 수 < 전체 관계 수 → 잘린 노드 표시 (UI 에서 "더 있음" 표시용)
+    incident: dict[str, int] = {}
+    for e in edges:
+        incident[e["from"]] = incident.get(e["from"], 0) + 1
+        incident[e["to"]] = incident.get(e["to"], 0) + 1
+    truncated_ids = []
+    for node in nodes:
+        node["degree"] = degrees.get(node["id"], 0)
+        node["truncated"] = node["supernode"] or node["degree"] > incident.get(node["id"], 0)
+        if node["truncated"]:
+            truncated_ids.append(node["id"])
 
     return {
         "nodes": nodes,
         "edges": edges,
         "ego_id": f"n{neo4j_id}",
+        "truncated_ids": truncated_ids,
+        "limits": {"max_hops": max_hops, "max_nodes": max_nodes, "top_k": top_k, "degree_cap": degree_cap},
+    }
+
+
+@router.get("/ultimate-owners")
+async def get_ultimate_owners(
+    node_id: str = Query(..., description="대상 회사 노드 ID (예: n123)"),
+    limit: int = Query(20, ge=1, le=200, description="최대 주주 수"),
+    terminal_only: bool = Query(True, description="True면 스스로는 보유되지 않는 최종 주주만"),
+    max_depth: int = Query(20, ge=1, le=100, description="지분 체인 최대 길이 (급수 절단)"),
+):
+    """
+    최종(간접) 지분율: 법인 주주 체인을 거친 실효 지분 상위 주주.
+
+    실효 지분 = 경로별 직접 지분 곱의 합 (A + A² + … = A(I − A)⁻¹ 의 대상 열).
+    CSR 엔진 위에서 희소 행렬-벡터 곱으로 계산하며, 결과는 엔진 스냅샷 version 별로 캐시.
+    엔진이 준비되지 않았으면 503 (Cypher 로는 순환 출자를 포함한 정확한 계산 불가).
+    """
+    engine = get_ownership_graph()
+    if engine is None:
+        raise HTTPException(503, "지분 그래프 엔진을 준비 중입니다. 잠시 후 다시 시도해주세요.")
+    neo4j_id = _neo4j_id(node_id)
+
+    async def _load() -> dict:
+        idx = int(engine.index_of([neo4j_id])[0])
+        if idx < 0:
+            result = {"owners": [], "iterations": 0, "converged": True}
+        else:
+            result = await run_in_threadpool(
+                top_ultimate_owners, engine, idx, limit, terminal_only, max_depth
+            )
+        owner_ids = [o["id"] for o in result["owners"]]
+        rows = await _node_rows_by_id(owner_ids, "최종 주주")
+        nodes = {nid: _row_to_node(r) for nid, r in rows.items()}
+        owners = []
+        for o in result["owners"]:
+            node = nodes.get(o["id"]) or {"id": f"n{o['id']}", "type": "person", "label": "Unknown"}
+            owners.append({
+                "id": node["id"],
+                "label": node["label"],
+                "type": node["type"],
+                "effective": round(_clamp_ratio(o["effective"]), 2),
+                "direct": round(_clamp_ratio(o["direct"]), 2),
+                "terminal": o["terminal"],
+            })
+        return {
+            "node_id": f"n{neo4j_id}",
+            "owners": owners,
+            "iterations": result["iterations"],
+            "converged": result["converged"],
+            "version": engine.version,
+        }
+
+    key = f"uo:{engine.version}:{neo4j_id}:{limit}:{int(terminal_only)}:{max_depth}"
+    try:
+        return await _analysis_cache().get_or_load(key, _load)
+    except HTTPException:
+        raise
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"최종 지분 계산 실패 (node_id={node_id}): {str(e)}", exc_info=True)
+        raise HTTPException(500, f"최종 지분 계산 실패: {str(e)}") from e
+
+
+@router.get("/cycles")
+async def get_cycles(
+    node_id: Optional[str] = Query(None, description="이 노드가 포함된 순환만 (예: n123)"),
+    limit: int = Query(50, ge=1, le=500, description="최대 순환 수"),
+):
+    """
+    순환 출자(상호·고리형 지분) 목록.
+
+    엔진 로드 시 배치로 계산한 인덱스(SCC + 길이 CYCLE_MAX_LENGTH 이하 단순 순환)에서 조회.
+    인덱스 준비 전에는 요청에서 계산하지 않고 503 + Retry-After (/clusters 와 같은 방식).
+    정렬: 순환 내 최소 지분율 내림차순 (강하게 연결된 고리 우선, 인덱스에 미리 정렬됨).
+    """
+    engine = get_ownership_graph()
+    if engine is None:
+        raise HTTPException(503, "지분 그래프 엔진을 준비 중입니다. 잠시 후 다시 시도해주세요.")
+    index = peek_cycle_index(engine)
+    if index is None:
+        raise HTTPException(
+            503,
+            "순환 출자 인덱스를 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "30"},
+        )
+
+    node_flag = None
+    if node_id:
+        idx = int(engine.index_of([_neo4j_id(node_id)])[0])
+        cycle_ids = index.node_cycles.get(idx, []) if idx >= 0 else []
+        node_flag = index.node_flag(idx) if idx >= 0 else {"in_cycle": False, "scc_size": 0, "cycle_count": 0}
+    else:
+        cycle_ids = range(len(index.cycles))
+    selected = cycle_ids[:limit]
+
+    ids = sorted({int(engine.node_ids[n]) for c in selected for n in index.cycles[c][0]})
+    rows = await _node_rows_by_id(ids, "순환 출자 노드")
+    nodes = {nid: _row_to_node(r) for nid, r in rows.items()}
+
+    cycles = []
+    for c in selected:
+        members, ratios = index.cycles[c]
+        cycle_nodes = []
+        for n in members:
+            nid = int(engine.node_ids[n])
+            node = nodes.get(nid) or {"id": f"n{nid}", "type": "company", "label": "Unknown"}
+            cycle_nodes.append({"id": node["id"], "label": node["label"], "type": node["type"]})
+        clamped = [round(_clamp_ratio(r), 1) for r in ratios]
+        cycles.append({
+            "nodes": cycle_nodes,
+            "ratios": clamped,  # i 번째: nodes[i] → nodes[i+1] (마지막은 → nodes[0])
+            "length": len(members),
+            "min_ratio": min(clamped),
+        })
+
+    return {
+        "summary": index.summary(),
+        "node": node_flag,
+        "cycles": cycles,
+        "total": len(cycle_ids),
+    }
+
+
+# ── 커뮤니티 클러스터 (슈퍼 노드) ─────────────────────────────────────────────
+_CLUSTER_PREFIX = "cluster-"
+
+
+def _cluster_node_id(cid: int) -> str:
+    return f"{_CLUSTER_PREFIX}{cid}"
+
+
+def _parse_cluster_id(cluster_id: str) -> int:
+    if not cluster_id.startswith(_CLUSTER_PREFIX) or not cluster_id[len(_CLUSTER_PREFIX):].isdigit():
+        raise HTTPException(400, "잘못된 cluster_id 형식입니다 (예: cluster-3).")
+    return int(cluster_id[len(_CLUSTER_PREFIX):])
+
+
+def _community_index(engine):
+    """
+    현재 스냅샷의 커뮤니티 인덱스. 계산은 엔진 로드/재빌드 리스너가 백그라운드에서 하므로
+    준비 전에는 요청에서 Louvain 을 돌리지 않고 503 + Retry-After (/viewport 와 같은 방식).
+    """
+    index = peek_community_index(engine)
+    if index is None:
+        raise HTTPException(
+            503,
+            "클러스터 분할을 준비 중입니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "30"},
+        )
+    return index
+
+
+def _super_edge_to_dict(index, pos: int) -> dict:
+    count = int(index.edge_count[pos])
+    return {
+        "from": _cluster_node_id(int(index.edge_src[pos])),
+        "to": _cluster_node_id(int(index.edge_dst[pos])),
+        "type": "CLUSTER_LINK",
+        "count": count,
+        "ratio": round(_clamp_ratio(index.edge_ratio_max[pos]), 1),
+        "weight": round(float(index.edge_ratio_sum[pos]) / 100.0, 3),
+        "label": f"{count}건",
+    }
+
+
+@router.get("/clusters")
+async def get_clusters(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500, description="최대 클러스터 수 (크기 내림차순)"),
+    preview: int = Query(3, ge=0, le=20, description="클러스터별 대표 멤버 수 (중요도순)"),
+):
+    """
+    커뮤니티 슈퍼 노드 그래프 (첫 화면: 수천 노드 대신 수십 개 클러스터).
+
+    지분 그래프 전체에 Louvain(가중치 = 쌍별 max ratio) 분할, 스냅샷(데이터 버전)당 1회 백그라운드 계산·보관.
+    분할 준비 전(엔진 로드·재빌드 직후)에는 503 + Retry-After.
+    - nodes: 클러스터당 1개 (id=cluster-{n}, size, internal_pairs, 대표 멤버 preview, 라벨 = 최고 중요도 멤버)
+    - edges: 표시 클러스터 간 방향 슈퍼 엣지 (count = 주주→회사 쌍 수, ratio = 최대 지분율, weight = 지분율 합/100)
+    - layout.positions: 전역 레이아웃이 준비되어 있으면 멤버 좌표 평균 (0~1). 준비 전 응답은 ETag 없음
+    펼치기: GET /clusters/{cluster_id}. (cluster-{n} id 가 섞이므로 컬럼형 응답 미지원, JSON 만)
+    """
+    engine = get_ownership_graph()
+    if engine is None:
+        raise HTTPException(503, "지분 그래프 엔진을 준비 중입니다. 잠시 후 다시 시도해주세요.")
+    index = _community_index(engine)
+    cids = list(range(min(limit, index.n_communities)))
+    heads = {c: index.community_members(c)[: max(preview, 1)] for c in cids}
+    rows = await _node_rows_by_id(
+        sorted({int(engine.node_ids[i]) for members in heads.values() for i in members}), "클러스터 대표 노드"
+    )
+
+    global_layout = peek_global_layout(engine)
+    nodes = []
+    positions: dict[str, dict[str, float]] = {}
+    for cid, members in heads.items():
+        shown = [_row_to_node(rows[int(engine.node_ids[i])]) for i in members if int(engine.node_ids[i]) in rows]
+        size = int(index.sizes[cid])
+        head_label = shown[0]["label"] if shown else "Unknown"
+        nodes.append({
+            "id": _cluster_node_id(cid),
+            "type": "cluster",
+            "label": f"{head_label} 외 {size - 1}" if size > 1 else head_label,
+            "sub": "클러스터",
+            "size": size,
+            "internal_pairs": int(index.internal_pairs[cid]),
+            "preview": [{"id": x["id"], "label": x["label"], "type": x["type"]} for x in shown[:preview]],
+        })
+        if global_layout is not None:
+            x, y = global_layout.xy[index.community_members(cid)].mean(axis=0)
+            positions[_cluster_node_id(cid)] = {"x": round(float(x), 6), "y": round(float(y), 6)}
+
+    edges = [_super_edge_to_dict(index, int(p)) for p in index.super_edges(cids)]
+    body = {
+        "nodes": nodes,
+        "edges": edges,
+        "total": index.n_communities,
+        "covered_nodes": int(index.sizes[: len(cids)].sum()),
+        "summary": index.summary(),
+    }
+    if positions:
+        body["layout"] = {"positions": positions}
+    else:
+        _mark_partial(response)  # 전역 레이아웃 준비 전: 좌표 없음
+    return body
+
+
+@router.get("/clusters/{cluster_id}")
+async def expand_cluster(
+    cluster_id: str,
+    limit: int = Query(200, ge=1, le=2000, description="최대 멤버 노드 수 (중요도순)"),
+):
+    """
+    클러스터 펼치기: 멤버 노드(중요도 상위 limit) + 멤버 간 엣지 + 다른 클러스터로 향하는 집계 엣지.
+
+    외부 엣지는 (멤버, 상대 클러스터) 단위로 합쳐 to/from = cluster-{n} (count, 최대 ratio)
+    → 프론트는 슈퍼 노드 하나를 멤버로 바꿔 그려도 다른 슈퍼 노드와의 연결이 유지됨.
+    hidden = 표시하지 않은 멤버 수.
+    """
+    engine = get_ownership_graph()
+    if engine is None:
+        raise HTTPException(503, "지분 그래프 엔진을 준비 중입니다. 잠시 후 다시 시도해주세요.")
+    cid = _parse_cluster_id(cluster_id)
+    index = _community_index(engine)
+    if cid >= index.n_communities:
+        raise HTTPException(404, "클러스터를 찾을 수 없습니다 (데이터 갱신으로 번호가 바뀌었을 수 있음).")
+    members = index.community_members(cid)[:limit]
+    ids = [int(x) for x in engine.node_ids[members]]
+    rows = await _node_rows_by_id(ids, "클러스터 멤버")
+
+    nodes = []
+    for nid, i in zip(ids, members):
+        if nid not in rows:
+            continue
+        node = _row_to_node(rows[nid])
+        node["importance"] = int(index.importance[i])
+        node["cluster"] = cluster_id
+        nodes.append(node)
+    edges = [_edge_row_to_dict(row) for row in engine.induced_edges(ids)]
+
+    # 멤버 → 다른 클러스터 (보유), 다른 클러스터 → 멤버 (피보유) 집계
+    for direction in ("out", "in"):
+        outside: dict[tuple[int, int], list[float]] = {}
+        for nid, i in zip(ids, members):
+            nbrs, ratios = engine.neighbors(int(i), direction)
+            other = index.labels[nbrs]
+            for c, r in zip(other[other != cid].tolist(), ratios[other != cid].tolist()):
+                agg = outside.setdefault((nid, c), [0, 0.0])
+                agg[0] += 1
+                agg[1] = max(agg[1], r)
+        for (nid, c), (count, ratio) in sorted(outside.items()):
+            member, cluster = f"n{nid}", _cluster_node_id(c)
+            edges.append({
+                "from": member if direction == "out" else cluster,
+                "to": cluster if direction == "out" else member,
+                "type": "CLUSTER_LINK",
+                "count": count,
+                "ratio": round(_clamp_ratio(ratio), 1),
+                "label": f"{count}건",
+            })
+
+    return {
+        "cluster": cluster_id,
+        "size": int(index.sizes[cid]),
+        "hidden": int(index.sizes[cid]) - len(nodes),
+        "nodes": nodes,
+        "edges": edges,
     }
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
 
-from app.services import graph_service
+from app.core.cache import cache_stats
+from app.services import graph_service, get_connection_manager, get_stats_service
+from app.services.chat_history import get_chat_history
+from app.services.cypher_cache import get_cypher_cache
+from app.services.layout_jobs import get_layout_jobs
+from app.services.layout_pool import get_layout_pool
 
 router = APIRouter(tags=["system"])
 
@@ -24,37 +29,28 @@ def health():
     """
     상세한 헬스 체크 (Neo4j 연결 상태 포함).
     CTO: 백엔드 및 데이터베이스 상태를 종합적으로 확인.
+    연결 상태는 백그라운드 라이브니스 프로브/서킷 브레이커 결과를 사용 (요청마다 핑하지 않음).
     """
     from datetime import datetime
-    
+
+    manager = get_connection_manager()
+    breaker = manager.status()
+    if breaker["last_probe_at"] is None:
+        # 프로브가 아직 한 번도 돌지 않았으면 (기동 직후) 1회 동기 확인
+        manager.probe()
+        breaker = manager.status()
+
     health_status = {
         "status": "healthy",
         "backend": "ok",
         "neo4j": "disconnected",
+        "circuit_breaker": breaker,
         "timestamp": datetime.now().isoformat(),
     }
-    
-    try:
-        graph = graph_service.get_graph()
-        # 간단한 쿼리로 연결 확인
-        graph.query("RETURN 1 AS test LIMIT 1")
-        health_status["neo4j"] = "connected"
-        
-        # 노드 통계 (선택적)
-        try:
-            counts = graph.query(
-                "MATCH (n) RETURN labels(n)[0] AS label, count(n) AS cnt ORDER BY cnt DESC LIMIT 10"
-            )
-            health_status["node_stats"] = counts
-        except Exception:
-            pass  # 통계 조회 실패해도 헬스 체크는 성공
-        
-        return health_status
-    except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["neo4j"] = "disconnected"
-        health_status["error"] = str(e)[:200]  # 에러 메시지 제한
-        
+
+    connected = breaker["state"] != "open" and bool(breaker["last_probe_ok"])
+    if not connected:
+        error = breaker.get("last_error") or "Neo4j circuit breaker is open"
         # Neo4j 연결 실패는 503 반환
         raise HTTPException(
             503,
@@ -62,16 +58,51 @@ def health():
                 "status": "unhealthy",
                 "message": "일시적으로 서비스를 사용할 수 없습니다. 잠시 후 다시 시도해 주세요.",
                 "neo4j": "disconnected",
-                "error": str(e)[:200],
+                "circuit_breaker": breaker,
+                "error": str(error)[:200],
             },
-        ) from e
+        )
+
+    health_status["neo4j"] = "connected"
+    # 노드 통계 (선택적): 통계 스냅샷에서 읽기만 함 (프로브마다 라벨 스캔하지 않음)
+    stats = get_stats_service()
+    snapshot = stats.peek()
+    if snapshot is not None:
+        health_status["node_stats"] = [{"label": x["l"], "cnt": x["n"]} for x in snapshot["nodes"][:10]]
+    health_status["stats_snapshot"] = stats.status()
+    health_status["layout_pool"] = get_layout_pool().status()
+    health_status["layout_jobs"] = get_layout_jobs().status()
+    health_status["chat_history"] = get_chat_history().status()
+
+    return health_status
 
 
 @router.get("/stats")
 def db_stats():
+    """DB 현황 (통계 스냅샷). snapshot.age_sec 로 최신성 확인."""
     return graph_service.get_stats()
 
 
+@router.post("/stats/refresh")
+def refresh_stats():
+    """통계 스냅샷 즉시 재계산 (데이터 적재 직후 등 명시적 갱신)."""
+    svc = get_stats_service()
+    try:
+        snapshot = svc.refresh()
+    except Exception as e:
+        raise HTTPException(
+            503,
+            "일시적으로 서비스를 사용할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+        ) from e
+    return {"snapshot": svc.meta(snapshot), "elapsed_ms": snapshot["elapsed_ms"]}
+
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """응답 캐시별 적중/미스/제거 카운터 + 질문 → Cypher 의미 캐시 ("cypher") (프로세스 로컬 기준)."""
+    return {**cache_stats(), "cypher": get_cypher_cache().stats()}
+
+
 @router.get("/search")
 def vector_search(q: str, k: int = 5):
     try:
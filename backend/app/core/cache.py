@@ -0,0 +1,397 @@
+"""
+응답 캐시 공통 모듈 (LRU + TTL, 크기 상한, single-flight, 선택적 공유 백엔드).
+
+- 로컬 계층: OrderedDict LRU. 항목 수(max_entries)·추정 바이트(max_bytes) 상한 초과 시 오래된 항목부터 제거,
+  만료 항목은 조회 시 + 삽입 시 정리 → 장기 실행 프로세스에서도 메모리 상한 유지.
+- single-flight: 같은 키 동시 미스는 하나의 로더만 실행하고 나머지는 그 결과를 공유
+  (asyncio: get_or_load, 스레드풀 동기 작업: get_or_compute).
+- 공유 계층(선택): 로컬 SQLite 파일. 같은 호스트의 uvicorn 워커끼리 적중 공유.
+  네임스페이스별 항목 수·바이트 상한, 만료·상한 정리는 쓰기 시점에 주기적으로 (파일이 무한히 커지지 않게).
+- 적중/미스/제거 카운터: cache_stats() 로 조회.
+"""
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _estimate_bytes(value: Any) -> int:
+    """JSON 직렬화 길이로 크기 추정 (응답 페이로드 기준)."""
+    try:
+        return len(json.dumps(value, default=str, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class SQLiteCacheBackend:
+    """
+    워커 간 공유용 SQLite 캐시 (JSON 값, 만료 시각 저장).
+    WAL 모드로 다중 프로세스 동시 읽기/쓰기. 값은 JSON 직렬화 가능해야 함 (비표준 타입은 str 변환).
+    상한(max_entries·max_bytes, 0 = 없음) 초과분은 만료가 가까운(= 오래 전에 쓴) 항목부터 제거.
+    정리는 _PURGE_INTERVAL_SEC 마다 쓰기 시점에 한 번 (매 쓰기 전체 집계 방지) → 상한을 잠시 넘을 수 있음.
+    """
+
+    _PURGE_INTERVAL_SEC = 60.0
+
+    def __init__(self, path: str, namespace: str, max_entries: int = 0, max_bytes: int = 0):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max(0, max_entries)
+        self.max_bytes = max(0, max_bytes)
+        self._local = threading.local()
+        self._last_purge = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, expires REAL NOT NULL, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (ns, key))"
+        )
+        if "size" not in {row[1] for row in conn.execute("PRAGMA table_info(cache)")}:
+            # 상한 도입 전에 만든 파일: 크기 열 추가 후 기존 행 채움
+            conn.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            conn.execute("UPDATE cache SET size = length(CAST(value AS BLOB))")
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_ns_expires ON cache (ns, expires)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유 불가 → 스레드별 연결
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        row = self._conn().execute(
+            "SELECT expires, value FROM cache WHERE ns = ? AND key = ?", (self.namespace, key)
+        ).fetchone()
+        if row is None or row[0] < time.time():
+            return _MISSING
+        return json.loads(row[1])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        payload = json.dumps(value, default=str, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 저장하지 않음
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (ns, key, expires, value, size) VALUES (?, ?, ?, ?, ?)",
+            (self.namespace, key, now + ttl, payload, size),
+        )
+        conn.commit()
+        if now - self._last_purge >= self._PURGE_INTERVAL_SEC:
+            self._last_purge = now
+            try:
+                self.purge_expired()
+            except sqlite3.OperationalError as e:
+                # 다른 워커가 쓰는 중 (락 대기 초과): 다음 주기에 다시
+                logger.warning(f"[cache:{self.namespace}] shared purge skipped: {e}")
+
+    def delete(self, key: Optional[str] = None) -> None:
+        conn = self._conn()
+        if key is None:
+            conn.execute("DELETE FROM cache WHERE ns = ?", (self.namespace,))
+        else:
+            conn.execute("DELETE FROM cache WHERE ns = ? AND key = ?", (self.namespace, key))
+        conn.commit()
+
+    def purge_expired(self) -> None:
+        """만료 항목 삭제 + 항목 수·바이트 상한 적용 (만료가 먼 항목부터 남김)."""
+        ns = self.namespace
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE ns = ? AND expires < ?", (ns, time.time()))
+            if self.max_entries:
+                conn.execute(
+                    "DELETE FROM cache WHERE ns = ? AND key IN ("
+                    " SELECT key FROM cache WHERE ns = ? ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+                    (ns, ns, self.max_entries),
+                )
+            if self.max_bytes:
+                conn.execute(
+                    "DELETE FROM cache WHERE ns = ? AND key IN ("
+                    " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY expires DESC, key) AS total"
+                    " FROM cache WHERE ns = ?) WHERE total > ?)",
+                    (ns, ns, self.max_bytes),
+                )
+
+    def usage(self) -> tuple[int, int]:
+        """(항목 수, 바이트) — 네임스페이스 기준."""
+        row = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache WHERE ns = ?", (self.namespace,)
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+
+class LRUTTLCache:
+    """프로세스 로컬 LRU + TTL 캐시. 스레드 안전 (동기 get/set). single-flight 는 get_or_load(async)/get_or_compute(sync)."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl: float,
+        max_entries: int = 1024,
+        max_bytes: int = 0,
+        shared: Optional[SQLiteCacheBackend] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(0, max_bytes)  # 0 = 바이트 상한 없음
+        self.shared = shared
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()  # key -> (expiry, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}  # 키 → 로드 태스크
+        self._sync_inflight: dict[str, threading.Event] = {}
+        self._stats = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "loads": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    # ── 로컬 계층 ───────────────────────────────────────────────────────────
+    def _pop(self, key: str) -> None:
+        # 호출자는 self._lock 보유
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """로컬 계층 조회. 없거나 만료면 default."""
+        return self._lookup(key, default, count_hit=True)
+
+    def _lookup(self, key: str, default: Any, count_hit: bool) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= now:
+                self._pop(key)
+                self._stats["expirations"] += 1
+                return default
+            self._data.move_to_end(key)
+            if count_hit:
+                self._stats["hits"] += 1
+            return entry[2]
+
+    def set(self, key: str, value: Any) -> None:
+        size = _estimate_bytes(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 캐시하지 않음
+        now = time.monotonic()
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (now + self.ttl, size, value)
+            self._bytes += size
+            # 만료 항목 먼저, 그 다음 LRU 순으로 상한까지 제거
+            if len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                for k in [k for k, (exp, _, _) in self._data.items() if exp <= now]:
+                    self._pop(k)
+                    self._stats["expirations"] += 1
+            while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """key=None 이면 전체 무효화 (공유 계층 포함)."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._bytes = 0
+            elif key in self._data:
+                self._pop(key)
+        if self.shared is not None:
+            try:
+                self.shared.delete(key)
+            except sqlite3.Error as e:
+                logger.warning(f"[cache:{self.name}] shared invalidate failed: {e}")
+
+    # ── single-flight 로드 ─────────────────────────────────────────────────
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        로컬 → 공유 → 로더 순. 같은 키 동시 미스는 첫 요청의 로드 결과를 공유.
+        로더 예외(HTTPException 404 등)도 대기 중인 요청 모두에 그대로 전달되며 캐시되지 않음.
+        로드는 별도 태스크 (모든 요청이 shield 로 대기) → 첫 요청이 취소(클라이언트 끊김)돼도
+        다른 대기 요청은 결과를 받고, 대기자가 없어도 로드를 끝까지 마쳐 캐시에 넣음.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._load_through(key, loader))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._load_done(key, t))
+        return await asyncio.shield(task)
+
+    def _load_done(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 대기자가 없어도 'exception was never retrieved' 경고 방지
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        get_or_load 의 동기 버전 (스레드풀 CPU 작업용). 로컬 → 공유 → compute 순.
+        같은 키 동시 미스는 첫 스레드의 계산 완료를 기다려 결과 공유 (실패 시 각자 계산).
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            event = self._sync_inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._sync_inflight[key] = threading.Event()
+        if not leader:
+            event.wait()
+            self._stats["coalesced"] += 1
+            value = self._lookup(key, _MISSING, count_hit=False)
+            return value if value is not _MISSING else compute()
+
+        try:
+            if self.shared is not None:
+                try:
+                    value = self.shared.get(key)
+                except sqlite3.Error as e:
+                    logger.warning(f"[cache:{self.name}] shared get failed: {e}")
+                if value is not _MISSING:
+                    self._stats["shared_hits"] += 1
+                    self.set(key, value)
+                    return value
+
+            self._stats["misses"] += 1
+            self._stats["loads"] += 1
+            value = compute()
+            self.set(key, value)
+            if self.shared is not None:
+                try:
+                    self.shared.set(key, value, self.ttl)
+                except (sqlite3.Error, TypeError, ValueError) as e:
+                    logger.warning(f"[cache:{self.name}] shared set failed: {e}")
+            return value
+        finally:
+            with self._lock:
+                self._sync_inflight.pop(key, None)
+            event.set()
+
+    async def _load_through(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.shared is not None:
+            try:
+                value = await asyncio.to_thread(self.shared.get, key)
+            except sqlite3.Error as e:
+                logger.warning(f"[cache:{self.name}] shared get failed: {e}")
+                value = _MISSING
+            if value is not _MISSING:
+                self._stats["shared_hits"] += 1
+                self.set(key, value)
+                return value
+
+        self._stats["misses"] += 1
+        self._stats["loads"] += 1
+        value = await loader()
+        self.set(key, value)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, value, self.ttl)
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logger.warning(f"[cache:{self.name}] shared set failed: {e}")
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = len(self._data), self._bytes
+        stats = dict(self._stats)
+        lookups = stats["hits"] + stats["shared_hits"] + stats["misses"] + stats["coalesced"]
+        return {
+            **stats,
+            "hit_rate": round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_sec": self.ttl,
+            "shared": self.shared.path if self.shared is not None else None,
+        }
+
+    def shared_usage(self) -> Optional[dict]:
+        """공유 계층 사용량 (없으면 None). 파일 집계라 /cache-stats 처럼 드문 조회에서만."""
+        if self.shared is None:
+            return None
+        try:
+            entries, size = self.shared.usage()
+        except sqlite3.Error as e:
+            return {"error": str(e)[:200]}
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.shared.max_entries,
+            "max_bytes": self.shared.max_bytes,
+        }
+
+
+# ── 이름별 레지스트리 ────────────────────────────────────────────────────────
+_caches: dict[str, LRUTTLCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(
+    name: str,
+    *,
+    ttl: float,
+    max_entries: int = 1024,
+    max_bytes: int = 0,
+    shared_path: str = "",
+    shared_max_entries: int = 0,
+    shared_max_bytes: int = 0,
+) -> LRUTTLCache:
+    """
+    이름별 캐시 싱글톤. shared_path 가 주어지면 SQLite 공유 계층 사용 (열기 실패 시 로컬만).
+    shared_max_entries / shared_max_bytes: 공유 계층 상한 (0 = 없음).
+    """
+    with _registry_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            shared = None
+            if shared_path:
+                try:
+                    shared = SQLiteCacheBackend(
+                        shared_path, namespace=name, max_entries=shared_max_entries, max_bytes=shared_max_bytes
+                    )
+                    shared.purge_expired()
+                except sqlite3.Error as e:
+                    logger.warning(f"[cache:{name}] shared backend unavailable ({shared_path}): {e}")
+            cache = LRUTTLCache(name, ttl=ttl, max_entries=max_entries, max_bytes=max_bytes, shared=shared)
+            _caches[name] = cache
+        return cache
+
+
+def cache_stats() -> dict:
+    """등록된 모든 캐시의 적중/미스 카운터 + 공유 계층 사용량."""
+    with _registry_lock:
+        caches = list(_caches.values())
+    return {c.name: {**c.stats(), "shared_usage": c.shared_usage()} for c in caches}
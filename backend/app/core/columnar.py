@@ -0,0 +1,132 @@
+"""
+그래프 컬럼형 바이너리 전송 포맷 (Accept: application/vnd.graphiq.columnar).
+
+JSON 은 엣지마다 "type"/"label", 노드마다 "sub" 문자열이 반복됨. 같은 데이터를 열 단위 typed array 로 전송:
+브라우저는 ArrayBuffer 위에 Int32Array/Float32Array 를 복사 없이 올려 읽음 (graph.js decodeColumnarGraph).
+
+레이아웃 (모든 정수 little-endian):
+
+    0      4B   매직 b"GQC1"
+    4      4B   uint32 헤더 길이 H
+    8      H B  UTF-8 JSON 헤더
+    …           0 패딩 (8바이트 정렬)
+    열 본문      헤더 columns 순서, 각 열 시작 오프셋은 8의 배수 (버퍼 시작 기준 절대 오프셋)
+
+헤더: {"version": 1, "n_nodes": N, "n_edges": M, "types": [...], "columns": [{name, dtype, offset, length}], "meta": {...}}
+
+열:
+- node_id             float64[N]   Neo4j internal id (2^53 까지 정확)
+- node_type           uint8[N]     types 사전 인덱스 (0 = "" : 엣지에만 등장한 노드)
+- node_active         uint8[N]     회사 isActive (그 외 1)
+- node_label_offsets  uint32[N+1]  node_label_data 내 UTF-8 구간
+- node_label_data     uint8[*]
+- edge_from, edge_to  int32[M]     노드 테이블 인덱스
+- edge_ratio          float32[M]   지분율(%) (JSON 응답과 같은 값)
+- edge_count          int32[M]     (from,to) 쌍 관계 수
+- layout_x, layout_y  float32[N]   (선택) 0~1 정규화 좌표, 없는 노드는 NaN
+
+"sub"·엣지 label 같은 파생 문자열은 보내지 않음 (클라이언트가 type / ratio 로 생성).
+"""
+import json
+import struct
+from typing import Any, Optional
+
+import numpy as np
+
+MEDIA_TYPE = "application/vnd.graphiq.columnar"
+MAGIC = b"GQC1"
+NODE_TYPES = ["", "company", "person", "major", "institution"]
+
+_ALIGN = 8
+
+
+def accepts_columnar(accept: Optional[str]) -> bool:
+    """Accept 헤더가 컬럼형 포맷을 요청하는지."""
+    return bool(accept) and MEDIA_TYPE in accept
+
+
+def _node_num(node_id: str) -> int:
+    return int(node_id.lstrip("n"))
+
+
+def encode_graph(
+    nodes: list[dict],
+    edges: list[dict],
+    *,
+    meta: Optional[dict[str, Any]] = None,
+    positions: Optional[dict[str, dict]] = None,
+) -> bytes:
+    """시각화용 노드/엣지 딕셔너리 (JSON 응답과 같은 모양) → 컬럼형 바이너리."""
+    index: dict[str, int] = {}
+    node_rows: list[dict] = []
+    for n in nodes:
+        if n["id"] not in index:
+            index[n["id"]] = len(node_rows)
+            node_rows.append(n)
+    for e in edges:
+        for end in (e["from"], e["to"]):
+            if end not in index:
+                index[end] = len(node_rows)
+                node_rows.append({"id": end})
+
+    type_index = {t: i for i, t in enumerate(NODE_TYPES)}
+    labels = [(n.get("label") or "").encode("utf-8") for n in node_rows]
+    label_offsets = np.zeros(len(labels) + 1, dtype=np.uint32)
+    np.cumsum([len(b) for b in labels], out=label_offsets[1:])
+
+    columns: list[tuple[str, np.ndarray]] = [
+        ("node_id", np.array([_node_num(n["id"]) for n in node_rows], dtype=np.float64)),
+        ("node_type", np.array([type_index.get(n.get("type", ""), 0) for n in node_rows], dtype=np.uint8)),
+        ("node_active", np.array([0 if n.get("active") is False else 1 for n in node_rows], dtype=np.uint8)),
+        ("node_label_offsets", label_offsets),
+        ("node_label_data", np.frombuffer(b"".join(labels), dtype=np.uint8)),
+        ("edge_from", np.array([index[e["from"]] for e in edges], dtype=np.int32)),
+        ("edge_to", np.array([index[e["to"]] for e in edges], dtype=np.int32)),
+        ("edge_ratio", np.array([e.get("ratio") or 0.0 for e in edges], dtype=np.float32)),
+        ("edge_count", np.array([e.get("count") or 1 for e in edges], dtype=np.int32)),
+    ]
+    if positions is not None:
+        xy = np.full((len(node_rows), 2), np.nan, dtype=np.float32)
+        for nid, p in positions.items():
+            i = index.get(nid)
+            if i is not None:
+                xy[i] = (p["x"], p["y"])
+        columns += [("layout_x", np.ascontiguousarray(xy[:, 0])), ("layout_y", np.ascontiguousarray(xy[:, 1]))]
+
+    # 헤더 길이가 열 오프셋에 영향 → 길이가 늘지 않을 때까지 반복 (짧아지면 공백 패딩, JSON 허용)
+    header_len = 0
+    while True:
+        body_start = _aligned(8 + header_len)
+        specs, pos = [], body_start
+        for name, arr in columns:
+            pos = _aligned(pos)
+            specs.append({"name": name, "dtype": arr.dtype.name, "offset": pos, "length": int(arr.shape[0])})
+            pos += arr.nbytes
+        header = json.dumps(
+            {
+                "version": 1,
+                "n_nodes": len(node_rows),
+                "n_edges": len(edges),
+                "types": NODE_TYPES,
+                "columns": specs,
+                "meta": meta or {},
+            },
+            ensure_ascii=False,
+            default=str,
+        ).encode("utf-8")
+        if len(header) <= header_len:
+            header = header.ljust(header_len, b" ")
+            break
+        header_len = len(header)
+
+    out = bytearray(pos)
+    out[0:4] = MAGIC
+    out[4:8] = struct.pack("<I", header_len)
+    out[8:8 + header_len] = header
+    for spec, (_, arr) in zip(specs, columns):
+        out[spec["offset"]:spec["offset"] + arr.nbytes] = arr.astype(arr.dtype.newbyteorder("<")).tobytes()
+    return bytes(out)
+
+
+def _aligned(pos: int) -> int:
+    return (pos + _ALIGN - 1) // _ALIGN * _ALIGN
@@ -13,6 +13,14 @@ class Settings(BaseSettings):
     NEO4J_URI: str = ""
     NEO4J_USER: str = "neo4j"
     NEO4J_PASSWORD: str = ""
+    # 비동기 드라이버 (그래프 조회 엔드포인트)
+    NEO4J_MAX_POOL_SIZE: int = 50  # 커넥션 풀 최대 크기
+    NEO4J_FETCH_SIZE: int = 1000  # 레코드 배치 수신 크기
+    NEO4J_ACQUIRE_TIMEOUT: float = 30.0  # 풀에서 커넥션 획득 대기(초)
+    # 연결 관리자 (백그라운드 라이브니스 프로브 + 서킷 브레이커)
+    NEO4J_PROBE_INTERVAL_SEC: float = 15.0
+    NEO4J_BREAKER_FAILURES: int = 3  # 연속 실패 N회 → OPEN
+    NEO4J_BREAKER_RESET_SEC: float = 30.0  # OPEN 유지 후 HALF_OPEN 시험
 
     # OpenAI
     OPENAI_API_KEY: str = ""
@@ -22,6 +30,64 @@ class Settings(BaseSettings):
     EMBED_MODEL: str = "text-embedding-3-small"
     EMBED_DIM: int = 1536
 
+    # 대화 이력 (세션별: X-Session-Id 헤더 또는 graphiq_session 쿠키)
+    CHAT_HISTORY_MAX_TURNS: int = 6  # 세션당 보관 턴 (질문+답변 = 1턴)
+    CHAT_HISTORY_MAX_SESSIONS: int = 10000  # 초과 시 가장 오래 안 쓴 세션부터 제거
+    CHAT_HISTORY_TTL_SEC: float = 2 * 3600.0  # 마지막 사용 후 이 시간 지나면 만료
+    CHAT_HISTORY_PATH: str = ""  # 예: /var/lib/graphiq/chat_history.sqlite — 설정 시 SQLite (워커·재시작 간 공유)
+
+    # 질문 → Cypher 의미 캐시 (임베딩 유사도 + 힌트·숫자 일치 시 LLM Cypher 생성 생략)
+    CYPHER_CACHE_ENABLED: bool = True
+    CYPHER_CACHE_MAX_ENTRIES: int = 512  # 초과 시 가장 오래 안 쓴 항목부터 제거
+    CYPHER_CACHE_THRESHOLD: float = 0.95  # 코사인 유사도 하한 (높을수록 보수적)
+
+    # 캐시 (노드 상세 등 응답 캐시)
+    NODE_DETAIL_CACHE_TTL_SEC: float = 60.0
+    NODE_DETAIL_CACHE_MAX_ENTRIES: int = 2048
+    NODE_DETAIL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # 추정 JSON 바이트 상한
+    CACHE_SHARED_PATH: str = ""  # 예: /tmp/graphiq_cache.sqlite — 설정 시 워커 간 공유 (비우면 프로세스 로컬만)
+    CACHE_SHARED_MAX_ENTRIES: int = 20000  # 공유 파일의 캐시(네임스페이스)별 상한, 초과 시 오래 전에 쓴 항목부터 제거
+    CACHE_SHARED_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # 통계 스냅샷 (/stats, /health, /graph/node-counts)
+    STATS_REFRESH_SEC: float = 300.0
+
+    # 인메모리 CSR 지분 그래프 엔진 (/graph/edges, /ego, 노드 상세)
+    OWNERSHIP_ENGINE_ENABLED: bool = True
+    OWNERSHIP_SNAPSHOT_DIR: str = ""  # 예: /var/lib/graphiq/engine — 설정 시 mmap 스냅샷 저장·워커 간 공유
+    OWNERSHIP_SNAPSHOT_POLL_SEC: float = 5.0  # 다른 워커의 재빌드(CURRENT 변경) 확인 주기 (다중 워커는 스냅샷 디렉터리 필수)
+    ANALYSIS_CACHE_TTL_SEC: float = 3600.0  # 분석 결과 캐시 (키에 스냅샷 version 포함 → 재빌드 시 자연 무효화)
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    CYCLE_MAX_LENGTH: int = 4  # 순환 출자 열거 최대 길이 (SCC 는 전체 계산)
+    CYCLE_MAX_COUNT: int = 10000
+    COMMUNITY_RESOLUTION: float = 1.0  # Louvain 해상도 (클수록 작은 커뮤니티 다수)
+
+    # 레이아웃 캐시 (콘텐츠 주소: 단순 그래프 + 엔진/옵션 해시)
+    LAYOUT_CACHE_TTL_SEC: float = 7 * 24 * 3600.0  # 결정론적 결과 → 길게
+    LAYOUT_CACHE_MAX_ENTRIES: int = 256
+    LAYOUT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LAYOUT_CACHE_PATH: str = ""  # 예: /var/lib/graphiq/layout_cache.sqlite — 설정 시 디스크 계층 (재시작·워커 간 유지)
+    LAYOUT_CACHE_DISK_MAX_ENTRIES: int = 4096  # 디스크 계층 상한 (메모리 계층보다 크게)
+    LAYOUT_CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024
+    # 레이아웃 프로세스 풀 (0 = 풀 없이 요청 스레드에서 계산)
+    LAYOUT_POOL_WORKERS: int = 2
+    LAYOUT_POOL_MAX_PENDING: int = 8  # 동시 레이아웃 작업 상한 (실행 중 + 대기), 초과 시 503
+    LAYOUT_POOL_RETRY_AFTER_SEC: int = 2
+    LAYOUT_AUTO_BUDGET_SEC: float = 5.0  # engine=auto 요청당 시간 예산 (큰 요소의 fa2 반복 수를 여기에 맞춤)
+    # 점진 레이아웃 작업 (POST /graph/layout/jobs → SSE 로 정제 좌표 전송)
+    LAYOUT_JOB_BUDGET_SEC: float = 10.0  # 정제 시간 예산, 초과 시 그 시점 좌표로 완료 (truncated)
+    LAYOUT_JOB_PROGRESS_SEC: float = 0.25  # 중간 좌표 전송 간격
+    LAYOUT_JOB_TTL_SEC: float = 600.0  # 끝난 작업 보관 (상태·최종 좌표 재조회용)
+    # 전역 레이아웃 (엔진 로드 후 전체 지분 그래프 1회 배치 + 격자 인덱스, GET /graph/viewport)
+    GLOBAL_LAYOUT_ENABLED: bool = True
+    GLOBAL_LAYOUT_PATH: str = ""  # 예: /var/lib/graphiq/global_layout.npz — 설정 시 워커·재시작 간 공유
+    GLOBAL_LAYOUT_ITERATIONS: int = 100
+    GLOBAL_LAYOUT_CELL_NODES: int = 8  # 격자 셀당 표시 노드 상한 (줌아웃 시 중요도 상위만)
+
+    # 그래프 응답 ETag (데이터 버전) + 압축
+    DATA_VERSION_PATH: str = ""  # 예: /var/lib/graphiq/data_version — 설정 시 워커 간 버전 토큰 공유
+    HTTP_COMPRESS_MIN_BYTES: int = 1024
+
     # 앱
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
@@ -0,0 +1,143 @@
+"""
+그래프 조회 응답 HTTP 캐시 검증자(ETag) + 압축 미들웨어.
+
+- ETag: "<데이터 버전>-<경로·정렬된 쿼리·표현(Accept/Content-Encoding) 해시>" (강한 검증자).
+  If-None-Match 일치 시 엔드포인트를 실행하지 않고 304 — 재방문 시 서버 계산·전송 모두 생략.
+  Cache-Control: no-cache → 브라우저는 매번 재검증 (데이터 버전이 바뀌면 즉시 새 응답).
+  경로별 추가 검증자(path_validators, 예: 통계 스냅샷 버전)는 데이터 버전 뒤에 붙임.
+  준비 전이라 일부 필드가 빠진 응답(X-Graph-Partial 헤더)은 ETag 없이 내보냄 → 불완전 본문이 304 로 고정되지 않음.
+- 압축: Accept-Encoding 협상 (br: brotli 패키지 설치 시, 그 외 gzip), HTTP_COMPRESS_MIN_BYTES 이상 본문만.
+  스트리밍 응답(NDJSON, SSE)은 그대로 통과.
+"""
+import gzip
+import hashlib
+import logging
+import re
+from typing import Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.columnar import accepts_columnar
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+GRAPH_PREFIX = "/api/v1/graph/"
+# 데이터 버전에만 의존하는 조회 (레이아웃 POST·엔진 상태 등은 제외)
+ETAG_PATH_RE = re.compile(r"^/api/v1/graph/(nodes|nodes/[^/]+|edges|ego|node-counts|bootstrap|viewport|clusters|clusters/[^/]+)$")
+STREAMING_TYPES = ("application/x-ndjson", "text/event-stream")
+# 엔드포인트 → 미들웨어 신호 (클라이언트에는 전달하지 않음)
+PARTIAL_HEADER = "X-Graph-Partial"
+VARY = "Accept, Accept-Encoding"
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding → "br" / "gzip" / None (q=0 은 거부로 처리)."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip().lower())
+    if HAS_BROTLI and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compute_etag(version: str, request: Request, encoding: Optional[str]) -> str:
+    """데이터 버전 + 경로 + 정렬된 쿼리 + 표현 → 강한 ETag."""
+    query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    representation = "columnar" if accepts_columnar(request.headers.get("accept")) else "json"
+    digest = hashlib.sha1(f"{request.url.path}?{query}|{representation}".encode("utf-8")).hexdigest()[:16]
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{version}-{digest}{suffix}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # 304 판정은 약한 비교 (W/ 접두어 무시)
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class GraphHTTPCacheMiddleware(BaseHTTPMiddleware):
+    """
+    /api/v1/graph/* GET 응답에 ETag·304·압축 적용. version_getter: 현재 데이터 버전 토큰.
+    path_validators: {경로 정규식: 추가 검증자 토큰} — 데이터 버전 외에도 본문이 바뀌는 경로용.
+    """
+
+    def __init__(
+        self,
+        app,
+        version_getter: Callable[[], str],
+        min_compress_bytes: int = 1024,
+        path_validators: Optional[dict[str, Callable[[], str]]] = None,
+    ):
+        super().__init__(app)
+        self.version_getter = version_getter
+        self.min_compress_bytes = min_compress_bytes
+        self.path_validators = [(re.compile(p), fn) for p, fn in (path_validators or {}).items()]
+
+    def _validator(self, path: str) -> str:
+        version = self.version_getter()
+        extra = [fn() for pattern, fn in self.path_validators if pattern.match(path)]
+        return ".".join([version, *extra])
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if request.method != "GET" or not path.startswith(GRAPH_PREFIX):
+            return await call_next(request)
+
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        streaming = any(t in (request.headers.get("accept") or "") for t in STREAMING_TYPES)
+        etag = version = None
+        if ETAG_PATH_RE.match(path) and not streaming:
+            version = self._validator(path)
+            etag = compute_etag(version, request, encoding)
+            if _etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(
+                    status_code=304,
+                    headers={"ETag": etag, "Vary": VARY, "Cache-Control": "no-cache"},
+                )
+
+        response = await call_next(request)
+        content_type = response.headers.get("content-type", "")
+        if response.status_code != 200 or content_type.startswith(STREAMING_TYPES):
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = dict(response.headers)
+        headers.pop("content-length", None)
+        partial = headers.pop(PARTIAL_HEADER.lower(), None) is not None
+        headers["vary"] = VARY
+        # 처리 중 버전이 바뀌었으면 응답이 어느 버전인지 보장할 수 없으므로 ETag 생략 (부분 응답도 생략)
+        if etag is not None and not partial and self._validator(path) == version:
+            headers["etag"] = etag
+            headers["cache-control"] = "no-cache"
+        if encoding and len(body) >= self.min_compress_bytes and "content-encoding" not in headers:
+            body = _compress(body, encoding)
+            headers["content-encoding"] = encoding
+        return Response(content=body, status_code=response.status_code, headers=headers)
@@ -25,6 +25,11 @@ CRITICAL_INDEXES: List[Tuple[str, str]] = [
         "stockholder_name_text",
         "CREATE TEXT INDEX stockholder_name_text IF NOT EXISTS FOR (s:Stockholder) ON (s.stockName)",
     ),
+    # 노드 목록 keyset 페이지 (GET /graph/nodes, 주주는 personId 순; 회사 bizno 는 bizno_unique 제약 인덱스)
+    (
+        "stockholder_person_id",
+        "CREATE INDEX stockholder_person_id IF NOT EXISTS FOR (s:Stockholder) ON (s.personId)",
+    ),
     # 범위 검색 인덱스 (지분율 필터링)
     (
         "holds_shares_ratio",
@@ -1,11 +1,29 @@
+import zlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1 import api_router
 from app.core.config import get_settings
+from app.core.http_cache import GraphHTTPCacheMiddleware
 from app.core.neo4j_indexes import init_indexes_on_startup
+from app.services import close_async_driver, get_connection_manager, get_ownership_engine, get_stats_service
+from app.services.data_version import get_data_version
+from app.services.global_layout import get_global_layout
+from app.services.layout_pool import get_layout_pool
+from app.services.ownership_analysis import get_community_index, get_cycle_index
+from app.services.ownership_engine import get_ownership_graph
+
 
+def _graph_validator() -> str:
+    """
+    ETag 기준값: 데이터 버전 + 이 워커의 엔진 스냅샷. 다른 워커의 재빌드를 아직 반영하지 못한 워커는
+    ETag 가 달라 이전 데이터 본문이 새 데이터 버전으로 304 고정되지 않음.
+    """
+    g = get_ownership_graph()
+    engine = f"{zlib.crc32(g.version.encode('utf-8')):08x}" if g is not None else "neo4j"
+    return f"{get_data_version().current()}.{engine}"
 
 
 def _cors_origins_list() -> list[str]:
@@ -28,11 +46,22 @@ def health_check():
 # ---------------------------
 
 api.mount("/static", StaticFiles(directory="static"), name="static")
+# 그래프 조회 ETag/304 + gzip·br 압축 (CORS 보다 안쪽)
+api.add_middleware(
+    GraphHTTPCacheMiddleware,
+    version_getter=_graph_validator,
+    min_compress_bytes=get_settings().HTTP_COMPRESS_MIN_BYTES,
+    # 노드 개수는 통계 스냅샷 갱신(데이터 버전과 별개)으로도 바뀜
+    path_validators={
+        r"^/api/v1/graph/(node-counts|bootstrap)$": lambda: f"s{(get_stats_service().peek() or {}).get('version', 0)}",
+    },
+)
 api.add_middleware(
     CORSMiddleware,
     allow_origins=_cors_origins_list(),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Session-Id"],
 )
 # unversioned (Streamlit 기존 경로 호환)
 api.include_router(api_router)
@@ -42,11 +71,31 @@ api.include_router(api_router, prefix="/api/v1")
 
 @api.on_event("startup")
 async def startup_event():
-    """앱 기동 시 Neo4j 인덱스 자동 생성."""
+    """앱 기동 시 Neo4j 인덱스 자동 생성 + 연결 라이브니스 프로브·통계 스냅샷 갱신·CSR 엔진 로드·레이아웃 풀 기동."""
     try:
+        get_connection_manager().start()
+        get_stats_service().start()
+        get_layout_pool().start()
+        if get_settings().OWNERSHIP_ENGINE_ENABLED:
+            engine = get_ownership_engine()
+            engine.add_listener(get_cycle_index)  # 엔진 로드/재빌드 직후 순환 출자 인덱스 배치 계산
+            engine.add_listener(get_community_index)  # 커뮤니티 분할 (/graph/clusters)
+            if get_settings().GLOBAL_LAYOUT_ENABLED:
+                engine.add_listener(get_global_layout)  # 이어서 전역 레이아웃 + 격자 인덱스 (/graph/viewport)
+            engine.start()
         init_indexes_on_startup()
     except Exception as e:
         # 인덱스 생성 실패해도 앱은 계속 실행 (기능은 동작하나 성능 저하 가능)
         import logging
         logger = logging.getLogger(__name__)
         logger.warning(f"Failed to initialize Neo4j indexes on startup: {e}")
+
+
+@api.on_event("shutdown")
+async def shutdown_event():
+    """앱 종료 시 프로브·통계 갱신·레이아웃 풀 중지 + 비동기 Neo4j 드라이버 커넥션 풀 정리."""
+    get_stats_service().stop()
+    get_ownership_engine().stop()
+    get_layout_pool().stop()
+    get_connection_manager().stop()
+    await close_async_driver()
@@ -12,4 +12,5 @@ class ChatResponse(BaseModel):
     hints: list
     source: str  # DB | DB_EMPTY | LLM
     confidence: str  # HIGH | MEDIUM | LOW
+    cached: bool = False  # Cypher 의미 캐시 적중 (LLM Cypher 생성 생략)
     elapsed: float
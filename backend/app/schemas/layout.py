@@ -1,5 +1,5 @@
 """레이아웃 API 요청/응답 스키마 (협업: 프론트-백엔드 계약)."""
-from typing import Any
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,7 +13,11 @@ class LayoutRequest(BaseModel):
     height: float = Field(1.0, ge=0.1, le=2.0, description="정규화 캔버스 높이")
     padding: float = Field(0.05, ge=0, le=0.2)
     use_components: bool = Field(True, description="연결 요소별 그리드 배치 여부")
-    engine: str = Field("networkx", description="레이아웃 엔진: networkx(기본) 또는 pygraphviz(고품질, Graphviz 필요)")
+    engine: str = Field("networkx", description="레이아웃 엔진: networkx(기본), pygraphviz(고품질, Graphviz 필요), fa2(대형 그래프) 또는 auto(요소별 자동 선택 + 시간 예산)")
+    positions: Optional[dict[str, dict[str, float]]] = Field(
+        None, description='화면에 이미 있는 노드의 현재 좌표 id -> { "x", "y" } (0~1, 증분 레이아웃)'
+    )
+    pin: bool = Field(True, description="True면 positions 노드를 고정하고 새 노드만 배치, False면 전체 재계산")
 
 
 class LayoutResponse(BaseModel):
@@ -21,3 +25,26 @@ class LayoutResponse(BaseModel):
 
     positions: dict[str, dict[str, float]] = Field(..., description='노드 id -> { "x", "y" } (0~1)')
     components: list[list[str]] = Field(default_factory=list, description="연결 요소별 노드 id 리스트")
+
+
+class LayoutJobRequest(BaseModel):
+    """POST /graph/layout/jobs 요청. 정제는 항상 fa2 엔진 (반복 단위 중간 결과가 있는 엔진)."""
+
+    nodes: list[dict[str, Any]] = Field(..., description="노드 목록, 각 항목에 id 필수")
+    edges: list[dict[str, Any]] = Field(..., description="엣지 목록, from, to, ratio 필드")
+    padding: float = Field(0.05, ge=0, le=0.2)
+    use_components: bool = Field(True, description="연결 요소별 그리드 배치 여부")
+
+
+class LayoutJobResponse(BaseModel):
+    """점진 레이아웃 작업 상태. 생성 직후엔 초기 배치, 완료 후엔 최종 좌표."""
+
+    job_id: str
+    status: str = Field(..., description="running | done | failed")
+    seq: int = Field(0, description="마지막 이벤트 번호 (SSE 이벤트와 비교해 중복 제거)")
+    iteration: int = Field(0, description="마지막으로 전송된 요소의 fa2 반복 수")
+    truncated: bool = Field(False, description="시간 예산 초과로 수렴 전에 끝남")
+    elapsed_ms: Optional[float] = None
+    error: Optional[str] = None
+    positions: dict[str, dict[str, float]] = Field(..., description='노드 id -> { "x", "y" } (0~1)')
+    components: list[list[str]] = Field(default_factory=list)
@@ -1,4 +1,17 @@
 from .graph_service import graph_service
 from .layout_service import compute_layout
+from .neo4j_async import get_async_graph, close_async_driver
+from .neo4j_connection import get_connection_manager
+from .ownership_engine import get_ownership_engine, get_ownership_graph
+from .stats_service import get_stats_service
 
-__all__ = ["graph_service", "compute_layout"]
+__all__ = [
+    "graph_service",
+    "compute_layout",
+    "get_async_graph",
+    "close_async_driver",
+    "get_connection_manager",
+    "get_ownership_engine",
+    "get_ownership_graph",
+    "get_stats_service",
+]
@@ -0,0 +1,223 @@
+"""
+세션별 대화 이력 저장소 (POST /chat, /chat/stream, DELETE /chat).
+
+모듈 전역 리스트 하나를 모든 사용자가 공유하면 동시 요청의 메시지가 섞이고 초기화가 전원에게 적용됨 → 세션 키로 분리:
+- 세션 id: X-Session-Id 헤더 또는 graphiq_session 쿠키 (엔드포인트에서 결정, 없으면 새로 발급)
+- 세션당 최근 CHAT_HISTORY_MAX_TURNS 턴만 보관 (질문+답변 = 1턴)
+- 마지막 사용 후 CHAT_HISTORY_TTL_SEC 지나면 만료, 세션 수가 CHAT_HISTORY_MAX_SESSIONS 를 넘으면 LRU 제거
+- 백엔드: 메모리(기본, 프로세스 로컬) 또는 SQLite (CHAT_HISTORY_PATH, 같은 호스트의 워커·재시작 간 공유)
+"""
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Protocol
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+# (질문, 답변)
+Turn = tuple[str, str]
+
+
+class ChatHistoryStore(Protocol):
+    def turns(self, session_id: str) -> list[Turn]: ...
+
+    def append(self, session_id: str, question: str, answer: str) -> None: ...
+
+    def clear(self, session_id: str) -> None: ...
+
+    def status(self) -> dict: ...
+
+
+class MemoryChatHistory:
+    """프로세스 로컬 LRU (OrderedDict: 오래 안 쓴 세션이 앞) + 유휴 TTL. 스레드 안전."""
+
+    def __init__(self, max_turns: int, max_sessions: int, ttl_sec: float):
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        # 세션 id → (마지막 사용 시각, 최근 턴)
+        self._sessions: OrderedDict[str, tuple[float, deque[Turn]]] = OrderedDict()
+        self.evictions = 0
+
+    def turns(self, session_id: str) -> list[Turn]:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            self._sessions[session_id] = (now, entry[1])
+            self._sessions.move_to_end(session_id)
+            return list(entry[1])
+
+    def append(self, session_id: str, question: str, answer: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._purge(now)
+            entry = self._sessions.pop(session_id, None)
+            turns = entry[1] if entry is not None else deque(maxlen=self.max_turns)
+            turns.append((question, answer))
+            self._sessions[session_id] = (now, turns)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _purge(self, now: float) -> None:
+        # 사용 순서대로 정렬되어 있으므로 앞쪽 만료분만 확인
+        cutoff = now - self.ttl_sec
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest[0] >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "backend": "memory",
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "max_turns": self.max_turns,
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteChatHistory:
+    """
+    SQLite 파일 (WAL, 스레드별 연결 — app.core.cache.SQLiteCacheBackend 와 같은 방식).
+    만료·세션 수 상한 정리는 _PURGE_INTERVAL_SEC 마다 쓰기 시점에 한 번 (매 요청 전체 스캔 방지).
+    """
+
+    _PURGE_INTERVAL_SEC = 60.0
+
+    def __init__(self, path: str, max_turns: int, max_sessions: int, ttl_sec: float):
+        self.path = path
+        self.max_turns = max_turns
+        self.max_sessions = max_sessions
+        self.ttl_sec = ttl_sec
+        self._local = threading.local()
+        self._last_purge = 0.0
+        conn = self._conn()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS chat_sessions ("
+            " session TEXT PRIMARY KEY, last_used REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS chat_sessions_last_used ON chat_sessions (last_used);"
+            "CREATE TABLE IF NOT EXISTS chat_turns ("
+            " session TEXT NOT NULL, seq INTEGER NOT NULL, question TEXT NOT NULL, answer TEXT NOT NULL,"
+            " PRIMARY KEY (session, seq));"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def turns(self, session_id: str) -> list[Turn]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT last_used FROM chat_sessions WHERE session = ?", (session_id,)).fetchone()
+        if row is None or row[0] < now - self.ttl_sec:
+            return []
+        rows = conn.execute(
+            "SELECT question, answer FROM chat_turns WHERE session = ? ORDER BY seq", (session_id,)
+        ).fetchall()
+        conn.execute("UPDATE chat_sessions SET last_used = ? WHERE session = ?", (now, session_id))
+        conn.commit()
+        return [(q, a) for q, a in rows]
+
+    def append(self, session_id: str, question: str, answer: str) -> None:
+        now = time.time()
+        conn = self._conn()
+        # 쓰기 락을 먼저 잡음: 기본(지연) 트랜잭션이면 두 워커가 같은 MAX(seq) 를 읽고
+        # 둘 다 쓰기로 올리다 "database is locked" 또는 (session, seq) 충돌
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            row = conn.execute("SELECT last_used FROM chat_sessions WHERE session = ?", (session_id,)).fetchone()
+            if row is not None and row[0] < now - self.ttl_sec:
+                # 만료됐지만 아직 정리 전인 세션: 이전 턴을 이어 쓰지 않음
+                conn.execute("DELETE FROM chat_turns WHERE session = ?", (session_id,))
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM chat_turns WHERE session = ?", (session_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO chat_turns (session, seq, question, answer) VALUES (?, ?, ?, ?)",
+                (session_id, seq, question, answer),
+            )
+            conn.execute("DELETE FROM chat_turns WHERE session = ? AND seq <= ?", (session_id, seq - self.max_turns))
+            conn.execute(
+                "INSERT INTO chat_sessions (session, last_used) VALUES (?, ?)"
+                " ON CONFLICT (session) DO UPDATE SET last_used = excluded.last_used",
+                (session_id, now),
+            )
+        if now - self._last_purge >= self._PURGE_INTERVAL_SEC:
+            self._last_purge = now
+            self._purge(now)
+
+    def clear(self, session_id: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM chat_turns WHERE session = ?", (session_id,))
+            conn.execute("DELETE FROM chat_sessions WHERE session = ?", (session_id,))
+
+    def _purge(self, now: float) -> None:
+        conn = self._conn()
+        try:
+            with conn:
+                conn.execute("DELETE FROM chat_sessions WHERE last_used < ?", (now - self.ttl_sec,))
+                # 세션 수 상한: 가장 오래 안 쓴 세션부터
+                conn.execute(
+                    "DELETE FROM chat_sessions WHERE session IN ("
+                    " SELECT session FROM chat_sessions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_sessions,),
+                )
+                conn.execute("DELETE FROM chat_turns WHERE session NOT IN (SELECT session FROM chat_sessions)")
+        except sqlite3.OperationalError as e:
+            # 다른 워커가 쓰는 중 (락 대기 초과): 다음 주기에 다시
+            logger.warning(f"Chat history purge skipped: {e}")
+
+    def status(self) -> dict:
+        sessions = self._conn().execute("SELECT COUNT(*) FROM chat_sessions").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "sessions": sessions,
+            "max_sessions": self.max_sessions,
+            "max_turns": self.max_turns,
+        }
+
+
+_chat_history: ChatHistoryStore | None = None
+
+
+def get_chat_history() -> ChatHistoryStore:
+    global _chat_history
+    if _chat_history is None:
+        s = get_settings()
+        if s.CHAT_HISTORY_PATH:
+            _chat_history = SQLiteChatHistory(
+                s.CHAT_HISTORY_PATH,
+                max_turns=s.CHAT_HISTORY_MAX_TURNS,
+                max_sessions=s.CHAT_HISTORY_MAX_SESSIONS,
+                ttl_sec=s.CHAT_HISTORY_TTL_SEC,
+            )
+        else:
+            _chat_history = MemoryChatHistory(
+                max_turns=s.CHAT_HISTORY_MAX_TURNS,
+                max_sessions=s.CHAT_HISTORY_MAX_SESSIONS,
+                ttl_sec=s.CHAT_HISTORY_TTL_SEC,
+            )
+    return _chat_history
@@ -0,0 +1,154 @@
+"""
+질문 → 생성 Cypher 의미 캐시 (POST /chat, /chat/stream 의 Cypher 생성 단계 앞).
+
+사이드바 예시 질문처럼 같은(거의 같은) 질문이 반복되면 매번 LLM 왕복으로 Cypher 를 다시 만듦 → 재사용:
+- 조회: 질문 임베딩(유사 회사명 힌트 조회와 같은 벡터)과 보관 항목의 코사인 유사도 ≥ CYPHER_CACHE_THRESHOLD 중 최고.
+  단 유사 회사명 힌트·질문 속 숫자가 같아야 적중 ("삼성" ↔ "현대", "5%" ↔ "10%" 처럼 임베딩은 가깝지만
+  Cypher 리터럴이 달라지는 질문을 걸러냄)
+- 저장: 실행해서 결과 행이 있었던 Cypher 만 (오류·빈 결과 Cypher 는 다음 질문에서 다시 생성).
+  세션에 이전 대화가 있던 질문은 저장하지 않음 (Cypher 가 앞 턴의 지시어 해석에 기댈 수 있음)
+- 상한 CYPHER_CACHE_MAX_ENTRIES, 초과 시 가장 오래 안 쓴 항목부터 제거 (벡터는 미리 잡은 행렬의 슬롯 재사용)
+- 세대(generation) = 데이터 버전 + 프롬프트·스키마·모델 지문. 바뀌면 전체 비움
+- 프로세스 로컬, 카운터는 /cache-stats 의 "cypher"
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.core import get_settings
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def _numbers(question: str) -> tuple[str, ...]:
+    """질문 속 숫자 (순서 유지, 쉼표 제거): 연도·지분율·TOP N 등 Cypher 리터럴이 되는 값."""
+    return tuple(_NUMBER_RE.findall(question.replace(",", "")))
+
+
+@dataclass
+class CypherCacheEntry:
+    question: str
+    hints: tuple[str, ...]
+    numbers: tuple[str, ...]
+    cypher: str
+    hits: int = 0
+
+
+class SemanticCypherCache:
+    """정규화 임베딩 행렬(슬롯) + OrderedDict LRU (오래 안 쓴 슬롯이 앞). 스레드 안전."""
+
+    def __init__(self, max_entries: int, threshold: float, dim: int):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        # 슬롯 → 항목 (사용 순서)
+        self._entries: OrderedDict[int, CypherCacheEntry] = OrderedDict()
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._generation: Optional[str] = None
+        self._stats = {"hits": 0, "misses": 0, "rejected": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    @staticmethod
+    def _normalize(vec: Sequence[float]) -> np.ndarray:
+        v = np.asarray(vec, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def _sync_generation(self, generation: str) -> None:
+        # 락 안에서 호출
+        if generation == self._generation:
+            return
+        if self._entries:
+            self._stats["invalidations"] += 1
+        self._entries.clear()
+        self._free = list(range(self.max_entries - 1, -1, -1))
+        self._generation = generation
+
+    def _nearest(self, v: np.ndarray, hints: tuple[str, ...], numbers: tuple[str, ...]) -> tuple[Optional[int], bool]:
+        """(임계값 이상이면서 힌트·숫자가 같은 최근접 슬롯, 임계값 이상 후보가 있었는지). 락 안에서 호출."""
+        if not self._entries:
+            return None, False
+        slots = np.fromiter(self._entries.keys(), dtype=np.int64, count=len(self._entries))
+        sims = self._vectors[slots] @ v
+        above = np.flatnonzero(sims >= self.threshold)
+        for i in above[np.argsort(-sims[above])]:
+            entry = self._entries[int(slots[i])]
+            if entry.hints == hints and entry.numbers == numbers:
+                return int(slots[i]), True
+        return None, above.size > 0
+
+    def lookup(self, vec: Sequence[float], question: str, hints: Sequence[str], generation: str) -> Optional[str]:
+        """적중하면 저장된 Cypher, 아니면 None."""
+        if self.max_entries <= 0:
+            return None
+        v = self._normalize(vec)
+        with self._lock:
+            self._sync_generation(generation)
+            slot, near = self._nearest(v, tuple(hints), _numbers(question))
+            if slot is None:
+                self._stats["misses"] += 1
+                if near:
+                    self._stats["rejected"] += 1
+                return None
+            entry = self._entries[slot]
+            entry.hits += 1
+            self._entries.move_to_end(slot)
+            self._stats["hits"] += 1
+            return entry.cypher
+
+    def store(self, vec: Sequence[float], question: str, hints: Sequence[str], cypher: str, generation: str) -> None:
+        """검증된(실행 성공·결과 있음) Cypher 저장. 같은 힌트·숫자의 근접 항목이 있으면 교체."""
+        if self.max_entries <= 0 or not cypher:
+            return
+        v = self._normalize(vec)
+        entry = CypherCacheEntry(question=question, hints=tuple(hints), numbers=_numbers(question), cypher=cypher)
+        with self._lock:
+            self._sync_generation(generation)
+            slot, _ = self._nearest(v, entry.hints, entry.numbers)
+            if slot is not None:
+                self._entries.pop(slot)
+            elif self._free:
+                slot = self._free.pop()
+            else:
+                slot, _ = self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            self._vectors[slot] = v
+            self._entries[slot] = entry
+            self._stats["stores"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._free = list(range(self.max_entries - 1, -1, -1))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+        }
+
+
+_cypher_cache: SemanticCypherCache | None = None
+
+
+def get_cypher_cache() -> SemanticCypherCache:
+    global _cypher_cache
+    if _cypher_cache is None:
+        s = get_settings()
+        _cypher_cache = SemanticCypherCache(
+            max_entries=s.CYPHER_CACHE_MAX_ENTRIES if s.CYPHER_CACHE_ENABLED else 0,
+            threshold=s.CYPHER_CACHE_THRESHOLD,
+            dim=s.EMBED_DIM,
+        )
+    return _cypher_cache
@@ -0,0 +1,72 @@
+"""
+그래프 데이터 버전 토큰 (ETag 기준값).
+
+그래프 데이터는 재적재 시에만 바뀜 → 버전 토큰이 같으면 같은 요청의 응답도 같다고 간주.
+- 갱신: 엔진 재빌드(데이터 재적재 후 POST /graph/engine/reload) 또는 수동 POST /graph/data-version/bump
+- DATA_VERSION_PATH 설정 시 파일에 저장 → 같은 호스트의 워커가 같은 토큰 공유 (mtime 변경 시 재읽기)
+- 미설정 시 프로세스 로컬 토큰 (워커마다 달라 304 적중률만 낮아지고 정확성은 유지)
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def _new_token() -> str:
+    return f"{int(time.time()):x}{uuid.uuid4().hex[:8]}"
+
+
+class DataVersion:
+    def __init__(self, path: str = ""):
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._mtime: Optional[float] = None
+
+    def current(self) -> str:
+        """현재 토큰. 파일 모드면 mtime 이 바뀐 경우에만 다시 읽음 (요청당 stat 1회)."""
+        if self.path is None:
+            if self._token is None:
+                with self._lock:
+                    self._token = self._token or _new_token()
+            return self._token
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return self.bump("init")
+        if mtime != self._mtime:
+            with self._lock:
+                self._token = self.path.read_text().strip() or self._token
+                self._mtime = mtime
+        return self._token
+
+    def bump(self, reason: str = "manual") -> str:
+        """새 토큰 발급 (파일 모드면 원자적 교체로 다른 워커에도 전파)."""
+        token = _new_token()
+        with self._lock:
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                tmp.write_text(token)
+                os.replace(tmp, self.path)
+                self._mtime = self.path.stat().st_mtime
+            self._token = token
+        logger.info(f"Data version bumped to {token} ({reason})")
+        return token
+
+
+_data_version: DataVersion | None = None
+
+
+def get_data_version() -> DataVersion:
+    global _data_version
+    if _data_version is None:
+        _data_version = DataVersion(path=get_settings().DATA_VERSION_PATH)
+    return _data_version
@@ -0,0 +1,314 @@
+"""
+ForceAtlas2 레이아웃 (NumPy 벡터화 + Barnes-Hut 근사).
+
+Kamada-Kawai 는 전 쌍 최단거리 행렬(O(n²) 메모리·시간) → 수백 노드 이상에서 수 초.
+여기서는 Pivot MDS 초기 배치 + 반복당 O(n log n) 힘 계산으로 수천~1만 노드도 수십 반복이면 수렴.
+
+힘 (ForceAtlas2, Jacomy et al. 2014):
+- 척력: kr · m_i · m_j / d  (m = 차수 + 1, 허브끼리 더 강하게 밀어냄)
+- 인력: w · d               (w = ratio/100 → 평형 거리 ∝ 1/√ratio, /layout 의 거리 규칙과 동일)
+- 중력: kg · m_i            (원점 방향, 떨어진 요소 표류 방지)
+- 속도: 전역 swing/traction 적응 속도 + 노드별 swing 감쇠 (진동 억제)
+
+초기 배치 (무작위 시작은 수백 반복 필요):
+- Pivot MDS (Brandes & Pich 2006): max-min 으로 고른 피벗까지 BFS 거리 → 이중 중심화 → 상위 2 특이벡터
+- 배율은 평형 조건(virial: 인력 s²A + 중력 sG = 척력 R, 척력 항은 배율 무관)에서 s 를 풀어 맞춤
+  → FA2 의 자연 크기에서 시작, 남은 반복은 국소 정리만 담당
+
+Barnes-Hut (균일 격자 계층, 점유 셀만 압축 저장, 루프는 레벨·오프셋 단위):
+- 경계 상자를 2^L × 2^L 격자로 나누고, 레벨별 점유 셀 질량·무게중심은 np.bincount 로 집계
+- 각 레벨에서 "부모 이웃의 자식 중 자기 이웃이 아닌 셀"(최대 27개)만 셀 단위 근사
+  → 셀 크기/거리 ≤ 1 (θ ≈ 1), 모든 원거리 쌍이 정확히 한 레벨에서 한 번 계산
+- 셀 무게중심에서 장(field)과 야코비안을 계산해 자식 셀로 1차 전개 (FMM 방식), 최하위에서 노드 위치로 보간
+- 최하위 레벨 인접 3×3 셀 안의 노드 쌍은 정확히 계산. 노드가 몰리면 L 을 늘려 쌍 수 상한 유지
+
+결정론적: 피벗 시작점·지터는 seed 고정 난수, 노드 순서는 호출자(정렬된 id) 기준.
+"""
+from typing import Iterator
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+# 최하위 격자 셀당 평균 노드 수 목표, 근거리 쌍 수 상한 (노드당)
+_LEAF_OCCUPANCY = 4
+_NEAR_PAIRS_PER_NODE = 8
+_MAX_LEVEL = 12
+_MIN_WEIGHT = 0.01
+_PIVOTS = 50
+_JITTER = 0.01
+
+
+def forceatlas2(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray,
+    *,
+    seed: int,
+    iterations: int = 50,
+    scaling: float = 2.0,
+    gravity: float = 1.0,
+    tolerance: float = 1.0,
+) -> np.ndarray:
+    """
+    노드 0..n-1, 무방향 엣지 (src[k], dst[k], weight[k]) → 좌표 (n, 2).
+
+    weight 는 0~1 (호출자가 ratio/100 으로 변환), _MIN_WEIGHT 미만은 올림.
+    """
+    for _, pos in forceatlas2_steps(
+        n, src, dst, weight,
+        seed=seed, iterations=iterations, scaling=scaling, gravity=gravity, tolerance=tolerance,
+    ):
+        pass
+    return pos
+
+
+def forceatlas2_steps(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weight: np.ndarray,
+    *,
+    seed: int,
+    iterations: int = 50,
+    scaling: float = 2.0,
+    gravity: float = 1.0,
+    tolerance: float = 1.0,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    forceatlas2 의 반복 단위 생성기: (0, 초기 배치) 후 매 반복 (i, 좌표).
+    점진 레이아웃(중간 결과 전송·시간 예산 중단)용. 좌표 배열은 제자리 갱신되므로 보관 시 복사.
+    """
+    if n < 2:
+        yield 0, np.zeros((n, 2))
+        return
+    rng = np.random.default_rng(seed)
+    src = np.asarray(src, dtype=np.intp)
+    dst = np.asarray(dst, dtype=np.intp)
+    w = np.maximum(np.asarray(weight, dtype=np.float64), _MIN_WEIGHT)
+    mass = np.bincount(src, minlength=n) + np.bincount(dst, minlength=n) + 1.0
+
+    pos = _initial_positions(n, src, dst, w, mass, rng, scaling, gravity)
+    yield 0, pos
+    prev = np.zeros((n, 2))
+    speed, speed_efficiency = 1.0, 1.0
+    for it in range(1, iterations + 1):
+        force = scaling * mass[:, None] * _repulsion_field(pos, mass)
+
+        pull = w[:, None] * (pos[src] - pos[dst])
+        for axis in range(2):
+            force[:, axis] -= np.bincount(src, weights=pull[:, axis], minlength=n)
+            force[:, axis] += np.bincount(dst, weights=pull[:, axis], minlength=n)
+
+        dist = np.hypot(pos[:, 0], pos[:, 1])
+        force -= (gravity * mass / np.maximum(dist, 1e-9))[:, None] * pos
+
+        speed, speed_efficiency, node_speed = _adapt_speed(
+            force, prev, mass, speed, speed_efficiency, tolerance
+        )
+        pos += force * node_speed[:, None]
+        prev = force
+        yield it, pos
+
+
+def _initial_positions(n, src, dst, w, mass, rng, scaling, gravity) -> np.ndarray:
+    """Pivot MDS 배치를 평형 배율로 맞추고 작은 지터 추가 (구조적으로 같은 노드가 겹치지 않게)."""
+    pos = _pivot_mds(n, src, dst, rng)
+    pos -= pos.mean(axis=0)
+    spread = float(np.abs(pos).max()) or 1.0
+    pos += rng.normal(scale=_JITTER * spread, size=pos.shape)
+
+    d = pos[src] - pos[dst]
+    attraction = float((w * (d * d).sum(axis=1)).sum())
+    pull_to_center = float(gravity * (mass * np.hypot(pos[:, 0], pos[:, 1])).sum())
+    repulsion = scaling * (mass.sum() ** 2 - (mass * mass).sum()) / 2.0
+    if attraction > 0:
+        s = (-pull_to_center + np.sqrt(pull_to_center ** 2 + 4.0 * attraction * repulsion)) / (2.0 * attraction)
+    else:
+        s = repulsion / max(pull_to_center, 1e-9)
+    return pos * s
+
+
+def _pivot_mds(n: int, src: np.ndarray, dst: np.ndarray, rng) -> np.ndarray:
+    """Pivot MDS: k 개 피벗까지의 홉 거리 행렬 (n × k) 로 고전 MDS 근사. 비연결 쌍은 최대 거리 + 1."""
+    adj = sparse.csr_matrix((np.ones(len(src)), (src, dst)), shape=(n, n))
+    adj = adj + adj.T
+    k = min(_PIVOTS, n)
+    dist = np.empty((n, k))
+    nearest = np.full(n, np.inf)
+    pivot = int(rng.integers(n))
+    for t in range(k):
+        d = csgraph.shortest_path(adj, unweighted=True, indices=pivot)
+        finite = np.isfinite(d)
+        d[~finite] = d[finite].max() + 1.0
+        dist[:, t] = d
+        np.minimum(nearest, d, out=nearest)
+        pivot = int(np.argmax(nearest))
+    c = dist * dist
+    c -= c.mean(axis=0)
+    c -= c.mean(axis=1)[:, None]
+    c *= -0.5
+    u, s, _ = np.linalg.svd(c, full_matrices=False)
+    return u[:, :2] * s[:2]
+
+
+def _adapt_speed(force, prev, mass, speed, speed_efficiency, tolerance):
+    """ForceAtlas2 적응 속도: 전역 swing/traction 비율로 속도 조절, 노드별 swing 으로 감쇠."""
+    swing = mass * np.hypot(*(force - prev).T)
+    traction = mass * np.hypot(*(force + prev).T) / 2.0
+    total_swing, total_traction = swing.sum(), traction.sum()
+    n = force.shape[0]
+
+    estimated_jitter = 0.05 * np.sqrt(n)
+    min_jitter = np.sqrt(estimated_jitter)
+    jitter = tolerance * max(min_jitter, min(estimated_jitter, total_traction / (n * n)))
+    min_efficiency = 0.05
+    if total_traction > 0 and total_swing / total_traction > 2.0:
+        if speed_efficiency > min_efficiency:
+            speed_efficiency *= 0.5
+        jitter = max(jitter, tolerance)
+    if total_swing == 0:
+        target = float("inf")
+    else:
+        target = jitter * speed_efficiency * total_traction / total_swing
+    if total_swing > jitter * total_traction:
+        if speed_efficiency > min_efficiency:
+            speed_efficiency *= 0.7
+    elif speed < 1000:
+        speed_efficiency *= 1.3
+    speed = speed + min(target - speed, 0.5 * speed)
+
+    node_speed = speed / (1.0 + np.sqrt(speed * swing))
+    # 한 번에 10 이상 이동 금지 (FA2 원 구현과 동일)
+    magnitude = np.hypot(force[:, 0], force[:, 1])
+    node_speed = np.minimum(node_speed, 10.0 / np.maximum(magnitude, 1e-9))
+    return speed, speed_efficiency, node_speed
+
+
+def _repulsion_field(pos: np.ndarray, mass: np.ndarray) -> np.ndarray:
+    """노드별 척력 장 Σ_j m_j (x_i − x_j) / d² (Barnes-Hut 근사). 노드 질량·kr 은 호출자가 곱함."""
+    n = len(pos)
+    lo = pos.min(axis=0)
+    extent = float((pos.max(axis=0) - lo).max()) or 1.0
+    unit = (pos - lo) / extent
+
+    # 최하위 레벨: 평균 점유 목표에서 시작, 한 셀에 몰려 근거리 쌍이 상한을 넘으면 한 단계씩 세분
+    levels = int(np.clip(np.ceil(np.log(max(n / _LEAF_OCCUPANCY, 1.0)) / np.log(4.0)), 2, _MAX_LEVEL))
+    while True:
+        size = 1 << levels
+        leaf = np.minimum((unit * size).astype(np.int64), size - 1)
+        key = leaf[:, 0] * size + leaf[:, 1]
+        _, counts = np.unique(key, return_counts=True)
+        if levels >= _MAX_LEVEL or int((counts * counts).sum()) <= _NEAR_PAIRS_PER_NODE * n:
+            break
+        levels += 1
+
+    # 레벨별 점유 셀의 장 F 와 야코비안 J (xx, xy, yy) 를 무게중심에서 계산, 자식 셀로 전개
+    parent = None
+    for level in range(2, levels + 1):
+        g = 1 << level
+        shift = levels - level
+        cells, inverse = np.unique((leaf[:, 0] >> shift) * g + (leaf[:, 1] >> shift), return_inverse=True)
+        cell_mass = np.bincount(inverse, weights=mass)
+        com = np.stack(
+            [np.bincount(inverse, weights=mass * pos[:, axis]) for axis in range(2)], axis=1
+        ) / cell_mass[:, None]
+
+        f, j = _far_field(cells, com, cell_mass, g)
+        if parent is not None:
+            # 부모 국소 전개를 자식 무게중심으로 평행 이동: F + J·Δ, J 그대로
+            parent_cells, parent_com, parent_f, parent_j = parent
+            p = np.searchsorted(parent_cells, ((cells // g) >> 1) * (g >> 1) + ((cells % g) >> 1))
+            f += _apply_jacobian(parent_f[p], parent_j[p], com - parent_com[p])
+            j += parent_j[p]
+        parent = (cells, com, f, j)
+
+    field = _apply_jacobian(f[inverse], j[inverse], pos - com[inverse])
+    field += _near_field(pos, mass, cells, inverse, size)
+    return field
+
+
+def _apply_jacobian(f: np.ndarray, j: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    return np.stack(
+        (f[:, 0] + j[:, 0] * delta[:, 0] + j[:, 1] * delta[:, 1],
+         f[:, 1] + j[:, 1] * delta[:, 0] + j[:, 2] * delta[:, 1]),
+        axis=1,
+    )
+
+
+def _lookup(cells: np.ndarray, keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """정렬된 점유 셀 키에서 keys 위치 (found 마스크, 인덱스)."""
+    idx = np.minimum(np.searchsorted(cells, keys), len(cells) - 1)
+    return cells[idx] == keys, idx
+
+
+# 부모 이웃(3×3)의 자식 6×6 중 자신 이웃(3×3)이 아닌 셀: 자기 셀 좌표의 짝홀에 따라 27개
+_OFFSET_X, _OFFSET_Y = (a.ravel() for a in np.meshgrid(np.arange(-2, 4), np.arange(-2, 4), indexing="ij"))
+
+
+def _far_field(cells, com, cell_mass, g) -> tuple[np.ndarray, np.ndarray]:
+    """점유 셀 무게중심에서 상호작용 목록 셀들로부터 받는 장 F 와 야코비안 J."""
+    x, y = cells // g, cells % g
+    tx = ((x >> 1) << 1)[:, None] + _OFFSET_X
+    ty = ((y >> 1) << 1)[:, None] + _OFFSET_Y
+    valid = (tx >= 0) & (tx < g) & (ty >= 0) & (ty < g) & (
+        (np.abs(tx - x[:, None]) > 1) | (np.abs(ty - y[:, None]) > 1)
+    )
+    row, col = np.nonzero(valid)
+    found, t = _lookup(cells, tx[row, col] * g + ty[row, col])
+    row, t = row[found], t[found]
+
+    dx = com[row, 0] - com[t, 0]
+    dy = com[row, 1] - com[t, 1]
+    inv = 1.0 / np.maximum(dx * dx + dy * dy, 1e-12)
+    s = cell_mass[t] * inv
+    # ∂/∂x [m d / |d|²] = m (I / |d|² − 2 d dᵀ / |d|⁴)
+    s2 = 2.0 * s * inv
+    terms = (dx * s, dy * s, s - s2 * dx * dx, -s2 * dx * dy, s - s2 * dy * dy)
+    # 이 레벨에 원거리 쌍이 없으면 bincount 가 (weights 와 무관하게) int64 → 부모 전개 누적(+=)용으로 float
+    acc = np.stack([np.bincount(row, weights=v, minlength=len(cells)) for v in terms], axis=1).astype(np.float64)
+    return acc[:, :2], acc[:, 2:]
+
+
+# 인접 셀 쌍은 한 방향만 생성하고 양쪽에 반대 부호로 누적 (같은 셀은 i < j)
+_NEAR_OFFSETS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+
+def _near_field(pos, mass, cells, inverse, g) -> np.ndarray:
+    """최하위 레벨 인접 3×3 셀 안의 노드 쌍 정확 계산 (셀 정렬 + 구간 반복으로 쌍 생성)."""
+    n = len(pos)
+    order = np.argsort(inverse, kind="stable")
+    counts = np.bincount(inverse, minlength=len(cells))
+    starts = np.cumsum(counts) - counts
+    x, y = cells[inverse] // g, cells[inverse] % g
+    nodes = np.arange(n)
+    pairs_i, pairs_j = [], []
+    for dx, dy in _NEAR_OFFSETS:
+        tx, ty = x + dx, y + dy
+        found, t = _lookup(cells, tx * g + ty)
+        found &= (tx >= 0) & (tx < g) & (ty >= 0) & (ty < g)
+        k = np.where(found, counts[t], 0)
+        total = int(k.sum())
+        if total == 0:
+            continue
+        i = np.repeat(nodes, k)
+        # 각 i 의 대상 셀 구간 [starts[t], starts[t]+k) 펼치기
+        run_start = np.repeat(np.cumsum(k) - k, k)
+        j = order[np.repeat(starts[t], k) + (np.arange(total) - run_start)]
+        if dx == 0 and dy == 0:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        pairs_i.append(i)
+        pairs_j.append(j)
+    out = np.zeros((n, 2))
+    if not pairs_i:
+        return out
+    i, j = np.concatenate(pairs_i), np.concatenate(pairs_j)
+    ddx = pos[i, 0] - pos[j, 0]
+    ddy = pos[i, 1] - pos[j, 1]
+    inv = 1.0 / np.maximum(ddx * ddx + ddy * ddy, 1e-12)
+    wi, wj = mass[j] * inv, mass[i] * inv
+    out[:, 0] = np.bincount(i, weights=ddx * wi, minlength=n) - np.bincount(j, weights=ddx * wj, minlength=n)
+    out[:, 1] = np.bincount(i, weights=ddy * wi, minlength=n) - np.bincount(j, weights=ddy * wj, minlength=n)
+    return out
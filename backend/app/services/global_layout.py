@@ -0,0 +1,219 @@
+"""
+전역 레이아웃 + 격자 공간 인덱스 (전체 지분 그래프 탐색, GET /graph/viewport).
+
+요청마다 부분 그래프를 골라 배치하면 화면에 수백 노드가 한계 → 전체 그래프를 1회 배치해 두고 타일처럼 조회:
+- 배치: 엔진 로드/재빌드 직후 배치 작업 (순환 출자 인덱스와 같은 리스너), fa2 를 레이아웃 풀 워커에서 실행.
+  엔진 쌍을 무방향 단순 그래프(쌍당 max ratio)로 합쳐 ForceAtlas2, 종횡비 유지한 채 0~1 로 정규화.
+- 인덱스: 레벨 l 은 2^l × 2^l 격자, 셀마다 중요도(쌍 단위 차수) 상위 GLOBAL_LAYOUT_CELL_NODES 개만 보관.
+  모든 셀이 상한 이하가 되는 레벨(= 전체 노드)에서 멈춤. 셀 키 정렬 배열 + 구간 오프셋 (희소, 빈 셀 없음).
+- 조회: zoom·상자 크기로 레벨 선택 (zoom 1 = 전체가 한 화면, 2배 확대마다 한 레벨 아래) → 상자와 겹치는 셀의
+  보관 노드만 모음. 상자가 레벨에 비해 크면 셀 수가 상한 이하가 되도록 레벨을 올림 → 조회 비용이 데이터 크기와 무관.
+- GLOBAL_LAYOUT_PATH 설정 시 .npz 로 저장, 같은 스냅샷 version 이면 워커·재시작 간 재사용 (계산은 파일 락으로 1개 워커만).
+"""
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.core import get_settings
+from app.services.fa2_layout import forceatlas2
+from app.services.layout_pool import LayoutPoolBusy, get_layout_pool
+from app.services.ownership_engine import OwnershipGraph
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 락 없이 동작 (단일 워커 개발 환경)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# zoom=1 (전체 화면) 에서 쓰는 레벨: 16×16 셀
+_BASE_LEVEL = 4
+# 한 번의 조회가 훑는 셀 수 상한 (화면 ≈ 16×16 셀, 팬·종횡비 여유 포함)
+_MAX_QUERY_CELLS = 48 * 48
+_MAX_LEVEL = 20
+_LAYOUT_SEED = 42
+
+
+def _layout_positions(n: int, src: np.ndarray, dst: np.ndarray, weight: np.ndarray, iterations: int) -> np.ndarray:
+    """fa2 전체 배치 (레이아웃 풀 워커에서 실행) → 종횡비 유지 0~1 좌표 float32 (n, 2)."""
+    xy = forceatlas2(n, src, dst, weight, seed=_LAYOUT_SEED, iterations=iterations)
+    if n == 0:
+        return np.zeros((0, 2), dtype=np.float32)
+    lo = xy.min(axis=0)
+    span = float((xy.max(axis=0) - lo).max()) or 1.0
+    out = (xy - lo) / span
+    out += (1.0 - out.max(axis=0)) / 2.0  # 짧은 축은 가운데 정렬
+    return out.astype(np.float32)
+
+
+class GlobalLayout:
+    """불변 전역 배치 + 레벨별 격자 인덱스. 노드 인덱스는 엔진 스냅샷(node_ids) 위치 기준."""
+
+    def __init__(self, version: str, xy: np.ndarray, importance: np.ndarray, cell_nodes: int):
+        self.version = version
+        self.xy = xy
+        self.importance = importance
+        self.cell_nodes = cell_nodes
+        # 레벨 l → (정렬된 셀 키, 셀별 시작 오프셋(len+1), 보관 노드 인덱스, 셀별 전체 노드 수)
+        self.levels: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        self._build_levels()
+
+    @classmethod
+    def build(cls, g: OwnershipGraph, iterations: int, cell_nodes: int) -> "GlobalLayout":
+        src, dst, ratio = g.simple_pairs()
+        weight = np.clip(ratio, 0.1, 100.0) / 100.0
+        args = (g.n_nodes, src, dst, weight, iterations)
+        try:
+            xy = get_layout_pool().map(_layout_positions, [args])[0]
+        except LayoutPoolBusy:
+            # 배치 작업이라 기다릴 필요 없음 → 호출(엔진 빌드) 스레드에서 계산
+            logger.info("Layout pool busy, computing global layout in the engine thread")
+            xy = _layout_positions(*args)
+        importance = np.diff(np.asarray(g.out_offsets)) + np.diff(np.asarray(g.in_offsets))
+        return cls(g.version, xy, importance.astype(np.float32), cell_nodes)
+
+    def _build_levels(self) -> None:
+        n = self.xy.shape[0]
+        # 중요도 내림차순, 동점은 인덱스 순 (결정론적)
+        rank = np.empty(n, dtype=np.int64)
+        rank[np.lexsort((np.arange(n), -self.importance))] = np.arange(n)
+        for level in range(_MAX_LEVEL + 1):
+            keys = self._cell_keys(level, np.arange(n))
+            order = np.lexsort((rank, keys))
+            sorted_keys = keys[order]
+            cell_keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+            within = np.arange(n) - np.repeat(starts, counts)
+            keep = within < self.cell_nodes
+            members = order[keep].astype(np.int32)
+            kept = np.minimum(counts, self.cell_nodes)
+            offsets = np.zeros(cell_keys.size + 1, dtype=np.int64)
+            np.cumsum(kept, out=offsets[1:])
+            self.levels.append((cell_keys, offsets, members, counts))
+            if n == 0 or counts.max() <= self.cell_nodes:
+                break  # 이 레벨이 모든 노드를 담음 → 더 깊은 레벨은 동일
+
+    def _cell_keys(self, level: int, idx: np.ndarray) -> np.ndarray:
+        side = 1 << level
+        cells = np.minimum((self.xy[idx] * side).astype(np.int64), side - 1)
+        return cells[:, 1] * side + cells[:, 0]
+
+    def query(
+        self, x0: float, y0: float, x1: float, y1: float, zoom: float, limit: int
+    ) -> tuple[np.ndarray, dict]:
+        """
+        상자 [x0,x1]×[y0,y1] 안의 표시 노드 인덱스 (중요도순) + 조회 정보
+        {level, total(셀 단위 추정 상자 내 노드 수), truncated(셀 보관 상한·limit 으로 일부 생략)}.
+        """
+        x0, x1 = sorted((min(max(x0, 0.0), 1.0), min(max(x1, 0.0), 1.0)))
+        y0, y1 = sorted((min(max(y0, 0.0), 1.0), min(max(y1, 0.0), 1.0)))
+        # 레벨: zoom 기준과 상자 크기 기준(상자 한 변 ≈ 16 셀) 중 깊은 쪽 (zoom 이 상자와 안 맞아도 빈 화면 방지)
+        span = max(x1 - x0, y1 - y0, 1e-9)
+        level = _BASE_LEVEL + max(0, round(math.log2(max(zoom, 1.0))), round(math.log2(1.0 / span)))
+        level = min(level, len(self.levels) - 1)
+        while level > 0 and ((x1 - x0) * (1 << level) + 1) * ((y1 - y0) * (1 << level) + 1) > _MAX_QUERY_CELLS:
+            level -= 1
+        cell_keys, offsets, members, counts = self.levels[level]
+        side = 1 << level
+        cx0, cx1 = (min(int(v * side), side - 1) for v in (x0, x1))
+        cy0, cy1 = (min(int(v * side), side - 1) for v in (y0, y1))
+        rows = np.arange(cy0, cy1 + 1, dtype=np.int64) * side
+        lo = np.searchsorted(cell_keys, rows + cx0, side="left")
+        hi = np.searchsorted(cell_keys, rows + cx1, side="right")
+        picked = [members[offsets[a]:offsets[b]] for a, b in zip(lo, hi) if b > a]
+        total = int(sum(counts[a:b].sum() for a, b in zip(lo, hi)))
+        idx = np.concatenate(picked) if picked else np.empty(0, dtype=np.int32)
+        truncated = idx.size < total
+        # 셀 경계에 걸친 상자: 셀 단위로 모은 뒤 실제 좌표로 자름
+        p = self.xy[idx]
+        idx = idx[(p[:, 0] >= x0) & (p[:, 0] <= x1) & (p[:, 1] >= y0) & (p[:, 1] <= y1)]
+        if idx.size > limit:
+            idx = idx[np.argpartition(-self.importance[idx], limit - 1)[:limit]]
+            truncated = True
+        idx = idx[np.lexsort((idx, -self.importance[idx]))]
+        return idx, {"level": level, "total": total, "truncated": truncated}
+
+    # ── 저장 / 로드 ────────────────────────────────────────────────────────
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, version=np.array(self.version), xy=self.xy, importance=self.importance)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, version: str, cell_nodes: int) -> Optional["GlobalLayout"]:
+        """저장된 배치가 같은 스냅샷 version 이면 로드 (격자 인덱스는 재구성, 수 초 미만)."""
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            if str(data["version"]) != version:
+                return None
+            return cls(version, data["xy"], data["importance"], cell_nodes)
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "nodes": int(self.xy.shape[0]),
+            "levels": len(self.levels),
+            "cell_nodes": self.cell_nodes,
+        }
+
+
+_layout_lock = threading.Lock()
+_global_layout: Optional[GlobalLayout] = None
+
+
+def get_global_layout(g: OwnershipGraph) -> GlobalLayout:
+    """스냅샷 version 별 전역 레이아웃 (파일에 같은 version 이 있으면 로드, 없으면 계산 후 저장)."""
+    global _global_layout
+    with _layout_lock:
+        gl = _global_layout
+        if gl is None or gl.version != g.version:
+            s = get_settings()
+            path = Path(s.GLOBAL_LAYOUT_PATH) if s.GLOBAL_LAYOUT_PATH else None
+            t0 = time.perf_counter()
+            gl = _with_file_lock(
+                path, lambda: _load_or_build(g, path, s.GLOBAL_LAYOUT_ITERATIONS, s.GLOBAL_LAYOUT_CELL_NODES)
+            )
+            _global_layout = gl
+            logger.info(
+                f"Global layout ready: {gl.xy.shape[0]} nodes, {len(gl.levels)} levels "
+                f"in {round((time.perf_counter() - t0) * 1000, 1)}ms"
+            )
+        return gl
+
+
+def peek_global_layout(g: OwnershipGraph) -> Optional[GlobalLayout]:
+    """이미 계산된 현재 version 레이아웃만 반환 (없으면 None, 계산하지 않음)."""
+    gl = _global_layout
+    return gl if gl is not None and gl.version == g.version else None
+
+
+def _load_or_build(g: OwnershipGraph, path: Optional[Path], iterations: int, cell_nodes: int) -> GlobalLayout:
+    if path is not None:
+        gl = GlobalLayout.load(path, g.version, cell_nodes)
+        if gl is not None:
+            logger.info(f"Global layout loaded from {path}")
+            return gl
+    gl = GlobalLayout.build(g, iterations, cell_nodes)
+    if path is not None:
+        gl.save(path)
+    return gl
+
+
+def _with_file_lock(path: Optional[Path], fn):
+    # 워커마다 엔진 리스너가 돌므로 계산은 1개 워커만, 나머지는 락 해제 후 파일 로드
+    if path is None or fcntl is None:
+        return fn()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(f"{path.name}.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            return fn()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
@@ -1,40 +1,43 @@
 """
 Neo4j 연결, Vector Index, GraphCypherQAChain, ask_graph 통합.
+
+ask_graph / ask_graph_stream: 같은 체인의 하위 체인(Cypher 생성 → DB 조회 → 답변)을 단계별로 직접 실행
+(스트림은 중간 결과·답변 토큰을 이벤트로 내보냄, POST /chat/stream SSE).
+Cypher 생성 앞에 질문 → Cypher 의미 캐시 (app.services.cypher_cache): 질문 임베딩은 1회만 계산해
+유사 회사명 힌트 조회와 캐시 조회에 함께 사용.
+세션 대화 이력 (app.services.chat_history): 최근 턴을 Cypher 생성·답변 프롬프트에 넣고, 성공한 턴을 추가.
 """
+import asyncio
+import hashlib
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncIterator
 
-from langchain_core.messages import AIMessage, HumanMessage
 from langchain_neo4j import GraphCypherQAChain, Neo4jGraph
+from langchain_neo4j.chains.graph_qa.cypher import extract_cypher
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_core.prompts import PromptTemplate
 from neo4j.exceptions import ClientError
 
 from app.core import get_settings
+from app.services.chat_history import Turn, get_chat_history
+from app.services.cypher_cache import get_cypher_cache
+from app.services.data_version import get_data_version
+from app.services.neo4j_async import get_async_graph
+from app.services.neo4j_connection import get_connection_manager
 
 logger = logging.getLogger(__name__)
 
 # ── Lazy 싱글톤 (앱 기동 시 1회 초기화) ─────────────────────────────────────
-_graph: Neo4jGraph | None = None
 _embed_model: OpenAIEmbeddings | None = None
 _qa_chain: Any = None
-_chat_history: list = []
+# Cypher 의미 캐시 세대의 고정 부분: 프롬프트·스키마·모델 지문 (_get_qa_chain 에서 체인과 함께 계산)
+_cypher_fingerprint = ""
 
 
 def _get_graph() -> Neo4jGraph:
-    global _graph
-    if _graph is None:
-        s = get_settings()
-        _graph = Neo4jGraph(
-            url=s.NEO4J_URI,
-            username=s.NEO4J_USER,
-            password=s.NEO4J_PASSWORD,
-            # enhanced_schema=True 시 스키마 토큰 급증·컨텍스트 초과 가능. 도메인 규칙은 프롬프트에 명시하므로 기본 스키마 사용.
-            enhanced_schema=False,
-        )
-        _graph.refresh_schema()
-    return _graph
+    """연결 관리자 경유 (요청마다 핑 없음, 스키마 캐시, 브레이커 OPEN 시 CircuitOpenError)."""
+    return get_connection_manager().get_graph()
 
 
 def _get_embed_model() -> OpenAIEmbeddings:
@@ -46,14 +49,14 @@ def _get_embed_model() -> OpenAIEmbeddings:
 
 
 def _get_qa_chain():
-    global _qa_chain
+    global _qa_chain, _cypher_fingerprint
     if _qa_chain is None:
         s = get_settings()
         llm = ChatOpenAI(model=s.LLM_MODEL, temperature=0, max_tokens=1024, api_key=s.OPENAI_API_KEY)
         graph = _get_graph()
 
         CYPHER_PROMPT = PromptTemplate(
-            input_variables=["schema", "question"],
+            input_variables=["schema", "question", "history"],
             template="""당신은 Neo4j Cypher 작성자입니다.
 아래 스키마와 도메인 지식을 참고하여 사용자 질문에 맞는 Cypher를 작성하세요.
 
@@ -115,16 +118,22 @@ def _get_qa_chain():
   ORDER BY abs(maxRatio - minRatio) DESC
   LIMIT 10
 
+## 이전 대화 (질문의 "그 회사", "거기 최대주주" 같은 지시어는 여기서 해석)
+{history}
+
 질문: {question}
 
 Cypher:""".strip(),
         )
 
         QA_PROMPT = PromptTemplate(
-            input_variables=["context", "question"],
+            input_variables=["context", "question", "history"],
             template="""당신은 주주 네트워크 분석 전문가입니다.
 DB 조회 결과를 바탕으로 질문에 명확하고 친절하게 답변하세요.
 
+이전 대화:
+{history}
+
 질문: {question}
 
 DB 결과:
@@ -172,6 +181,9 @@ DB 결과:
             allow_dangerous_requests=True,
             top_k=10,
         )
+        _cypher_fingerprint = hashlib.sha256(
+            "\n".join((s.LLM_MODEL, s.EMBED_MODEL, CYPHER_PROMPT.template, _qa_chain.graph_schema)).encode()
+        ).hexdigest()[:12]
     return _qa_chain
 
 
@@ -194,55 +206,142 @@ def ensure_vector_index() -> None:
         pass
 
 
-def find_similar_companies(text: str, top_k: int = 3) -> list[str]:
-    embed = _get_embed_model()
-    graph = _get_graph()
-    vec = embed.embed_query(text)
-    rows = graph.query("""
-        CALL db.index.vector.queryNodes('company_name_vector', $k, $vec)
-        YIELD node, score
-        WHERE score > 0.75
-        RETURN node.companyName AS name, score
-        ORDER BY score DESC
-    """, params={"k": top_k, "vec": vec})
+_SIMILAR_COMPANIES_QUERY = """
+    CALL db.index.vector.queryNodes('company_name_vector', $k, $vec)
+    YIELD node, score
+    WHERE score > 0.75
+    RETURN node.companyName AS name, score
+    ORDER BY score DESC
+"""
+
+
+def _similar_companies(vec: list[float], top_k: int) -> list[str]:
+    rows = _get_graph().query(_SIMILAR_COMPANIES_QUERY, params={"k": top_k, "vec": vec})
     return [r["name"] for r in rows]
 
 
+async def _asimilar_companies(vec: list[float], top_k: int) -> list[str]:
+    rows = await get_async_graph().query(_SIMILAR_COMPANIES_QUERY, params={"k": top_k, "vec": vec})
+    return [r["name"] for r in rows]
+
+
+def find_similar_companies(text: str, top_k: int = 3) -> list[str]:
+    return _similar_companies(_get_embed_model().embed_query(text), top_k)
+
+
+# ── 답변 분류·대화 이력 (ask_graph / ask_graph_stream 공통) ─────────────────
+_LLM_FALLBACK_NOTICE = "⚠️ DB 조회에 실패하여 LLM 추론으로 답변합니다. 실제 데이터와 다를 수 있습니다.\n\n"
+
+
+def _with_hints(question: str, hints: list[str]) -> str:
+    return f"{question}\n[DB 내 유사 회사명: {', '.join(hints)}]" if hints else question
+
+
+def _classify(cypher: str, raw: list) -> tuple[str, str]:
+    """(source, confidence): Cypher 와 결과 유무로 답변 근거 분류."""
+    if cypher and raw:
+        return "DB", "HIGH"
+    if cypher:
+        return "DB_EMPTY", "MEDIUM"
+    return "LLM", "LOW"
+
+
+def _error_answer(e: Exception) -> str:
+    error_msg = str(e)
+    # Context length exceeded 등 LLM 에러는 명확히 구분
+    if "context_length" in error_msg.lower() or "token" in error_msg.lower():
+        return f"⚠️ 질문이 너무 길거나 대화 이력이 너무 깁니다. 질문을 짧게 하거나 대화를 초기화해 주세요.\n\n오류: {error_msg[:200]}"
+    return f"⚠️ 오류 발생: {error_msg[:200]}"
+
+
+# 프롬프트에 넣는 이전 답변 길이 상한 (턴 수 상한은 CHAT_HISTORY_MAX_TURNS)
+_HISTORY_ANSWER_CHARS = 500
+
+
+def _recall(session_id: str) -> list[Turn]:
+    """세션의 최근 턴 (오래된 것부터). 저장소 오류 시 이력 없이 진행."""
+    try:
+        return get_chat_history().turns(session_id)
+    except Exception as e:
+        logger.warning(f"대화 이력 조회 실패, 이력 없이 진행: {e}")
+        return []
+
+
+def _format_history(turns: list[Turn]) -> str:
+    if not turns:
+        return "(없음)"
+    return "\n".join(f"Q: {q}\nA: {a[:_HISTORY_ANSWER_CHARS]}" for q, a in turns)
+
+
+def _remember(session_id: str, question: str, answer: str) -> None:
+    """성공한 턴만 세션 대화 이력에 추가 (보관 턴 수 상한은 저장소가 적용). 실패해도 답변은 그대로 반환."""
+    try:
+        get_chat_history().append(session_id, question, answer)
+    except Exception as e:
+        logger.warning(f"대화 이력 저장 실패: {e}")
+
+
+def _text(chunk: Any) -> str:
+    # 체인 구성(StrOutputParser 유무·버전)에 따라 str / 메시지 청크 / {"text": ...}
+    if isinstance(chunk, str):
+        return chunk
+    if isinstance(chunk, dict):
+        return str(chunk.get("text", ""))
+    return str(getattr(chunk, "content", "") or "")
+
+
+def _cypher_generation() -> str:
+    """의미 캐시 세대: 데이터 버전 + 프롬프트·스키마·모델 지문 (_get_qa_chain 이후 호출)."""
+    return f"{get_data_version().current()}:{_cypher_fingerprint}"
+
+
+def _clean_cypher(chain: Any, generated: Any) -> str:
+    # GraphCypherQAChain._call 과 같은 후처리 (코드 블록 추출 → 관계 방향 교정)
+    cypher = extract_cypher(_text(generated))
+    if chain.cypher_query_corrector is not None:
+        cypher = chain.cypher_query_corrector(cypher)
+    return cypher
+
+
 # ── 공개 API ───────────────────────────────────────────────────────────────
 class GraphService:
     """ask_graph, reset_chat, graph/stats 검색 등."""
 
     @staticmethod
-    def ask_graph(question: str) -> dict:
+    def ask_graph(question: str, session_id: str) -> dict:
+        """
+        체인 하위 단계를 직접 실행 (GraphCypherQAChain._call 과 같은 순서·top_k).
+        Cypher 는 의미 캐시 적중 시 재사용, 미스면 LLM 생성 후 결과가 있으면 캐시에 저장.
+        세션의 이전 턴은 Cypher 생성·답변 프롬프트에 함께 넣음 (후속 질문의 지시어 해석).
+        """
         t0 = time.time()
-        hints = find_similar_companies(question, top_k=3)
-        enhanced = question
-        if hints:
-            enhanced = f"{question}\n[DB 내 유사 회사명: {', '.join(hints)}]"
+        vec = _get_embed_model().embed_query(question)
+        hints = _similar_companies(vec, top_k=3)
+        enhanced = _with_hints(question, hints)
+        turns = _recall(session_id)
+        # 이력이 있으면 같은 문장도 앞 턴에 따라 뜻이 달라짐 ("그 회사의 최대주주는?") → 의미 캐시 조회·저장 모두 생략
+        history, contextual = _format_history(turns), bool(turns)
 
         chain = _get_qa_chain()
-        graph = _get_graph()
-        cypher, raw = "", []
+        cypher, raw, cached = "", [], False
         try:
-            # 대화 이력 제한: 최근 3턴만 (토큰 수 제한)
-            result = chain.invoke({
-                "query": enhanced,
-                "chat_history": _chat_history[-6:],  # 최근 3턴 (Human+AIMessage 쌍)
-            })
-            answer = result.get("result", "답변을 생성하지 못했습니다.")
-            for step in result.get("intermediate_steps", []):
-                if isinstance(step, dict):
-                    cypher = cypher or step.get("query", "")
-                    ctx = step.get("context")
-                    if ctx is not None and not raw:
-                        raw = ctx if isinstance(ctx, list) else [{"result": ctx}]
+            cache = get_cypher_cache()
+            generation = _cypher_generation()
+            cypher = "" if contextual else (cache.lookup(vec, question, hints, generation) or "")
+            cached = bool(cypher)
+            if not cached:
+                generated = chain.cypher_generation_chain.invoke(
+                    {"question": enhanced, "schema": chain.graph_schema, "history": history}
+                )
+                cypher = _clean_cypher(chain, generated)
+            if cypher:
+                raw = _get_graph().query(cypher)[: chain.top_k]
+                if raw and not cached and not contextual:
+                    cache.store(vec, question, hints, cypher, generation)
+            answer = _text(chain.qa_chain.invoke({"question": enhanced, "context": raw, "history": history}))
+            answer = answer or "답변을 생성하지 못했습니다."
         except Exception as e:
-            error_msg = str(e)
-            # Context length exceeded 등 LLM 에러는 명확히 구분
-            if "context_length" in error_msg.lower() or "token" in error_msg.lower():
-                answer = f"⚠️ 질문이 너무 길거나 대화 이력이 너무 깁니다. 질문을 짧게 하거나 대화를 초기화해 주세요.\n\n오류: {error_msg[:200]}"
-            else:
-                answer = f"⚠️ 오류 발생: {error_msg[:200]}"
+            answer = _error_answer(e)
             cypher, raw = "", []
             source, confidence = "LLM", "LOW"
             
@@ -254,26 +353,17 @@ class GraphService:
                 "hints": hints,
                 "source": source,
                 "confidence": confidence,
+                "cached": False,
                 "elapsed": round(time.time() - t0, 2),
             }
 
-        if cypher and raw:
-            source, confidence = "DB", "HIGH"
-        elif cypher and not raw:
-            source, confidence = "DB_EMPTY", "MEDIUM"
-        else:
-            source, confidence = "LLM", "LOW"
-            # DB 조회 실패 시에만 LLM 추론 메시지 추가
-            if not answer.startswith("⚠️"):
-                answer = f"⚠️ DB 조회에 실패하여 LLM 추론으로 답변합니다. 실제 데이터와 다를 수 있습니다.\n\n{answer}"
+        source, confidence = _classify(cypher, raw)
+        # DB 조회 실패 시에만 LLM 추론 메시지 추가
+        if source == "LLM" and not answer.startswith("⚠️"):
+            answer = f"{_LLM_FALLBACK_NOTICE}{answer}"
 
         # 성공한 경우에만 대화 이력 추가 (에러는 이미 return됨)
-        _chat_history.append(HumanMessage(content=question))
-        _chat_history.append(AIMessage(content=answer))
-        # 대화 이력 최대 6턴 유지 (토큰 수 제한)
-        while len(_chat_history) > 12:  # 6턴 = 12개 메시지
-            _chat_history.pop(0)
-            _chat_history.pop(0)
+        _remember(session_id, question, answer)
 
         return {
             "answer": answer,
@@ -282,34 +372,113 @@ class GraphService:
             "hints": hints,
             "source": source,
             "confidence": confidence,
+            "cached": cached,
+            "elapsed": round(time.time() - t0, 2),
+        }
+
+    @staticmethod
+    async def ask_graph_stream(question: str, session_id: str) -> AsyncIterator[tuple[str, dict]]:
+        """
+        ask_graph 의 단계별 스트리밍 버전. (이벤트, 데이터) 를 순서대로 yield:
+        hints → cypher(cached: 의미 캐시 적중 여부) → rows → token(답변 조각)* → done (ChatResponse 와 같은 모양).
+        실패 시 그 시점에 error (역시 ChatResponse 모양, answer 에 ⚠️ 메시지) 로 끝나고 대화 이력은 그대로.
+
+        체인 하위 단계를 직접 실행 (GraphCypherQAChain._call 과 같은 순서·top_k):
+        임베딩·LLM 은 a* API, DB 는 AsyncDriver → 한 턴 동안 스레드를 점유하지 않음.
+        클라이언트가 끊으면 제너레이터가 취소되며 진행 중 LLM 스트림도 함께 중단.
+        """
+        t0 = time.time()
+        hints: list[str] = []
+        cypher, raw, cached = "", [], False
+        try:
+            vec = await _get_embed_model().aembed_query(question)
+            hints = await _asimilar_companies(vec, top_k=3)
+            yield "hints", {"hints": hints}
+            enhanced = _with_hints(question, hints)
+            turns = await asyncio.to_thread(_recall, session_id)
+            # 이력이 있으면 의미 캐시 조회·저장 생략 (ask_graph 와 같은 규칙)
+            history, contextual = _format_history(turns), bool(turns)
+
+            # 첫 호출만 체인 생성(스키마 조회) → 이벤트 루프 밖에서
+            chain = await asyncio.to_thread(_get_qa_chain)
+            cache = get_cypher_cache()
+            generation = _cypher_generation()
+            cypher = "" if contextual else (cache.lookup(vec, question, hints, generation) or "")
+            cached = bool(cypher)
+            if not cached:
+                generated = await chain.cypher_generation_chain.ainvoke(
+                    {"question": enhanced, "schema": chain.graph_schema, "history": history}
+                )
+                cypher = _clean_cypher(chain, generated)
+            yield "cypher", {"cypher": cypher, "cached": cached}
+
+            if cypher:
+                raw = (await get_async_graph().query(cypher))[: chain.top_k]
+                if raw and not cached and not contextual:
+                    cache.store(vec, question, hints, cypher, generation)
+            yield "rows", {"raw": raw}
+
+            source, confidence = _classify(cypher, raw)
+            parts: list[str] = []
+            if source == "LLM":
+                parts.append(_LLM_FALLBACK_NOTICE)
+                yield "token", {"text": _LLM_FALLBACK_NOTICE}
+            async for chunk in chain.qa_chain.astream({"question": enhanced, "context": raw, "history": history}):
+                text = _text(chunk)
+                if text:
+                    parts.append(text)
+                    yield "token", {"text": text}
+            answer = "".join(parts) or "답변을 생성하지 못했습니다."
+        except Exception as e:
+            logger.warning(f"스트리밍 질의 실패: {e}", exc_info=True)
+            yield "error", {
+                "answer": _error_answer(e),
+                "cypher": "",
+                "raw": [],
+                "hints": hints,
+                "source": "LLM",
+                "confidence": "LOW",
+                "cached": False,
+                "elapsed": round(time.time() - t0, 2),
+            }
+            return
+
+        await asyncio.to_thread(_remember, session_id, question, answer)
+        yield "done", {
+            "answer": answer,
+            "cypher": cypher,
+            "raw": raw,
+            "hints": hints,
+            "source": source,
+            "confidence": confidence,
+            "cached": cached,
             "elapsed": round(time.time() - t0, 2),
         }
 
     @staticmethod
-    def reset_chat() -> None:
-        global _chat_history
-        _chat_history = []
+    def reset_chat(session_id: str) -> None:
+        get_chat_history().clear(session_id)
 
     @staticmethod
     def get_graph():
-        """Neo4j 그래프 인스턴스 반환 (연결 상태 확인 및 재연결)"""
-        try:
-            graph = _get_graph()
-            # 연결 상태 확인 (간단한 쿼리 실행)
-            graph.query("RETURN 1 AS test LIMIT 1")
-            return graph
-        except Exception:
-            # 연결 실패 시 재연결 시도
-            global _graph
-            _graph = None
-            return _get_graph()
+        """Neo4j 그래프 인스턴스 반환. 연결 상태는 백그라운드 프로브/브레이커가 관리 (추가 왕복 없음)."""
+        return _get_graph()
 
     @staticmethod
     def get_stats() -> dict:
-        g = _get_graph()
+        """
+        통계 스냅샷 기반 (요청마다 전체 스캔하지 않음). 스냅샷 버전·경과 초 포함.
+        nodes: 첫 레이블 기준 노드 수 (합 = 전체 노드 수), labels: 레이블별 노드 수 (다중 레이블 노드는 중복 집계).
+        """
+        from app.services.stats_service import get_stats_service
+
+        svc = get_stats_service()
+        snapshot = svc.get_snapshot()
         return {
-            "nodes": g.query("MATCH (n) RETURN labels(n)[0] AS l, count(n) AS n ORDER BY n DESC"),
-            "relationships": g.query("MATCH ()-[r]->() RETURN type(r) AS t, count(r) AS n ORDER BY n DESC"),
+            "nodes": snapshot["nodes"],
+            "labels": snapshot["labels"],
+            "relationships": snapshot["relationships"],
+            "snapshot": svc.meta(snapshot),
         }
 
 
@@ -0,0 +1,211 @@
+"""
+점진 레이아웃 작업 (초기 배치 즉시 반환 + 정제 좌표 SSE 스트리밍).
+
+대형 그래프는 compute_layout 이 끝날 때까지 화면이 비어 있음 → 작업으로 분리:
+- create: 요청 스레드에서 초기 배치(반복 없음)만 계산해 job_id 와 함께 즉시 반환
+- 정제(refine_layout)는 레이아웃 풀에 제출 (동시 작업 상한 공유, 포화 시 LayoutPoolBusy)
+- 워커의 중간 좌표는 진행 큐 → 소비 스레드 하나가 작업별 구독자(asyncio.Queue)에게 전달
+- 완료 결과는 레이아웃 캐시(engine=fa2 키)에 저장 → 같은 그래프의 다음 작업/동기 요청은 즉시 완료
+- 끝난 작업은 LAYOUT_JOB_TTL_SEC 뒤 정리 (작업 상태·최종 좌표 재조회용으로 잠시 보관)
+
+작업 상태는 프로세스 로컬 (uvicorn 워커가 여럿이면 이벤트 구독은 작업을 만든 워커로 가야 함).
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from app.core import get_settings
+from app.services import layout_service
+from app.services.layout_pool import get_layout_pool
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LayoutJob:
+    id: str
+    positions: dict[str, dict[str, float]]
+    components: list[list[str]]
+    status: str = "running"  # running | done | failed
+    seq: int = 0
+    iteration: int = 0
+    truncated: bool = False
+    elapsed_ms: Optional[float] = None
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    subscribers: list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = field(default_factory=list)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "seq": self.seq,
+            "iteration": self.iteration,
+            "truncated": self.truncated,
+            "elapsed_ms": self.elapsed_ms,
+            "error": self.error,
+            "positions": self.positions,
+            "components": self.components,
+        }
+
+
+class LayoutJobManager:
+    def __init__(self, budget_sec: float, progress_sec: float, ttl_sec: float):
+        self.budget_sec = budget_sec
+        self.progress_sec = progress_sec
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._jobs: dict[str, LayoutJob] = {}
+        self._pump: Optional[threading.Thread] = None
+
+    def create(
+        self,
+        nodes: list[dict[str, Any]],
+        edges: list[dict[str, Any]],
+        *,
+        padding: float,
+        use_components: bool,
+    ) -> LayoutJob:
+        """초기 배치 계산 + 정제 제출. 캐시 적중이면 완료 상태로 바로 반환 (정제 없음)."""
+        self._purge()
+        plan = layout_service.plan_progressive(nodes, edges, padding=padding, use_components=use_components)
+        job = LayoutJob(id=uuid.uuid4().hex, positions=plan["positions"], components=plan["components"])
+        if plan["cached"] is not None or not plan["parts"]:
+            job.status, job.finished_at = "done", time.monotonic()
+            with self._lock:
+                self._jobs[job.id] = job
+            return job
+
+        pool = get_layout_pool()
+        self._ensure_pump(pool.progress_queue())
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            future = pool.submit(
+                layout_service.refine_layout, job.id, plan["parts"], self.budget_sec, self.progress_sec
+            )
+        except Exception:
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise
+        future.add_done_callback(lambda f: self._finish(job, plan["key"], f))
+        return job
+
+    def get(self, job_id: str) -> Optional[LayoutJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def subscribe(self, job: LayoutJob) -> tuple[asyncio.Queue, dict[str, Any]]:
+        """
+        이벤트 루프에서 호출. (큐, 현재 스냅샷) — 둘을 같은 락 안에서 잡으므로 스냅샷 이후 이벤트는
+        빠짐없이 큐로 들어옴 (seq 가 스냅샷 seq 보다 큼).
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            job.subscribers.append((asyncio.get_running_loop(), queue))
+            return queue, job.snapshot()
+
+    def unsubscribe(self, job: LayoutJob, queue: asyncio.Queue) -> None:
+        with self._lock:
+            job.subscribers = [(loop, q) for loop, q in job.subscribers if q is not queue]
+
+    def _publish(self, job: LayoutJob, event: dict[str, Any]) -> None:
+        # 호출 측에서 self._lock 보유 (seq 증가와 전달 순서 일치)
+        job.seq += 1
+        event = {**event, "seq": job.seq}
+        for loop, queue in job.subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                pass  # 구독자 루프 종료됨
+
+    def _on_progress(self, job_id: str, event: dict[str, Any]) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "running":
+                return  # 완료 후 늦게 도착한 중간 결과는 버림
+            job.positions = {**job.positions, **event["positions"]}
+            job.iteration = event.get("iteration", job.iteration)
+            self._publish(job, event)
+
+    def _finish(self, job: LayoutJob, key: str, future: Future) -> None:
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"점진 레이아웃 작업 실패 ({job.id}): {e}", exc_info=True)
+            with self._lock:
+                job.status, job.error, job.finished_at = "failed", str(e)[:200], time.monotonic()
+                self._publish(job, {"type": "failed", "error": job.error})
+            return
+        # 정제 결과는 fa2 실행 단위 노드만 (공식 배치 요소는 초기 배치가 최종)
+        with self._lock:
+            positions = {**job.positions, **result["positions"]}
+        if not result["truncated"]:
+            layout_service.cache_layout(key, {"positions": positions, "components": job.components})
+        with self._lock:
+            job.positions = positions
+            job.truncated = result["truncated"]
+            job.elapsed_ms = result["elapsed_ms"]
+            job.status, job.finished_at = "done", time.monotonic()
+            self._publish(
+                job,
+                {
+                    "type": "done",
+                    "positions": job.positions,
+                    "truncated": job.truncated,
+                    "elapsed_ms": job.elapsed_ms,
+                    "iteration": job.iteration,
+                },
+            )
+
+    def _ensure_pump(self, progress_queue: Any) -> None:
+        with self._lock:
+            if self._pump is not None and self._pump.is_alive():
+                return
+            self._pump = threading.Thread(
+                target=self._pump_loop, args=(progress_queue,), name="layout-progress", daemon=True
+            )
+            self._pump.start()
+
+    def _pump_loop(self, progress_queue: Any) -> None:
+        while True:
+            try:
+                job_id, event = progress_queue.get()
+                self._on_progress(job_id, event)
+            except (EOFError, OSError):
+                logger.warning("Layout progress queue closed, stopping progress pump")
+                return
+            except Exception:
+                logger.warning("Layout progress event dropped", exc_info=True)
+
+    def _purge(self) -> None:
+        cutoff = time.monotonic() - self.ttl_sec
+        with self._lock:
+            expired = [jid for jid, j in self._jobs.items() if j.finished_at is not None and j.finished_at < cutoff]
+            for jid in expired:
+                del self._jobs[jid]
+
+    def status(self) -> dict:
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if j.status == "running")
+            return {"jobs": len(self._jobs), "running": running, "budget_sec": self.budget_sec}
+
+
+_layout_jobs: LayoutJobManager | None = None
+
+
+def get_layout_jobs() -> LayoutJobManager:
+    global _layout_jobs
+    if _layout_jobs is None:
+        s = get_settings()
+        _layout_jobs = LayoutJobManager(
+            budget_sec=s.LAYOUT_JOB_BUDGET_SEC,
+            progress_sec=s.LAYOUT_JOB_PROGRESS_SEC,
+            ttl_sec=s.LAYOUT_JOB_TTL_SEC,
+        )
+    return _layout_jobs
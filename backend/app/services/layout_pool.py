@@ -0,0 +1,219 @@
+"""
+레이아웃 계산 프로세스 풀 (GIL 격리 + 연결 요소 병렬 + 백프레셔).
+
+레이아웃은 순수 CPU 작업 → 요청 스레드에서 돌리면 GIL 을 쥐고 같은 워커의 다른 요청까지 느려짐.
+- 계산은 별도 프로세스(spawn)에서, 요청 스레드는 결과 대기만 (대기 중 GIL 해제)
+- 한 작업의 배치(연결 요소 묶음)는 풀 워커에 나눠 병렬 실행, 결과 순서는 제출 순서 유지
+- 동시 작업 수 상한(LAYOUT_POOL_MAX_PENDING, 실행 중 + 대기) 초과 시 즉시 LayoutPoolBusy
+  → API 는 503 + Retry-After (레이아웃 폭주가 조회 API 를 굶기지 않도록)
+- LAYOUT_POOL_WORKERS=0 이면 풀 없이 호출 스레드에서 계산 (상한은 동일 적용)
+- 워커 프로세스가 죽으면 (BrokenProcessPool) 풀을 다시 만들어 한 번 재시도, 또 실패하면 LayoutPoolBusy
+  (요청 스레드에서 대신 계산하면 GIL 격리·동시 작업 상한이 모두 무너짐)
+- 점진 작업(submit): 결과를 기다리지 않고 Future 반환, 중간 결과는 report_progress → 진행 큐
+  (spawn 워커는 initializer 인자로 큐를 상속 — mp.Queue 는 submit 인자로 넘길 수 없음)
+
+fork 가 아닌 spawn: 부모에 Neo4j 드라이버·프로브·통계 스레드가 떠 있어 fork 후 락 상태가 불안정.
+"""
+import importlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Sequence
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LayoutPoolBusy(Exception):
+    """동시 레이아웃 작업 상한 초과 (503 + Retry-After 로 변환)."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Layout pool is busy")
+        self.retry_after = retry_after
+
+
+# 점진 작업의 진행 이벤트 (job_id, event) 를 넣는 큐. 워커 프로세스는 initializer 에서, 부모는 큐 생성 시 설정
+_progress_queue: Any = None
+
+
+def _init_worker(progress_queue: Any = None) -> None:
+    global _progress_queue
+    _progress_queue = progress_queue
+    # 첫 작업 지연을 줄이기 위해 워커 기동 시 레이아웃 모듈(networkx/numpy) 미리 임포트
+    importlib.import_module("app.services.layout_service")
+
+
+def report_progress(job_id: str, event: dict) -> None:
+    """점진 작업 함수(submit 으로 실행)에서 중간 결과 전달. 큐가 없으면 (일반 map 호출) 무시."""
+    if _progress_queue is not None:
+        _progress_queue.put((job_id, event))
+
+
+class LayoutPool:
+    def __init__(self, workers: int, max_pending: int, retry_after: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress: Any = None
+        self._pending = 0
+        self._jobs = 0
+        self._rejected = 0
+        self._failed = 0
+        self._restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        progress = self.progress_queue()
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(progress,),
+                )
+            return self._executor
+
+    def progress_queue(self) -> Any:
+        """진행 이벤트 큐 (지연 생성, 풀 재생성 후에도 동일 큐 → 소비 스레드 하나로 충분)."""
+        global _progress_queue
+        with self._lock:
+            if self._progress is None:
+                self._progress = multiprocessing.get_context("spawn").Queue()
+                _progress_queue = self._progress  # workers=0 (호출 프로세스 내 실행) 용
+            return self._progress
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self._restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise LayoutPoolBusy(self.retry_after)
+            self._pending += 1
+            self._jobs += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def map(self, fn: Callable[..., Any], args_list: Sequence[tuple], inline: bool = False) -> list[Any]:
+        """
+        하나의 레이아웃 작업: args_list 각 항목을 fn(*args) 로 실행, 입력 순서대로 결과 반환.
+        inline=True (작은 그래프) 면 IPC 비용이 계산보다 크므로 상한 검사 없이 호출 스레드에서 실행.
+        워커가 죽으면 새 풀로 한 번 재시도, 그래도 실패하면 LayoutPoolBusy (503 + Retry-After).
+        """
+        if inline:
+            return [fn(*args) for args in args_list]
+        self._admit()
+        try:
+            if self.workers <= 0:
+                return [fn(*args) for args in args_list]
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    futures = [executor.submit(fn, *args) for args in args_list]
+                    return [f.result() for f in futures]
+                except BrokenProcessPool:
+                    logger.warning(f"Layout worker process died (attempt {attempt + 1}), restarting pool")
+                    self._reset_executor(executor)
+            raise LayoutPoolBusy(self.retry_after)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        finally:
+            self._release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """
+        점진 작업 하나를 제출하고 바로 Future 반환 (동시 작업 상한은 map 과 공유, 완료 시 해제).
+        workers=0 이면 호출 프로세스의 스레드에서 실행. 워커가 죽으면 Future 는 BrokenProcessPool 로 실패.
+        """
+        self._admit()
+        try:
+            if self.workers <= 0:
+                self.progress_queue()
+                future: Future = Future()
+                threading.Thread(target=_run_into, args=(future, fn, args), daemon=True).start()
+            else:
+                executor = self._get_executor()
+                try:
+                    future = executor.submit(fn, *args)
+                except BrokenProcessPool:
+                    # 이전 작업 중 워커가 죽어 깨진 풀 → 새 풀로 한 번 재시도
+                    logger.warning("Layout worker pool broken, restarting before submit")
+                    self._reset_executor(executor)
+                    future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        self._release()
+        if not future.cancelled() and future.exception() is not None:
+            with self._lock:
+                self._failed += 1
+
+    def start(self) -> None:
+        """워커 프로세스 미리 기동 (앱 startup). 첫 요청이 spawn·임포트 비용을 떠안지 않도록."""
+        if self.workers <= 0:
+            return
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(os.getpid)
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._executor is not None,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "jobs": self._jobs,
+                "rejected": self._rejected,
+                "failed": self._failed,
+                "restarts": self._restarts,
+            }
+
+
+def _run_into(future: Future, fn: Callable[..., Any], args: tuple) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(fn(*args))
+    except BaseException as exc:
+        future.set_exception(exc)
+
+
+_layout_pool: LayoutPool | None = None
+
+
+def get_layout_pool() -> LayoutPool:
+    global _layout_pool
+    if _layout_pool is None:
+        s = get_settings()
+        _layout_pool = LayoutPool(
+            workers=s.LAYOUT_POOL_WORKERS,
+            max_pending=s.LAYOUT_POOL_MAX_PENDING,
+            retry_after=s.LAYOUT_POOL_RETRY_AFTER_SEC,
+        )
+    return _layout_pool
@@ -4,20 +4,45 @@
 지원 엔진:
 - NetworkX: Kamada-Kawai → Spring 2단계 (기본, Graphviz 불필요)
 - PyGraphviz: Graphviz 기반 고품질 레이아웃 (선택, Graphviz 시스템 라이브러리 필요)
+- fa2: NumPy 벡터화 ForceAtlas2 + Barnes-Hut (fa2_layout, 대형 그래프용 — KK 의 O(n²) 없음)
+- auto: 연결 요소마다 크기·모양으로 엔진 선택 (별·체인·고리는 공식 배치, 작은 요소 KK, 큰 요소 fa2),
+  요청당 시간 예산(LAYOUT_AUTO_BUDGET_SEC) 안에 들도록 fa2 반복 수 배분
 
 진단: "털뭉치" 방지
 - MultiDiGraph 함정: 동일 (u,v) 다중 엣지를 그대로 쓰면 스프링이 N배로 강해져 노드가 착 달라붙음.
   → 레이아웃용으로는 **단순 무방향 Graph**, 노드 쌍당 엣지 1개(weight=대표 ratio)만 사용.
 - k 파라미터: 노드 수에 따른 동적 k = 5.0/√n 으로 적정 거리 확보.
 - 결정론적: seed=42 고정으로 동일 데이터는 항상 동일 레이아웃 (협업/공유 시 필수).
+  노드·엣지·연결 요소 순서도 id 기준 정렬 → 입력 순서·프로세스(해시 시드)와 무관.
 
 파이프라인: 입력 정제 → 단순 그래프 생성 → 레이아웃 엔진(NetworkX/PyGraphviz) → 0~1 정규화.
+
+캐시: 결과는 단순 그래프(노드·가중 엣지) + 엔진·옵션의 정규 해시로 콘텐츠 주소화.
+메모리 LRU 계층 + 선택적 디스크(SQLite, LAYOUT_CACHE_PATH) 계층, 적중률은 /cache-stats 의 "layout".
+
+실행: 캐시 미스 계산은 레이아웃 프로세스 풀(layout_pool)에서 연결 요소 배치 단위 병렬 실행.
+풀이 가득 차면 LayoutPoolBusy (API 에서 503 + Retry-After).
+
+증분: positions(기존 노드 0~1 좌표) 가 오면 해당 노드는 고정, 새 노드 + 인접 고정 노드만 이완.
+
+점진: plan_progressive 가 즉시 초기 배치(공식 배치, fa2 대상 요소는 원형)를 주고, refine_layout 이
+풀 워커에서 fa2 반복을 돌리며 중간 좌표를 report_progress 로 흘림 (시간 예산 초과 시 그 시점 좌표로 종료).
 """
+import hashlib
+import json
 import math
 import logging
-from typing import Any, Literal
+import time
+from collections import Counter
+from typing import Any, Literal, Optional
 
 import networkx as nx
+import numpy as np
+
+from app.core import get_settings
+from app.core.cache import LRUTTLCache, get_cache
+from app.services.fa2_layout import forceatlas2, forceatlas2_steps
+from app.services.layout_pool import get_layout_pool, report_progress
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +56,11 @@ except ImportError:
 
 # 협업: 동일 데이터면 항상 같은 모양. 시드 고정.
 LAYOUT_SEED = 42
+# 레이아웃 알고리즘/파라미터 변경 시 올림 → 디스크 캐시의 이전 결과 자동 무효화
+LAYOUT_ALGO_VERSION = 3
+
+LayoutEngine = Literal["networkx", "pygraphviz", "fa2", "auto"]
+LAYOUT_ENGINES: tuple[str, ...] = ("networkx", "pygraphviz", "fa2", "auto")
 
 
 def _build_layout_graph(nodes: list[dict], edges: list[dict]) -> nx.Graph:
@@ -39,9 +69,8 @@ def _build_layout_graph(nodes: list[dict], edges: list[dict]) -> nx.Graph:
     동일 (from, to) 다중 엣지는 1개로 합치고, weight는 max(ratio) 사용 (높은 지분 = 가까이).
     """
     G = nx.Graph()
-    for i, n in enumerate(nodes):
-        nid = n.get("id") or f"n{i}"
-        G.add_node(nid)
+    # id 정렬 순서로 추가 (레이아웃 초기 배치가 노드 순서에 의존 → 입력 순서와 무관하게 고정)
+    G.add_nodes_from(sorted({n.get("id") or f"n{i}" for i, n in enumerate(nodes)}))
     node_ids = set(G.nodes())
     # (u,v) 쌍당 하나의 엣지만. weight = 해당 쌍의 max(ratio)
     pair_weight: dict[tuple[str, str], float] = {}
@@ -52,11 +81,49 @@ def _build_layout_graph(nodes: list[dict], edges: list[dict]) -> nx.Graph:
         key = (min(u, v), max(u, v))
         ratio = max(0.1, min(100.0, float(e.get("ratio") or 0)))
         pair_weight[key] = max(pair_weight.get(key, 0), ratio)
-    for (u, v), w in pair_weight.items():
+    for (u, v), w in sorted(pair_weight.items()):
         G.add_edge(u, v, weight=w)
     return G
 
 
+def _layout_cache() -> LRUTTLCache:
+    s = get_settings()
+    return get_cache(
+        "layout",
+        ttl=s.LAYOUT_CACHE_TTL_SEC,
+        max_entries=s.LAYOUT_CACHE_MAX_ENTRIES,
+        max_bytes=s.LAYOUT_CACHE_MAX_BYTES,
+        shared_path=s.LAYOUT_CACHE_PATH,
+        shared_max_entries=s.LAYOUT_CACHE_DISK_MAX_ENTRIES,
+        shared_max_bytes=s.LAYOUT_CACHE_DISK_MAX_BYTES,
+    )
+
+
+def _layout_cache_key(
+    G: nx.Graph,
+    engine: str,
+    padding: float,
+    use_components: bool,
+    pinned: Optional[dict[str, tuple[float, float]]] = None,
+) -> str:
+    """단순 그래프 + 결과에 영향을 주는 옵션(+ 증분 시 고정 좌표, auto 시간 예산)의 정규 해시 (SHA-256)."""
+    spec: dict[str, Any] = {
+        "v": LAYOUT_ALGO_VERSION,
+        "seed": LAYOUT_SEED,
+        "engine": engine,
+        "padding": padding,
+        "components": use_components,
+        "nodes": list(G.nodes()),
+        "edges": [[u, v, w] for u, v, w in G.edges(data="weight")],
+    }
+    if pinned:
+        spec["pinned"] = [[nid, x, y] for nid, (x, y) in sorted(pinned.items())]
+    if engine == "auto":
+        spec["budget"] = get_settings().LAYOUT_AUTO_BUDGET_SEC  # 예산이 fa2 반복 수를 정함
+    canonical = json.dumps(spec, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
 def _normalize_positions(
     pos: dict[str, tuple[float, float]],
     padding: float,
@@ -116,16 +183,65 @@ def _layout_with_pygraphviz(
         raise
 
 
+def _fa2_inputs(G: nx.Graph) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """nx.Graph → (노드 순서, src, dst, weight 0~1). 노드 순서는 G 삽입 순서(정렬된 id) 그대로 → 결정론적."""
+    nodes = list(G.nodes())
+    index = {nid: i for i, nid in enumerate(nodes)}
+    edges = list(G.edges(data="weight"))
+    src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.intp, count=len(edges))
+    dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.intp, count=len(edges))
+    weight = np.fromiter(((w or 0.0) / 100.0 for _, _, w in edges), dtype=np.float64, count=len(edges))
+    return nodes, src, dst, weight
+
+
+def _layout_with_fa2(
+    G: nx.Graph,
+    seed: int = LAYOUT_SEED,
+    iterations: int = 50,
+    deadline: Optional[float] = None,
+) -> dict[str, tuple[float, float]]:
+    """
+    ForceAtlas2 (Barnes-Hut) 레이아웃. 엣지 weight(ratio %) → 0~1 인력 계수.
+    deadline(time.time() 기준) 이 있으면 넘는 순간 그 반복의 좌표로 끝냄 (비용 추정이 빗나갔을 때 안전장치).
+    """
+    nodes, src, dst, weight = _fa2_inputs(G)
+    if deadline is None:
+        xy = forceatlas2(len(nodes), src, dst, weight, seed=seed, iterations=iterations)
+    else:
+        for it, xy in forceatlas2_steps(len(nodes), src, dst, weight, seed=seed, iterations=iterations):
+            if it < iterations and time.time() >= deadline:
+                logger.warning(f"fa2 stopped at iteration {it}/{iterations}: layout time budget exceeded ({len(nodes)} nodes)")
+                break
+    return {nid: (float(x), float(y)) for nid, (x, y) in zip(nodes, xy)}
+
+
+def _layout_with_networkx(G: nx.Graph, scale: float = 1.0, seed: int = LAYOUT_SEED) -> dict[str, tuple[float, float]]:
+    """Kamada-Kawai → Spring 2단계 (KK 가 O(n²) 메모리·수 초 이상이라 작은 그래프용)."""
+    k_val = 5.0 / math.sqrt(G.number_of_nodes())
+    try:
+        pos = nx.kamada_kawai_layout(G, scale=scale)
+    except Exception as ex:
+        logger.warning("kamada_kawai_layout failed: %s, using circular", ex)
+        pos = nx.circular_layout(G, scale=scale)
+    try:
+        pos = nx.spring_layout(G, pos=pos, k=k_val, iterations=30, threshold=1e-4, seed=seed)
+    except Exception as ex:
+        logger.warning("spring_layout refine failed: %s", ex)
+    return pos
+
+
 def _layout_one_graph(
     G: nx.Graph,
     scale: float = 1.0,
     seed: int = LAYOUT_SEED,
-    engine: Literal["networkx", "pygraphviz"] = "networkx",
+    engine: LayoutEngine = "networkx",
 ) -> dict[str, tuple[float, float]]:
     """
     레이아웃 엔진 선택:
     - pygraphviz: Graphviz 기반 (고품질, overlap=scale)
+    - fa2: ForceAtlas2 + Barnes-Hut (수천 노드 이상)
     - networkx: Kamada-Kawai → Spring 2단계 (기본, 폴백)
+    auto 는 요소별 계획(_plan_auto)을 따르므로 _layout_auto_step 으로 처리.
     """
     if engine == "pygraphviz" and HAS_PYGRAPHVIZ:
         try:
@@ -138,17 +254,9 @@ def _layout_one_graph(
         return {}
     if n == 1:
         return {list(G.nodes())[0]: (0.0, 0.0)}
-    k_val = 5.0 / math.sqrt(n)
-    try:
-        pos = nx.kamada_kawai_layout(G, scale=scale)
-    except Exception as ex:
-        logger.warning("kamada_kawai_layout failed: %s, using circular", ex)
-        pos = nx.circular_layout(G, scale=scale)
-    try:
-        pos = nx.spring_layout(G, pos=pos, k=k_val, iterations=30, threshold=1e-4, seed=seed)
-    except Exception as ex:
-        logger.warning("spring_layout refine failed: %s", ex)
-    return pos
+    if engine == "fa2":
+        return _layout_with_fa2(G, seed=seed)
+    return _layout_with_networkx(G, scale=scale, seed=seed)
 
 
 def compute_layout(
@@ -159,16 +267,23 @@ def compute_layout(
     height: float = 1.0,
     padding: float = 0.05,
     use_components: bool = True,
-    engine: Literal["networkx", "pygraphviz"] = "networkx",
+    engine: LayoutEngine = "networkx",
+    positions: Optional[dict[str, dict[str, float]]] = None,
+    pin: bool = True,
 ) -> dict[str, Any]:
     """
-    노드/엣지 리스트 → 단순 그래프 → Kamada-Kawai → Spring → 0~1 정규화.
+    노드/엣지 리스트 → 단순 그래프 → 엔진(Kamada-Kawai → Spring / PyGraphviz / ForceAtlas2 / auto) → 0~1 정규화.
 
     Args:
         nodes: [ {"id": "n1", "type": "...", ...}, ... ]
         edges: [ {"from": "n1", "to": "n2", "ratio": 50.0}, ... ] (동일 쌍 다중 가능)
         padding: 여백 비율. 반환 좌표는 [padding, 1-padding].
         use_components: True면 연결 요소별로 레이아웃 후 그리드 배치.
+        engine: "auto" 면 요소별 엔진 선택 + LAYOUT_AUTO_BUDGET_SEC 시간 예산.
+        positions: 화면에 이미 있는 노드의 0~1 좌표. pin=True 면 그대로 고정하고 새 노드만 배치 (증분).
+        pin: False 면 positions 무시하고 전체 재계산.
+
+    동일 단순 그래프·옵션의 반복 요청은 레이아웃 캐시에서 반환 (재계산 없음).
 
     Returns:
         { "positions": { "n1": {"x": 0.2, "y": 0.5}, ... }, "components": [ ["n1","n2"], ... ] }
@@ -176,6 +291,20 @@ def compute_layout(
     if not nodes:
         return {"positions": {}, "components": []}
 
+    pinned = _parse_pinned(positions) if pin else {}
+    if pinned:
+        G_layout = _build_layout_graph(nodes, edges)
+        pinned = {nid: xy for nid, xy in pinned.items() if nid in G_layout}
+    if pinned:
+        effective_engine = engine if engine != "pygraphviz" or HAS_PYGRAPHVIZ else "networkx"
+        key = _layout_cache_key(G_layout, effective_engine, padding, use_components, pinned)
+        return _layout_cache().get_or_compute(
+            key,
+            lambda: _incremental_layout(
+                G_layout, pinned, padding=padding, use_components=use_components, engine=effective_engine
+            ),
+        )
+
     if not edges:
         # 노드만: 균등 원형, 결정론적 (seed 역할으로 인덱스 순서 고정)
         positions = {}
@@ -191,37 +320,553 @@ def compute_layout(
         return {"positions": positions, "components": comp_list}
 
     G_layout = _build_layout_graph(nodes, edges)
-    components = list(nx.connected_components(G_layout))
-    components = [list(c) for c in sorted(components, key=len, reverse=True)]
+    # pygraphviz 미설치 시 실제로는 networkx → 같은 키로 캐시
+    effective_engine = engine if engine != "pygraphviz" or HAS_PYGRAPHVIZ else "networkx"
+    key = _layout_cache_key(G_layout, effective_engine, padding, use_components)
+    return _layout_cache().get_or_compute(
+        key, lambda: _layout_graph(G_layout, padding=padding, use_components=use_components, engine=effective_engine)
+    )
 
-    positions: dict[str, dict[str, float]] = {}
 
-    if use_components and len(components) > 1:
-        n_comp = len(components)
-        n_cols = math.ceil(math.sqrt(n_comp))
-        n_rows = math.ceil(n_comp / n_cols)
-        cell_w = (1.0 - 2 * padding) / n_cols
-        cell_h = (1.0 - 2 * padding) / n_rows
-        for idx, comp in enumerate(components):
-            sub = G_layout.subgraph(comp).copy()
-            pos_sub = _layout_one_graph(sub, scale=1.0, seed=LAYOUT_SEED, engine=engine)
-            pos_norm = _normalize_positions(pos_sub, padding=0.0)
-            row, col = idx // n_cols, idx % n_cols
-            ox = padding + col * cell_w
-            oy = padding + row * cell_h
-            for nid, p in pos_norm.items():
-                positions[nid] = {
-                    "x": ox + p["x"] * cell_w,
-                    "y": oy + p["y"] * cell_h,
-                }
+def _layout_graph(
+    G_layout: nx.Graph,
+    *,
+    padding: float,
+    use_components: bool,
+    engine: LayoutEngine,
+) -> dict[str, Any]:
+    """
+    단순 그래프 → 레이아웃 (캐시 미스 시에만 실행). 모든 입력 노드가 G_layout 에 포함됨.
+    연결 요소(또는 전체 그래프)를 배치로 묶어 레이아웃 프로세스 풀에서 병렬 계산 후 그리드로 배치.
+    """
+    components = [sorted(c) for c in nx.connected_components(G_layout)]
+    components.sort(key=lambda c: (-len(c), c[0]))
+    split = use_components and len(components) > 1
+    parts = components if split else [list(G_layout.nodes())]
+
+    batches = _component_batches(G_layout, parts)
+    if engine == "auto":
+        budget = get_settings().LAYOUT_AUTO_BUDGET_SEC
+        steps = iter(_plan_auto(G_layout, parts, budget, split))
+        # 계획은 노드·엣지 수로만 정해짐 (결정론적). deadline 은 추정이 빗나갔을 때만 작동
+        deadline = time.time() + budget
+        args = [(batch, engine, [next(steps) for _ in batch], deadline) for batch in batches]
     else:
-        pos_raw = _layout_one_graph(G_layout, scale=1.0, seed=LAYOUT_SEED, engine=engine)
-        pos_norm = _normalize_positions(pos_raw, padding=padding)
-        positions.update(pos_norm)
+        args = [(batch, engine) for batch in batches]
+    results = get_layout_pool().map(
+        _layout_batch,
+        args,
+        inline=G_layout.number_of_nodes() < _POOL_MIN_NODES,
+    )
+    normalized = [pos for batch_result in results for pos in batch_result]
+
+    positions: dict[str, dict[str, float]] = {}
+    for pos_norm, cell in zip(normalized, _component_cells(len(parts), padding)):
+        positions.update(_place_in_cell(pos_norm, cell))
+    return {"positions": positions, "components": components}
+
+
+# (ox, oy, w, h) — 요소 하나가 차지하는 0~1 캔버스 영역
+Cell = tuple[float, float, float, float]
+
+
+def _component_cells(n_parts: int, padding: float) -> list[Cell]:
+    """요소 수 → 그리드 셀 (큰 요소부터 행 우선). 요소가 하나면 여백 제외 전체 영역."""
+    n_cols = math.ceil(math.sqrt(n_parts))
+    n_rows = math.ceil(n_parts / n_cols)
+    cell_w = (1.0 - 2 * padding) / n_cols
+    cell_h = (1.0 - 2 * padding) / n_rows
+    return [
+        (padding + (idx % n_cols) * cell_w, padding + (idx // n_cols) * cell_h, cell_w, cell_h)
+        for idx in range(n_parts)
+    ]
+
+
+def _place_in_cell(pos_norm: dict[str, dict[str, float]], cell: Cell) -> dict[str, dict[str, float]]:
+    ox, oy, w, h = cell
+    return {nid: {"x": ox + p["x"] * w, "y": oy + p["y"] * h} for nid, p in pos_norm.items()}
+
+
+# 이 노드 수 미만 그래프는 프로세스 간 전송 비용이 계산보다 커서 호출 스레드에서 계산
+_POOL_MIN_NODES = 50
+# 작은 연결 요소는 합쳐서 배치당 최소 이 노드 수 (요소마다 IPC 왕복 방지)
+_BATCH_MIN_NODES = 200
+
+# (노드 id 목록, [(u, v, weight), ...]) — 프로세스 간 전송용 (nx.Graph 보다 직렬화가 가벼움)
+ComponentPayload = tuple[list[str], list[tuple[str, str, float]]]
+
+
+def _component_batches(G_layout: nx.Graph, parts: list[list[str]]) -> list[list[ComponentPayload]]:
+    """요소 목록(큰 것부터) → 배치 목록. 큰 요소는 단독, 작은 요소는 _BATCH_MIN_NODES 까지 묶음."""
+    # 엣지를 한 번 훑어 요소별로 분배 (요소마다 subgraph 뷰를 훑으면 요소 수 × 전체 크기)
+    part_of = {nid: i for i, part in enumerate(parts) for nid in part}
+    part_edges: list[list[tuple[str, str, float]]] = [[] for _ in parts]
+    for u, v, w in G_layout.edges(data="weight"):
+        part_edges[part_of[u]].append((u, v, w))
+
+    batches: list[list[ComponentPayload]] = []
+    current: list[ComponentPayload] = []
+    size = 0
+    for part, edges in zip(parts, part_edges):
+        current.append((part, edges))
+        size += len(part)
+        if size >= _BATCH_MIN_NODES:
+            batches.append(current)
+            current, size = [], 0
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _layout_batch(
+    batch: list[ComponentPayload],
+    engine: LayoutEngine,
+    steps: Optional[list["AutoStep"]] = None,
+    deadline: Optional[float] = None,
+) -> list[dict[str, dict[str, float]]]:
+    """배치 내 각 요소 레이아웃 → 0~1 정규화 좌표 (풀 워커 프로세스에서 실행). auto 는 요소별 steps 사용."""
+    if engine == "fa2" and steps is None:
+        return _layout_fa2_batch(batch)
+    out = []
+    for i, (nodes, edges) in enumerate(batch):
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_weighted_edges_from(edges)
+        if steps is not None:
+            pos = _layout_auto_step(G, steps[i], deadline)
+        else:
+            pos = _layout_one_graph(G, scale=1.0, seed=LAYOUT_SEED, engine=engine)
+        out.append(_normalize_positions(pos, padding=0.0))
+    return out
+
+
+# 이 노드 수 이하의 (공식 배치가 안 되는) 요소는 배치 안에서 한 번의 fa2 로 함께 계산
+_FA2_PACK_MAX_NODES = 100
+
+
+def _split_fa2_batch(
+    batch: list[ComponentPayload],
+) -> tuple[dict[int, dict[str, tuple[float, float]]], list[list[int]]]:
+    """
+    engine="fa2" 배치 → (공식 배치 요소 인덱스 → 좌표, fa2 실행 단위 목록 [[요소 인덱스, ...], ...]).
+    요소마다 Pivot MDS + 50 반복을 따로 돌면 작은 요소 수백 개에 수 초 →
+    - 별·체인·고리: 공식 배치 (auto 와 동일)
+    - 나머지 작은 요소: 서로 이어지지 않은 한 그래프로 묶어 fa2 1회 (마지막 실행 단위)
+    - 큰 요소: 단독 fa2
+    동기 레이아웃과 점진 레이아웃이 같은 분할을 써서 결과(캐시 키 공유)가 같음.
+    """
+    closed: dict[int, dict[str, tuple[float, float]]] = {}
+    runs: list[list[int]] = []
+    packed: list[int] = []
+    for i, (nodes, edges) in enumerate(batch):
+        # 엣지는 단순 그래프에서 온 것 (쌍당 1개) → 차수는 끝점 등장 횟수
+        degree = Counter(nid for u, v, _ in edges for nid in (u, v))
+        shape = _closed_form_shape(len(nodes), len(edges), max(degree.values(), default=0))
+        G = _payload_graph([(nodes, edges)]) if shape is not None else None
+        # 요소 분리를 끈 경우 한 부분이 비연결일 수 있음 (공식 배치 조건은 연결 그래프에서만 성립)
+        if G is not None and nx.is_connected(G):
+            closed[i] = _layout_auto_step(G, (shape, 0), None)
+        elif len(nodes) <= _FA2_PACK_MAX_NODES:
+            packed.append(i)
+        else:
+            runs.append([i])
+    if packed:
+        runs.append(packed)
+    return closed, runs
+
+
+def _payload_graph(payloads: list[ComponentPayload]) -> nx.Graph:
+    G = nx.Graph()
+    for nodes, edges in payloads:
+        G.add_nodes_from(nodes)
+        G.add_weighted_edges_from(edges)
+    return G
+
+
+def _layout_fa2_batch(batch: list[ComponentPayload]) -> list[dict[str, dict[str, float]]]:
+    """engine="fa2" 배치 레이아웃 (_split_fa2_batch 의 실행 단위마다 fa2 1회, 좌표는 요소별로 나눠 정규화)."""
+    closed, runs = _split_fa2_batch(batch)
+    out: list[dict[str, dict[str, float]]] = [{} for _ in batch]
+    for i, pos in closed.items():
+        out[i] = _normalize_positions(pos, padding=0.0)
+    for run in runs:
+        pos = _layout_one_graph(_payload_graph([batch[i] for i in run]), scale=1.0, seed=LAYOUT_SEED, engine="fa2")
+        for i in run:
+            out[i] = _normalize_positions({nid: pos[nid] for nid in batch[i][0]}, padding=0.0)
+    return out
+
+
+# ── 자동 엔진 선택 (engine="auto") ────────────────────────────────────────────
+# 요소 하나의 계획: (방법, fa2 반복 수). 방법 = star | chain | ring (공식 배치) | kk | fa2
+AutoStep = tuple[str, int]
 
-    for n in nodes:
-        nid = n.get("id")
-        if nid and nid not in positions:
-            positions[nid] = {"x": 0.5, "y": 0.5}
+# 이 노드 수 이하 요소만 KK (KK ≈ n^2.5: 100 노드 ~0.15초, 300 노드 ~2초)
+_AUTO_KK_MAX_NODES = 100
+# 요소 비용 추정 계수 (초). 합성 지분 그래프 기준 측정값, 보수적으로 반올림
+_AUTO_KK_COST = 1.5e-6  # × n^2.5
+_AUTO_FA2_INIT_COST = 2e-5  # × (n + m), Pivot MDS 초기 배치
+_AUTO_FA2_ITER_COST = 4e-6  # × (n + m), 반복 1회
+_AUTO_OVERHEAD_COST = 1.5e-5  # × 전체 (n + m): 그래프 구성·요소 분리·정규화 등 엔진 밖 파이썬 비용
+# fa2 반복 수 범위: 예산이 넉넉해도 기본 반복 이상은 수렴 이득이 작음, 모자라면 초기 배치만(0)
+_AUTO_FA2_MAX_ITERATIONS = 50
+# KK 요소가 쓸 수 있는 예산 비율 (나머지는 큰 요소의 fa2 반복)
+_AUTO_KK_BUDGET_SHARE = 0.5
+
+
+def _closed_form_shape(n: int, m: int, max_degree: int) -> Optional[str]:
+    """
+    연결 그래프의 노드·엣지 수·최대 차수 → 공식 배치 모양: star(허브 1 + 잎), chain(경로), ring(단일 고리).
+    연결 그래프에서만 성립 (예: 고리 + 떨어진 경로도 chain 조건을 만족).
+    """
+    if n < 2:
+        return None
+    if m == n - 1 and max_degree == n - 1:
+        return "star"
+    if max_degree == 2 and m in (n - 1, n):
+        return "chain" if m == n - 1 else "ring"
+    return None
+
+
+def _plan_auto(G_layout: nx.Graph, parts: list[list[str]], budget_sec: float, split: bool) -> list[AutoStep]:
+    """
+    요소별 배치 방법 + fa2 반복 수 (노드·엣지 수로만 결정 → 같은 그래프·예산이면 같은 계획).
+    - 별·체인·고리: 공식 배치 (비용 ~0)
+    - _AUTO_KK_MAX_NODES 이하: KK → Spring. 합계 추정이 예산의 절반을 넘으면 큰 것부터 fa2 로 내림
+    - 나머지: fa2. 남은 예산 ÷ 요소들의 반복당 비용 합 = 공통 반복 수 (0 이면 Pivot MDS 초기 배치만)
+    요소들이 풀 워커에서 병렬로 돌아도 추정은 직렬 합 기준 (보수적).
+    하한은 그래프 구성 + 초기 배치 비용 — 수만 노드 요소에 예산이 그보다 작으면 초기 배치만 하고도 넘을 수 있음.
+    """
+    degree = dict(G_layout.degree())
+    methods: list[str] = []
+    sizes: list[tuple[int, int]] = []
+    for part in parts:
+        # 요소 단위면 모든 엣지가 요소 내부 → 차수 합 / 2 = 엣지 수
+        n, m = len(part), sum(degree[nid] for nid in part) // 2
+        sizes.append((n, m))
+        shape = _closed_form_shape(n, m, max((degree[nid] for nid in part), default=0))
+        if shape is not None and not split and not nx.is_connected(G_layout):
+            shape = None
+        methods.append(shape or ("kk" if n <= _AUTO_KK_MAX_NODES else "fa2"))
+
+    kk_cost = {i: _AUTO_KK_COST * sizes[i][0] ** 2.5 for i, method in enumerate(methods) if method == "kk"}
+    kk_total = sum(kk_cost.values())
+    for i in sorted(kk_cost, key=lambda i: -sizes[i][0]):
+        if kk_total <= budget_sec * _AUTO_KK_BUDGET_SHARE:
+            break
+        methods[i] = "fa2"
+        kk_total -= kk_cost[i]
+
+    fa2_parts = [i for i, method in enumerate(methods) if method == "fa2"]
+    iterations = 0
+    if fa2_parts:
+        init = sum(_AUTO_FA2_INIT_COST * (sizes[i][0] + sizes[i][1]) for i in fa2_parts)
+        per_iteration = sum(_AUTO_FA2_ITER_COST * (sizes[i][0] + sizes[i][1]) for i in fa2_parts)
+        overhead = _AUTO_OVERHEAD_COST * (G_layout.number_of_nodes() + G_layout.number_of_edges())
+        remaining = budget_sec - overhead - kk_total - init
+        iterations = max(0, min(_AUTO_FA2_MAX_ITERATIONS, int(remaining / per_iteration)))
+        if iterations < _AUTO_FA2_MAX_ITERATIONS:
+            logger.info(
+                f"auto layout: {len(fa2_parts)} fa2 components "
+                f"({sum(sizes[i][0] for i in fa2_parts)} nodes) get {iterations} iterations within {budget_sec}s"
+            )
+    return [(method, iterations if method == "fa2" else 0) for method in methods]
+
+
+def _layout_auto_step(G: nx.Graph, step: AutoStep, deadline: Optional[float]) -> dict[str, tuple[float, float]]:
+    method, iterations = step
+    nodes = list(G.nodes())
+    if method == "star":
+        hub = max(nodes, key=lambda nid: (G.degree(nid), nid))
+        leaves = [nid for nid in nodes if nid != hub]
+        # π/4 에서 시작: 잎이 하나여도 두 축 모두 폭이 생김 (정규화 시 한 줄로 눌리지 않음)
+        angles = [math.pi / 4 + 2 * math.pi * i / len(leaves) for i in range(len(leaves))]
+        pos = {nid: (math.cos(a), math.sin(a)) for nid, a in zip(leaves, angles)}
+        pos[hub] = (0.0, 0.0)
+        return pos
+    if method in ("chain", "ring"):
+        start = min(nid for nid in nodes if G.degree(nid) == 1) if method == "chain" else nodes[0]
+        order = [start, *(v for _, v in nx.dfs_edges(G, start))]
+        if method == "ring":
+            return {
+                nid: (math.cos(2 * math.pi * i / len(order)), math.sin(2 * math.pi * i / len(order)))
+                for i, nid in enumerate(order)
+            }
+        # 지그재그(부스트로페돈) 격자: 긴 체인도 셀을 고르게 채움
+        row = math.ceil(math.sqrt(len(order)))
+        return {
+            nid: (float(i % row if (i // row) % 2 == 0 else row - 1 - i % row), float(i // row))
+            for i, nid in enumerate(order)
+        }
+    if method == "fa2":
+        return _layout_with_fa2(G, seed=LAYOUT_SEED, iterations=iterations, deadline=deadline)
+    return _layout_one_graph(G, scale=1.0, seed=LAYOUT_SEED, engine="networkx")
+
+
+# ── 증분 레이아웃 (기존 노드 고정) ─────────────────────────────────────────────
+def _parse_pinned(positions: Optional[dict[str, dict[str, float]]]) -> dict[str, tuple[float, float]]:
+    """요청 positions → {id: (x, y)}. 숫자가 아닌 좌표는 무시."""
+    out: dict[str, tuple[float, float]] = {}
+    for nid, p in (positions or {}).items():
+        try:
+            x, y = float(p["x"]), float(p["y"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if math.isfinite(x) and math.isfinite(y):
+            out[nid] = (x, y)
+    return out
+
+
+def _incremental_layout(
+    G_layout: nx.Graph,
+    pinned: dict[str, tuple[float, float]],
+    *,
+    padding: float,
+    use_components: bool,
+    engine: LayoutEngine,
+) -> dict[str, Any]:
+    """
+    고정 노드는 입력 좌표 그대로, 새 노드만 배치 (비용 ∝ 새 노드 + 인접 고정 노드).
+    - 고정 노드와 같은 연결 요소의 새 노드: 이웃 무게중심에서 시작, 새 노드 + 인접 고정 노드 부분그래프만
+      spring_layout(fixed=인접 고정 노드) 으로 이완
+    - 고정 노드가 없는 새 연결 요소: 따로 레이아웃 후 고정 노드가 가장 적은 모서리 영역에 축소 배치
+    """
+    components = [sorted(c) for c in nx.connected_components(G_layout)]
+    components.sort(key=lambda c: (-len(c), c[0]))
+    positions = {nid: {"x": x, "y": y} for nid, (x, y) in pinned.items()}
+
+    anchored: list[str] = []
+    floating: list[str] = []
+    for comp in components:
+        fresh = [nid for nid in comp if nid not in pinned]
+        if fresh:
+            (anchored if len(fresh) < len(comp) else floating).extend(fresh)
+
+    if anchored:
+        payload = _relax_payload(G_layout, sorted(anchored), pinned)
+        relaxed = get_layout_pool().map(_relax_new_nodes, [payload], inline=len(anchored) < _POOL_MIN_NODES)[0]
+        positions.update(relaxed)
+    if floating:
+        sub = G_layout.subgraph(sorted(floating)).copy()
+        placed = _layout_graph(sub, padding=0.0, use_components=use_components, engine=engine)["positions"]
+        positions.update(_place_in_free_corner(placed, pinned, len(floating) / G_layout.number_of_nodes(), padding))
 
     return {"positions": positions, "components": components}
+
+
+def _relax_payload(
+    G_layout: nx.Graph,
+    fresh: list[str],
+    pinned: dict[str, tuple[float, float]],
+) -> tuple[list[str], list[tuple[str, str, float]], dict[str, tuple[float, float]], list[str], float]:
+    """
+    새 노드 초기 좌표 (고정 이웃에서 BFS 로 한 층씩: 배치된 이웃 무게중심 + 시드 지터) 와
+    이완 대상 부분그래프 (새 노드 + 인접 고정 노드) 구성.
+    """
+    boundary = sorted({nb for nid in fresh for nb in G_layout[nid] if nb in pinned})
+    k = _pinned_edge_length(G_layout, pinned)
+    rng = np.random.default_rng(LAYOUT_SEED)
+
+    init: dict[str, tuple[float, float]] = {nid: pinned[nid] for nid in boundary}
+    remaining = list(fresh)
+    while remaining:
+        layer = [nid for nid in remaining if any(nb in init for nb in G_layout[nid])]
+        for nid in layer:
+            placed = [init[nb] for nb in G_layout[nid] if nb in init]
+            cx = sum(p[0] for p in placed) / len(placed)
+            cy = sum(p[1] for p in placed) / len(placed)
+            jx, jy = rng.normal(scale=k * 0.5, size=2)
+            init[nid] = (cx + float(jx), cy + float(jy))
+        layer_set = set(layer)
+        remaining = [nid for nid in remaining if nid not in layer_set]
+
+    nodes = boundary + fresh
+    edges = list(G_layout.subgraph(nodes).edges(data="weight"))
+    return nodes, edges, init, boundary, k
+
+
+def _relax_new_nodes(
+    nodes: list[str],
+    edges: list[tuple[str, str, float]],
+    init: dict[str, tuple[float, float]],
+    fixed: list[str],
+    k: float,
+) -> dict[str, dict[str, float]]:
+    """고정 노드는 두고 새 노드만 spring 이완 (fixed 지정 시 재스케일 없음 → 기존 좌표계 유지)."""
+    H = nx.Graph()
+    H.add_nodes_from(nodes)
+    H.add_weighted_edges_from(edges)
+    try:
+        pos = nx.spring_layout(H, pos=init, fixed=fixed or None, k=k, iterations=50, seed=LAYOUT_SEED)
+    except Exception as ex:
+        logger.warning("incremental spring_layout failed: %s, using initial positions", ex)
+        pos = init
+    fixed_set = set(fixed)
+    return {
+        nid: {"x": min(1.0, max(0.0, float(pos[nid][0]))), "y": min(1.0, max(0.0, float(pos[nid][1])))}
+        for nid in nodes
+        if nid not in fixed_set
+    }
+
+
+def _pinned_edge_length(G_layout: nx.Graph, pinned: dict[str, tuple[float, float]]) -> float:
+    """고정 노드끼리 엣지의 중앙값 길이 (새 노드 간격 기준). 없으면 노드 수 기반 기본값."""
+    lengths = [
+        math.dist(pinned[u], pinned[v])
+        for u, v in G_layout.edges()
+        if u in pinned and v in pinned
+    ]
+    lengths = [d for d in lengths if d > 0]
+    if lengths:
+        return float(np.median(lengths))
+    return 1.0 / math.sqrt(max(G_layout.number_of_nodes(), 1))
+
+
+def _place_in_free_corner(
+    placed: dict[str, dict[str, float]],
+    pinned: dict[str, tuple[float, float]],
+    share: float,
+    padding: float,
+) -> dict[str, dict[str, float]]:
+    """0~1 레이아웃을 고정 노드가 가장 적은 모서리의 정사각형 영역(크기 ∝ √노드 비율)으로 축소."""
+    size = min(0.5, max(0.15, math.sqrt(share)))
+    lo, hi = padding, 1.0 - padding - size
+    corners = [(lo, lo), (hi, lo), (lo, hi), (hi, hi)]
+
+    def crowd(corner: tuple[float, float]) -> int:
+        ox, oy = corner
+        return sum(1 for x, y in pinned.values() if ox <= x <= ox + size and oy <= y <= oy + size)
+
+    ox, oy = min(corners, key=crowd)
+    return {nid: {"x": ox + p["x"] * size, "y": oy + p["y"] * size} for nid, p in placed.items()}
+
+
+
+# ── 점진 레이아웃 (초기 배치 즉시 + fa2 반복 중간 결과 스트리밍) ───────────────────────
+# fa2 실행 단위 하나: (노드 id 목록, 엣지, [(요소 노드 id 목록, 캔버스 셀), ...]) — 작은 요소 여럿을 묶은 단위는 셀도 여럿
+ProgressivePart = tuple[list[str], list[tuple[str, str, float]], list[tuple[list[str], Cell]]]
+
+
+def plan_progressive(
+    nodes: list[dict[str, Any]],
+    edges: list[dict[str, Any]],
+    *,
+    padding: float = 0.05,
+    use_components: bool = True,
+) -> dict[str, Any]:
+    """
+    점진 레이아웃 준비 (요청 스레드에서, fa2 계산 없이).
+    요소 분할·엣지 분배·별/체인/고리 공식 배치·작은 요소 묶음은 engine="fa2" 동기 레이아웃과 같음.
+    fa2 실행 단위(큰 요소 + 배치마다 작은 요소 묶음)의 요소는 셀 안 원형으로 두고, Pivot MDS 부터는
+    refine_layout 이 풀에서 계산 (첫 progress 이벤트가 Pivot MDS 배치).
+
+    Returns:
+        {
+          "key": fa2 동기 레이아웃과 같은 캐시 키 (정제 결과를 그대로 캐시에 넣을 수 있음),
+          "cached": 캐시 적중 시 완성 결과, 아니면 None,
+          "positions": 초기 0~1 좌표 (공식 배치 또는 원형 → 그리드 셀),
+          "components": 연결 요소 목록,
+          "parts": refine_layout 입력 (fa2 실행 단위, 없으면 초기 배치가 곧 최종),
+        }
+    """
+    G_layout = _build_layout_graph(nodes, edges)
+    key = _layout_cache_key(G_layout, "fa2", padding, use_components)
+    cached = _layout_cache().get(key)
+    components = [sorted(c) for c in nx.connected_components(G_layout)]
+    components.sort(key=lambda c: (-len(c), c[0]))
+    if cached is not None:
+        return {"key": key, "cached": cached, "positions": cached["positions"], "components": components, "parts": []}
+
+    split = use_components and len(components) > 1
+    groups = components if split else [list(G_layout.nodes())]
+    cells = iter(_component_cells(len(groups), padding))
+    positions: dict[str, dict[str, float]] = {}
+    parts: list[ProgressivePart] = []
+    for batch in _component_batches(G_layout, groups):
+        batch_cells = [next(cells) for _ in batch]
+        closed, runs = _split_fa2_batch(batch)
+        for i, pos in closed.items():
+            positions.update(_place_in_cell(_normalize_positions(pos, padding=0.0), batch_cells[i]))
+        for run in runs:
+            parts.append((
+                [nid for i in run for nid in batch[i][0]],
+                [e for i in run for e in batch[i][1]],
+                [(batch[i][0], batch_cells[i]) for i in run],
+            ))
+            for i in run:
+                positions.update(_place_in_cell(_circle_positions(batch[i][0]), batch_cells[i]))
+    return {"key": key, "cached": None, "positions": positions, "components": components, "parts": parts}
+
+
+def cache_layout(key: str, result: dict[str, Any]) -> None:
+    """정제 완료 결과를 plan_progressive 의 키로 저장 (fa2 동기 요청과 공유)."""
+    _layout_cache().set(key, result)
+
+
+def refine_layout(job_id: str, parts: list[ProgressivePart], budget_sec: float, emit_sec: float) -> dict[str, Any]:
+    """
+    실행 단위별 fa2 반복 (큰 요소부터, 풀 워커 프로세스에서 실행).
+    emit_sec 마다 그동안 바뀐 좌표를 {"type": "progress", ...} 로 report_progress.
+    budget_sec 초과 시 진행 중 요소는 현재 좌표로 끊고 남은 요소는 초기 배치 그대로 (truncated=True).
+    예산 안에 끝나면 결과는 engine="fa2" 동기 레이아웃과 동일.
+    """
+    started = time.monotonic()
+    deadline = started + budget_sec
+    last_emit = started
+    positions: dict[str, dict[str, float]] = {}
+    dirty: dict[str, dict[str, float]] = {}
+    truncated = False
+
+    for idx, (part_nodes, part_edges, part_cells) in enumerate(parts):
+        xy = None
+        for it, xy in _fa2_part_steps(part_nodes, part_edges):
+            now = time.monotonic()
+            if now >= deadline:
+                truncated = True
+                break
+            # 반복 0 (Pivot MDS) 은 바로 전송: plan_progressive 의 원형 자리 표시를 대체
+            if it == 0 or now - last_emit >= emit_sec:
+                dirty.update(_place_part(part_nodes, xy, part_cells))
+                report_progress(job_id, {"type": "progress", "part": idx, "iteration": it, "positions": _rounded(dirty)})
+                dirty, last_emit = {}, now
+        placed = _place_part(part_nodes, xy, part_cells)
+        positions.update(placed)
+        dirty.update(placed)
+
+    return {
+        "positions": positions,
+        "truncated": truncated,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 1),
+    }
+
+
+def _fa2_part_steps(part_nodes: list[str], part_edges: list[tuple[str, str, float]]):
+    # _layout_fa2_batch 와 같은 노드·엣지 순서 → 같은 fa2 입력
+    G = _payload_graph([(part_nodes, part_edges)])
+    _, src, dst, weight = _fa2_inputs(G)
+    return forceatlas2_steps(len(part_nodes), src, dst, weight, seed=LAYOUT_SEED)
+
+
+def _circle_positions(group: list[str]) -> dict[str, dict[str, float]]:
+    """요소 노드를 0~1 정사각형 안 원 위에 id 순서로 (fa2 초기 배치가 오기 전 자리 표시)."""
+    if len(group) == 1:
+        return {group[0]: {"x": 0.5, "y": 0.5}}
+    step = 2 * math.pi / len(group)
+    return {nid: {"x": 0.5 + 0.5 * math.cos(i * step), "y": 0.5 + 0.5 * math.sin(i * step)} for i, nid in enumerate(group)}
+
+
+def _place_part(
+    part_nodes: list[str],
+    xy: np.ndarray,
+    part_cells: list[tuple[list[str], Cell]],
+) -> dict[str, dict[str, float]]:
+    """실행 단위 좌표 → 요소별 정규화 → 각 요소의 셀."""
+    coords = {nid: (float(x), float(y)) for nid, (x, y) in zip(part_nodes, xy)}
+    placed: dict[str, dict[str, float]] = {}
+    for group, cell in part_cells:
+        placed.update(_place_in_cell(_normalize_positions({nid: coords[nid] for nid in group}, padding=0.0), cell))
+    return placed
+
+
+def _rounded(positions: dict[str, dict[str, float]]) -> dict[str, dict[str, float]]:
+    # 중간 결과는 화면 표시용 → 소수 5자리 (이벤트 크기 ~절반)
+    return {nid: {"x": round(p["x"], 5), "y": round(p["y"], 5)} for nid, p in positions.items()}
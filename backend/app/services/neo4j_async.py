@@ -0,0 +1,108 @@
+"""
+비동기 Neo4j 읽기 계층 (neo4j.AsyncDriver).
+
+그래프 조회 엔드포인트(/graph/*) 전용. 동기 Neo4jGraph.query 는 DB 대기 동안
+Starlette 스레드풀 스레드를 점유하므로, 조회 경로는 이벤트 루프 위에서 대기하도록 분리.
+LangChain Neo4jGraph 는 QA 체인(GraphCypherQAChain)에서만 사용.
+
+- 커넥션 풀 크기 / fetch size / 풀 획득 타임아웃: 설정(NEO4J_*)으로 조정
+- 읽기 트랜잭션(execute_read): 클러스터 라우팅 시 리더로 분산, 일시 오류 자동 재시도
+- 서킷 브레이커: 동기 경로와 동일한 브레이커 공유 (OPEN 이면 DB 대기 없이 즉시 503)
+"""
+import logging
+from typing import Any, AsyncIterator, Optional
+
+from neo4j import READ_ACCESS, AsyncDriver, AsyncGraphDatabase
+from neo4j.exceptions import Neo4jError
+
+from app.core import get_settings
+from app.services.neo4j_connection import CONNECTION_ERRORS, CircuitOpenError, get_connection_manager
+
+logger = logging.getLogger(__name__)
+
+# ── Lazy 싱글톤 (첫 조회 시 1회 생성, 종료 시 close) ───────────────────────
+_driver: AsyncDriver | None = None
+
+
+def get_async_driver() -> AsyncDriver:
+    global _driver
+    if _driver is None:
+        s = get_settings()
+        _driver = AsyncGraphDatabase.driver(
+            s.NEO4J_URI,
+            auth=(s.NEO4J_USER, s.NEO4J_PASSWORD),
+            max_connection_pool_size=s.NEO4J_MAX_POOL_SIZE,
+            connection_acquisition_timeout=s.NEO4J_ACQUIRE_TIMEOUT,
+            fetch_size=s.NEO4J_FETCH_SIZE,
+        )
+    return _driver
+
+
+async def close_async_driver() -> None:
+    """앱 종료 시 커넥션 풀 정리."""
+    global _driver
+    if _driver is not None:
+        await _driver.close()
+        _driver = None
+
+
+class AsyncGraphReader:
+    """
+    Neo4jGraph.query 와 동일한 호출 형태(query, params) → list[dict].
+    엔드포인트의 Cypher 헬퍼가 동기/비동기 구현과 무관하게 같은 모양으로 작성되도록 함.
+    """
+
+    async def query(self, query: str, params: Optional[dict[str, Any]] = None) -> list[dict]:
+        s = get_settings()
+
+        async def _work(tx):
+            result = await tx.run(query, params or {})
+            return [record.data() async for record in result]
+
+        breaker = get_connection_manager().breaker
+        if not breaker.allow_request():
+            raise CircuitOpenError("Neo4j circuit breaker is open")
+        try:
+            async with get_async_driver().session(fetch_size=s.NEO4J_FETCH_SIZE) as session:
+                rows = await session.execute_read(_work)
+        except CONNECTION_ERRORS as e:
+            breaker.record_failure(e)
+            raise
+        except Neo4jError:
+            # 서버가 응답한 오류(쿼리 오류 등)는 연결 정상으로 간주
+            breaker.record_success()
+            raise
+        breaker.record_success()
+        return rows
+
+    async def stream(self, query: str, params: Optional[dict[str, Any]] = None) -> AsyncIterator[dict]:
+        """
+        레코드 도착 즉시 1건씩 반환 (fetch_size 단위로 당겨옴 → 메모리 일정).
+        재시도 가능한 트랜잭션 함수(execute_read) 대신 자동 커밋 읽기 세션 사용: 이미 내보낸 행을 되돌릴 수 없으므로.
+        """
+        s = get_settings()
+        breaker = get_connection_manager().breaker
+        if not breaker.allow_request():
+            raise CircuitOpenError("Neo4j circuit breaker is open")
+        try:
+            async with get_async_driver().session(
+                fetch_size=s.NEO4J_FETCH_SIZE, default_access_mode=READ_ACCESS
+            ) as session:
+                result = await session.run(query, params or {})
+                async for record in result:
+                    yield record.data()
+        except CONNECTION_ERRORS as e:
+            breaker.record_failure(e)
+            raise
+        except Neo4jError:
+            breaker.record_success()
+            raise
+        breaker.record_success()
+
+
+_reader = AsyncGraphReader()
+
+
+def get_async_graph() -> AsyncGraphReader:
+    """그래프 조회 엔드포인트용 비동기 리더 반환."""
+    return _reader
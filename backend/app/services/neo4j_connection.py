@@ -0,0 +1,232 @@
+"""
+Neo4j 연결 관리자: 백그라운드 라이브니스 프로브 + 서킷 브레이커 + 스키마 캐시.
+
+기존 GraphService.get_graph() 는 요청마다 `RETURN 1` 핑을 보내고(요청당 왕복 1회 추가),
+실패 시 refresh_schema() 포함 싱글톤을 재생성했음.
+- 요청 경로: 핑 없이 준비된 Neo4jGraph 반환. 브레이커 OPEN 이면 즉시 CircuitOpenError(503).
+- 라이브니스: 백그라운드 스레드가 주기적으로 프로브, 결과를 브레이커에 기록.
+- 브레이커: CLOSED → (연속 실패 N회) OPEN → (reset 경과) HALF_OPEN → 시험 요청 1건 성공 시 CLOSED.
+- 스키마: 최초 1회만 refresh_schema(), 재연결 시 캐시된 스키마 재사용.
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from langchain_neo4j import Neo4jGraph
+from neo4j.exceptions import ServiceUnavailable, SessionExpired
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+# 연결 장애로 간주하는 예외 (쿼리 문법 오류 등 ClientError 는 제외)
+CONNECTION_ERRORS = (ServiceUnavailable, SessionExpired, ConnectionError, OSError)
+
+
+class CircuitOpenError(ServiceUnavailable):
+    """브레이커 OPEN 상태에서 요청 차단. ServiceUnavailable 하위라 기존 503 처리 경로를 그대로 탄다."""
+
+
+class CircuitBreaker:
+    """스레드 안전 서킷 브레이커 (CLOSED / OPEN / HALF_OPEN)."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def _current_state(self) -> str:
+        # 호출자는 self._lock 보유
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._trial_started_at = None
+        return self._state
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self) -> bool:
+        """CLOSED: 허용. OPEN: 차단. HALF_OPEN: 시험 요청 1건만 허용 (진행 중 시험이 오래 걸리면 재허용)."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.OPEN:
+                return False
+            now = time.monotonic()
+            if self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("Neo4j circuit breaker closed (connection recovered)")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_started_at = None
+            self._last_error = None
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if error is not None:
+                self._last_error = str(error)[:200]
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    logger.warning(f"Neo4j circuit breaker opened after {self._failures} failure(s): {self._last_error}")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_started_at = None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            state = self._current_state()
+            retry_in = None
+            if state == self.OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "retry_in_sec": retry_in,
+                "last_error": self._last_error,
+            }
+
+
+class Neo4jConnectionManager:
+    """Neo4jGraph 싱글톤 + 브레이커 + 백그라운드 프로브."""
+
+    def __init__(self):
+        s = get_settings()
+        self.breaker = CircuitBreaker(
+            failure_threshold=s.NEO4J_BREAKER_FAILURES,
+            reset_timeout=s.NEO4J_BREAKER_RESET_SEC,
+        )
+        self.probe_interval = s.NEO4J_PROBE_INTERVAL_SEC
+        self._graph: Neo4jGraph | None = None
+        self._schema: Optional[tuple[str, dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_probe_at: Optional[str] = None
+        self._last_probe_ok: Optional[bool] = None
+        self._last_probe_ms: Optional[float] = None
+
+    # ── 연결 ───────────────────────────────────────────────────────────────
+    def _ensure_graph(self) -> Neo4jGraph:
+        with self._lock:
+            if self._graph is None:
+                s = get_settings()
+                graph = Neo4jGraph(
+                    url=s.NEO4J_URI,
+                    username=s.NEO4J_USER,
+                    password=s.NEO4J_PASSWORD,
+                    # enhanced_schema=True 시 스키마 토큰 급증·컨텍스트 초과 가능. 도메인 규칙은 프롬프트에 명시하므로 기본 스키마 사용.
+                    enhanced_schema=False,
+                    refresh_schema=False,
+                )
+                if self._schema is None:
+                    graph.refresh_schema()
+                    self._schema = (graph.schema, graph.structured_schema)
+                else:
+                    # 재연결: 캐시된 스키마 재사용 (APOC 메타 조회 생략)
+                    graph.schema, graph.structured_schema = self._schema
+                self._graph = graph
+            return self._graph
+
+    def get_graph(self) -> Neo4jGraph:
+        """요청 경로: 핑 없이 준비된 그래프 반환. 브레이커 OPEN 이면 CircuitOpenError."""
+        if not self.breaker.allow_request():
+            raise CircuitOpenError("Neo4j circuit breaker is open")
+        try:
+            graph = self._ensure_graph()
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise
+        if self.breaker.state == CircuitBreaker.HALF_OPEN:
+            # 시험 요청: 실제 연결 확인 후 브레이커 상태 결정. 실패면 다시 OPEN → 죽은 연결을 넘기지 않음
+            if not self.probe():
+                raise CircuitOpenError("Neo4j circuit breaker is open")
+        return graph
+
+    def refresh_schema(self) -> None:
+        """데이터 모델 변경(재적재 등) 시 명시적으로 스키마 캐시 갱신."""
+        graph = self._ensure_graph()
+        graph.refresh_schema()
+        with self._lock:
+            self._schema = (graph.schema, graph.structured_schema)
+
+    # ── 라이브니스 프로브 ──────────────────────────────────────────────────
+    def probe(self) -> bool:
+        """연결 확인 1회. 결과를 브레이커에 기록."""
+        t0 = time.perf_counter()
+        try:
+            self._ensure_graph().query("RETURN 1 AS ok")
+            ok = True
+            self.breaker.record_success()
+        except Exception as e:
+            ok = False
+            logger.warning(f"Neo4j liveness probe failed: {e}")
+            self.breaker.record_failure(e)
+        self._last_probe_at = datetime.now().isoformat()
+        self._last_probe_ok = ok
+        self._last_probe_ms = round((time.perf_counter() - t0) * 1000, 1)
+        return ok
+
+    def _probe_loop(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            # OPEN 상태에서는 reset_timeout 이 지나 HALF_OPEN 이 된 뒤에만 시험 프로브
+            if self.breaker.state == CircuitBreaker.OPEN:
+                continue
+            self.probe()
+
+    def start(self) -> None:
+        """백그라운드 프로브 시작 (앱 startup)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._probe_loop, name="neo4j_probe", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """백그라운드 프로브 중지 (앱 shutdown)."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def status(self) -> dict:
+        """/health 노출용 상태."""
+        return {
+            **self.breaker.snapshot(),
+            "last_probe_at": self._last_probe_at,
+            "last_probe_ok": self._last_probe_ok,
+            "last_probe_ms": self._last_probe_ms,
+            "probe_interval_sec": self.probe_interval,
+            "schema_cached": self._schema is not None,
+        }
+
+
+_manager: Neo4jConnectionManager | None = None
+
+
+def get_connection_manager() -> Neo4jConnectionManager:
+    global _manager
+    if _manager is None:
+        _manager = Neo4jConnectionManager()
+    return _manager
@@ -0,0 +1,304 @@
+"""
+지분 그래프 분석 (CSR 엔진 기반 희소 행렬 연산).
+
+통합(간접) 지분율: A[i, j] = i 가 j 를 직접 보유한 지분(0~1) 일 때, 법인 주주 체인을 거친
+실효 지분은 T = A + A² + A³ + … = A (I − A)⁻¹.
+- 대상 회사 c 의 열 T[:, c] 만 필요하므로 역행렬/분해 없이 절단 급수로 계산:
+  v₁ = A[:, c], v_{k+1} = A v_k, 합이 tol 미만으로 수렴하거나 max_depth 에 도달하면 종료
+- 순환 출자가 있어도 경로 곱이 1 미만이면 수렴 (비정상 ratio 는 0~1 로 잘라 발산 방지)
+- 행렬은 엔진 CSR 배열(out_offsets/out_targets/out_ratio)을 그대로 사용 → 복사 1회, 스냅샷당 1회 생성
+
+순환 출자: 같은 행렬에서 SCC(scipy.sparse.csgraph) 계산 후 SCC 내부 짧은 순환만 열거해 인덱스로 보관.
+엔진 로드 직후 배치로 계산, 요청은 인덱스 조회만 (가변 길이 Cypher 탐색 없음).
+
+커뮤니티: 무방향 단순 그래프(쌍당 max ratio 가중)에 Louvain → 커뮤니티별 멤버(중요도순)와
+커뮤니티 간 방향 슈퍼 엣지(관계 수·ratio 합·최대)를 스냅샷당 1회 집계 (/graph/clusters 첫 화면용).
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from app.core import get_settings
+from app.services.ownership_engine import OwnershipGraph
+
+logger = logging.getLogger(__name__)
+
+_matrix_lock = threading.Lock()
+_matrix_cache: dict[str, sparse.csr_matrix] = {}  # 스냅샷 version → A (최신 1개만 유지)
+
+
+def ownership_matrix(g: OwnershipGraph) -> sparse.csr_matrix:
+    """직접 지분 행렬 A (행=주주, 열=회사, 값=max ratio/100, 0~1 클립). 스냅샷당 1회 생성."""
+    with _matrix_lock:
+        a = _matrix_cache.get(g.version)
+        if a is None:
+            data = np.clip(np.asarray(g.out_ratio, dtype=np.float64) / 100.0, 0.0, 1.0)
+            a = sparse.csr_matrix(
+                (data, np.asarray(g.out_targets), np.asarray(g.out_offsets)),
+                shape=(g.n_nodes, g.n_nodes),
+            )
+            _matrix_cache.clear()
+            _matrix_cache[g.version] = a
+        return a
+
+
+def integrated_ownership(
+    g: OwnershipGraph,
+    target: int,
+    max_depth: int = 20,
+    tol: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray, int, bool]:
+    """
+    대상 노드 인덱스 target 에 대한 주주별 (실효 지분, 직접 지분) 벡터 (0~1).
+    반환: (effective, direct, 반복 횟수, 수렴 여부)
+    """
+    a = ownership_matrix(g)
+    direct = a[:, target].toarray().ravel()
+    total = direct.copy()
+    v = direct
+    depth = 1
+    converged = not v.any()
+    while not converged and depth < max_depth:
+        v = a @ v
+        total += v
+        depth += 1
+        converged = float(v.sum()) < tol
+    return total, direct, depth, converged
+
+
+def top_ultimate_owners(
+    g: OwnershipGraph,
+    target: int,
+    limit: int = 20,
+    terminal_only: bool = True,
+    max_depth: int = 20,
+    tol: float = 1e-6,
+) -> dict:
+    """
+    실효 지분 상위 주주. terminal_only=True 면 스스로는 보유되지 않는 최종 주주(개인·최상위 법인)만.
+    결과 id 는 Neo4j internal id.
+    """
+    effective, direct, depth, converged = integrated_ownership(g, target, max_depth, tol)
+    effective[target] = 0.0  # 순환 출자로 자기 자신에게 돌아오는 지분 제외
+    candidates = np.flatnonzero(effective > tol)
+    terminal = np.diff(np.asarray(g.in_offsets))[candidates] == 0
+    if terminal_only:
+        candidates, terminal = candidates[terminal], terminal[terminal]
+    if candidates.size > limit:
+        part = np.argpartition(-effective[candidates], limit - 1)[:limit]
+        candidates, terminal = candidates[part], terminal[part]
+    order = np.argsort(-effective[candidates], kind="stable")
+    owners = [
+        {
+            "id": int(g.node_ids[i]),
+            "effective": float(effective[i]) * 100.0,
+            "direct": float(direct[i]) * 100.0,
+            "terminal": bool(t),
+        }
+        for i, t in zip(candidates[order], terminal[order])
+    ]
+    return {"owners": owners, "iterations": depth, "converged": converged}
+
+
+
+# ── 순환 출자 인덱스 ─────────────────────────────────────────────────────────
+class CycleIndex:
+    """
+    강연결 요소(SCC) + 짧은 순환 출자 경로 인덱스 (스냅샷당 1회 계산, 이후 조회 O(1)).
+    크기 2 이상 SCC 만 대상 (자기주식 같은 자기 루프 제외).
+    cycles 는 순환 내 최소 지분율 내림차순 (/graph/cycles 표시 순서), node_cycles 의 번호도 그 순서.
+    """
+
+    def __init__(self, g: OwnershipGraph, max_length: int, max_cycles: int):
+        self.version = g.version
+        self.max_length = max_length
+        self.max_cycles = max_cycles
+        a = ownership_matrix(g)
+        _, labels = csgraph.connected_components(a, directed=True, connection="strong")
+        sizes = np.bincount(labels)
+        nontrivial = sizes[labels] >= 2
+        self.scc_id = np.where(nontrivial, labels, -1).astype(np.int32)
+        self.scc_size = np.where(nontrivial, sizes[labels], 0).astype(np.int32)
+        self.components = {
+            int(c): np.flatnonzero(labels == c) for c in np.flatnonzero(sizes >= 2)
+        }
+        self.cycles: list[tuple[list[int], list[float]]] = []  # (노드 인덱스 순서, 구간별 ratio)
+        self.node_cycles: dict[int, list[int]] = {}
+        self.truncated = False
+        self._enumerate(g)
+        self._rank()
+
+    def _enumerate(self, g: OwnershipGraph) -> None:
+        """SCC 내부에서 길이 max_length 이하 단순 순환 열거. 각 순환은 최소 인덱스 노드에서 시작해 1회만."""
+        offsets, targets, ratios = g.out_offsets, g.out_targets, g.out_ratio
+        for comp in self.components.values():
+            members = set(comp.tolist())
+            for start in comp.tolist():
+                stack = [(start, [start], [])]
+                while stack:
+                    node, path, path_ratios = stack.pop()
+                    a, b = offsets[node], offsets[node + 1]
+                    for nxt, r in zip(targets[a:b].tolist(), ratios[a:b].tolist()):
+                        if nxt == start and len(path) >= 2:
+                            if len(self.cycles) >= self.max_cycles:
+                                self.truncated = True
+                                return
+                            cid = len(self.cycles)
+                            self.cycles.append((path, path_ratios + [r]))
+                            for n in path:
+                                self.node_cycles.setdefault(n, []).append(cid)
+                        elif nxt > start and nxt in members and nxt not in path and len(path) < self.max_length:
+                            stack.append((nxt, path + [nxt], path_ratios + [r]))
+
+    def _rank(self) -> None:
+        """순환을 최소 지분율 내림차순으로 한 번 정렬 (동점은 열거 순서), 노드별 번호도 새 순서로."""
+        self.cycles.sort(key=lambda cycle: -min(cycle[1]))
+        self.node_cycles = {}
+        for cid, (path, _) in enumerate(self.cycles):
+            for n in path:
+                self.node_cycles.setdefault(n, []).append(cid)
+
+    def node_flag(self, i: int) -> dict:
+        """노드 인덱스의 순환 출자 플래그 (노드 상세용)."""
+        return {
+            "in_cycle": bool(self.scc_id[i] >= 0),
+            "scc_size": int(self.scc_size[i]),
+            "cycle_count": len(self.node_cycles.get(i, ())),
+        }
+
+    def summary(self) -> dict:
+        return {
+            "components": len(self.components),
+            "nodes_in_cycles": int((self.scc_id >= 0).sum()),
+            "cycles": len(self.cycles),
+            "max_length": self.max_length,
+            "truncated": self.truncated,
+            "version": self.version,
+        }
+
+
+_cycle_lock = threading.Lock()
+_cycle_index: Optional[CycleIndex] = None
+
+
+def get_cycle_index(g: OwnershipGraph) -> CycleIndex:
+    """스냅샷 version 별 순환 출자 인덱스 (없거나 구버전이면 계산 후 교체)."""
+    global _cycle_index
+    with _cycle_lock:
+        idx = _cycle_index
+        if idx is None or idx.version != g.version:
+            s = get_settings()
+            t0 = time.perf_counter()
+            idx = CycleIndex(g, max_length=s.CYCLE_MAX_LENGTH, max_cycles=s.CYCLE_MAX_COUNT)
+            _cycle_index = idx
+            logger.info(
+                f"Cycle index built: {len(idx.components)} SCCs, {len(idx.cycles)} cycles "
+                f"in {round((time.perf_counter() - t0) * 1000, 1)}ms"
+            )
+        return idx
+
+
+def peek_cycle_index(g: OwnershipGraph) -> Optional[CycleIndex]:
+    """이미 계산된 현재 version 인덱스만 반환 (없으면 None, 계산하지 않음)."""
+    idx = _cycle_index
+    return idx if idx is not None and idx.version == g.version else None
+
+
+# ── 커뮤니티 (Louvain) 인덱스 ────────────────────────────────────────────────
+class CommunityIndex:
+    """
+    스냅샷당 1회 Louvain 분할 + 집계. 커뮤니티 번호는 크기 내림차순 (0 이 가장 큼, 동점은 최소 노드 인덱스 순).
+    members[offsets[c]:offsets[c+1]] = 커뮤니티 c 의 노드 인덱스 (중요도 = 쌍 단위 차수 내림차순).
+    """
+
+    def __init__(self, g: OwnershipGraph, resolution: float, seed: int = 42):
+        self.version = g.version
+        self.resolution = resolution
+        n = g.n_nodes
+        u, v, ratio = g.simple_pairs()
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_weighted_edges_from(zip(u.tolist(), v.tolist(), (np.clip(ratio, 0.1, 100.0) / 100.0).tolist()))
+        parts = nx.community.louvain_communities(G, weight="weight", resolution=resolution, seed=seed)
+        parts.sort(key=lambda c: (-len(c), min(c)))
+        self.labels = np.empty(n, dtype=np.int32)
+        for cid, members in enumerate(parts):
+            self.labels[np.fromiter(members, dtype=np.int64, count=len(members))] = cid
+        self.sizes = np.bincount(self.labels, minlength=len(parts)).astype(np.int64)
+        self.importance = (np.diff(np.asarray(g.out_offsets)) + np.diff(np.asarray(g.in_offsets))).astype(np.int64)
+        self.members = np.lexsort((np.arange(n), -self.importance, self.labels)).astype(np.int32)
+        self.offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+        np.cumsum(self.sizes, out=self.offsets[1:])
+        self._aggregate_edges(g)
+
+    def _aggregate_edges(self, g: OwnershipGraph) -> None:
+        """쌍 (주주 → 회사) 을 (커뮤니티 → 커뮤니티) 로 합산. 같은 커뮤니티 내부 쌍은 internal_pairs 로만 집계."""
+        cu = self.labels[np.asarray(g.pair_src)].astype(np.int64)
+        cv = self.labels[np.asarray(g.out_targets)].astype(np.int64)
+        ratio = np.asarray(g.out_ratio, dtype=np.float64)
+        internal = cu == cv
+        self.internal_pairs = np.bincount(cu[internal], minlength=self.n_communities).astype(np.int64)
+        k = max(self.n_communities, 1)
+        keys, inverse = np.unique(cu[~internal] * k + cv[~internal], return_inverse=True)
+        r = ratio[~internal]
+        self.edge_src = (keys // k).astype(np.int32)
+        self.edge_dst = (keys % k).astype(np.int32)
+        self.edge_count = np.bincount(inverse, minlength=keys.size).astype(np.int64)
+        self.edge_ratio_sum = np.bincount(inverse, weights=r, minlength=keys.size)
+        self.edge_ratio_max = np.zeros(keys.size)
+        np.maximum.at(self.edge_ratio_max, inverse, r)
+
+    @property
+    def n_communities(self) -> int:
+        return int(self.sizes.shape[0])
+
+    def community_members(self, cid: int) -> np.ndarray:
+        return self.members[self.offsets[cid]:self.offsets[cid + 1]]
+
+    def super_edges(self, cids: np.ndarray) -> np.ndarray:
+        """양 끝이 모두 cids 에 속한 슈퍼 엣지 위치 (관계 수 내림차순)."""
+        mask = np.isin(self.edge_src, cids) & np.isin(self.edge_dst, cids)
+        positions = np.flatnonzero(mask)
+        return positions[np.argsort(-self.edge_count[positions], kind="stable")]
+
+    def summary(self) -> dict:
+        return {
+            "communities": self.n_communities,
+            "largest": int(self.sizes[0]) if self.n_communities else 0,
+            "singletons": int((self.sizes == 1).sum()),
+            "super_edges": int(self.edge_src.shape[0]),
+            "resolution": self.resolution,
+            "version": self.version,
+        }
+
+
+_community_lock = threading.Lock()
+_community_index: Optional[CommunityIndex] = None
+
+
+def get_community_index(g: OwnershipGraph) -> CommunityIndex:
+    """스냅샷 version 별 커뮤니티 인덱스 (없거나 구버전이면 계산 후 교체)."""
+    global _community_index
+    with _community_lock:
+        idx = _community_index
+        if idx is None or idx.version != g.version:
+            t0 = time.perf_counter()
+            idx = CommunityIndex(g, resolution=get_settings().COMMUNITY_RESOLUTION)
+            _community_index = idx
+            logger.info(
+                f"Community index built: {idx.n_communities} communities, {idx.edge_src.shape[0]} super edges "
+                f"in {round((time.perf_counter() - t0) * 1000, 1)}ms"
+            )
+        return idx
+
+
+def peek_community_index(g: OwnershipGraph) -> Optional[CommunityIndex]:
+    """이미 계산된 현재 version 인덱스만 반환 (없으면 None, 계산하지 않음)."""
+    idx = _community_index
+    return idx if idx is not None and idx.version == g.version else None
@@ -0,0 +1,513 @@
+"""
+인메모리 CSR 지분 그래프 엔진 (Stockholder -HOLDS_SHARES-> Company).
+
+지분 그래프는 변경(재적재)보다 조회가 훨씬 잦은데, /edges·/ego·노드 상세 통계가 매번 Cypher 로 재집계했음.
+- 1회 적재: (from, to) 쌍 단위 집계(max ratio, 관계 수, ratio 합)를 NumPy CSR 배열로 보관 (정방향·역방향 모두)
+    offsets(int64, n+1) / 이웃 인덱스(int32) / max ratio(float32) / 관계 수(int32)
+- 스냅샷: 배열별 .npy 파일 + meta.json. np.load(mmap_mode="r") 로 열어 워커 간 페이지 캐시 공유, 기동 즉시 사용.
+  디렉터리 교체는 CURRENT 포인터 파일 원자적 갱신(os.replace), 동시 빌드는 파일 락으로 1개 워커만.
+  각 워커는 OWNERSHIP_SNAPSHOT_POLL_SEC 마다 CURRENT 를 확인 → 다른 워커가 재빌드한 스냅샷으로 교체.
+- 지분율은 소수점 RATIO_DECIMALS 자리로 반올림해 보관·반환 (Neo4j 폴백 경로도 같은 자리수)
+  → 엔진/Neo4j 어느 쪽이 응답해도 (ratio DESC, fromId, toId) 순서와 keyset 커서가 일치.
+- 조회 엔드포인트는 엔진이 준비되어 있으면 엔진으로 응답, 아니면 Neo4j 폴백.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.core import get_settings
+from app.services.graph_service import graph_service
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 락 없이 동작 (단일 워커 개발 환경)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# 지분율 반올림 자리수: float32(엔진)와 float64(Neo4j) 표현 차이 흡수 (0~100 범위에서 float32 로도 순서 보존)
+RATIO_DECIMALS = 4
+# 스냅샷 배열 형식 (바뀌면 이전 스냅샷은 로드하지 않고 재빌드)
+SNAPSHOT_FORMAT = 2
+
+
+def round_ratio(value: Optional[float]) -> float:
+    """커서·keyset 비교용 지분율 (RATIO_DECIMALS 자리 반올림)."""
+    return round(float(value or 0.0), RATIO_DECIMALS)
+
+# (from, to) 쌍 단위 집계. /edges 와 동일 규칙 (ratio=max(stockRatio), count=관계 건수)
+LOAD_QUERY = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WITH id(s) AS fromId, id(c) AS toId,
+         max(r.stockRatio) AS ratio, count(r) AS relCount, sum(r.stockRatio) AS ratioSum
+    RETURN fromId, toId, ratio, relCount, ratioSum
+"""
+
+
+class OwnershipGraph:
+    """불변 CSR 스냅샷. 모든 인덱스는 node_ids(정렬된 Neo4j id) 기준 위치."""
+
+    ARRAYS = (
+        "node_ids",      # int64[n]     정렬된 Neo4j internal id
+        "out_offsets",   # int64[n+1]   보유(정방향) CSR
+        "out_targets",   # int32[m]
+        "out_ratio",     # float32[m]   쌍별 max(stockRatio)
+        "out_count",     # int32[m]     쌍별 관계 수
+        "out_sum",       # float64[m]   쌍별 stockRatio 합 (평균 지분율 계산용)
+        "in_offsets",    # int64[n+1]   피보유(역방향) CSR
+        "in_sources",    # int32[m]
+        "in_ratio",      # float32[m]
+        "pair_src",      # int32[m]     out 배열 위치 → 출발 노드 인덱스
+        "pair_order",    # int64[m]     out 배열 위치를 ratio 내림차순 정렬
+    )
+
+    def __init__(self, arrays: dict[str, np.ndarray], meta: dict[str, Any]):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self._neg_ratio_desc: Optional[np.ndarray] = None
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def n_pairs(self) -> int:
+        return int(self.out_targets.shape[0])
+
+    @property
+    def version(self) -> str:
+        """스냅샷 식별자 (빌드 시각). 파생 결과 캐시 키에 사용."""
+        return str(self.meta.get("built_at", ""))
+
+    # ── 생성 / 저장 ────────────────────────────────────────────────────────
+    @classmethod
+    def from_pairs(
+        cls,
+        src: np.ndarray,
+        dst: np.ndarray,
+        ratio: np.ndarray,
+        count: np.ndarray,
+        ratio_sum: np.ndarray,
+        meta: Optional[dict[str, Any]] = None,
+    ) -> "OwnershipGraph":
+        node_ids = np.unique(np.concatenate([src, dst])).astype(np.int64)
+        n = node_ids.shape[0]
+        si = np.searchsorted(node_ids, src).astype(np.int32)
+        di = np.searchsorted(node_ids, dst).astype(np.int32)
+        ratio = np.round(np.nan_to_num(ratio.astype(np.float64)), RATIO_DECIMALS).astype(np.float32)
+
+        out_order = np.lexsort((di, si))
+        out_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(si, minlength=n), out=out_offsets[1:])
+        in_order = np.lexsort((si, di))
+        in_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(di, minlength=n), out=in_offsets[1:])
+
+        out_ratio = ratio[out_order]
+        arrays = {
+            "node_ids": node_ids,
+            "out_offsets": out_offsets,
+            "out_targets": di[out_order],
+            "out_ratio": out_ratio,
+            "out_count": count.astype(np.int32)[out_order],
+            "out_sum": np.nan_to_num(ratio_sum.astype(np.float64))[out_order],
+            "in_offsets": in_offsets,
+            "in_sources": si[in_order],
+            "in_ratio": ratio[in_order],
+            "pair_src": si[out_order],
+            "pair_order": np.argsort(-out_ratio, kind="stable").astype(np.int64),
+        }
+        meta = {
+            **(meta or {}),
+            "n_nodes": int(n),
+            "n_pairs": int(src.shape[0]),
+            "built_at": datetime.now().isoformat(),
+            "format": SNAPSHOT_FORMAT,
+        }
+        return cls(arrays, meta)
+
+    def save(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(path / f"{name}.npy", getattr(self, name))
+        (path / "meta.json").write_text(json.dumps(self.meta, ensure_ascii=False))
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "OwnershipGraph":
+        arrays = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None)
+            for name in cls.ARRAYS
+        }
+        meta = json.loads((path / "meta.json").read_text())
+        return cls(arrays, meta)
+
+    # ── 조회 ───────────────────────────────────────────────────────────────
+    def index_of(self, ids) -> np.ndarray:
+        """Neo4j id 배열 → 노드 인덱스 (없으면 -1)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.n_nodes == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        pos = np.searchsorted(self.node_ids, ids)
+        pos = np.minimum(pos, self.n_nodes - 1)
+        return np.where(self.node_ids[pos] == ids, pos, -1)
+
+    def _edge_rows(self, positions: np.ndarray) -> list[dict]:
+        """out 배열 위치들 → /edges 와 같은 원시 row (fromId, toId, ratio, relCount)."""
+        return [
+            {"fromId": int(f), "toId": int(t), "ratio": round(float(r), RATIO_DECIMALS), "relCount": int(c)}
+            for f, t, r, c in zip(
+                self.node_ids[self.pair_src[positions]],
+                self.node_ids[self.out_targets[positions]],
+                self.out_ratio[positions],
+                self.out_count[positions],
+            )
+        ]
+
+    def _sorted_neg_ratio(self) -> np.ndarray:
+        # pair_order 순서의 -ratio (오름차순) — min_ratio / cursor 이분 탐색용
+        if self._neg_ratio_desc is None:
+            self._neg_ratio_desc = -self.out_ratio[self.pair_order]
+        return self._neg_ratio_desc
+
+    def _keyset_start(self, after: tuple[float, int, int]) -> int:
+        """pair_order 에서 (ratio DESC, fromId, toId) 기준 after 바로 다음 위치."""
+        ratio, from_id, to_id = after
+        neg = self._sorted_neg_ratio()
+        key = -np.float32(round_ratio(ratio))
+        lo = int(np.searchsorted(neg, key, side="left"))
+        hi = int(np.searchsorted(neg, key, side="right"))
+        # 같은 ratio 구간은 out 배열 순서 (= fromId, toId 오름차순, node_ids 가 정렬되어 있으므로)
+        block = self.pair_order[lo:hi]
+        from_ids = self.node_ids[self.pair_src[block]]
+        a = int(np.searchsorted(from_ids, from_id, side="left"))
+        b = int(np.searchsorted(from_ids, from_id, side="right"))
+        to_ids = self.node_ids[self.out_targets[block[a:b]]]
+        return lo + a + int(np.searchsorted(to_ids, to_id, side="right"))
+
+    def top_edges(
+        self,
+        limit: int,
+        ids: Optional[list[int]] = None,
+        min_ratio: Optional[float] = None,
+        after: Optional[tuple[float, int, int]] = None,
+    ) -> list[dict]:
+        """
+        (ratio DESC, fromId, toId) 순 상위 limit 개 쌍. ids 가 주어지면 양 끝 중 하나라도 포함된 쌍만.
+        after=(ratio, fromId, toId) 이면 그 다음부터 (keyset 페이지네이션).
+        """
+        if ids is None:
+            start = self._keyset_start(after) if after is not None else 0
+            end = self.n_pairs
+            if min_ratio is not None:
+                # pair_order 는 ratio 내림차순 → min_ratio 이상은 앞쪽 연속 구간 (이분 탐색)
+                end = int(np.searchsorted(self._sorted_neg_ratio(), -np.float32(min_ratio), side="right"))
+            return self._edge_rows(np.asarray(self.pair_order[start:max(start, min(end, start + limit))]))
+
+        idx = self.index_of(ids)
+        idx = idx[idx >= 0]
+        if idx.size == 0:
+            return []
+        mask = np.isin(self.pair_src, idx) | np.isin(self.out_targets, idx)
+        if min_ratio is not None:
+            mask &= self.out_ratio >= min_ratio
+        if after is not None:
+            ratio, from_id, to_id = after
+            r = np.float32(round_ratio(ratio))
+            from_ids = self.node_ids[self.pair_src]
+            to_ids = self.node_ids[self.out_targets]
+            mask &= (self.out_ratio < r) | (
+                (self.out_ratio == r) & ((from_ids > from_id) | ((from_ids == from_id) & (to_ids > to_id)))
+            )
+        positions = np.flatnonzero(mask)
+        if positions.size > limit:
+            part = np.argpartition(-self.out_ratio[positions], limit - 1)
+            # 경계 ratio 동점 포함 후 정렬 → 잘라냄 (결정적 순서 유지)
+            cutoff = self.out_ratio[positions[part[limit - 1]]]
+            positions = positions[self.out_ratio[positions] >= cutoff]
+        # positions 는 오름차순(= fromId, toId 순) → ratio 안정 정렬로 (ratio DESC, fromId, toId)
+        positions = positions[np.argsort(-self.out_ratio[positions], kind="stable")][:limit]
+        return self._edge_rows(positions)
+
+    def neighbors(self, i: int, direction: str) -> tuple[np.ndarray, np.ndarray]:
+        """노드 인덱스 i 의 이웃 인덱스·ratio (direction: out=보유, in=피보유)."""
+        if direction == "out":
+            a, b = self.out_offsets[i], self.out_offsets[i + 1]
+            return self.out_targets[a:b], self.out_ratio[a:b]
+        a, b = self.in_offsets[i], self.in_offsets[i + 1]
+        return self.in_sources[a:b], self.in_ratio[a:b]
+
+    def degree(self, i: int, direction: Optional[str] = None) -> int:
+        """쌍 단위 차수 (direction=None 이면 양방향 합)."""
+        out_deg = int(self.out_offsets[i + 1] - self.out_offsets[i])
+        in_deg = int(self.in_offsets[i + 1] - self.in_offsets[i])
+        if direction == "out":
+            return out_deg
+        if direction == "in":
+            return in_deg
+        return out_deg + in_deg
+
+    def top_neighbors(self, i: int, direction: str, k: int) -> list[tuple[int, float]]:
+        """ratio 상위 k 이웃 (Neo4j id, ratio)."""
+        nbrs, ratios = self.neighbors(i, direction)
+        if nbrs.size > k:
+            part = np.argpartition(-ratios, k - 1)[:k]
+            nbrs, ratios = nbrs[part], ratios[part]
+        order = np.argsort(-ratios, kind="stable")
+        return [(int(self.node_ids[n]), float(r)) for n, r in zip(nbrs[order], ratios[order])]
+
+    def induced_edges(self, ids: list[int]) -> list[dict]:
+        """주어진 노드 집합 내부 쌍 (ego 엣지용)."""
+        idx = self.index_of(ids)
+        idx = idx[idx >= 0]
+        if idx.size == 0:
+            return []
+        starts, ends = self.out_offsets[idx], self.out_offsets[idx + 1]
+        positions = np.concatenate([np.arange(a, b) for a, b in zip(starts, ends)] or [np.empty(0, np.int64)])
+        positions = positions[np.isin(self.out_targets[positions], idx)]
+        return self._edge_rows(positions)
+
+    def simple_pairs(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        무방향 단순 엣지 (u < v, ratio = 두 방향 중 max, 자기 루프 제외) — 레이아웃·커뮤니티 탐지용.
+        반환: (u, v, ratio%) 노드 인덱스 기준.
+        """
+        u = np.asarray(self.pair_src, dtype=np.int64)
+        v = np.asarray(self.out_targets, dtype=np.int64)
+        ratio = np.asarray(self.out_ratio, dtype=np.float64)
+        keep = u != v
+        lo, hi, ratio = np.minimum(u, v)[keep], np.maximum(u, v)[keep], ratio[keep]
+        key = lo * max(self.n_nodes, 1) + hi
+        order = np.lexsort((-ratio, key))
+        first = np.ones(order.size, dtype=bool)
+        first[1:] = key[order][1:] != key[order][:-1]
+        pick = order[first]
+        return lo[pick].astype(np.intp), hi[pick].astype(np.intp), ratio[pick]
+
+    def holder_stats(self, i: int) -> dict:
+        """주주 노드: 투자 종목(관계) 수, 평균 지분율 (holdings_query 와 동일 정의)."""
+        a, b = self.out_offsets[i], self.out_offsets[i + 1]
+        holdings = int(self.out_count[a:b].sum())
+        avg_ratio = float(self.out_sum[a:b].sum() / holdings) if holdings else None
+        return {"holdings": holdings, "avgRatio": avg_ratio}
+
+    def company_stats(self, i: int) -> dict:
+        """회사 노드: 최대 지분율, 고유 주주 수 (max_ratio_query 와 동일 정의)."""
+        a, b = self.in_offsets[i], self.in_offsets[i + 1]
+        return {
+            "maxRatio": float(self.in_ratio[a:b].max()) if b > a else None,
+            "holderCount": int(b - a),
+        }
+
+
+def build_from_neo4j() -> OwnershipGraph:
+    """Neo4j 에서 쌍 단위 집계 1회 조회 → CSR 생성."""
+    t0 = time.perf_counter()
+    rows = graph_service.get_graph().query(LOAD_QUERY)
+    src = np.fromiter((r["fromId"] for r in rows), dtype=np.int64, count=len(rows))
+    dst = np.fromiter((r["toId"] for r in rows), dtype=np.int64, count=len(rows))
+    ratio = np.fromiter((r["ratio"] or 0.0 for r in rows), dtype=np.float64, count=len(rows))
+    count = np.fromiter((r["relCount"] or 0 for r in rows), dtype=np.int64, count=len(rows))
+    ratio_sum = np.fromiter((r["ratioSum"] or 0.0 for r in rows), dtype=np.float64, count=len(rows))
+    g = OwnershipGraph.from_pairs(src, dst, ratio, count, ratio_sum)
+    g.meta["load_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    logger.info(f"Ownership engine built: {g.n_nodes} nodes, {g.n_pairs} pairs in {g.meta['load_ms']}ms")
+    return g
+
+
+class OwnershipEngine:
+    """엔진 수명 관리: 스냅샷 로드/빌드, 원자적 교체, 상태."""
+
+    def __init__(self, snapshot_dir: str = "", poll_interval: float = 5.0):
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.poll_interval = poll_interval
+        self._graph: Optional[OwnershipGraph] = None
+        self._build_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+        self._listeners: list[Callable[[OwnershipGraph], None]] = []
+
+    def add_listener(self, fn: Callable[[OwnershipGraph], None]) -> None:
+        """그래프 교체 직후 호출 (빌드 스레드에서). 파생 인덱스 배치 계산용."""
+        self._listeners.append(fn)
+
+    def get(self) -> Optional[OwnershipGraph]:
+        """준비된 그래프 (없으면 None → 호출자는 Neo4j 폴백)."""
+        return self._graph
+
+    def _current_path(self) -> Optional[Path]:
+        pointer = self.snapshot_dir / "CURRENT"
+        if not pointer.exists():
+            return None
+        path = self.snapshot_dir / pointer.read_text().strip()
+        return path if (path / "meta.json").exists() else None
+
+    def _load_current(self) -> Optional[OwnershipGraph]:
+        """CURRENT 스냅샷 mmap 로드 (없거나 이전 형식이면 None → 호출자가 빌드)."""
+        path = self._current_path()
+        if path is None:
+            return None
+        g = OwnershipGraph.load(path)
+        if g.meta.get("format") != SNAPSHOT_FORMAT:
+            logger.info(f"Ownership snapshot {path} has an old format, rebuilding")
+            return None
+        logger.info(f"Ownership engine loaded from snapshot {path}")
+        return g
+
+    def _save_snapshot(self, g: OwnershipGraph) -> None:
+        name = f"v{int(time.time() * 1000)}"
+        g.meta["snapshot"] = name
+        g.save(self.snapshot_dir / name)
+        tmp = self.snapshot_dir / "CURRENT.tmp"
+        tmp.write_text(name)
+        os.replace(tmp, self.snapshot_dir / "CURRENT")
+        # 이전 스냅샷 정리 (다른 워커가 mmap 중이어도 리눅스에서는 열린 파일 유지)
+        for old in self.snapshot_dir.glob("v*"):
+            if old.name != name and old.is_dir():
+                shutil.rmtree(old, ignore_errors=True)
+
+    def _with_file_lock(self, fn):
+        if self.snapshot_dir is None or fcntl is None:
+            return fn()
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.snapshot_dir / ".build.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                return fn()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _install(self, build) -> OwnershipGraph:
+        """build() 결과로 현재 그래프 원자적 교체 (프로세스 내 직렬화 + 워커 간 파일 락)."""
+        with self._build_lock:
+            try:
+                self._graph = self._with_file_lock(build)
+                self._last_error = None
+            except Exception as e:
+                self._last_error = str(e)[:200]
+                raise
+            for fn in self._listeners:
+                try:
+                    fn(self._graph)
+                except Exception as e:
+                    # 파생 인덱스 실패는 엔진 자체에 영향 없음 (요청 시 재계산)
+                    logger.warning(f"Ownership engine listener failed: {e}")
+            return self._graph
+
+    def load_or_build(self) -> OwnershipGraph:
+        """스냅샷이 있으면 mmap 로드, 없으면 Neo4j 에서 빌드 후 저장 (워커 중 1개만 빌드)."""
+
+        def _run() -> OwnershipGraph:
+            if self.snapshot_dir is not None:
+                g = self._load_current()
+                if g is not None:
+                    return g
+            g = build_from_neo4j()
+            if self.snapshot_dir is not None:
+                self._save_snapshot(g)
+            return g
+
+        return self._install(_run)
+
+    def rebuild(self) -> OwnershipGraph:
+        """Neo4j 에서 강제 재빌드 (데이터 재적재 후). 스냅샷도 교체."""
+
+        def _run() -> OwnershipGraph:
+            g = build_from_neo4j()
+            if self.snapshot_dir is not None:
+                self._save_snapshot(g)
+            return g
+
+        return self._install(_run)
+
+    def sync_snapshot(self) -> bool:
+        """
+        다른 워커가 CURRENT 를 새 스냅샷으로 바꿨으면 그 스냅샷으로 교체 (POST /engine/reload 는 요청받은
+        워커에서만 재빌드). 교체했으면 True. 이 워커가 빌드 중이면 건너뜀 (끝나면 최신 스냅샷 보유).
+        """
+        if self.snapshot_dir is None or self._build_lock.locked():
+            return False
+        path = self._current_path()
+        g = self._graph
+        if path is None or (g is not None and g.meta.get("snapshot") == path.name):
+            return False
+        if json.loads((path / "meta.json").read_text()).get("format") != SNAPSHOT_FORMAT:
+            return False  # 이전 형식: 이 워커의 기동 빌드가 곧 교체
+
+        def _run() -> OwnershipGraph:
+            # 파일 락 안에서 CURRENT 를 다시 읽음 (그 사이 또 바뀌었으면 최신 것)
+            g = self._load_current()
+            if g is None:
+                raise RuntimeError(f"snapshot {path.name} is no longer available")
+            return g
+
+        logger.info(f"Ownership snapshot changed to {path.name}, reloading")
+        self._install(_run)
+        return True
+
+    def _watch_loop(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.sync_snapshot()
+            except Exception as e:
+                # 교체 중인 스냅샷 (정리·쓰기 경합) 등: 다음 주기에 다시
+                logger.warning(f"Ownership snapshot sync failed: {e}")
+
+    def start(self) -> None:
+        """
+        앱 기동 시 백그라운드 로드 (준비 전 요청은 Neo4j 폴백).
+        스냅샷 디렉터리가 있으면 이어서 CURRENT 감시 (다른 워커의 재빌드 반영).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            try:
+                self.load_or_build()
+            except Exception as e:
+                logger.warning(f"Ownership engine load failed, using Neo4j fallback: {e}")
+            if self.snapshot_dir is not None and self.poll_interval > 0:
+                self._watch_loop()
+
+        self._thread = threading.Thread(target=_run, name="ownership_engine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> dict:
+        g = self._graph
+        return {
+            "ready": g is not None,
+            "meta": g.meta if g is not None else None,
+            "snapshot_dir": str(self.snapshot_dir) if self.snapshot_dir else None,
+            "last_error": self._last_error,
+        }
+
+
+_engine: OwnershipEngine | None = None
+
+
+def get_ownership_engine() -> OwnershipEngine:
+    global _engine
+    if _engine is None:
+        s = get_settings()
+        _engine = OwnershipEngine(snapshot_dir=s.OWNERSHIP_SNAPSHOT_DIR, poll_interval=s.OWNERSHIP_SNAPSHOT_POLL_SEC)
+    return _engine
+
+
+def get_ownership_graph() -> Optional[OwnershipGraph]:
+    """엔진 사용 가능 시 준비된 그래프, 아니면 None (Neo4j 폴백)."""
+    if not get_settings().OWNERSHIP_ENGINE_ENABLED:
+        return None
+    return get_ownership_engine().get()
@@ -0,0 +1,198 @@
+"""
+DB 통계 스냅샷 서비스 (/stats, /health, /graph/node-counts 공통).
+
+기존에는 요청마다 MATCH (n) / MATCH ()-[r]->() 전체 스캔과 toUpper(coalesce(...)) 라벨 스캔을 실행했음.
+- 백그라운드 스레드가 주기적으로(STATS_REFRESH_SEC) 계산해 메모리 스냅샷으로 보관, 요청은 스냅샷만 읽음.
+- 레이블별/관계 타입별 개수는 count store 로 조회 (MATCH (n:Label) RETURN count(n) 은 O(1)).
+  다중 레이블 노드는 레이블마다 세어지므로 합이 전체 노드 수보다 큼 → "labels" 로 따로 노출.
+- "nodes" 는 기존 의미 그대로 첫 레이블(labels(n)[0]) 기준 분류 — 노드당 한 번만 세므로 합 = 전체 노드 수.
+  전체 스캔이 필요해 백그라운드에서만 실행.
+- 노드 타입별 개수(company/person/major/institution)는 속성 필터가 필요해 count store 불가 → 백그라운드에서만 실행.
+- 스냅샷은 version(갱신마다 +1)·computed_at 을 가지며 응답에 age_sec(경과 초)로 노출. 명시적 갱신: refresh().
+"""
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from app.core import get_settings
+from app.services.graph_service import graph_service
+
+logger = logging.getLogger(__name__)
+
+# 노드 타입별 개수 (필터 표시용)
+# 주의: shareholderType은 대소문자 구분하므로 toUpper() 사용하여 일관성 유지
+# 기관 노드: shareholderType이 'CORPORATION' 또는 'INSTITUTION'이거나 Company:Stockholder 레이블을 가진 경우
+NODE_COUNTS_QUERY = """
+MATCH (c:Company)
+WHERE NOT 'Stockholder' IN labels(c)
+WITH count(c) AS company_count
+MATCH (s:Stockholder)
+WHERE toUpper(coalesce(s.shareholderType, 'PERSON')) = 'PERSON'
+  AND NOT 'MajorShareholder' IN labels(s)
+  AND NOT 'Company' IN labels(s)
+WITH company_count, count(s) AS person_count
+MATCH (m:MajorShareholder)
+WITH company_count, person_count, count(m) AS major_count
+MATCH (i:Stockholder)
+WHERE (
+    toUpper(coalesce(i.shareholderType, 'PERSON')) IN ['CORPORATION', 'INSTITUTION']
+    OR 'Company' IN labels(i)
+  )
+  AND NOT 'MajorShareholder' IN labels(i)
+RETURN company_count, person_count, major_count, count(i) AS institution_count
+"""
+
+
+def _quote(name: str) -> str:
+    """레이블/관계 타입 식별자 이스케이프 (백틱)."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _compute_snapshot(graph) -> dict:
+    """첫 레이블 기준 노드 분류 + count store 기반 레이블/관계 개수 + 노드 타입별 개수 계산."""
+    nodes = graph.query("MATCH (n) RETURN labels(n)[0] AS l, count(n) AS n ORDER BY n DESC")
+
+    label_names = [r["label"] for r in graph.query("CALL db.labels() YIELD label RETURN label")]
+    labels = []
+    for label in label_names:
+        rows = graph.query(f"MATCH (n:{_quote(label)}) RETURN count(n) AS n")
+        labels.append({"l": label, "n": rows[0]["n"] if rows else 0})
+    labels.sort(key=lambda x: x["n"], reverse=True)
+
+    rel_types = [r["t"] for r in graph.query("CALL db.relationshipTypes() YIELD relationshipType AS t RETURN t")]
+    relationships = []
+    for rel_type in rel_types:
+        rows = graph.query(f"MATCH ()-[r:{_quote(rel_type)}]->() RETURN count(r) AS n")
+        relationships.append({"t": rel_type, "n": rows[0]["n"] if rows else 0})
+    relationships.sort(key=lambda x: x["n"], reverse=True)
+
+    totals = graph.query("MATCH (n) RETURN count(n) AS n")
+    total_rels = graph.query("MATCH ()-[r]->() RETURN count(r) AS n")
+
+    rows = graph.query(NODE_COUNTS_QUERY)
+    row = rows[0] if rows else {}
+    node_counts = {
+        "company": row.get("company_count", 0),
+        "person": row.get("person_count", 0),
+        "major": row.get("major_count", 0),
+        "institution": row.get("institution_count", 0),
+    }
+    return {
+        "nodes": nodes,
+        "labels": labels,
+        "relationships": relationships,
+        "total_nodes": totals[0]["n"] if totals else 0,
+        "total_relationships": total_rels[0]["n"] if total_rels else 0,
+        "node_counts": node_counts,
+    }
+
+
+class StatsService:
+    """버전 관리되는 통계 스냅샷 (메모리) + 백그라운드 갱신."""
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._version = 0
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_error: Optional[str] = None
+
+    def refresh(self) -> dict:
+        """스냅샷 즉시 재계산 후 교체 (동시 호출은 하나로 직렬화)."""
+        with self._refresh_lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> dict:
+        t0 = time.perf_counter()
+        try:
+            data = _compute_snapshot(graph_service.get_graph())
+        except Exception as e:
+            self._last_error = str(e)[:200]
+            raise
+        self._version += 1
+        self._last_error = None
+        self._snapshot = {
+            **data,
+            "version": self._version,
+            "computed_at": datetime.now().isoformat(),
+            "computed_at_ts": time.time(),
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+        }
+        logger.info(f"Stats snapshot v{self._version} computed in {self._snapshot['elapsed_ms']}ms")
+        return self._snapshot
+
+    def peek(self) -> Optional[dict]:
+        """현재 스냅샷 (없으면 None). DB 접근 없음."""
+        return self._snapshot
+
+    def get_snapshot(self) -> dict:
+        """현재 스냅샷. 아직 없으면 (기동 직후) 1회 동기 계산 — 동시 요청은 같은 계산 결과 공유."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._refresh_lock:
+                snapshot = self._snapshot or self._refresh_locked()
+        return snapshot
+
+    @staticmethod
+    def meta(snapshot: dict, with_age: bool = True) -> dict:
+        """
+        응답에 붙이는 스냅샷 메타 (버전·계산 시각·경과 초).
+        ETag 가 붙는 응답(/graph/node-counts, /graph/bootstrap)은 with_age=False — 304 로 재사용되는 본문에
+        요청 시점 값(age_sec)을 넣지 않음 (경과 시간은 computed_at 으로 계산).
+        """
+        meta = {"version": snapshot["version"], "computed_at": snapshot["computed_at"]}
+        if with_age:
+            meta["age_sec"] = round(time.time() - snapshot["computed_at_ts"], 1)
+        return meta
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                # 실패 시 이전 스냅샷 유지 (age_sec 로 노후 여부 확인 가능)
+                logger.warning(f"Stats snapshot refresh failed: {e}")
+
+    def start(self) -> None:
+        """백그라운드 갱신 시작 (앱 startup). 첫 스냅샷도 백그라운드에서 계산."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Initial stats snapshot failed: {e}")
+            self._refresh_loop()
+
+        self._thread = threading.Thread(target=_run, name="stats_snapshot", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def status(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            **(self.meta(snapshot) if snapshot else {"version": 0, "computed_at": None, "age_sec": None}),
+            "refresh_interval_sec": self.refresh_interval,
+            "last_error": self._last_error,
+        }
+
+
+_stats_service: StatsService | None = None
+
+
+def get_stats_service() -> StatsService:
+    global _stats_service
+    if _stats_service is None:
+        _stats_service = StatsService(refresh_interval=get_settings().STATS_REFRESH_SEC)
+    return _stats_service
@@ -0,0 +1 @@
+"""레이아웃 등 성능 벤치마크 (python -m benchmarks.<name>)."""
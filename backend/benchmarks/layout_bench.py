@@ -0,0 +1,298 @@
+"""
+레이아웃 벤치마크 (합성 지분 그래프 × 엔진 × 규모 → JSON).
+
+compute_layout 의 파라미터(k=5.0/√n, spring iterations=30, 그리드 배치 등)를 감이 아닌 숫자로 조정하기 위한 도구.
+- 합성 그래프: 주주 보유 수 멱법칙, 소수 허브 기관(수백~수천 종목), 법인 간 상호 보유, 작은 연결 요소 다수
+- 케이스(엔진, 노드 수)마다 새 spawn 프로세스: 캐시·풀 없이 (LAYOUT_POOL_WORKERS=0) 요청 경로 그대로 1회 계산
+  → 벽시계 시간, 최대 RSS (프로세스 전체 / 레이아웃 중 증가분), 품질 지표
+- 품질: 정규화 stress (표본 BFS 거리 vs 화면 거리, 최적 스케일 후 평균 상대 오차², 낮을수록 좋음),
+  엣지 길이 변동계수 (표준편차/평균, 낮을수록 균일)
+- 시간·메모리 상한 초과 케이스는 status=timeout / error 로 기록 (KK 는 요소 크기² 메모리)
+- --baseline 지정 시 같은 케이스와 비교해 시간·RSS·stress 회귀를 표시하고 종료 코드 1
+
+실행 (backend 디렉터리에서):
+    PYTHONPATH=. python -m benchmarks.layout_bench --out benchmarks/results/latest.json
+    PYTHONPATH=. python -m benchmarks.layout_bench --sizes 100,1000 --engines fa2 --baseline benchmarks/results/latest.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+DEFAULT_SIZES = (100, 1000, 5000, 20000)
+DEFAULT_ENGINES = ("networkx", "pygraphviz", "fa2", "auto")
+SEED = 42
+
+# 회귀 판정 허용치 (기준 대비 비율). 시간은 머신 잡음이 커서 넉넉히.
+TOLERANCE = {"wall_ms": 0.30, "rss_delta_mb": 0.30, "stress": 0.10}
+# stress 표본: BFS 시작 노드 수, 최대 노드 쌍 수
+_STRESS_SOURCES = 100
+_STRESS_MAX_PAIRS = 50_000
+
+
+# ── 합성 지분 그래프 ──────────────────────────────────────────────────────────
+def synthetic_ownership_graph(
+    n: int,
+    seed: int = SEED,
+    small_share: float = 0.3,
+    hub_share: float = 0.002,
+) -> tuple[list[dict], list[dict]]:
+    """
+    노드 n 개 (API 스키마: nodes [{id, type}], edges [{from, to, ratio}]) 의 결정론적 합성 지분 그래프.
+
+    - small_share: 작은 연결 요소(회사 1 + 주주 1~5 스타)에 쓰는 노드 비율
+    - 나머지 본체: 회사 40% / 주주 60%, 주주 보유 종목 수 ~ Zipf(2.2) (1~50), 인기 회사일수록 선택 확률 높음
+    - 허브 기관 (주주의 hub_share, 최소 1): 회사의 2~5% 를 소량(0.5~5%) 보유
+    - 법인 주주: 회사 10% 가 다른 회사 1~3 곳을 20~60% 보유 (계열사 구조)
+    """
+    rng = np.random.default_rng(seed)
+    nodes: list[dict] = []
+    edges: list[dict] = []
+
+    def add_nodes(count: int, node_type: str) -> np.ndarray:
+        start = len(nodes)
+        nodes.extend({"id": f"n{start + i}", "type": node_type} for i in range(count))
+        return np.arange(start, start + count)
+
+    def add_edges(src: np.ndarray, dst: np.ndarray, ratio: np.ndarray) -> None:
+        edges.extend(
+            {"from": f"n{s}", "to": f"n{d}", "ratio": round(float(r), 2)}
+            for s, d, r in zip(src.tolist(), dst.tolist(), ratio.tolist())
+            if s != d
+        )
+
+    # 작은 연결 요소
+    small_budget = int(n * small_share)
+    while small_budget >= 2:
+        size = int(min(small_budget, rng.integers(2, 7)))
+        company = add_nodes(1, "company")
+        holders = add_nodes(size - 1, "person")
+        add_edges(holders, np.repeat(company, size - 1), rng.uniform(1, 60, size - 1))
+        small_budget -= size
+
+    # 본체
+    main = n - len(nodes)
+    n_companies = max(1, int(main * 0.4))
+    companies = add_nodes(n_companies, "company")
+    n_holders = main - n_companies
+    if n_holders <= 0:
+        return nodes, edges
+    n_hubs = max(1, int(n_holders * hub_share))
+    hubs = add_nodes(n_hubs, "institution")
+    holders = add_nodes(n_holders - n_hubs, "person")
+
+    popularity = rng.pareto(1.5, n_companies) + 1.0
+    popularity /= popularity.sum()
+    degree = np.minimum(rng.zipf(2.2, holders.size), 50)
+    add_edges(
+        np.repeat(holders, degree),
+        rng.choice(companies, size=int(degree.sum()), p=popularity),
+        np.minimum(100.0, rng.exponential(5.0, int(degree.sum())) + 0.1),
+    )
+    for hub in hubs:
+        k = int(min(n_companies, max(1, rng.uniform(0.02, 0.05) * n_companies)))
+        add_edges(np.repeat(hub, k), rng.choice(companies, size=k, replace=False), rng.uniform(0.5, 5.0, k))
+    corporate = rng.choice(companies, size=max(1, n_companies // 10), replace=False)
+    k = rng.integers(1, 4, corporate.size)
+    add_edges(np.repeat(corporate, k), rng.choice(companies, size=int(k.sum())), rng.uniform(20, 60, int(k.sum())))
+    return nodes, edges
+
+
+# ── 품질 지표 ─────────────────────────────────────────────────────────────────
+def layout_quality(nodes: list[dict], edges: list[dict], positions: dict[str, dict[str, float]]) -> dict[str, Any]:
+    """정규화 stress (표본) + 엣지 길이 변동계수. 좌표는 compute_layout 반환값 (0~1, 그리드 배치 포함)."""
+    from scipy import sparse
+    from scipy.sparse import csgraph
+
+    index = {nd["id"]: i for i, nd in enumerate(nodes)}
+    n = len(nodes)
+    xy = np.array([[positions[nd["id"]]["x"], positions[nd["id"]]["y"]] for nd in nodes])
+    pairs = {(min(index[e["from"]], index[e["to"]]), max(index[e["from"]], index[e["to"]])) for e in edges}
+    u = np.fromiter((a for a, b in pairs if a != b), dtype=np.int64)
+    v = np.fromiter((b for a, b in pairs if a != b), dtype=np.int64)
+
+    lengths = np.hypot(*(xy[u] - xy[v]).T)
+    edge_cv = float(lengths.std() / lengths.mean()) if lengths.size and lengths.mean() > 0 else None
+
+    rng = np.random.default_rng(SEED)
+    adj = sparse.coo_matrix((np.ones(u.size), (u, v)), shape=(n, n)).tocsr()
+    sources = rng.choice(n, size=min(n, _STRESS_SOURCES), replace=False)
+    dist = csgraph.shortest_path(adj, directed=False, unweighted=True, indices=sources)
+    src_idx, dst_idx = np.nonzero(np.isfinite(dist) & (dist > 0))
+    if src_idx.size > _STRESS_MAX_PAIRS:
+        pick = rng.choice(src_idx.size, size=_STRESS_MAX_PAIRS, replace=False)
+        src_idx, dst_idx = src_idx[pick], dst_idx[pick]
+    d = dist[src_idx, dst_idx]
+    e = np.hypot(*(xy[sources[src_idx]] - xy[dst_idx]).T)
+    stress = None
+    if d.size and (e > 0).any():
+        # min_s Σ((s·e − d)/d)² 의 해 s = Σ(e/d) / Σ(e²/d²)
+        s = float((e / d).sum() / ((e / d) ** 2).sum())
+        stress = float((((s * e - d) / d) ** 2).mean())
+    return {
+        "stress": round(stress, 4) if stress is not None else None,
+        "edge_length_cv": round(edge_cv, 4) if edge_cv is not None else None,
+        "stress_pairs": int(d.size),
+    }
+
+
+# ── 케이스 실행 (자식 프로세스) ───────────────────────────────────────────────
+def _rss_mb() -> float:
+    # 리눅스 ru_maxrss 단위는 KB (macOS 는 바이트)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_case(engine: str, size: int, mem_limit_gb: float, out: "multiprocessing.Queue") -> None:
+    os.environ["LAYOUT_POOL_WORKERS"] = "0"  # 호출 프로세스에서 계산 → RSS·시간이 이 프로세스에 잡힘
+    os.environ["LAYOUT_CACHE_PATH"] = ""
+    if mem_limit_gb > 0:
+        limit = int(mem_limit_gb * 1024**3)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        from app.services import layout_service
+
+        if engine == "pygraphviz" and not layout_service.HAS_PYGRAPHVIZ:
+            out.put({"status": "skipped", "error": "PyGraphviz not installed"})
+            return
+        nodes, edges = synthetic_ownership_graph(size)
+        rss_before = _rss_mb()
+        t0 = time.perf_counter()
+        result = layout_service.compute_layout(nodes, edges, engine=engine)
+        wall_ms = (time.perf_counter() - t0) * 1000
+        peak = _rss_mb()
+        out.put({
+            "status": "ok",
+            "edges": len(edges),
+            "components": len(result["components"]),
+            "largest_component": max((len(c) for c in result["components"]), default=0),
+            "wall_ms": round(wall_ms, 1),
+            "peak_rss_mb": round(peak, 1),
+            "rss_delta_mb": round(peak - rss_before, 1),
+            **layout_quality(nodes, edges, result["positions"]),
+        })
+    except MemoryError:
+        out.put({"status": "error", "error": f"MemoryError (limit {mem_limit_gb} GB)"})
+    except Exception as e:
+        out.put({"status": "error", "error": f"{type(e).__name__}: {str(e)[:200]}"})
+
+
+def run_case(engine: str, size: int, timeout: float, mem_limit_gb: float) -> dict[str, Any]:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_run_case, args=(engine, size, mem_limit_gb, out), daemon=True)
+    proc.start()
+    deadline = time.monotonic() + timeout
+    result: Optional[dict] = None
+    try:
+        while result is None and time.monotonic() < deadline:
+            try:
+                result = out.get(timeout=1.0)
+            except queue.Empty:
+                if not proc.is_alive():  # 결과 없이 종료 (OOM kill 등)
+                    result = {"status": "error", "error": f"exit code {proc.exitcode}"}
+        if result is None:
+            result = {"status": "timeout", "error": f"> {timeout:.0f}s"}
+        proc.join(timeout=30)
+    finally:
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+    return {"engine": engine, "nodes": size, **result}
+
+
+# ── 기준 비교 ─────────────────────────────────────────────────────────────────
+def compare(results: list[dict], baseline: list[dict]) -> list[str]:
+    """기준 대비 회귀 목록 (케이스 키: 엔진 + 노드 수). 기준이 ok 였는데 지금 실패한 것도 회귀."""
+    base = {(r["engine"], r["nodes"]): r for r in baseline}
+    regressions = []
+    for r in results:
+        b = base.get((r["engine"], r["nodes"]))
+        if b is None or b.get("status") != "ok":
+            continue
+        case = f"{r['engine']}@{r['nodes']}"
+        if r.get("status") != "ok":
+            regressions.append(f"{case}: {r.get('status')} ({r.get('error')}), baseline ok")
+            continue
+        for metric, tol in TOLERANCE.items():
+            old, new = b.get(metric), r.get(metric)
+            if old is None or new is None:
+                continue
+            # 작은 값(수 ms, 수 MB)의 잡음 무시: 절대 차이도 일정 이상일 때만
+            if new > old * (1 + tol) and new - old > {"wall_ms": 50.0, "rss_delta_mb": 20.0}.get(metric, 0.0):
+                regressions.append(f"{case}: {metric} {old} → {new} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Layout benchmark over synthetic ownership graphs")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="노드 수 목록 (쉼표)")
+    parser.add_argument("--engines", default=",".join(DEFAULT_ENGINES), help="엔진 목록 (쉼표)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="케이스당 최대 초")
+    parser.add_argument("--mem-limit-gb", type=float, default=8.0, help="케이스 프로세스 주소 공간 상한 (0 = 없음)")
+    parser.add_argument("--out", default="benchmarks/results/latest.json", help="결과 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+    baseline = json.loads(Path(args.baseline).read_text())["results"] if args.baseline else None
+
+    results = []
+    for engine in engines:
+        failed_at: Optional[int] = None
+        for size in sorted(sizes):
+            if failed_at is not None:
+                # 더 작은 크기에서 시간·메모리 초과 → 큰 크기는 돌려 봐야 같은 결과
+                r = {"engine": engine, "nodes": size, "status": "skipped", "error": f"failed at {failed_at} nodes"}
+            else:
+                r = run_case(engine, size, args.timeout, args.mem_limit_gb)
+                if r["status"] in ("timeout", "error"):
+                    failed_at = size
+            results.append(r)
+            detail = (
+                f"{r['wall_ms']:>10.1f} ms  rss +{r['rss_delta_mb']:.0f} MB  "
+                f"stress {r['stress']}  edge-cv {r['edge_length_cv']}"
+                if r["status"] == "ok"
+                else f"{r['status']}: {r.get('error')}"
+            )
+            print(f"{engine:>10} {size:>7}  {detail}", flush=True)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": SEED,
+            "tolerance": TOLERANCE,
+        },
+        "results": results,
+    }
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+    print(f"결과 저장: {out}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline)
+        for line in regressions:
+            print(f"회귀: {line}")
+        if regressions:
+            return 1
+        print("기준 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
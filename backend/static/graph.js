@@ -35,6 +35,7 @@ const GRAPH_CONFIG = {
   minRatio: 5, // 초기 로딩 시 N% 미만 지분 제외 (노이즈·뭉침 감소)
   useServerLayout: true, // 서버 레이아웃 사용, 실패 시 클라이언트 force 폴백
   layoutEngine: "pygraphviz", // PyGraphviz(neato) → 실패 시 NetworkX
+  progressiveLayoutMinNodes: 300, // 이 노드 수 이상 + 고정할 기존 좌표 없음 → 점진 레이아웃 작업 (초기 배치 즉시 + SSE 정제)
   openEgoOnNodeClick: false, // 노드 클릭 시 포커스+상세만; true면 지배구조 맵 전체 화면
 };
 
@@ -391,6 +392,8 @@ function getThemeColor(name) {
 let NODES = [];
 let EDGES = [];
 let positions = {};
+let serverLayoutNorm = {}; // 마지막 서버 레이아웃 0~1 좌표 (재요청 시 기존 노드 고정용)
+let layoutJobSource = null; // 진행 중인 점진 레이아웃 작업의 EventSource (새 작업 시작 시 닫음)
 let selectedNode = null;
 let activeFilters = new Set(GRAPH_CONFIG.nodeTypes);
 let nodeCounts = Object.fromEntries(GRAPH_CONFIG.nodeTypes.map((t) => [t, 0])); // 노드 타입별 개수
@@ -418,6 +421,84 @@ let lastNodeSelectionTime = 0; // 선택 직후 zoom 핸들러에서 renderGraph
 /* ═══════════════════════════════════════════
    API
 ═══════════════════════════════════════════ */
+/** 컬럼형 바이너리 응답 (backend app/core/columnar.py 와 같은 레이아웃) */
+const COLUMNAR_MEDIA_TYPE = "application/vnd.graphiq.columnar";
+const COLUMNAR_ARRAY_TYPES = {
+  float64: Float64Array,
+  float32: Float32Array,
+  int32: Int32Array,
+  uint32: Uint32Array,
+  uint8: Uint8Array,
+};
+const NODE_SUB_LABELS = {
+  company: "회사",
+  major: "최대주주",
+  institution: "기관",
+  person: "개인주주",
+};
+
+/**
+ * 컬럼형 바이너리 → JSON 응답과 같은 모양 ({...meta, nodes, edges, layout}).
+ * 열은 ArrayBuffer 위 typed array 뷰로 복사 없이 읽고, Vis.js 에 넘길 객체만 생성.
+ */
+function decodeColumnarGraph(buffer) {
+  const magic = new TextDecoder("ascii").decode(new Uint8Array(buffer, 0, 4));
+  if (magic !== "GQC1") throw new Error("알 수 없는 그래프 바이너리 형식입니다.");
+  const headerLen = new DataView(buffer).getUint32(4, true);
+  const decoder = new TextDecoder();
+  const header = JSON.parse(decoder.decode(new Uint8Array(buffer, 8, headerLen)));
+  const col = {};
+  for (const c of header.columns) {
+    col[c.name] = new COLUMNAR_ARRAY_TYPES[c.dtype](buffer, c.offset, c.length);
+  }
+
+  const ids = new Array(header.n_nodes);
+  const nodes = [];
+  for (let i = 0; i < header.n_nodes; i++) {
+    ids[i] = `n${col.node_id[i]}`;
+    const type = header.types[col.node_type[i]];
+    if (!type) continue; // 엣지 끝점으로만 등장한 노드
+    const node = {
+      id: ids[i],
+      type,
+      label: decoder.decode(
+        col.node_label_data.subarray(
+          col.node_label_offsets[i],
+          col.node_label_offsets[i + 1],
+        ),
+      ),
+      sub: NODE_SUB_LABELS[type] || "",
+    };
+    if (type === "company") node.active = col.node_active[i] === 1;
+    nodes.push(node);
+  }
+
+  const edges = new Array(header.n_edges);
+  for (let j = 0; j < header.n_edges; j++) {
+    const ratio = Math.round(col.edge_ratio[j] * 10) / 10;
+    edges[j] = {
+      from: ids[col.edge_from[j]],
+      to: ids[col.edge_to[j]],
+      type: "HOLDS_SHARES",
+      ratio,
+      count: col.edge_count[j],
+      label: `${ratio.toFixed(1)}%`,
+    };
+  }
+
+  const result = { ...header.meta, nodes, edges };
+  if (col.layout_x) {
+    const positions = {};
+    for (let i = 0; i < header.n_nodes; i++) {
+      if (!Number.isNaN(col.layout_x[i])) {
+        positions[ids[i]] = { x: col.layout_x[i], y: col.layout_y[i] };
+      }
+    }
+    result.layout = { ...(header.meta.layout || {}), positions };
+  }
+  return result;
+}
+
 async function apiCall(endpoint, options = {}) {
   const controller = new AbortController();
   const timeoutId = setTimeout(() => controller.abort(), API_CONFIG.timeout);
@@ -434,6 +515,10 @@ async function apiCall(endpoint, options = {}) {
       const text = await res.text();
       throw new Error(`HTTP ${res.status}: ${text.substring(0, 100)}`);
     }
+    const contentType = res.headers.get("content-type") || "";
+    if (contentType.startsWith(COLUMNAR_MEDIA_TYPE)) {
+      return decodeColumnarGraph(await res.arrayBuffer());
+    }
     return await res.json();
   } catch (e) {
     clearTimeout(timeoutId);
@@ -487,12 +572,22 @@ function exitEgoMode() {
   });
 }
 
-/** 서버 레이아웃 API. 0~1 좌표 → 뷰포트 픽셀. ratio → 시각적 거리. */
+/**
+ * 서버 레이아웃 API. 0~1 좌표 → 뷰포트 픽셀. ratio → 시각적 거리.
+ * 이전 서버 레이아웃에 있던 노드는 그 좌표로 고정 (pin) → 새 노드만 배치, 화면의 기존 노드는 움직이지 않음.
+ */
 async function fetchServerLayout(nodes, edges, viewportW, viewportH) {
-  const pad = LAYOUT_CONFIG.force.padding;
-  const innerW = Math.max(1, viewportW - 2 * pad);
-  const innerH = Math.max(1, viewportH - 2 * pad);
   const engine = GRAPH_CONFIG.layoutEngine || "networkx";
+  const pinned = {};
+  for (const n of nodes) {
+    if (serverLayoutNorm[n.id]) pinned[n.id] = serverLayoutNorm[n.id];
+  }
+  if (
+    Object.keys(pinned).length === 0 &&
+    nodes.length >= GRAPH_CONFIG.progressiveLayoutMinNodes
+  ) {
+    return fetchProgressiveLayout(nodes, edges, viewportW, viewportH);
+  }
   const body = {
     nodes: nodes.map((n) => ({ id: n.id, type: n.type, label: n.label })),
     edges: edges.map((e) => ({
@@ -505,14 +600,98 @@ async function fetchServerLayout(nodes, edges, viewportW, viewportH) {
     padding: 0.05,
     use_components: true,
     engine: engine,
+    positions: Object.keys(pinned).length > 0 ? pinned : null,
+    pin: true,
   };
   const res = await apiCall("/api/v1/graph/layout", {
     method: "POST",
     body: JSON.stringify(body),
   });
   if (!res || !res.positions) return null;
+  serverLayoutNorm = res.positions;
+  return scaleServerLayout(res.positions, viewportW, viewportH);
+}
+
+/**
+ * 점진 레이아웃 작업: 초기 배치(서버에서 반복 없이 계산)를 바로 반환해 렌더,
+ * 이후 SSE 로 오는 정제 좌표를 화면 노드에 제자리 반영 (스피너 없이 점점 정돈됨).
+ */
+async function fetchProgressiveLayout(nodes, edges, viewportW, viewportH) {
+  closeLayoutJobStream();
+  const res = await apiCall("/api/v1/graph/layout/jobs", {
+    method: "POST",
+    body: JSON.stringify({
+      nodes: nodes.map((n) => ({ id: n.id })),
+      edges: edges.map((e) => ({
+        from: e.from,
+        to: e.to,
+        ratio: Math.max(0.1, Math.min(100, e.ratio || 0)),
+      })),
+      padding: 0.05,
+      use_components: true,
+    }),
+  });
+  if (!res || !res.positions) return null;
+  serverLayoutNorm = res.positions;
+  if (res.status === "running") streamLayoutJob(res.job_id, res.seq);
+  return scaleServerLayout(res.positions, viewportW, viewportH);
+}
+
+function streamLayoutJob(jobId, lastSeq) {
+  if (typeof EventSource === "undefined") return;
+  const source = new EventSource(
+    `${API_BASE}/api/v1/graph/layout/jobs/${encodeURIComponent(jobId)}/events`,
+  );
+  layoutJobSource = source;
+  let seq = lastSeq || 0;
+  const apply = (ev) => {
+    if (layoutJobSource !== source) return;
+    const data = JSON.parse(ev.data);
+    if (data.seq <= seq) return;
+    seq = data.seq;
+    applyLayoutUpdate(data.positions);
+  };
+  source.addEventListener("snapshot", apply);
+  source.addEventListener("progress", apply);
+  source.addEventListener("done", (ev) => {
+    apply(ev);
+    closeLayoutJobStream(source);
+  });
+  source.addEventListener("failed", (ev) => {
+    console.warn("Progressive layout failed, keeping initial layout:", ev.data);
+    closeLayoutJobStream(source);
+  });
+  // 서버가 done/failed 후 스트림을 닫으면 브라우저가 재연결을 시도 → 오류 시 닫고 현재 배치 유지
+  source.onerror = () => closeLayoutJobStream(source);
+}
+
+function closeLayoutJobStream(source = layoutJobSource) {
+  if (!source) return;
+  source.close();
+  if (layoutJobSource === source) layoutJobSource = null;
+}
+
+/** 정제 좌표(0~1, 일부 노드) → serverLayoutNorm·positions 갱신 + 화면 노드 이동. */
+function applyLayoutUpdate(norm) {
+  if (!norm || isEgoMode) return;
+  Object.assign(serverLayoutNorm, norm);
+  const vp = getGraphViewport();
+  const scaled = scaleServerLayout(norm, vp.width, vp.height);
+  for (const [id, p] of Object.entries(scaled)) {
+    if (!positions[id]) continue;
+    positions[id] = p;
+    if (visNetwork && visNetwork.body.nodes[id]) visNetwork.moveNode(id, p.x, p.y);
+  }
+}
+
+/** 서버 레이아웃 0~1 좌표 → 뷰포트 픽셀 (layout / bootstrap 공통). */
+function scaleServerLayout(positions, viewportW, viewportH) {
+  if (!positions) return null;
+  const pad = LAYOUT_CONFIG.force.padding;
+  const innerW = Math.max(1, viewportW - 2 * pad);
+  const innerH = Math.max(1, viewportH - 2 * pad);
   const out = {};
-  for (const [id, p] of Object.entries(res.positions)) {
+  for (const [id, p] of Object.entries(positions)) {
     if (p && typeof p.x === "number" && typeof p.y === "number") {
       out[id] = { x: pad + p.x * innerW, y: pad + p.y * innerH };
     }
@@ -853,28 +1032,24 @@ async function loadGraph() {
       1,
     );
 
-    // 노드 개수 조회 및 필터 업데이트
-    try {
-      const countsRes = await apiCall("/api/v1/graph/node-counts");
-      if (countsRes) {
-        nodeCounts = countsRes;
-        updateFilterCounts();
-      }
-    } catch (e) {
-      console.warn("Failed to load node counts:", e);
-      // 개수 조회 실패해도 계속 진행
-    }
-
-    // 엣지를 먼저 로드하여 연결된 노드 ID 수집
-    let edgesRes;
+    // 초기 뷰 단일 왕복: node-counts + edges + nodes + layout (서버에서 병렬 처리)
+    let bootstrapRes;
     try {
       const minR = GRAPH_CONFIG.minRatio != null ? GRAPH_CONFIG.minRatio : "";
-      edgesRes = await apiCall(
-        `/api/v1/graph/edges?limit=${GRAPH_CONFIG.limits.edges}${minR !== "" ? `&min_ratio=${minR}` : ""}`,
-      );
+      const params = new URLSearchParams({
+        edge_limit: GRAPH_CONFIG.limits.edges,
+        node_limit: GRAPH_CONFIG.limits.nodesFallback,
+        engine: GRAPH_CONFIG.layoutEngine || "networkx",
+        layout: GRAPH_CONFIG.useServerLayout ? "true" : "false",
+      });
+      if (minR !== "") params.set("min_ratio", minR);
+      // 컬럼형 바이너리 요청 (응답이 JSON 이면 apiCall 이 그대로 파싱)
+      bootstrapRes = await apiCall(`/api/v1/graph/bootstrap?${params}`, {
+        headers: { Accept: `${COLUMNAR_MEDIA_TYPE}, application/json;q=0.9` },
+      });
     } catch (e) {
       updateStatus("데이터 로드 실패", false);
-      console.error("Failed to load edges:", e);
+      console.error("Failed to load graph bootstrap:", e);
       hideGraphLoading();
       if (e.message && e.message.includes("503")) showServiceUnavailable();
       else showConnectionError();
@@ -888,79 +1063,16 @@ async function loadGraph() {
       1,
     );
 
-    // 빈 응답 처리 강화
-    EDGES = (edgesRes?.edges || []).filter((e) => e && e.from && e.to);
-
-    // 엣지가 참조하는 모든 노드 ID 수집
-    const requiredNodeIds = new Set();
-    EDGES.forEach((e) => {
-      requiredNodeIds.add(e.from);
-      requiredNodeIds.add(e.to);
-    });
-
-    // 연결된 노드만 조회 (엣지가 참조하는 노드들)
-    let nodesRes;
-    try {
-      if (requiredNodeIds.size > 0) {
-        // 노드 ID 목록을 쿼리 파라미터로 전달
-        const nodeIdsParam = Array.from(requiredNodeIds).join(",");
-        nodesRes = await apiCall(
-          `/api/v1/graph/nodes?limit=${GRAPH_CONFIG.limits.nodes}&node_ids=${encodeURIComponent(nodeIdsParam)}`,
-        );
-      } else {
-        // 엣지가 없으면 기본 limit으로 노드만 로드
-        nodesRes = await apiCall(
-          `/api/v1/graph/nodes?limit=${GRAPH_CONFIG.limits.nodesFallback}`,
-        );
-      }
-    } catch (e) {
-      updateStatus("노드 로드 실패", false);
-      console.error("Failed to load nodes:", e);
-      hideGraphLoading();
-      if (e.message && e.message.includes("503")) showServiceUnavailable();
-      else showConnectionError();
-      return;
+    // 노드 개수 (실패 시 null → 아래에서 로드된 NODES 기준으로 표시)
+    if (bootstrapRes?.counts) {
+      nodeCounts = bootstrapRes.counts;
+      updateFilterCounts();
     }
 
     // 빈 응답 처리 강화
-    NODES = (nodesRes?.nodes || []).filter((n) => n && n.id);
-
-    // 엣지가 참조하는 노드가 모두 로드되었는지 확인
-    const loadedNodeIds = new Set(NODES.map((n) => n.id));
-    const missingNodeIds = new Set();
-    EDGES.forEach((e) => {
-      if (!loadedNodeIds.has(e.from)) missingNodeIds.add(e.from);
-      if (!loadedNodeIds.has(e.to)) missingNodeIds.add(e.to);
-    });
-
-    if (missingNodeIds.size > 0) {
-      console.warn(
-        `경고: ${missingNodeIds.size}개의 노드가 엣지에 참조되지만 로드되지 않았습니다.`,
-      );
-      // 누락된 노드가 있으면 추가로 로드 시도
-      try {
-        const missingIdsParam = Array.from(missingNodeIds)
-          .slice(0, GRAPH_CONFIG.limits.nodes)
-          .join(",");
-        const missingNodesRes = await apiCall(
-          `/api/v1/graph/nodes?limit=${GRAPH_CONFIG.limits.nodes}&node_ids=${encodeURIComponent(missingIdsParam)}`,
-        );
-        const missingNodes = (missingNodesRes?.nodes || []).filter(
-          (n) => n && n.id,
-        );
-        NODES.push(...missingNodes);
-        // 개발 환경에서만 로그
-        const isDevelopment =
-          window.location.hostname === "localhost" ||
-          window.location.hostname === "127.0.0.1" ||
-          window.location.protocol === "file:";
-        if (isDevelopment) {
-          console.debug(`누락된 노드 ${missingNodes.length}개 추가 로드 완료`);
-        }
-      } catch (e) {
-        console.warn("누락된 노드 로드 실패:", e);
-      }
-    }
+    EDGES = (bootstrapRes?.edges || []).filter((e) => e && e.from && e.to);
+    NODES = (bootstrapRes?.nodes || []).filter((n) => n && n.id);
+    const bootstrapLayout = bootstrapRes?.layout || null;
 
     // 엣지 필터링: 양쪽 노드가 모두 로드된 엣지만 유지
     const finalNodeIds = new Set(NODES.map((n) => n.id));
@@ -1040,12 +1152,16 @@ async function loadGraph() {
           (e) => nodeIdSet.has(e.from) && nodeIdSet.has(e.to),
         );
         try {
-          const serverPos = await fetchServerLayout(
-            graphView.allNodes,
-            edgesForLayout,
-            vp.width,
-            vp.height,
-          );
+          // 부트스트랩에 포함된 서버 레이아웃 우선, 없으면 별도 레이아웃 요청
+          if (bootstrapLayout) serverLayoutNorm = bootstrapLayout.positions || {};
+          const serverPos = bootstrapLayout
+            ? scaleServerLayout(bootstrapLayout.positions, vp.width, vp.height)
+            : await fetchServerLayout(
+                graphView.allNodes,
+                edgesForLayout,
+                vp.width,
+                vp.height,
+              );
           if (
             serverPos &&
             Object.keys(serverPos).length >= graphView.allNodes.length
@@ -1359,6 +1475,18 @@ async function loadNodeDetail(nodeId) {
   }
 }
 
+// 대화 이력은 세션별 (백엔드가 X-Session-Id 로 구분) — 탭 단위로 유지
+function chatSessionHeaders() {
+  let id = sessionStorage.getItem("graphiqChatSession");
+  if (!id) {
+    id = window.crypto && crypto.randomUUID
+      ? crypto.randomUUID().replace(/-/g, "")
+      : Date.now().toString(36) + Math.random().toString(36).slice(2);
+    sessionStorage.setItem("graphiqChatSession", id);
+  }
+  return { "X-Session-Id": id };
+}
+
 async function sendChatMessage(question) {
   const contextLabel = chatContext ? chatContext.label : null;
   const enhancedQ = contextLabel
@@ -1368,6 +1496,7 @@ async function sendChatMessage(question) {
   try {
     const res = await apiCall("/api/v1/chat", {
       method: "POST",
+      headers: chatSessionHeaders(),
       body: JSON.stringify({ question: enhancedQ }),
     });
     return res;
@@ -3333,6 +3462,7 @@ async function resetChatHistory() {
   try {
     await apiCall("/api/v1/chat", {
       method: "DELETE",
+      headers: chatSessionHeaders(),
     });
 
     const msgs = document.getElementById("chatMsgs");
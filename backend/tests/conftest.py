@@ -0,0 +1,68 @@
+"""
+공통 테스트 설정.
+
+설정(get_settings)은 필수 환경변수를 검증하므로 앱 모듈 임포트 전에 더미 값을 채움 (CI 는 워크플로 env 로 지정).
+레이아웃은 프로세스 풀 없이 호출 스레드에서 계산, 공유 캐시·스냅샷 파일은 쓰지 않음.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("NEO4J_URI", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_PASSWORD", "test")
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ["LAYOUT_POOL_WORKERS"] = "0"
+os.environ["LAYOUT_CACHE_PATH"] = ""
+os.environ["CACHE_SHARED_PATH"] = ""
+os.environ["OWNERSHIP_SNAPSHOT_DIR"] = ""
+os.environ["GLOBAL_LAYOUT_PATH"] = ""
+
+
+class FakeAsyncGraph:
+    """AsyncGraphReader 대역: handler(query, params) → 행 목록 (예외 인스턴스면 raise). 호출은 calls 에 기록."""
+
+    def __init__(self, handler=None):
+        self.handler = handler or (lambda query, params: [])
+        self.calls: list[tuple[str, dict]] = []
+
+    async def query(self, query: str, params: dict | None = None) -> list[dict]:
+        self.calls.append((query, params or {}))
+        result = self.handler(query, params or {})
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def stream(self, query: str, params: dict | None = None):
+        for row in await self.query(query, params):
+            yield row
+
+
+@pytest.fixture
+def fake_graph(monkeypatch) -> FakeAsyncGraph:
+    """그래프 엔드포인트의 Neo4j 조회를 대역으로 교체."""
+    from app.api.v1.endpoints import graph as endpoints
+
+    fake = FakeAsyncGraph()
+    monkeypatch.setattr(endpoints, "get_async_graph", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def install_engine(monkeypatch):
+    """CSR 엔진에 테스트 그래프 설치 (테스트 끝나면 원래대로)."""
+    from app.services.ownership_engine import get_ownership_engine
+
+    def install(g) -> None:
+        monkeypatch.setattr(get_ownership_engine(), "_graph", g)
+
+    return install
+
+
+@pytest.fixture
+def client():
+    """앱 TestClient (startup 이벤트 없이: 프로브·통계·엔진 스레드를 띄우지 않음)."""
+    from fastapi.testclient import TestClient
+
+    from app.main import api
+
+    return TestClient(api)
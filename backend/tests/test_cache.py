@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.cache import _MISSING, LRUTTLCache, SQLiteCacheBackend
+
+
+def test_lru_eviction_by_entries():
+    c = LRUTTLCache("t", ttl=60, max_entries=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # a 를 최근 사용으로
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    assert c.stats()["evictions"] == 1
+
+
+def test_byte_bound():
+    c = LRUTTLCache("t", ttl=60, max_entries=100, max_bytes=40)
+    c.set("big", "x" * 100)  # 단일 항목이 상한 초과 → 저장 안 함
+    assert c.get("big") is None
+    c.set("a", "x" * 25)  # JSON 27바이트씩 → 둘은 상한 초과
+    c.set("b", "y" * 25)
+    assert c.get("a") is None and c.get("b") is not None
+    assert c.stats()["bytes"] <= 40
+
+
+def test_ttl_expiry():
+    c = LRUTTLCache("t", ttl=0.05, max_entries=10)
+    c.set("a", 1)
+    assert c.get("a") == 1
+    time.sleep(0.06)
+    assert c.get("a", "missing") == "missing"
+    assert c.stats()["expirations"] == 1
+
+
+def test_invalidate():
+    c = LRUTTLCache("t", ttl=60)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.invalidate("a")
+    assert c.get("a") is None and c.get("b") == 2
+    c.invalidate()
+    assert c.get("b") is None and c.stats()["bytes"] == 0
+
+
+def test_get_or_load_single_flight():
+    c = LRUTTLCache("t", ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return {"v": calls}
+
+    async def main():
+        return await asyncio.gather(*(c.get_or_load("k", loader) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert results == [{"v": 1}] * 5
+    stats = c.stats()
+    assert stats["loads"] == 1 and stats["coalesced"] == 4
+
+
+def test_get_or_load_survives_first_waiter_cancel():
+    """첫 요청(로드를 시작한 쪽)이 취소돼도 나머지 대기자는 결과를 받고, 결과는 캐시됨."""
+    c = LRUTTLCache("t", ttl=60)
+    calls = 0
+
+    async def main():
+        gate = asyncio.Event()
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return "value"
+
+        first = asyncio.create_task(c.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(c.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "value"
+    assert calls == 1
+    assert c.get("k") == "value"
+
+
+def test_get_or_load_finishes_without_waiters():
+    """유일한 대기자가 취소돼도 로드는 끝까지 실행되어 캐시에 들어감."""
+    c = LRUTTLCache("t", ttl=60)
+
+    async def main():
+        done = asyncio.Event()
+
+        async def loader():
+            await asyncio.sleep(0.01)
+            done.set()
+            return 42
+
+        task = asyncio.create_task(c.get_or_load("k", loader))
+        await asyncio.sleep(0)
+        task.cancel()
+        await done.wait()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert c.get("k") == 42
+
+
+def test_get_or_load_error_is_shared_not_cached():
+    c = LRUTTLCache("t", ttl=60)
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise KeyError("nope")
+
+    async def main():
+        return await asyncio.gather(*(c.get_or_load("k", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert calls == 1 and all(isinstance(r, KeyError) for r in results)
+    assert c.get("k") is None
+    assert asyncio.run(c.get_or_load("k", _const(7))) == 7
+
+
+def _const(value):
+    async def loader():
+        return value
+
+    return loader
+
+
+def test_get_or_compute_single_flight():
+    c = LRUTTLCache("t", ttl=60)
+    calls = 0
+    lock = threading.Lock()
+
+    def compute():
+        nonlocal calls
+        with lock:
+            calls += 1
+        time.sleep(0.05)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(c.get_or_compute("k", compute))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["v"] * 4
+    assert calls == 1
+
+
+def test_shared_tier_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    a = LRUTTLCache("t", ttl=60, shared=SQLiteCacheBackend(path, namespace="t"))
+    b = LRUTTLCache("t", ttl=60, shared=SQLiteCacheBackend(path, namespace="t"))
+    assert a.get_or_compute("k", lambda: {"x": 1}) == {"x": 1}
+    assert b.get_or_compute("k", lambda: pytest.fail("should hit shared tier")) == {"x": 1}
+    assert b.stats()["shared_hits"] == 1
+    a.invalidate("k")  # 공유 행도 삭제
+    assert SQLiteCacheBackend(path, namespace="t").usage() == (0, 0)
+
+
+def test_shared_tier_bounds(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), namespace="t", max_entries=3, max_bytes=0)
+    for i in range(6):
+        backend.set(f"k{i}", i, ttl=60 + i)  # 만료가 먼 항목이 남음
+    backend.purge_expired()
+    assert backend.usage()[0] == 3
+    assert [backend.get(f"k{i}") for i in (3, 4, 5)] == [3, 4, 5]
+
+    sized = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), namespace="s", max_bytes=25)
+    for i in range(4):
+        sized.set(f"k{i}", "x" * 8, ttl=60 + i)  # JSON 10바이트씩
+    sized.purge_expired()
+    entries, size = sized.usage()
+    assert entries == 2 and size <= 25
+    # 다른 네임스페이스는 영향 없음
+    assert backend.usage()[0] == 3
+
+
+def test_shared_tier_expiry(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), namespace="t")
+    backend.set("k", 1, ttl=-1)
+    assert backend.get("k") is _MISSING
+    backend.purge_expired()
+    assert backend.usage() == (0, 0)
@@ -0,0 +1,105 @@
+"""/chat 엔드포인트 (GraphService 대역)."""
+import json
+
+import pytest
+
+from app.api.v1.endpoints import chat
+
+RESULT = {
+    "answer": "답변",
+    "cypher": "MATCH (c) RETURN c",
+    "raw": [],
+    "hints": [],
+    "source": "DB_EMPTY",
+    "confidence": "MEDIUM",
+    "cached": False,
+    "elapsed": 0.1,
+}
+
+
+class _Service:
+    """ask_graph / ask_graph_stream / reset_chat 대역. 받은 (질문, 세션 id) 를 기록."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    def ask_graph(self, question: str, session_id: str) -> dict:
+        self.calls.append((question, session_id))
+        return RESULT
+
+    async def ask_graph_stream(self, question: str, session_id: str):
+        self.calls.append((question, session_id))
+        yield "hints", {"hints": ["삼성전자"]}
+        yield "cypher", {"cypher": RESULT["cypher"], "cached": False}
+        yield "rows", {"raw": []}
+        yield "token", {"text": "답"}
+        yield "token", {"text": "변"}
+        yield "done", RESULT
+
+    def reset_chat(self, session_id: str) -> None:
+        self.calls.append(("reset", session_id))
+
+
+@pytest.fixture
+def service(monkeypatch) -> _Service:
+    fake = _Service()
+    monkeypatch.setattr(chat, "graph_service", fake)
+    return fake
+
+
+def _events(text: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_chat_stream_sse(client, service):
+    r = client.post("/api/v1/chat/stream", json={"question": "삼성전자 최대주주는?"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert r.headers["Cache-Control"] == "no-cache"
+    events = _events(r.text)
+    assert [name for name, _ in events] == ["hints", "cypher", "rows", "token", "token", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == events[-1][1]["answer"]
+
+
+def test_chat_stream_rejects_empty_question(client, service):
+    assert client.post("/api/v1/chat/stream", json={"question": "  "}).status_code == 400
+    assert service.calls == []
+
+
+# ── 세션 (헤더 우선, 없으면 쿠키) ───────────────────────────────────────────
+def test_new_session_issues_cookie_and_header(client, service):
+    r = client.post("/api/v1/chat", json={"question": "질문"})
+    session_id = r.headers[chat.SESSION_HEADER]
+    assert r.cookies[chat.SESSION_COOKIE] == session_id
+    assert service.calls == [("질문", session_id)]
+
+    # 쿠키로 같은 세션 유지, 쿠키 재발급 없음
+    r = client.post("/api/v1/chat", json={"question": "후속"})
+    assert r.headers[chat.SESSION_HEADER] == session_id
+    assert chat.SESSION_COOKIE not in r.cookies
+    assert service.calls[-1] == ("후속", session_id)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/chat", "/api/v1/chat/stream"])
+def test_header_overrides_cookie(client, service, path):
+    client.cookies.set(chat.SESSION_COOKIE, "cookie-session-1")
+    r = client.post(path, json={"question": "질문"}, headers={chat.SESSION_HEADER: "header-session-1"})
+    assert r.headers[chat.SESSION_HEADER] == "header-session-1"
+    assert service.calls == [("질문", "header-session-1")]
+
+
+def test_malformed_session_id_gets_new_one(client, service):
+    r = client.post("/api/v1/chat/stream", json={"question": "질문"}, headers={chat.SESSION_HEADER: "bad id!"})
+    issued = r.headers[chat.SESSION_HEADER]
+    assert issued != "bad id!" and r.cookies[chat.SESSION_COOKIE] == issued
+
+
+def test_clear_history_only_for_known_session(client, service):
+    client.delete("/api/v1/chat")
+    assert service.calls == []  # 세션 없는 요청은 초기화할 이력도 없음
+    client.delete("/api/v1/chat", headers={chat.SESSION_HEADER: "session-abc"})
+    assert service.calls == [("reset", "session-abc")]
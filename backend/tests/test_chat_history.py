@@ -0,0 +1,106 @@
+import threading
+import time
+
+import pytest
+
+from app.services.chat_history import MemoryChatHistory, SQLiteChatHistory
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(max_turns=3, max_sessions=100, ttl_sec=60.0):
+        if request.param == "memory":
+            return MemoryChatHistory(max_turns=max_turns, max_sessions=max_sessions, ttl_sec=ttl_sec)
+        return SQLiteChatHistory(
+            str(tmp_path / "chat.sqlite"), max_turns=max_turns, max_sessions=max_sessions, ttl_sec=ttl_sec
+        )
+
+    return make
+
+
+def test_sessions_are_isolated(make_store):
+    store = make_store()
+    store.append("a", "q1", "a1")
+    store.append("b", "q2", "a2")
+    assert store.turns("a") == [("q1", "a1")]
+    assert store.turns("b") == [("q2", "a2")]
+    assert store.turns("unknown") == []
+
+
+def test_keeps_latest_turns(make_store):
+    store = make_store(max_turns=3)
+    for i in range(5):
+        store.append("s", f"q{i}", f"a{i}")
+    assert store.turns("s") == [("q2", "a2"), ("q3", "a3"), ("q4", "a4")]
+
+
+def test_clear(make_store):
+    store = make_store()
+    store.append("s", "q", "a")
+    store.append("t", "q", "a")
+    store.clear("s")
+    assert store.turns("s") == []
+    assert store.turns("t") == [("q", "a")]
+
+
+def test_idle_ttl_expiry(make_store):
+    store = make_store(ttl_sec=0.05)
+    store.append("s", "old", "answer")
+    time.sleep(0.1)
+    assert store.turns("s") == []
+    # 만료된 세션에 이어 쓰면 이전 턴 없이 새로 시작
+    store.append("s", "new", "answer")
+    assert store.turns("s") == [("new", "answer")]
+
+
+def test_memory_session_cap_is_lru():
+    store = MemoryChatHistory(max_turns=3, max_sessions=2, ttl_sec=60)
+    store.append("a", "q", "a")
+    store.append("b", "q", "a")
+    store.turns("a")  # a 를 최근 사용으로
+    store.append("c", "q", "a")
+    assert store.turns("b") == []
+    assert store.turns("a") and store.turns("c")
+    assert store.status()["evictions"] == 1
+
+
+def test_sqlite_session_cap_on_purge(tmp_path):
+    store = SQLiteChatHistory(str(tmp_path / "chat.sqlite"), max_turns=3, max_sessions=2, ttl_sec=60)
+    for sid in ("a", "b", "c"):
+        store.append(sid, "q", "a")
+        time.sleep(0.01)
+    store._purge(time.time())
+    assert store.status()["sessions"] == 2
+    assert store.turns("a") == []
+
+
+def test_sqlite_shared_between_instances(tmp_path):
+    path = str(tmp_path / "chat.sqlite")
+    SQLiteChatHistory(path, max_turns=3, max_sessions=10, ttl_sec=60).append("s", "q", "a")
+    assert SQLiteChatHistory(path, max_turns=3, max_sessions=10, ttl_sec=60).turns("s") == [("q", "a")]
+
+
+def test_sqlite_concurrent_appends(tmp_path):
+    """워커 여럿(= 연결 여럿)이 같은 세션에 동시에 써도 턴이 빠지거나 (session, seq) 가 충돌하지 않음."""
+    path = str(tmp_path / "chat.sqlite")
+    stores = [SQLiteChatHistory(path, max_turns=100, max_sessions=10, ttl_sec=60) for _ in range(4)]
+    errors: list[BaseException] = []
+
+    def worker(store, w):
+        try:
+            for i in range(10):
+                store.append("s", f"w{w}-q{i}", "a")
+        except BaseException as e:  # noqa: BLE001 — 스레드 예외를 테스트로 전달
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(s, w)) for w, s in enumerate(stores)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    turns = stores[0].turns("s")
+    assert len(turns) == 40
+    for w in range(4):
+        mine = [q for q, _ in turns if q.startswith(f"w{w}-")]
+        assert mine == [f"w{w}-q{i}" for i in range(10)]
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+
+from app.services.neo4j_connection import CircuitBreaker, CircuitOpenError, Neo4jConnectionManager
+
+
+def test_opens_after_consecutive_failures():
+    b = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        b.record_failure(RuntimeError("down"))
+        assert b.state == CircuitBreaker.CLOSED and b.allow_request()
+    b.record_failure(RuntimeError("down"))
+    assert b.state == CircuitBreaker.OPEN
+    assert not b.allow_request()
+    snap = b.snapshot()
+    assert snap["consecutive_failures"] == 3 and snap["last_error"] == "down"
+    assert 0 < snap["retry_in_sec"] <= 60
+
+
+def test_success_resets_failure_count():
+    b = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    b.record_failure()
+    b.record_success()
+    b.record_failure()
+    assert b.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_trial():
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    b.record_failure()
+    assert not b.allow_request()
+    time.sleep(0.06)
+    assert b.state == CircuitBreaker.HALF_OPEN
+    assert b.allow_request()
+    assert not b.allow_request()  # 시험 요청 진행 중
+    b.record_success()
+    assert b.state == CircuitBreaker.CLOSED and b.allow_request()
+
+
+def test_half_open_failure_reopens():
+    b = CircuitBreaker(failure_threshold=5, reset_timeout=0.05)
+    for _ in range(5):
+        b.record_failure()
+    time.sleep(0.06)
+    assert b.allow_request()
+    b.record_failure()  # 시험 실패는 임계값과 무관하게 즉시 OPEN
+    assert b.state == CircuitBreaker.OPEN
+    assert not b.allow_request()
+
+
+class _FakeGraph:
+    def __init__(self, ok: bool):
+        self.ok = ok
+
+    def query(self, cypher):
+        if not self.ok:
+            raise ServiceUnavailable("down")
+        return [{"ok": 1}]
+
+
+def _manager(graph: _FakeGraph) -> Neo4jConnectionManager:
+    manager = Neo4jConnectionManager()
+    manager.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    manager._graph = graph
+    return manager
+
+
+def test_get_graph_half_open_failed_trial_raises():
+    manager = _manager(_FakeGraph(ok=False))
+    manager.breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        manager.get_graph()  # OPEN
+    time.sleep(0.06)
+    with pytest.raises(CircuitOpenError):
+        manager.get_graph()  # HALF_OPEN 시험 실패 → 연결을 넘기지 않고 다시 OPEN
+    assert manager.breaker.state == CircuitBreaker.OPEN
+
+
+def test_get_graph_half_open_successful_trial_closes():
+    graph = _FakeGraph(ok=True)
+    manager = _manager(graph)
+    manager.breaker.record_failure()
+    time.sleep(0.06)
+    assert manager.get_graph() is graph
+    assert manager.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,72 @@
+import json
+import math
+import struct
+
+import numpy as np
+
+from app.core.columnar import MAGIC, NODE_TYPES, accepts_columnar, encode_graph
+
+
+def _decode(buf: bytes) -> tuple[dict, dict[str, np.ndarray]]:
+    """graph.js decodeColumnarGraph 와 같은 규칙으로 읽기."""
+    assert buf[:4] == MAGIC
+    (header_len,) = struct.unpack("<I", buf[4:8])
+    header = json.loads(buf[8:8 + header_len])
+    columns = {}
+    for spec in header["columns"]:
+        assert spec["offset"] % 8 == 0
+        dtype = np.dtype(spec["dtype"]).newbyteorder("<")
+        columns[spec["name"]] = np.frombuffer(buf, dtype=dtype, count=spec["length"], offset=spec["offset"])
+    return header, columns
+
+
+NODES = [
+    {"id": "n1", "type": "company", "label": "삼성전자", "active": True},
+    {"id": "n2", "type": "person", "label": "홍길동"},
+    {"id": "n3", "type": "company", "label": "폐업회사", "active": False},
+]
+EDGES = [
+    {"from": "n2", "to": "n1", "ratio": 12.5, "count": 2},
+    {"from": "n1", "to": "n3", "ratio": 100.0},
+    {"from": "n9", "to": "n1", "ratio": None},  # 엣지에만 등장한 노드
+]
+
+
+def test_roundtrip():
+    header, cols = _decode(encode_graph(NODES, EDGES, meta={"total": 3}))
+    assert header["n_nodes"] == 4 and header["n_edges"] == 3
+    assert header["meta"] == {"total": 3}
+    assert cols["node_id"].tolist() == [1.0, 2.0, 3.0, 9.0]
+    assert [NODE_TYPES[t] for t in cols["node_type"]] == ["company", "person", "company", ""]
+    assert cols["node_active"].tolist() == [1, 1, 0, 1]
+
+    offsets, data = cols["node_label_offsets"], cols["node_label_data"].tobytes()
+    labels = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(header["n_nodes"])]
+    assert labels == ["삼성전자", "홍길동", "폐업회사", ""]
+
+    assert cols["edge_from"].tolist() == [1, 0, 3]
+    assert cols["edge_to"].tolist() == [0, 2, 0]
+    assert cols["edge_ratio"].tolist() == [12.5, 100.0, 0.0]
+    assert cols["edge_count"].tolist() == [2, 1, 1]
+    assert "layout_x" not in cols
+
+
+def test_positions_and_missing_nodes():
+    positions = {"n1": {"x": 0.25, "y": 0.75}, "n3": {"x": 1.0, "y": 0.0}, "unknown": {"x": 0.5, "y": 0.5}}
+    _, cols = _decode(encode_graph(NODES, EDGES, positions=positions))
+    xs, ys = cols["layout_x"].tolist(), cols["layout_y"].tolist()
+    assert xs[0] == 0.25 and ys[0] == 0.75
+    assert xs[2] == 1.0 and ys[2] == 0.0
+    assert math.isnan(xs[1]) and math.isnan(ys[3])
+
+
+def test_empty_graph():
+    header, cols = _decode(encode_graph([], []))
+    assert header["n_nodes"] == 0 and header["n_edges"] == 0
+    assert cols["node_label_offsets"].tolist() == [0]
+
+
+def test_accepts_columnar():
+    assert accepts_columnar("application/vnd.graphiq.columnar, application/json;q=0.5")
+    assert not accepts_columnar("application/json")
+    assert not accepts_columnar(None)
@@ -0,0 +1,46 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.graph import _decode_cursor, _encode_cursor
+
+
+def _raw(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_roundtrip_numbers():
+    values = [12.3456, 101, 202]
+    cursor = _encode_cursor(values)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor, 3) == values
+
+
+def test_roundtrip_keys():
+    values = [1, "가나다-123", 77]
+    assert _decode_cursor(_encode_cursor(values), 3, keys=True) == values
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "%%%",  # base64 아님
+        _raw({"a": 1}),  # 리스트 아님
+        _raw([1, 2]),  # 길이 불일치
+        _raw([1, True, 3]),  # bool 은 숫자로 보지 않음
+        _raw([1, None, 3]),
+        _raw([1, "x", 3]),  # keys=False 면 문자열 거부
+    ],
+)
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(cursor, 3)
+    assert exc.value.status_code == 400
+
+
+def test_keys_mode_still_rejects_non_scalars():
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(_raw([0, ["x"], 1]), 3, keys=True)
+    assert exc.value.status_code == 400
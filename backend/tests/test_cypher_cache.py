@@ -0,0 +1,72 @@
+import numpy as np
+
+from app.services.cypher_cache import SemanticCypherCache
+
+GEN = "g1"
+
+
+def _vec(seed: int, dim: int = 16) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=dim)
+
+
+def _near(v: np.ndarray, eps: float = 0.01) -> np.ndarray:
+    return v + eps * np.random.default_rng(99).normal(size=v.shape)
+
+
+def test_hit_on_similar_question():
+    c = SemanticCypherCache(max_entries=8, threshold=0.95, dim=16)
+    v = _vec(1)
+    c.store(v, "삼성전자 최대주주는?", ["삼성전자"], "MATCH (c) RETURN c", GEN)
+    assert c.lookup(_near(v), "삼성전자의 최대 주주는?", ["삼성전자"], GEN) == "MATCH (c) RETURN c"
+    assert c.lookup(_vec(2), "전혀 다른 질문", ["삼성전자"], GEN) is None
+    stats = c.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["rejected"] == 0
+
+
+def test_hints_and_numbers_must_match():
+    c = SemanticCypherCache(max_entries=8, threshold=0.95, dim=16)
+    v = _vec(1)
+    c.store(v, "지분 5% 이상 주주", ["삼성전자"], "CYPHER-5", GEN)
+    assert c.lookup(v, "지분 10% 이상 주주", ["삼성전자"], GEN) is None
+    assert c.lookup(v, "지분 5% 이상 주주", ["현대차"], GEN) is None
+    assert c.lookup(v, "지분 5 % 이상 주주들", ["삼성전자"], GEN) == "CYPHER-5"
+    # 임계값은 넘었지만 힌트·숫자가 달라 거른 경우
+    assert c.stats()["rejected"] == 2
+
+
+def test_numbers_ignore_thousands_separator():
+    c = SemanticCypherCache(max_entries=8, threshold=0.95, dim=16)
+    v = _vec(3)
+    c.store(v, "자산 1,000억 이상", [], "CYPHER", GEN)
+    assert c.lookup(v, "자산 1000억 이상", [], GEN) == "CYPHER"
+
+
+def test_generation_change_clears():
+    c = SemanticCypherCache(max_entries=8, threshold=0.95, dim=16)
+    v = _vec(1)
+    c.store(v, "q", [], "CYPHER", GEN)
+    assert c.lookup(v, "q", [], "g2") is None
+    assert c.stats()["entries"] == 0 and c.stats()["invalidations"] == 1
+    assert c.lookup(v, "q", [], GEN) is None
+
+
+def test_lru_eviction_and_replace():
+    c = SemanticCypherCache(max_entries=2, threshold=0.95, dim=16)
+    a, b, d = _vec(1), _vec(2), _vec(3)
+    c.store(a, "a", [], "A", GEN)
+    c.store(b, "b", [], "B", GEN)
+    assert c.lookup(a, "a", [], GEN) == "A"  # a 가 최근 사용
+    c.store(d, "d", [], "D", GEN)  # b 제거
+    assert c.lookup(b, "b", [], GEN) is None
+    assert c.lookup(a, "a", [], GEN) == "A" and c.lookup(d, "d", [], GEN) == "D"
+    assert c.stats()["evictions"] == 1
+
+    c.store(_near(a), "a again", [], "A2", GEN)  # 같은 힌트·숫자의 근접 항목 교체 (제거 아님)
+    assert c.lookup(a, "a", [], GEN) == "A2"
+    assert c.stats()["entries"] == 2 and c.stats()["evictions"] == 1
+
+
+def test_disabled_cache():
+    c = SemanticCypherCache(max_entries=0, threshold=0.95, dim=16)
+    c.store(_vec(1), "q", [], "CYPHER", GEN)
+    assert c.lookup(_vec(1), "q", [], GEN) is None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from app.services.fa2_layout import _repulsion_field, forceatlas2
+
+
+def _brute_repulsion(pos: np.ndarray, mass: np.ndarray) -> np.ndarray:
+    d = pos[:, None, :] - pos[None, :, :]
+    d2 = (d * d).sum(axis=2)
+    np.fill_diagonal(d2, np.inf)
+    return (mass[None, :, None] * d / d2[:, :, None]).sum(axis=1)
+
+
+@pytest.mark.parametrize(
+    "pos",
+    [
+        np.random.default_rng(0).uniform(-10, 10, size=(600, 2)),
+        # 한쪽에 몰린 분포 (최하위 레벨 세분 경로)
+        np.concatenate([
+            np.random.default_rng(1).normal(0, 0.05, size=(400, 2)),
+            np.random.default_rng(2).uniform(-50, 50, size=(200, 2)),
+        ]),
+    ],
+    ids=["uniform", "clustered"],
+)
+def test_barnes_hut_matches_brute_force(pos):
+    mass = np.random.default_rng(3).integers(1, 6, size=len(pos)).astype(np.float64)
+    approx = _repulsion_field(pos, mass)
+    exact = _brute_repulsion(pos, mass)
+    err = np.linalg.norm(approx - exact, axis=1) / np.maximum(np.linalg.norm(exact, axis=1), 1e-9)
+    assert float(np.median(err)) < 0.02
+    assert float(np.percentile(err, 95)) < 0.1
+
+
+def _ring_with_hub(n: int):
+    src = np.concatenate([np.arange(n), np.zeros(n // 4, dtype=int)])
+    dst = np.concatenate([(np.arange(n) + 1) % n, np.arange(1, n, 4)[: n // 4]])
+    return src, dst, np.full(src.shape, 0.5)
+
+
+def test_forceatlas2_deterministic_and_finite():
+    src, dst, w = _ring_with_hub(200)
+    a = forceatlas2(200, src, dst, w, seed=42, iterations=30)
+    b = forceatlas2(200, src, dst, w, seed=42, iterations=30)
+    assert a.shape == (200, 2) and np.isfinite(a).all()
+    np.testing.assert_array_equal(a, b)
+    # 겹친 노드 없음
+    assert len({(round(x, 9), round(y, 9)) for x, y in a}) == 200
+
+
+def test_forceatlas2_neighbors_closer_than_average():
+    src, dst, w = _ring_with_hub(200)
+    pos = forceatlas2(200, src, dst, w, seed=42, iterations=50)
+    edge_len = np.linalg.norm(pos[src] - pos[dst], axis=1).mean()
+    rng = np.random.default_rng(5)
+    i, j = rng.integers(0, 200, size=(2, 2000))
+    keep = i != j
+    random_len = np.linalg.norm(pos[i[keep]] - pos[j[keep]], axis=1).mean()
+    assert edge_len < 0.5 * random_len
+
+
+def test_barnes_hut_level_without_far_pairs():
+    # 멀리 떨어진 두 밀집 무리: 깊은 레벨에는 원거리 상호작용 셀이 없음 (빈 누적이 정수 배열이 되던 경우)
+    rng = np.random.default_rng(4)
+    pos = np.concatenate([rng.normal(0, 1e-3, size=(30, 2)), rng.normal(0, 1e-3, size=(30, 2)) + [1.0, 0.0]])
+    mass = np.ones(len(pos))
+    approx = _repulsion_field(pos, mass)
+    exact = _brute_repulsion(pos, mass)
+    err = np.linalg.norm(approx - exact, axis=1) / np.maximum(np.linalg.norm(exact, axis=1), 1e-9)
+    assert float(np.percentile(err, 95)) < 0.1
@@ -0,0 +1,455 @@
+"""그래프 엔드포인트 (TestClient + Neo4j 조회 대역 + 테스트용 CSR 엔진)."""
+import json
+
+import numpy as np
+import pytest
+
+from app.api.v1.endpoints import graph as graph_endpoints
+from app.api.v1.endpoints.graph import _encode_cursor, _node_detail_cache
+from app.core.columnar import MAGIC, MEDIA_TYPE as COLUMNAR_MEDIA_TYPE
+from app.core.http_cache import HAS_BROTLI, PARTIAL_HEADER
+from app.services import global_layout, layout_service, ownership_analysis
+from app.services.data_version import get_data_version
+from app.services.layout_pool import LayoutPoolBusy
+from app.services.ownership_analysis import CommunityIndex, CycleIndex
+from app.services.ownership_engine import OwnershipGraph
+
+
+def _engine(pairs: list[tuple[int, int, float]]) -> OwnershipGraph:
+    src = np.array([p[0] for p in pairs], dtype=np.int64)
+    dst = np.array([p[1] for p in pairs], dtype=np.int64)
+    ratio = np.array([p[2] for p in pairs], dtype=np.float64)
+    return OwnershipGraph.from_pairs(src, dst, ratio, np.ones(len(pairs)), ratio)
+
+
+def _company_rows(query: str, params: dict) -> list[dict]:
+    """_NODE_ROWS_QUERY 응답: 모든 id 를 회사로."""
+    return [{"id": i, "labels": ["Company"], "props": {"companyName": f"회사{i}"}} for i in params.get("ids", [])]
+
+
+# ── /graph/cycles ───────────────────────────────────────────────────────────
+CYCLE_PAIRS = [(1, 2, 10.0), (2, 1, 90.0), (3, 4, 50.0), (4, 3, 60.0), (5, 6, 1.0)]
+
+
+def test_cycles_503_until_index_ready(client, fake_graph, install_engine, monkeypatch):
+    install_engine(_engine(CYCLE_PAIRS))
+    monkeypatch.setattr(ownership_analysis, "_cycle_index", None)
+    r = client.get("/api/v1/graph/cycles")
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "30"
+    assert fake_graph.calls == []
+
+
+def test_cycles_from_ranked_index(client, fake_graph, install_engine, monkeypatch):
+    g = _engine(CYCLE_PAIRS)
+    install_engine(g)
+    monkeypatch.setattr(ownership_analysis, "_cycle_index", CycleIndex(g, max_length=4, max_cycles=100))
+    fake_graph.handler = _company_rows
+
+    body = client.get("/api/v1/graph/cycles").json()
+    assert body["total"] == 2
+    assert [c["min_ratio"] for c in body["cycles"]] == [50.0, 10.0]
+
+    body = client.get("/api/v1/graph/cycles", params={"limit": 1}).json()
+    assert [c["min_ratio"] for c in body["cycles"]] == [50.0]
+
+    body = client.get("/api/v1/graph/cycles", params={"node_id": "n2"}).json()
+    assert body["total"] == 1 and body["node"]["in_cycle"]
+    assert {n["id"] for n in body["cycles"][0]["nodes"]} == {"n1", "n2"}
+
+
+# ── /graph/edges ────────────────────────────────────────────────────────────
+EDGE_PAIRS = [(i, i + 1, float(i % 7)) for i in range(1, 30)]
+
+
+def test_edges_cursor_pages_cover_everything(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 8, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/graph/edges", params=params).json()
+        seen.extend((e["from"], e["to"]) for e in body["edges"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(EDGE_PAIRS) == len(set(seen))
+
+
+def test_edges_ndjson_stream(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    r = client.get("/api/v1/graph/edges", headers={"Accept": "application/x-ndjson"})
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert lines[-1] == {"done": True, "count": len(EDGE_PAIRS)}
+    ratios = [e["ratio"] for e in lines[:-1]]
+    assert ratios == sorted(ratios, reverse=True)
+
+
+def test_edges_bad_cursor_is_400(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    assert client.get("/api/v1/graph/edges", params={"cursor": "%%%"}).status_code == 400
+
+
+# ── /graph/nodes ────────────────────────────────────────────────────────────
+COMPANIES = [(f"{100 + i}", i) for i in range(1, 5)]  # (bizno, id)
+STOCKHOLDERS = [("p1", 20), ("p1", 21), ("p2", 10), ("p3", 30), ("p3", 31)]  # (personId, id) — personId 중복 허용
+
+
+def _nodes_handler(query: str, params: dict) -> list[dict]:
+    """회사/주주 keyset 페이지 쿼리를 메모리 데이터로 흉내 (WHERE 절 형태로 분기)."""
+    limit = params["limit"]
+    if "MATCH (c:Company)" in query:
+        rows = [(k, i) for k, i in COMPANIES if "$after_key" not in query or k > params["after_key"]]
+        return [{"key": k, "id": i, "labels": ["Company"], "props": {"companyName": f"회사{i}", "bizno": k}}
+                for k, i in rows[:limit]]
+    rows = sorted(STOCKHOLDERS)
+    if "$after_key" in query:
+        rows = [r for r in rows if r > (params["after_key"], params["after_id"])]
+    return [{"key": k, "id": i, "labels": ["Stockholder"], "props": {"stockName": f"주주{i}"}} for k, i in rows[:limit]]
+
+
+def test_nodes_cursor_walks_companies_then_stockholders(client, fake_graph):
+    fake_graph.handler = _nodes_handler
+    pages, cursor = [], None
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/api/v1/graph/nodes", params=params).json()
+        pages.append([n["id"] for n in body["nodes"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    companies = [f"n{i}" for _, i in COMPANIES]
+    stockholders = [f"n{i}" for _, i in sorted(STOCKHOLDERS)]
+    assert sum(pages, []) == companies + stockholders
+    assert pages[1] == companies[3:] + stockholders[:2]  # 회사 목록이 끝난 페이지는 주주로 이어 채움
+
+
+@pytest.mark.parametrize("extra", [{"search": "삼성"}, {"node_ids": "n1,n2"}])
+def test_nodes_cursor_rejected_with_search_or_ids(client, fake_graph, extra):
+    cursor = _encode_cursor([0, "101", 1])
+    r = client.get("/api/v1/graph/nodes", params={"cursor": cursor, **extra})
+    assert r.status_code == 400
+    assert fake_graph.calls == []
+
+
+@pytest.mark.parametrize("values", [[2, "101", 1], [1, "p1", "x"]])
+def test_nodes_cursor_with_bad_kind_or_id_is_400(client, fake_graph, values):
+    r = client.get("/api/v1/graph/nodes", params={"cursor": _encode_cursor(values)})
+    assert r.status_code == 400
+
+
+# ── 컬럼형 응답 ─────────────────────────────────────────────────────────────
+def test_edges_columnar_response(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    r = client.get("/api/v1/graph/edges", params={"limit": 5}, headers={"Accept": COLUMNAR_MEDIA_TYPE})
+    assert r.headers["content-type"].startswith(COLUMNAR_MEDIA_TYPE)
+    assert r.content[:4] == MAGIC
+
+
+# ── HTTP 캐시 (ETag·304·압축) + 노드 상세 캐시 ──────────────────────────────
+@pytest.fixture
+def node_detail_cache():
+    cache = _node_detail_cache()
+    cache.invalidate()
+    yield cache
+    cache.invalidate()
+
+
+def test_node_detail_etag_and_304(client, fake_graph, install_engine, monkeypatch, node_detail_cache):
+    g = _engine(CYCLE_PAIRS)
+    install_engine(g)
+    monkeypatch.setattr(ownership_analysis, "_cycle_index", CycleIndex(g, max_length=4, max_cycles=100))
+    fake_graph.handler = _company_rows
+
+    r = client.get("/api/v1/graph/nodes/n1")
+    assert r.status_code == 200 and r.json()["cycle"] is not None
+    etag = r.headers["ETag"]
+    assert r.headers["Cache-Control"] == "no-cache"
+    calls = len(fake_graph.calls)
+
+    r = client.get("/api/v1/graph/nodes/n1", headers={"If-None-Match": etag})
+    assert r.status_code == 304 and r.headers["ETag"] == etag
+    assert len(fake_graph.calls) == calls  # 엔드포인트 미실행
+
+    get_data_version().bump("test")
+    r = client.get("/api/v1/graph/nodes/n1", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+    assert len(fake_graph.calls) > calls  # 새 데이터 버전 → 상세 캐시도 다시 로드
+
+
+def test_partial_node_detail_has_no_etag(client, fake_graph, install_engine, monkeypatch, node_detail_cache):
+    install_engine(_engine(CYCLE_PAIRS))
+    monkeypatch.setattr(ownership_analysis, "_cycle_index", None)
+    fake_graph.handler = _company_rows
+
+    r = client.get("/api/v1/graph/nodes/n1")
+    assert r.status_code == 200 and r.json()["cycle"] is None
+    assert "ETag" not in r.headers
+    assert PARTIAL_HEADER not in r.headers
+
+
+def test_node_detail_cache_keyed_by_engine_version(client, fake_graph, install_engine, monkeypatch, node_detail_cache):
+    monkeypatch.setattr(ownership_analysis, "_cycle_index", None)
+    fake_graph.handler = _company_rows
+    install_engine(_engine(CYCLE_PAIRS))
+    client.get("/api/v1/graph/nodes/n1")
+    calls = len(fake_graph.calls)
+    client.get("/api/v1/graph/nodes/n1")
+    assert len(fake_graph.calls) == calls
+
+    install_engine(_engine(CYCLE_PAIRS + [(1, 7, 5.0)]))  # 리로드된 엔진 (새 버전)
+    related = client.get("/api/v1/graph/nodes/n1").json()["related"]
+    assert len(fake_graph.calls) > calls
+    assert "n7" in {n["id"] for n in related}
+
+
+def test_gzip_negotiation(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    r = client.get("/api/v1/graph/edges", params={"limit": 100}, headers={"Accept-Encoding": "br, gzip"})
+    assert r.headers["Content-Encoding"] == ("br" if HAS_BROTLI else "gzip")
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert len(r.json()["edges"]) == len(EDGE_PAIRS)  # 클라이언트가 풀어서 읽음
+
+    r = client.get("/api/v1/graph/edges", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in r.headers  # 최소 크기 미만
+
+
+@pytest.mark.skipif(not HAS_BROTLI, reason="brotli 미설치")
+def test_brotli_etag_differs_from_gzip(client, fake_graph, install_engine):
+    install_engine(_engine(EDGE_PAIRS))
+    br = client.get("/api/v1/graph/edges", headers={"Accept-Encoding": "br"})
+    gz = client.get("/api/v1/graph/edges", headers={"Accept-Encoding": "gzip"})
+    assert br.headers["Content-Encoding"] == "br"
+    assert br.headers["ETag"] != gz.headers["ETag"]
+
+
+# ── /graph/layout ───────────────────────────────────────────────────────────
+def test_layout_busy_is_503_with_retry_after(client, monkeypatch):
+    def busy(*args, **kwargs):
+        raise LayoutPoolBusy(retry_after=4)
+
+    monkeypatch.setattr(layout_service, "compute_layout", busy)
+    r = client.post("/api/v1/graph/layout", json={"nodes": [{"id": "a"}], "edges": []})
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "4"
+
+
+def test_layout_returns_normalized_positions(client):
+    body = {"nodes": [{"id": "a"}, {"id": "b"}, {"id": "c"}], "edges": [{"from": "a", "to": "b", "ratio": 50.0}]}
+    r = client.post("/api/v1/graph/layout", json=body)
+    assert r.status_code == 200
+    positions = r.json()["positions"]
+    assert set(positions) == {"a", "b", "c"}
+    assert all(0.0 <= p["x"] <= 1.0 and 0.0 <= p["y"] <= 1.0 for p in positions.values())
+
+
+def test_layout_job_streams_snapshot_then_done(client):
+    nodes = [{"id": f"j{i}"} for i in range(80)]
+    edges = [{"from": f"j{i}", "to": f"j{(i * 7 + 3) % 80}", "ratio": float(i % 9 + 1)} for i in range(80)]
+    created = client.post("/api/v1/graph/layout/jobs", json={"nodes": nodes, "edges": edges}).json()
+    assert set(created["positions"]) == {n["id"] for n in nodes}
+
+    with client.stream("GET", f"/api/v1/graph/layout/jobs/{created['job_id']}/events") as r:
+        assert r.headers["content-type"].startswith("text/event-stream")
+        lines = [line for line in r.iter_lines() if line.startswith(("event: ", "data: "))]
+    events = [line.removeprefix("event: ") for line in lines if line.startswith("event: ")]
+    snapshot = json.loads(lines[1].removeprefix("data: "))
+    assert events[0] == "snapshot"
+    # 구독 전에 끝난 작업은 완료 스냅샷 하나로 종료
+    assert events[-1] == "done" or (events == ["snapshot"] and snapshot["status"] == "done")
+
+    final = client.get(f"/api/v1/graph/layout/jobs/{created['job_id']}").json()
+    assert final["status"] == "done"
+    assert client.get("/api/v1/graph/layout/jobs/nope").status_code == 404
+
+
+# ── /graph/ego ──────────────────────────────────────────────────────────────
+# 회사 1 ← 허브 주주 2 ← 주주 100..109 (100, 101 은 같은 쌍에 관계 2건 → 관계 12건, 쌍 10개)
+EGO_RELS = [(2, 1, 30.0)] + [(100 + i, 2, float(i + 1)) for i in range(10)] + [(100, 2, 0.5), (101, 2, 0.5)]
+
+
+def _ego_handler(rels: list[tuple[int, int, float]]):
+    """Neo4j 경로 쿼리 흉내: 홉 쿼리(쌍 단위 degree·cap·top_k), 노드 속성, 유도 엣지."""
+
+    def handler(query: str, params: dict) -> list[dict]:
+        if "UNWIND $frontier" in query:
+            out = "(f)-[r:HOLDS_SHARES]->(m)" in query
+            rows = []
+            for fid in params["frontier"]:
+                best: dict[int, float] = {}
+                for a, b, ratio in rels:
+                    if (a if out else b) == fid:
+                        other = b if out else a
+                        best[other] = max(ratio, best.get(other, ratio))
+                degree = len(best)  # count(DISTINCT m)
+                expand = degree <= params["degree_cap"] or fid == params["ego_id"]
+                top = sorted(best.items(), key=lambda x: -x[1])[: params["top_k"]] if expand else []
+                rows.append({"id": fid, "degree": degree, "nbrs": [{"id": m, "ratio": r} for m, r in top]})
+            return rows
+        if "UNWIND $ids" in query:
+            return [{"id": i, "labels": ["Company" if i == 1 else "Stockholder"], "props": {"companyName": f"노드{i}"},
+                     "degree": sum(i in (a, b) for a, b, _ in rels)} for i in params["ids"]]
+        ids = set(params["ids"])
+        return [{"fromId": a, "toId": b, "ratio": r} for a, b, r in rels if a in ids and b in ids]
+
+    return handler
+
+
+def _ego_engine(rels: list[tuple[int, int, float]]) -> OwnershipGraph:
+    pairs: dict[tuple[int, int], float] = {}
+    for a, b, r in rels:
+        pairs[(a, b)] = max(r, pairs.get((a, b), r))
+    return _engine([(a, b, r) for (a, b), r in pairs.items()])
+
+
+@pytest.mark.parametrize("extra_holders, supernode", [(0, False), (1, True)])
+def test_ego_supernode_cap_counts_pairs_on_both_paths(client, fake_graph, install_engine, extra_holders, supernode):
+    rels = EGO_RELS + [(200 + i, 2, 1.0) for i in range(extra_holders)]
+    fake_graph.handler = _ego_handler(rels)
+    params = {"node_id": "n1", "degree_cap": 10}
+
+    neo4j = client.get("/api/v1/graph/ego", params=params).json()
+    assert all("count(DISTINCT m)" in q for q, _ in fake_graph.calls if "UNWIND $frontier" in q)
+    install_engine(_ego_engine(rels))
+    engine = client.get("/api/v1/graph/ego", params=params).json()
+
+    for body in (neo4j, engine):
+        nodes = {n["id"]: n for n in body["nodes"]}
+        # 관계 12건이어도 쌍 10개 = cap 이면 확장, 쌍 11개면 슈퍼노드
+        assert nodes["n2"]["supernode"] is supernode
+        assert ("n101" in nodes) is not supernode
+    assert {n["id"] for n in neo4j["nodes"]} == {n["id"] for n in engine["nodes"]}
+
+
+def test_ego_top_k_and_max_nodes(client, fake_graph, install_engine):
+    install_engine(_ego_engine(EGO_RELS))
+    fake_graph.handler = _ego_handler(EGO_RELS)
+    body = client.get("/api/v1/graph/ego", params={"node_id": "n1", "top_k": 3, "degree_cap": 10}).json()
+    assert {n["id"] for n in body["nodes"]} == {"n1", "n2", "n109", "n108", "n107"}  # 허브의 주주는 지분 상위 3명만
+    assert "n2" in body["truncated_ids"]
+
+    body = client.get("/api/v1/graph/ego", params={"node_id": "n1", "max_nodes": 10, "degree_cap": 10}).json()
+    assert len(body["nodes"]) == 10
+
+
+# ── /graph/bootstrap ────────────────────────────────────────────────────────
+COUNTS = {"company": 4, "person": 0, "major": 0, "institution": 0, "snapshot": {"version": 1, "computed_at": "t"}}
+
+
+@pytest.fixture
+def bootstrap_graph(fake_graph, install_engine, monkeypatch):
+    install_engine(_engine([(1, 2, 40.0), (2, 3, 20.0), (3, 4, 5.0)]))
+    fake_graph.handler = _company_rows
+
+    async def counts():
+        return COUNTS
+
+    monkeypatch.setattr(graph_endpoints, "_snapshot_node_counts", counts)
+    return fake_graph
+
+
+def test_bootstrap_single_round_trip(client, bootstrap_graph):
+    r = client.get("/api/v1/graph/bootstrap", params={"min_ratio": 10})
+    body = r.json()
+    assert body["counts"] == COUNTS
+    assert {(e["from"], e["to"]) for e in body["edges"]} == {("n1", "n2"), ("n2", "n3")}
+    assert {n["id"] for n in body["nodes"]} == {"n1", "n2", "n3"}  # 엣지가 참조하는 노드만, 한 번에
+    assert len(bootstrap_graph.calls) == 1
+    assert set(body["layout"]["positions"]) == {"n1", "n2", "n3"}
+    assert "ETag" in r.headers
+
+
+def test_bootstrap_without_counts_is_partial(client, bootstrap_graph, monkeypatch):
+    async def failing():
+        raise RuntimeError("snapshot failed")
+
+    monkeypatch.setattr(graph_endpoints, "_snapshot_node_counts", failing)
+    r = client.get("/api/v1/graph/bootstrap")
+    assert r.status_code == 200 and r.json()["counts"] is None
+    assert "ETag" not in r.headers
+
+
+def test_bootstrap_busy_layout_is_partial(client, bootstrap_graph, monkeypatch):
+    def busy(*args, **kwargs):
+        raise LayoutPoolBusy(retry_after=1)
+
+    monkeypatch.setattr(layout_service, "compute_layout", busy)
+    r = client.get("/api/v1/graph/bootstrap")
+    assert r.status_code == 200 and r.json()["layout"] is None
+    assert "ETag" not in r.headers
+    # 레이아웃을 요청하지 않으면 완전한 응답
+    assert "ETag" in client.get("/api/v1/graph/bootstrap", params={"layout": False}).headers
+
+
+# ── /graph/viewport ─────────────────────────────────────────────────────────
+VIEWPORT_PAIRS = [(i, (i * 7 + 1) % 60 + 1, float(i % 13 + 1)) for i in range(1, 61)]
+
+
+def test_viewport_503_until_global_layout_ready(client, fake_graph, install_engine, monkeypatch):
+    install_engine(_engine(VIEWPORT_PAIRS))
+    monkeypatch.setattr(global_layout, "_global_layout", None)
+    r = client.get("/api/v1/graph/viewport")
+    assert r.status_code == 503 and r.headers["Retry-After"] == "30"
+
+
+def test_viewport_box_and_zoom(client, fake_graph, install_engine, monkeypatch):
+    g = _engine(VIEWPORT_PAIRS)
+    install_engine(g)
+    monkeypatch.setattr(global_layout, "_global_layout", None)
+    gl = global_layout.get_global_layout(g)
+    fake_graph.handler = _company_rows
+
+    body = client.get("/api/v1/graph/viewport", params={"zoom": 1_000}).json()
+    assert len(body["nodes"]) == g.node_ids.shape[0] and not body["truncated"]
+    assert body["layout"]["version"] == gl.version
+
+    box = {"x0": 0.0, "y0": 0.0, "x1": 0.5, "y1": 0.5, "zoom": 1_000}
+    body = client.get("/api/v1/graph/viewport", params=box).json()
+    positions = body["layout"]["positions"]
+    assert positions and all(p["x"] <= 0.5 and p["y"] <= 0.5 for p in positions.values())
+    shown = set(positions)
+    assert all(e["from"] in shown and e["to"] in shown for e in body["edges"])
+
+    body = client.get("/api/v1/graph/viewport", params={"limit": 5}).json()
+    assert len(body["nodes"]) <= 5 and body["truncated"]
+
+
+# ── /graph/clusters ─────────────────────────────────────────────────────────
+# 두 밀집 무리 (1~6, 11~16) + 무리 사이 약한 연결 1건
+CLUSTER_PAIRS = (
+    [(a, b, 30.0) for a in range(1, 7) for b in range(1, 7) if a < b]
+    + [(a, b, 30.0) for a in range(11, 17) for b in range(11, 17) if a < b]
+    + [(6, 11, 1.0)]
+)
+
+
+def test_clusters_503_until_index_ready(client, fake_graph, install_engine, monkeypatch):
+    monkeypatch.setattr(ownership_analysis, "_community_index", None)
+    install_engine(_engine(CLUSTER_PAIRS))
+    for path in ("/api/v1/graph/clusters", "/api/v1/graph/clusters/cluster-0"):
+        r = client.get(path)
+        assert r.status_code == 503 and r.headers["Retry-After"] == "30"
+    assert fake_graph.calls == []
+
+
+def test_clusters_and_expand(client, fake_graph, install_engine, monkeypatch):
+    g = _engine(CLUSTER_PAIRS)
+    install_engine(g)
+    monkeypatch.setattr(ownership_analysis, "_community_index", CommunityIndex(g, resolution=1.0))
+    monkeypatch.setattr(global_layout, "_global_layout", None)
+    fake_graph.handler = _company_rows
+
+    r = client.get("/api/v1/graph/clusters")
+    body = r.json()
+    assert body["total"] == 2 and [n["size"] for n in body["nodes"]] == [6, 6]
+    assert [(e["count"], e["ratio"]) for e in body["edges"]] == [(1, 1.0)]
+    assert "layout" not in body and "ETag" not in r.headers  # 전역 레이아웃 전: 좌표 없는 부분 응답
+
+    expanded = client.get(f"/api/v1/graph/clusters/{body['nodes'][0]['id']}").json()
+    members = {n["id"] for n in expanded["nodes"]}
+    assert expanded["hidden"] == 0 and len(members) == 6
+    links = [e for e in expanded["edges"] if e["type"] == "CLUSTER_LINK"]
+    assert len(links) == 1 and ({links[0]["from"], links[0]["to"]} & members)
+
+    assert client.get("/api/v1/graph/clusters/cluster-9").status_code == 404
+    assert client.get("/api/v1/graph/clusters/nine").status_code == 400
@@ -0,0 +1,139 @@
+"""ask_graph / ask_graph_stream 단계 실행 (LLM·임베딩·Neo4j 대역, 실제 의미 캐시·대화 이력)."""
+import asyncio
+import importlib
+
+import numpy as np
+import pytest
+
+from app.services.chat_history import MemoryChatHistory
+from app.services.cypher_cache import SemanticCypherCache
+
+# app.services 는 같은 이름의 GraphService 인스턴스를 재노출 → 모듈은 직접 로드
+gs = importlib.import_module("app.services.graph_service")
+
+VEC_DIM = 16
+QUESTION = "그 회사의 최대주주는?"
+VEC = np.random.default_rng(0).normal(size=VEC_DIM)
+
+
+class _Generation:
+    def __init__(self, cypher: str):
+        self.cypher = cypher
+        self.calls = 0
+
+    def invoke(self, inputs: dict) -> str:
+        self.calls += 1
+        return self.cypher
+
+    async def ainvoke(self, inputs: dict) -> str:
+        return self.invoke(inputs)
+
+
+class _Answer:
+    def invoke(self, inputs: dict) -> str:
+        return "답변"
+
+    async def astream(self, inputs: dict):
+        yield "답"
+        yield "변"
+
+
+class _Chain:
+    graph_schema = ""
+    top_k = 10
+    cypher_query_corrector = None
+
+    def __init__(self, cypher: str):
+        self.cypher_generation_chain = _Generation(cypher)
+        self.qa_chain = _Answer()
+
+
+class _Embed:
+    def embed_query(self, text: str):
+        return VEC
+
+    async def aembed_query(self, text: str):
+        return VEC
+
+
+class _Rows:
+    def query(self, cypher: str, params=None):
+        return [{"name": "삼성전자"}]
+
+
+class _AsyncRows:
+    async def query(self, cypher: str, params=None):
+        return [{"name": "삼성전자"}]
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """외부 호출을 모두 대역으로: (체인, 의미 캐시, 대화 이력)."""
+    chain = _Chain("MATCH (n) RETURN n.name AS name")
+    cache = SemanticCypherCache(max_entries=8, threshold=0.95, dim=VEC_DIM)
+    history = MemoryChatHistory(max_turns=3, max_sessions=10, ttl_sec=60.0)
+    monkeypatch.setattr(gs, "_get_embed_model", lambda: _Embed())
+    monkeypatch.setattr(gs, "_similar_companies", lambda vec, top_k: [])
+    monkeypatch.setattr(gs, "_asimilar_companies", _no_hints)
+    monkeypatch.setattr(gs, "_get_qa_chain", lambda: chain)
+    monkeypatch.setattr(gs, "_get_graph", lambda: _Rows())
+    monkeypatch.setattr(gs, "get_async_graph", lambda: _AsyncRows())
+    monkeypatch.setattr(gs, "get_cypher_cache", lambda: cache)
+    monkeypatch.setattr(gs, "_cypher_generation", lambda: "g1")
+    monkeypatch.setattr(gs, "get_chat_history", lambda: history)
+    return chain, cache, history
+
+
+async def _no_hints(vec, top_k):
+    return []
+
+
+def _stream(question: str, session_id: str) -> list[tuple[str, dict]]:
+    async def collect():
+        return [event async for event in gs.GraphService.ask_graph_stream(question, session_id)]
+
+    return asyncio.run(collect())
+
+
+def test_first_turn_uses_and_fills_cache(service):
+    chain, cache, _ = service
+    first = gs.GraphService.ask_graph(QUESTION, "s1")
+    assert not first["cached"] and chain.cypher_generation_chain.calls == 1
+    second = gs.GraphService.ask_graph(QUESTION, "s2")
+    assert second["cached"] and second["cypher"] == first["cypher"]
+    assert chain.cypher_generation_chain.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_contextual_question_skips_seeded_cache(service):
+    chain, cache, history = service
+    cache.store(VEC, QUESTION, [], "MATCH (stale) RETURN stale", "g1")
+    history.append("s1", "삼성전자 알려줘", "삼성전자는 ...")
+
+    result = gs.GraphService.ask_graph(QUESTION, "s1")
+    assert not result["cached"] and result["cypher"] == "MATCH (n) RETURN n.name AS name"
+    assert chain.cypher_generation_chain.calls == 1
+    stats = cache.stats()
+    assert stats["hits"] == 0 and stats["misses"] == 0  # 조회 자체를 하지 않음
+    assert stats["entries"] == 1  # 앞 턴에 기댄 Cypher 는 저장하지 않음
+
+
+def test_contextual_stream_skips_seeded_cache(service):
+    chain, cache, history = service
+    cache.store(VEC, QUESTION, [], "MATCH (stale) RETURN stale", "g1")
+    history.append("s1", "삼성전자 알려줘", "삼성전자는 ...")
+
+    events = _stream(QUESTION, "s1")
+    cypher = next(data for name, data in events if name == "cypher")
+    assert cypher == {"cypher": "MATCH (n) RETURN n.name AS name", "cached": False}
+    assert chain.cypher_generation_chain.calls == 1
+    assert events[-1][0] == "done" and events[-1][1]["answer"] == "답변"
+
+
+def test_stream_without_history_hits_cache(service):
+    chain, cache, _ = service
+    cache.store(VEC, QUESTION, [], "MATCH (c) RETURN c", "g1")
+    events = _stream(QUESTION, "fresh")
+    assert [name for name, _ in events] == ["hints", "cypher", "rows", "token", "token", "done"]
+    assert events[1][1] == {"cypher": "MATCH (c) RETURN c", "cached": True}
+    assert chain.cypher_generation_chain.calls == 0
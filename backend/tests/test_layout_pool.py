@@ -0,0 +1,66 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services.layout_pool import LayoutPool, LayoutPoolBusy
+
+
+class _Executor:
+    """ProcessPoolExecutor 대역: broken 이면 모든 작업이 BrokenProcessPool 로 실패."""
+
+    def __init__(self, broken: bool):
+        self.broken = broken
+        self.shut_down = False
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self.shut_down = True
+
+
+def _pool(monkeypatch, executors: list[_Executor]) -> LayoutPool:
+    pool = LayoutPool(workers=2, max_pending=4, retry_after=7)
+    created = iter(executors)
+
+    def get_executor():
+        if pool._executor is None:
+            pool._executor = next(created)
+        return pool._executor
+
+    monkeypatch.setattr(pool, "_get_executor", get_executor)
+    return pool
+
+
+def test_map_retries_once_on_fresh_pool(monkeypatch):
+    broken, fresh = _Executor(broken=True), _Executor(broken=False)
+    pool = _pool(monkeypatch, [broken, fresh])
+    assert pool.map(pow, [(2, 3), (3, 2)]) == [8, 9]
+    assert broken.shut_down and not fresh.shut_down
+    status = pool.status()
+    assert status["restarts"] == 1 and status["pending"] == 0 and status["failed"] == 0
+
+
+def test_map_busy_when_retry_also_breaks(monkeypatch):
+    pool = _pool(monkeypatch, [_Executor(broken=True), _Executor(broken=True)])
+    with pytest.raises(LayoutPoolBusy) as exc:
+        pool.map(pow, [(2, 3)])
+    assert exc.value.retry_after == 7
+    status = pool.status()
+    assert status["restarts"] == 2 and status["pending"] == 0
+
+
+def test_admission_limit():
+    pool = LayoutPool(workers=0, max_pending=1, retry_after=1)
+    pool._admit()
+    with pytest.raises(LayoutPoolBusy):
+        pool.map(pow, [(2, 3)])
+    pool._release()
+    assert pool.map(pow, [(2, 3)]) == [8]
+    assert pool.status()["rejected"] == 1
@@ -0,0 +1,184 @@
+import math
+import random
+
+import networkx as nx
+import pytest
+
+from app.services.layout_service import (
+    _AUTO_FA2_MAX_ITERATIONS,
+    _build_layout_graph,
+    _layout_cache,
+    _layout_cache_key,
+    _plan_auto,
+    compute_layout,
+    plan_progressive,
+    refine_layout,
+)
+from benchmarks.layout_bench import synthetic_ownership_graph
+
+
+def test_build_layout_graph_merges_multi_edges():
+    G = _build_layout_graph(
+        [{"id": "a"}, {"id": "b"}],
+        [
+            {"from": "a", "to": "b", "ratio": 10.0},
+            {"from": "b", "to": "a", "ratio": 40.0},
+            {"from": "a", "to": "zz", "ratio": 5.0},  # 없는 노드
+        ],
+    )
+    assert list(G.edges(data="weight")) == [("a", "b", 40.0)]
+
+
+def _small_graph() -> tuple[list[dict], list[dict]]:
+    nodes = [{"id": f"c{i}"} for i in range(12)]
+    edges = [{"from": f"c{i}", "to": f"c{(i * 5 + 1) % 12}", "ratio": float(i + 1)} for i in range(12)]
+    edges.append({"from": "c1", "to": "c0", "ratio": 3.0})  # 다중 엣지 (max 로 합쳐짐)
+    return nodes, edges
+
+
+def test_cache_key_ignores_input_order():
+    nodes, edges = _small_graph()
+    shuffled_nodes, shuffled_edges = nodes[:], edges[:]
+    random.Random(0).shuffle(shuffled_nodes)
+    random.Random(1).shuffle(shuffled_edges)
+    key = _layout_cache_key(_build_layout_graph(nodes, edges), "networkx", 0.05, True)
+    assert key == _layout_cache_key(_build_layout_graph(shuffled_nodes, shuffled_edges), "networkx", 0.05, True)
+    assert key != _layout_cache_key(_build_layout_graph(nodes, edges), "networkx", 0.1, True)
+    assert key != _layout_cache_key(_build_layout_graph(nodes, edges), "fa2", 0.05, True)
+
+
+def test_compute_layout_hits_cache_for_shuffled_input():
+    cache = _layout_cache()
+    cache.invalidate()
+    nodes, edges = _small_graph()
+    first = compute_layout(nodes, edges)
+    hits = cache.stats()["hits"]
+
+    random.Random(2).shuffle(nodes)
+    random.Random(3).shuffle(edges)
+    assert compute_layout(nodes, edges) == first
+    assert cache.stats()["hits"] == hits + 1
+
+
+def _in_unit_square(positions: dict) -> bool:
+    return all(0.0 <= p["x"] <= 1.0 and 0.0 <= p["y"] <= 1.0 for p in positions.values())
+
+
+def test_incremental_layout_keeps_pinned_nodes():
+    nodes, edges = synthetic_ownership_graph(200, seed=4)
+    first = compute_layout(nodes, edges, engine="fa2")["positions"]
+
+    anchor = edges[0]["to"]
+    new_nodes = nodes + [{"id": "new1"}, {"id": "new2"}, {"id": "iso1"}, {"id": "iso2"}]
+    new_edges = edges + [
+        {"from": "new1", "to": anchor, "ratio": 30.0},
+        {"from": "new2", "to": "new1", "ratio": 10.0},
+        {"from": "iso1", "to": "iso2", "ratio": 50.0},  # 고정 노드와 이어지지 않은 새 요소
+    ]
+    result = compute_layout(new_nodes, new_edges, engine="fa2", positions=first)
+    positions = result["positions"]
+
+    for nid, p in first.items():
+        assert positions[nid] == p
+    assert {"new1", "new2", "iso1", "iso2"} <= set(positions)
+    assert _in_unit_square(positions)
+    assert math.dist(
+        (positions["new1"]["x"], positions["new1"]["y"]), (first[anchor]["x"], first[anchor]["y"])
+    ) < 0.5
+
+
+def test_pin_false_recomputes_everything():
+    nodes, edges = synthetic_ownership_graph(100, seed=5)
+    fake = {n["id"]: {"x": 0.5, "y": 0.5} for n in nodes}
+    result = compute_layout(nodes, edges, engine="fa2", positions=fake, pin=False)
+    assert result == compute_layout(nodes, edges, engine="fa2")
+
+
+def test_incremental_ignores_invalid_positions():
+    nodes, edges = synthetic_ownership_graph(60, seed=6)
+    bad = {nodes[0]["id"]: {"x": "nan?", "y": 0.1}, nodes[1]["id"]: {"x": float("inf"), "y": 0.2}}
+    result = compute_layout(nodes, edges, engine="fa2", positions=bad)
+    assert result == compute_layout(nodes, edges, engine="fa2")
+
+
+def test_progressive_refine_matches_sync_fa2():
+    # 작은 요소 묶음·공식 배치 요소·큰 요소가 모두 있는 그래프. 캐시 적중을 피하려고 동기 레이아웃보다 먼저 계획
+    nodes, edges = synthetic_ownership_graph(600, seed=8)
+    plan = plan_progressive(nodes, edges, padding=0.05)
+    assert plan["cached"] is None
+    assert set(plan["positions"]) == {n["id"] for n in nodes}
+    assert _in_unit_square(plan["positions"])
+    assert plan["parts"]
+
+    refined = refine_layout("test-job", plan["parts"], budget_sec=60.0, emit_sec=0.25)
+    assert not refined["truncated"]
+    merged = {**plan["positions"], **refined["positions"]}
+
+    sync = compute_layout(nodes, edges, engine="fa2", padding=0.05)
+    assert merged.keys() == sync["positions"].keys()
+    for nid, p in sync["positions"].items():
+        assert merged[nid]["x"] == pytest.approx(p["x"], abs=1e-9)
+        assert merged[nid]["y"] == pytest.approx(p["y"], abs=1e-9)
+
+    # 이제 캐시 적중
+    assert plan_progressive(nodes, edges, padding=0.05)["cached"] == sync
+
+
+def _components(G: nx.Graph) -> list[list[str]]:
+    parts = [sorted(c) for c in nx.connected_components(G)]
+    parts.sort(key=lambda c: (-len(c), c[0]))
+    return parts
+
+
+def _mixed_graph() -> nx.Graph:
+    G = nx.Graph()
+    nx.add_star(G, ["s0", "s1", "s2", "s3", "s4"])
+    nx.add_path(G, ["p0", "p1", "p2", "p3"])
+    nx.add_cycle(G, ["r0", "r1", "r2", "r3", "r4", "r5"])
+    G.add_edges_from((f"k{i}", f"k{j}") for i in range(5) for j in range(i + 1, 5))
+    big = nx.barabasi_albert_graph(300, 2, seed=1)
+    G.add_edges_from((f"b{u:03d}", f"b{v:03d}") for u, v in big.edges())
+    return G
+
+
+def test_plan_auto_methods():
+    G = _mixed_graph()
+    parts = _components(G)
+    plan = dict(zip((p[0] for p in parts), _plan_auto(G, parts, budget_sec=5.0, split=True)))
+    assert plan["s0"] == ("star", 0)
+    assert plan["p0"] == ("chain", 0)
+    assert plan["r0"] == ("ring", 0)
+    assert plan["k0"] == ("kk", 0)
+    assert plan["b000"] == ("fa2", _AUTO_FA2_MAX_ITERATIONS)
+
+
+def test_plan_auto_tiny_budget_falls_back_to_fa2_initial_placement():
+    G = _mixed_graph()
+    parts = _components(G)
+    plan = dict(zip((p[0] for p in parts), _plan_auto(G, parts, budget_sec=0.0, split=True)))
+    assert plan["s0"] == ("star", 0)  # 공식 배치는 예산과 무관
+    assert plan["k0"] == ("fa2", 0)  # KK 예산 초과 → fa2 로 내림
+    assert plan["b000"] == ("fa2", 0)
+
+
+def test_plan_auto_unsplit_disconnected_graph_has_no_closed_form():
+    G = nx.Graph()
+    nx.add_cycle(G, ["a", "b", "c"])
+    nx.add_path(G, ["x", "y"])
+    # 고리 + 떨어진 경로는 n=5, m=4, 최대 차수 2 → chain 조건을 만족하지만 연결 그래프가 아님
+    assert _plan_auto(G, [sorted(G.nodes())], budget_sec=5.0, split=False) == [("kk", 0)]
+
+
+def test_plan_auto_is_deterministic():
+    G = _mixed_graph()
+    parts = _components(G)
+    assert _plan_auto(G, parts, 1.0, True) == _plan_auto(G, parts, 1.0, True)
+
+
+@pytest.mark.parametrize("engine", ["networkx", "fa2", "auto"])
+def test_compute_layout_covers_all_nodes(engine):
+    nodes, edges = synthetic_ownership_graph(300, seed=3)
+    result = compute_layout(nodes, edges, engine=engine, padding=0.05)
+    assert set(result["positions"]) == {n["id"] for n in nodes}
+    assert all(0.05 - 1e-9 <= p["x"] <= 0.95 + 1e-9 for p in result["positions"].values())
+    assert sum(len(c) for c in result["components"]) == len(nodes)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from app.services.ownership_analysis import CycleIndex, integrated_ownership, top_ultimate_owners
+from app.services.ownership_engine import OwnershipGraph
+
+
+def _graph(pairs: list[tuple[int, int, float]]) -> OwnershipGraph:
+    """(fromId, toId, ratio%) 쌍 → CSR 스냅샷 (관계 수 1, ratio 합 = ratio)."""
+    src = np.array([p[0] for p in pairs], dtype=np.int64)
+    dst = np.array([p[1] for p in pairs], dtype=np.int64)
+    ratio = np.array([p[2] for p in pairs], dtype=np.float64)
+    return OwnershipGraph.from_pairs(src, dst, ratio, np.ones(len(pairs)), ratio)
+
+
+def test_integrated_ownership_chain():
+    # 1 → 2 (50%), 2 → 3 (40%), 4 → 3 (10%): 1 의 3 에 대한 실효 지분 = 0.5 × 0.4
+    g = _graph([(1, 2, 50.0), (2, 3, 40.0), (4, 3, 10.0)])
+    target = int(g.index_of([3])[0])
+    effective, direct, _, converged = integrated_ownership(g, target)
+    i1, i2, i4 = (int(i) for i in g.index_of([1, 2, 4]))
+    assert converged
+    assert effective[i1] == pytest.approx(0.2)
+    assert direct[i1] == 0.0
+    assert effective[i2] == pytest.approx(0.4) and direct[i2] == pytest.approx(0.4)
+    assert effective[i4] == pytest.approx(0.1)
+
+    result = top_ultimate_owners(g, target, limit=10)
+    assert [o["id"] for o in result["owners"]] == [1, 4]  # 2 는 보유되는 법인 → 최종 주주 아님
+    assert result["owners"][0]["effective"] == pytest.approx(20.0)
+
+
+def test_integrated_ownership_with_cycle_matches_closed_form():
+    # 순환 출자 2 ↔ 3 포함: T = A (I − A)⁻¹ 의 열과 비교
+    pairs = [(1, 2, 60.0), (2, 3, 50.0), (3, 2, 20.0), (4, 3, 30.0)]
+    g = _graph(pairs)
+    n = g.n_nodes
+    a = np.zeros((n, n))
+    for f, t, r in pairs:
+        a[g.index_of([f])[0], g.index_of([t])[0]] = r / 100.0
+    closed = a @ np.linalg.inv(np.eye(n) - a)
+    target = int(g.index_of([3])[0])
+    effective, _, _, converged = integrated_ownership(g, target, max_depth=200, tol=1e-12)
+    assert converged
+    np.testing.assert_allclose(effective, closed[:, target], atol=1e-9)
+
+
+def test_cycle_index():
+    # 2 → 3 → 4 → 2 (길이 3), 3 ↔ 5 (길이 2), 1 → 2 는 순환 밖, 6 은 자기주식 루프
+    g = _graph([(1, 2, 10.0), (2, 3, 20.0), (3, 4, 30.0), (4, 2, 40.0), (3, 5, 5.0), (5, 3, 5.0), (6, 6, 1.0)])
+    idx = CycleIndex(g, max_length=4, max_cycles=100)
+    i = {nid: int(g.index_of([nid])[0]) for nid in (1, 2, 3, 4, 5, 6)}
+
+    assert idx.summary()["components"] == 1
+    assert idx.node_flag(i[1]) == {"in_cycle": False, "scc_size": 0, "cycle_count": 0}
+    assert idx.node_flag(i[6])["in_cycle"] is False
+    assert idx.node_flag(i[3]) == {"in_cycle": True, "scc_size": 4, "cycle_count": 2}
+    cycles = sorted(sorted(g.node_ids[path].tolist()) for path, _ in idx.cycles)
+    assert cycles == [[2, 3, 4], [3, 5]]
+    for path, ratios in idx.cycles:
+        assert len(ratios) == len(path)
+
+    # 길이 제한: 2-순환만
+    short = CycleIndex(g, max_length=2, max_cycles=100)
+    assert [sorted(g.node_ids[p].tolist()) for p, _ in short.cycles] == [[3, 5]]
+    # 개수 제한
+    capped = CycleIndex(g, max_length=4, max_cycles=1)
+    assert len(capped.cycles) == 1 and capped.truncated
+
+
+def test_cycle_index_ranked_by_min_ratio():
+    g = _graph([(1, 2, 10.0), (2, 1, 90.0), (3, 4, 50.0), (4, 3, 60.0), (1, 3, 30.0), (3, 1, 40.0)])
+    idx = CycleIndex(g, max_length=4, max_cycles=100)
+    mins = [min(ratios) for _, ratios in idx.cycles]
+    assert mins == sorted(mins, reverse=True)
+    # node_cycles 번호는 정렬 후 순서 기준
+    for n, cids in idx.node_cycles.items():
+        assert cids == sorted(cids)
+        assert all(n in idx.cycles[c][0] for c in cids)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from app.services.ownership_engine import OwnershipGraph, round_ratio
+
+
+def _graph(pairs: list[tuple[int, int, float]]) -> OwnershipGraph:
+    """(fromId, toId, ratio%) 쌍 → CSR 스냅샷 (관계 수 1, ratio 합 = ratio)."""
+    src = np.array([p[0] for p in pairs], dtype=np.int64)
+    dst = np.array([p[1] for p in pairs], dtype=np.int64)
+    ratio = np.array([p[2] for p in pairs], dtype=np.float64)
+    return OwnershipGraph.from_pairs(src, dst, ratio, np.ones(len(pairs)), ratio)
+
+
+def _brute_top(pairs, limit, ids=None, min_ratio=None, after=None):
+    rows = [(round_ratio(r), f, t) for f, t, r in pairs]
+    if ids is not None:
+        rows = [row for row in rows if row[1] in ids or row[2] in ids]
+    if min_ratio is not None:
+        rows = [row for row in rows if row[0] >= min_ratio]
+    rows.sort(key=lambda row: (-row[0], row[1], row[2]))
+    if after is not None:
+        rows = [row for row in rows if (-row[0], row[1], row[2]) > (-after[0], after[1], after[2])]
+    return [(f, t, r) for r, f, t in rows[:limit]]
+
+
+def _as_tuples(rows):
+    return [(row["fromId"], row["toId"], row["ratio"]) for row in rows]
+
+
+@pytest.fixture(scope="module")
+def random_pairs():
+    rng = np.random.default_rng(7)
+    seen, pairs = set(), []
+    while len(pairs) < 400:
+        f, t = (int(x) for x in rng.integers(1, 120, size=2))
+        if f == t or (f, t) in seen:
+            continue
+        seen.add((f, t))
+        # 동점 ratio 를 많이 만들어 (fromId, toId) 보조 정렬까지 확인
+        pairs.append((f * 10, t * 10, float(rng.choice([5.0, 10.0, 12.34567, 50.0, rng.uniform(0, 100)]))))
+    return pairs
+
+
+def test_top_edges_matches_sort(random_pairs):
+    g = _graph(random_pairs)
+    assert _as_tuples(g.top_edges(50)) == _brute_top(random_pairs, 50)
+    assert _as_tuples(g.top_edges(500, min_ratio=10.0)) == _brute_top(random_pairs, 500, min_ratio=10.0)
+
+    ids = [100, 200, 300, 99999]
+    assert _as_tuples(g.top_edges(30, ids=ids)) == _brute_top(random_pairs, 30, ids=set(ids))
+    assert g.top_edges(10, ids=[99999]) == []
+
+
+@pytest.mark.parametrize("ids", [None, [100, 200, 300, 400, 500]])
+def test_top_edges_keyset_pages_cover_everything(random_pairs, ids):
+    g = _graph(random_pairs)
+    expected = _brute_top(random_pairs, len(random_pairs), ids=set(ids) if ids else None)
+    seen, after = [], None
+    while True:
+        page = _as_tuples(g.top_edges(17, ids=ids, after=after))
+        if not page:
+            break
+        seen.extend(page)
+        f, t, r = page[-1]
+        after = (r, f, t)
+    assert seen == expected
+
+
+def test_neighbors_and_stats():
+    g = _graph([(1, 2, 30.0), (1, 3, 70.0), (4, 3, 10.0)])
+    i1, i3 = (int(i) for i in g.index_of([1, 3]))
+    assert g.index_of([999]).tolist() == [-1]
+    assert g.degree(i1) == 2 and g.degree(i3, "in") == 2
+    assert g.top_neighbors(i1, "out", 1) == [(3, pytest.approx(70.0))]
+    assert g.holder_stats(i1) == {"holdings": 2, "avgRatio": pytest.approx(50.0)}
+    assert g.company_stats(i3) == {"maxRatio": pytest.approx(70.0), "holderCount": 2}
+    assert sorted(_as_tuples(g.induced_edges([1, 3, 4]))) == [(1, 3, 70.0), (4, 3, 10.0)]
+
+
+def test_snapshot_save_load(tmp_path, random_pairs):
+    g = _graph(random_pairs)
+    g.save(tmp_path / "snap")
+    loaded = OwnershipGraph.load(tmp_path / "snap")
+    assert loaded.version == g.version
+    assert loaded.top_edges(20) == g.top_edges(20)
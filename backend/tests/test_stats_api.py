@@ -0,0 +1,76 @@
+"""통계 스냅샷: /stats, /graph/node-counts (Neo4jGraph 대역, 새 StatsService)."""
+import importlib
+
+import pytest
+
+from app.services.stats_service import NODE_COUNTS_QUERY, StatsService
+
+stats_module = importlib.import_module("app.services.stats_service")
+
+
+class _SyncGraph:
+    """스냅샷 계산 쿼리에 고정 값으로 응답. 실행한 쿼리 수를 기록."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, q: str, params=None) -> list[dict]:
+        self.queries += 1
+        if q == NODE_COUNTS_QUERY:
+            return [{"company_count": 3, "person_count": 1, "major_count": 1, "institution_count": 0}]
+        if "labels(n)[0]" in q:
+            return [{"l": "Company", "n": 3}, {"l": "Stockholder", "n": 2}]
+        if "db.labels()" in q:
+            return [{"label": "Company"}, {"label": "Stockholder"}]
+        if "db.relationshipTypes()" in q:
+            return [{"t": "HOLDS_SHARES"}]
+        if "MATCH (n:`Company`)" in q:
+            return [{"n": 3}]
+        if "MATCH (n:`Stockholder`)" in q:
+            return [{"n": 3}]  # 이중 레이블 노드 포함
+        if "MATCH (n)" in q or "]->()" in q:
+            return [{"n": 5 if "(n)" in q else 4}]
+        raise AssertionError(f"unexpected query: {q}")
+
+
+@pytest.fixture
+def stats(monkeypatch) -> tuple[StatsService, _SyncGraph]:
+    graph = _SyncGraph()
+    svc = StatsService(refresh_interval=3600)
+    monkeypatch.setattr(stats_module, "_stats_service", svc)
+    monkeypatch.setattr(stats_module.graph_service, "get_graph", lambda: graph)
+    return svc, graph
+
+
+def test_stats_served_from_snapshot(client, stats):
+    svc, graph = stats
+    body = client.get("/stats").json()
+    assert body["nodes"] == [{"l": "Company", "n": 3}, {"l": "Stockholder", "n": 2}]
+    assert body["relationships"] == [{"t": "HOLDS_SHARES", "n": 4}]
+    assert body["snapshot"]["version"] == 1 and body["snapshot"]["age_sec"] >= 0
+    computed = graph.queries
+
+    client.get("/stats")
+    client.get("/api/v1/graph/node-counts")
+    assert graph.queries == computed  # 이후 요청은 스냅샷만 읽음
+
+    svc.refresh()
+    assert client.get("/stats").json()["snapshot"]["version"] == 2
+
+
+def test_node_counts_etag_follows_snapshot_version(client, stats):
+    svc, _ = stats
+    r = client.get("/api/v1/graph/node-counts")
+    body = r.json()
+    assert {k: body[k] for k in ("company", "person", "major", "institution")} == {
+        "company": 3, "person": 1, "major": 1, "institution": 0
+    }
+    assert "age_sec" not in body["snapshot"]  # 304 로 재사용되는 본문에 요청 시점 값 없음
+    assert "ETag" not in r.headers  # 요청 중에 첫 스냅샷 계산 → 검증자가 바뀌어 ETag 생략
+
+    etag = client.get("/api/v1/graph/node-counts").headers["ETag"]
+    assert client.get("/api/v1/graph/node-counts", headers={"If-None-Match": etag}).status_code == 304
+
+    svc.refresh()  # 데이터 버전은 그대로, 스냅샷만 갱신
+    r = client.get("/api/v1/graph/node-counts", headers={"If-None-Match": etag})
+    assert r.status_code == 200 and r.json()["snapshot"]["version"] == 2
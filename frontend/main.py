@@ -2,6 +2,8 @@
 GraphIQ Streamlit 진입점.
 Backend(API) URL: GRAPHIQ_API_URL 환경변수 또는 http://localhost:8000
 """
+import uuid
+
 import streamlit as st
 from src.components.sidebar import render_sidebar
 from src.services import api_client
@@ -38,12 +40,15 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "pending" not in st.session_state:
     st.session_state.pending = None
+if "chat_session_id" not in st.session_state:
+    # 브라우저 세션(탭)마다 백엔드 대화 이력 분리
+    st.session_state.chat_session_id = uuid.uuid4().hex
 
 
 def _on_reset():
     st.session_state.messages = []
     try:
-        api_client.delete_chat()
+        api_client.delete_chat(st.session_state.chat_session_id)
     except Exception:
         pass
 
@@ -73,7 +78,7 @@ for msg in st.session_state.messages:
             meta = SOURCE_META.get(src, SOURCE_META["LLM"])
             st.caption(f"{meta['emoji']} **{meta['label']}** — {meta['desc']}")
             if msg.get("cypher"):
-                with st.expander("🔍 생성된 Cypher (고급)"):
+                with st.expander("🔍 재사용된 Cypher (캐시)" if msg.get("cached") else "🔍 생성된 Cypher (고급)"):
                     st.code(msg["cypher"], language="cypher")
             if msg.get("hints"):
                 st.caption(f"🧠 벡터 힌트: {', '.join(msg['hints'])}")
@@ -91,28 +96,47 @@ if question:
         st.markdown(question)
 
     with st.chat_message("assistant"):
-        with st.spinner("그래프 DB 탐색 중..."):
-            try:
-                d = api_client.post_chat(question)
-                answer = d["answer"]
-                cypher = d.get("cypher", "")
-                raw = d.get("raw", [])
-                hints = d.get("hints", [])
-                source = d.get("source", "LLM")
-                confidence = d.get("confidence", "LOW")
-                elapsed = d.get("elapsed", 0)
-            except Exception as e:
-                answer = "서버에 연결할 수 없습니다. 잠시 후 다시 시도하거나 관리자에게 문의해 주세요."
-                cypher, raw, hints, elapsed = "", [], [], 0
-                source, confidence = "LLM", "LOW"
-                if "ConnectError" in type(e).__name__ or "connect" in str(e).lower():
-                    answer = "서버에 연결할 수 없습니다. 백엔드가 실행 중인지 확인해 주세요."
-
-        st.markdown(answer)
+        # 단계 표시 + 답변 토큰을 도착하는 대로 (POST /chat/stream)
+        stage = st.empty()
+        answer_box = st.empty()
+        stage.caption("🧠 유사 회사명 검색 중...")
+        try:
+            d, tokens = None, []
+            for event, data in api_client.stream_chat(question, st.session_state.chat_session_id):
+                if event == "hints":
+                    stage.caption("🔍 Cypher 생성 중...")
+                elif event == "cypher":
+                    stage.caption("📡 그래프 DB 조회 중...")
+                elif event == "rows":
+                    stage.caption(f"✍️ 답변 작성 중... (조회 결과 {len(data.get('raw', []))}건)")
+                elif event == "token":
+                    tokens.append(data.get("text", ""))
+                    answer_box.markdown("".join(tokens) + "▌")
+                elif event in ("done", "error"):
+                    d = data
+            if d is None:
+                raise RuntimeError("응답 스트림이 결과 없이 끝났습니다.")
+            answer = d["answer"]
+            cypher = d.get("cypher", "")
+            raw = d.get("raw", [])
+            hints = d.get("hints", [])
+            source = d.get("source", "LLM")
+            confidence = d.get("confidence", "LOW")
+            elapsed = d.get("elapsed", 0)
+            cached = d.get("cached", False)
+        except Exception as e:
+            answer = "서버에 연결할 수 없습니다. 잠시 후 다시 시도하거나 관리자에게 문의해 주세요."
+            cypher, raw, hints, elapsed, cached = "", [], [], 0, False
+            source, confidence = "LLM", "LOW"
+            if "ConnectError" in type(e).__name__ or "connect" in str(e).lower():
+                answer = "서버에 연결할 수 없습니다. 백엔드가 실행 중인지 확인해 주세요."
+        stage.empty()
+
+        answer_box.markdown(answer)
         meta = SOURCE_META.get(source, SOURCE_META["LLM"])
         st.caption(f"{meta['emoji']} **{meta['label']}** — {meta['desc']}")
         if cypher:
-            with st.expander("🔍 생성된 Cypher (고급)"):
+            with st.expander("🔍 재사용된 Cypher (캐시)" if cached else "🔍 생성된 Cypher (고급)"):
                 st.code(cypher, language="cypher")
         if hints:
             st.caption(f"🧠 벡터 힌트: {', '.join(hints)}")
@@ -130,5 +154,6 @@ if question:
         "hints": hints,
         "source": source,
         "confidence": confidence,
+        "cached": cached,
         "elapsed": elapsed,
     })
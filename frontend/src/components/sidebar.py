@@ -30,6 +30,9 @@ def render_sidebar(on_example_click=None, on_reset_click=None):
             cols = st.columns(2)
             for i, node in enumerate(data.get("nodes", [])[:4]):
                 cols[i % 2].metric(node.get("l") or "기타", f"{node.get('n', 0):,}")
+            snapshot = data.get("snapshot") or {}
+            if snapshot.get("computed_at"):
+                st.caption(f"집계 기준: {snapshot['computed_at'][:19].replace('T', ' ')}")
         except Exception:
             st.caption("API 연결 후 DB 현황을 불러옵니다.")
 
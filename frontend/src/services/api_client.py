@@ -1,14 +1,21 @@
 """
 Backend API 호출 전담. 결합도 격리.
 """
+import json
 import os
-from typing import Any
+from typing import Any, Iterator, Optional
 
 import httpx
 
 BASE_URL = os.environ.get("GRAPHIQ_API_URL", "https://stock-graph-y8v7.onrender.com")
 # BASE_URL = os.environ.get("GRAPHIQ_API_URL", "http://localhost:8000")
 TIMEOUT = 60.0
+# 대화 이력은 세션별 (백엔드가 X-Session-Id 로 구분)
+SESSION_HEADER = "X-Session-Id"
+
+
+def _session_headers(session_id: Optional[str]) -> dict[str, str]:
+    return {SESSION_HEADER: session_id} if session_id else {}
 
 
 def get_status() -> dict:
@@ -29,18 +36,50 @@ def get_stats() -> dict:
     return r.json()
 
 
-def post_chat(question: str) -> dict[str, Any]:
+def post_chat(question: str, session_id: Optional[str] = None) -> dict[str, Any]:
     r = httpx.post(
         f"{BASE_URL}/chat",
         json={"question": question},
+        headers=_session_headers(session_id),
         timeout=TIMEOUT,
     )
     r.raise_for_status()
     return r.json()
 
 
-def delete_chat() -> dict:
-    r = httpx.delete(f"{BASE_URL}/chat", timeout=5.0)
+def stream_chat(question: str, session_id: Optional[str] = None) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    POST /chat/stream (SSE) → (이벤트, 데이터) 를 도착 순서대로.
+    hints → cypher → rows → token* → done | error (마지막 데이터는 post_chat 응답과 같은 모양).
+    스트리밍 미지원 백엔드(404/405)면 post_chat 결과를 done 하나로 반환.
+    """
+    with httpx.stream(
+        "POST",
+        f"{BASE_URL}/chat/stream",
+        json={"question": question},
+        headers=_session_headers(session_id),
+        timeout=httpx.Timeout(TIMEOUT, connect=10.0),
+    ) as r:
+        if r.status_code in (404, 405):
+            yield "done", post_chat(question, session_id)
+            return
+        r.raise_for_status()
+        event, data = "message", []
+        for line in r.iter_lines():
+            if not line:
+                if data:
+                    yield event, json.loads("\n".join(data))
+                event, data = "message", []
+            elif line.startswith(":"):
+                continue  # 주석 (keep-alive)
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].lstrip())
+
+
+def delete_chat(session_id: Optional[str] = None) -> dict:
+    r = httpx.delete(f"{BASE_URL}/chat", headers=_session_headers(session_id), timeout=5.0)
     r.raise_for_status()
     return r.json()
 